@@ -169,7 +169,17 @@ function run_test_unit() {
 }
 
 function run_test_e2e() {
-    call_python $PATH_TESTCONFIG/e2e.py "$PATH_TESTCONFIG";
+    _log_info "E2E TESTS";
+    _log_info "Activate VENV";
+    activate_python_venv;
+    call_python $PATH_TEST/e2e.py "$PATH_TESTCONFIG" --report "$PATH_BUILD/e2e.json";
+}
+
+function run_test_benchmark() {
+    _log_info "BENCHMARKS";
+    _log_info "Activate VENV";
+    activate_python_venv;
+    call_python $PATH_TEST/benchmark.py "$PATH_TESTCONFIG" --output "$PATH_BUILD/benchmark.json";
 }
 
 function run_clean_artefacts() {
@@ -25,6 +25,14 @@ elif [ "$mode" == "unit" ]; then
     # whale_call <service>  <tag-sequence>    <save, it, ports> <type, command>
     whale_call   "$SERVICE" "setup,unit"      false false true  SCRIPT $ME $SCRIPTARGS;
     run_test_unit;
+elif [ "$mode" == "e2e" ]; then
+    # whale_call <service>  <tag-sequence>    <save, it, ports> <type, command>
+    whale_call   "$SERVICE" "setup,e2e"       false false true  SCRIPT $ME $SCRIPTARGS;
+    run_test_e2e;
+elif [ "$mode" == "benchmark" ]; then
+    # whale_call <service>  <tag-sequence>    <save, it, ports> <type, command>
+    whale_call   "$SERVICE" "setup,benchmark" false false true  SCRIPT $ME $SCRIPTARGS;
+    run_test_benchmark;
 elif [ "$mode" == "explore" ]; then
     # whale_call <service>  <tag-sequence>    <save, it, ports> <type, command>
     whale_call   "$SERVICE" "setup,(explore)" true true true    SCRIPT $ME $SCRIPTARGS;
@@ -33,10 +41,11 @@ else
     _log_error   "Invalid cli argument.";
     _cli_message "";
     _cli_message "  Call \033[1m./test.sh\033[0m with one of the commands";
-    _cli_message "    $( _help_cli_key_values      "--mode" "         " "setup" "unit" "e2e" "explore" )";
+    _cli_message "    $( _help_cli_key_values      "--mode" "         " "setup" "unit" "e2e" "benchmark" "explore" )";
     _cli_message "    $( _help_cli_key_description "--mode setup" "   " "install all necessary requirements" )";
     _cli_message "    $( _help_cli_key_description "--mode unit" "    " "runs unit tests" )";
     _cli_message "    $( _help_cli_key_description "--mode e2e" "     " "runs e2e tests" )";
+    _cli_message "    $( _help_cli_key_description "--mode benchmark" "" "runs benchmarks and writes \033[1m$PATH_BUILD/benchmark.json\033[0m" )";
     _cli_message "    $( _help_cli_key_description "--mode explore" " " "opens the console (potentially in docker)" )";
     _cli_message "";
     exit 1;
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+import hashlib;
+import importlib;
+import os;
+import pickle;
+import sys;
+import tempfile;
+import types;
+from typing import Any;
+from typing import TYPE_CHECKING;
+from typing import Union;
+
+if TYPE_CHECKING:
+    from lark import Lark;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# directory of the on-disk grammar cache; set to the empty string to disable the cache.
+ENV_CACHE_DIR: str = 'LOGIC_CACHE_DIR';
+PATH_GRAMMARS: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'grammars');
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASSES: pickling of compiled parsers
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: Lark 0.11 can neither save() nor cache= an Earley parser and plain pickling
+# fails on the references to the regex module. Modules are thus stored by name.
+
+class ParserPickler(pickle.Pickler):
+    def persistent_id(self, obj: Any):
+        if isinstance(obj, types.ModuleType):
+            return obj.__name__;
+        return None;
+
+class ParserUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid: Any):
+        return importlib.import_module(pid);
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def grammarPath(name: str) -> str:
+    return os.path.join(PATH_GRAMMARS, name);
+
+def loadGrammar(path: str, **options: Any) -> Lark:
+    '''
+    Builds a Lark parser for the grammar at `path` with the given Lark options.
+    Compiled parsers are kept on disk, keyed by the grammar text, the options
+    and the versions of Lark and Python, so that only the first process pays for the grammar analysis.
+    A missing, stale or unreadable cache entry is silently rebuilt.
+    '''
+    import lark;
+    with open(path, 'r') as fp:
+        grammar = fp.read();
+    directory = grammarCacheDir();
+    if directory is None:
+        return lark.Lark(grammar, **options);
+    key = hashlib.sha256(repr((
+        grammar,
+        sorted([ (key, optionKey(value)) for key, value in options.items() ]),
+        lark.__version__,
+        sys.version_info[:2],
+    )).encode('utf-8')).hexdigest();
+    path_cache = os.path.join(directory, 'grammar-{}.pickle'.format(key));
+    try:
+        with open(path_cache, 'rb') as fp:
+            parser = ParserUnpickler(fp).load();
+        if isinstance(parser, lark.Lark):
+            return parser;
+    except:
+        pass;
+    parser = lark.Lark(grammar, **options);
+    try:
+        os.makedirs(directory, exist_ok=True);
+        # write atomically, as concurrent processes may build the same entry:
+        fd, path_tmp = tempfile.mkstemp(dir=directory, suffix='.tmp');
+        with os.fdopen(fd, 'wb') as fp:
+            ParserPickler(fp, protocol=pickle.HIGHEST_PROTOCOL).dump(parser);
+        os.replace(path_tmp, path_cache);
+    except:
+        pass;
+    return parser;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def optionKey(value: Any) -> str:
+    # functions and classes (e.g. tree_class) by name, as their repr contains the address:
+    if isinstance(value, (type, types.FunctionType)):
+        return '{}.{}'.format(value.__module__, value.__qualname__);
+    return repr(value);
+
+def grammarCacheDir() -> Union[str, None]:
+    directory = os.environ.get(ENV_CACHE_DIR);
+    if directory is None:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache');
+        directory = os.path.join(base, 'logic');
+    return directory if directory != '' else None;
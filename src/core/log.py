@@ -5,15 +5,17 @@
 # IMPORTS
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+import sys;
 from typing import Any;
+from typing import IO;
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # METHODS
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-def logGeneric(tag: str, *lines: Any):
+def logGeneric(tag: str, *lines: Any, file: IO[str] = None):
     for line in lines:
-        print('{} {}'.format(tag, line));
+        print('{} {}'.format(tag, line), file=file or sys.stdout);
 
 def logInfo(*lines: Any):
     logGeneric('[\033[94;1mINFO\033[0m]', *lines);
@@ -25,7 +27,8 @@ def logWarn(*lines: Any):
     logGeneric('[\033[93;1mWARNING\033[0m]', *lines);
 
 def logError(*lines: Any):
-    logGeneric('[\033[91;1mERROR\033[0m]', *lines);
+    # errors go to stderr, so as not to mix with output written to stdout:
+    logGeneric('[\033[91;1mERROR\033[0m]', *lines, file=sys.stderr);
 
 def logFatal(*lines: Any):
     logGeneric('[\033[94;1mFATAL\033[0m]', *lines);
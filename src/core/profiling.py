@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+import atexit;
+import json;
+import os;
+import tracemalloc;
+from threading import Lock;
+from timeit import default_timer as timer;
+from typing import Any;
+from typing import Dict;
+from typing import List;
+from typing import Union;
+
+from src.core.log import logInfo;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: Instrumentation is off unless enabled via the environment or main.py --profile.
+# Call sites guard on PROFILER.enabled (one attribute lookup) and phase() hands out a shared no-op
+# context manager while disabled, so that the disabled instrumentation costs essentially nothing.
+# Phase times are inclusive, i.e. nested phases are also counted in the enclosing one.
+#   LOGIC_PROFILE         unset, '' or '0': off; '1' or 'log': report to the log at exit; otherwise: path of a JSON report.
+#   LOGIC_PROFILE_MEMORY  '1': also trace allocations (tracemalloc), per phase and in snapshots.
+ENV_PROFILE: str = 'LOGIC_PROFILE';
+ENV_PROFILE_MEMORY: str = 'LOGIC_PROFILE_MEMORY';
+SNAPSHOT_TOP: int = 10;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: Phase
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class Phase(object):
+    __slots__ = ('profiler', 'name', 't0', 'm0');
+
+    profiler: Profiler;
+    name:     str;
+    t0:       float;
+    m0:       int;
+
+    def __init__(self, profiler: Profiler, name: str):
+        self.profiler = profiler;
+        self.name     = name;
+        return;
+
+    def __enter__(self) -> Phase:
+        self.m0 = tracemalloc.get_traced_memory()[0] if self.profiler.memory else 0;
+        self.t0 = timer();
+        return self;
+
+    def __exit__(self, *_):
+        seconds = timer() - self.t0;
+        allocated = tracemalloc.get_traced_memory()[0] - self.m0 if self.profiler.memory else 0;
+        self.profiler.record(self.name, seconds, allocated);
+        return False;
+
+class NoPhase(object):
+    __slots__ = ();
+
+    def __enter__(self) -> NoPhase:
+        return self;
+
+    def __exit__(self, *_):
+        return False;
+
+NO_PHASE: NoPhase = NoPhase();
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: Profiler
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class Profiler(object):
+    '''
+    Per-phase timers (calls, seconds, net allocated bytes), named counters
+    and tracemalloc snapshots, collected process-wide.
+    '''
+    enabled:   bool;
+    memory:    bool;
+    phases:    Dict[str, List[Union[int, float]]];
+    counters:  Dict[str, int];
+    snapshots: List[Dict[str, Any]];
+    lock:      Lock;
+
+    def __init__(self):
+        self.enabled = False;
+        self.memory  = False;
+        self.lock    = Lock();
+        self.reset();
+        return;
+
+    def enable(self, memory: bool = False):
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start();
+        self.memory  = memory;
+        self.enabled = True;
+        return;
+
+    def disable(self):
+        if self.memory and tracemalloc.is_tracing():
+            tracemalloc.stop();
+        self.enabled = False;
+        self.memory  = False;
+        return;
+
+    def reset(self):
+        with self.lock:
+            self.phases    = dict();
+            self.counters  = dict();
+            self.snapshots = [];
+        return;
+
+    def phase(self, name: str) -> Union[Phase, NoPhase]:
+        return Phase(self, name) if self.enabled else NO_PHASE;
+
+    def record(self, name: str, seconds: float, allocated: int = 0):
+        with self.lock:
+            entry = self.phases.get(name);
+            if entry is None:
+                entry = self.phases[name] = [ 0, 0., 0 ];
+            entry[0] += 1;
+            entry[1] += seconds;
+            entry[2] += allocated;
+        return;
+
+    def count(self, name: str, n: int = 1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n;
+        return;
+
+    def snapshot(self, label: str, top: int = SNAPSHOT_TOP):
+        if not (self.enabled and self.memory):
+            return;
+        stats = tracemalloc.take_snapshot().statistics('lineno')[:top];
+        current, peak = tracemalloc.get_traced_memory();
+        with self.lock:
+            self.snapshots.append(dict(
+                label   = label,
+                current = current,
+                peak    = peak,
+                top     = [ dict(location=str(stat.traceback), size=stat.size, count=stat.count) for stat in stats ],
+            ));
+        return;
+
+    def report(self) -> Dict[str, Any]:
+        with self.lock:
+            report = dict(
+                phases    = { name: dict(calls=calls, seconds=seconds, allocated=allocated) for name, (calls, seconds, allocated) in self.phases.items() },
+                counters  = dict(self.counters),
+                snapshots = list(self.snapshots),
+            );
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory();
+            report['memory'] = dict(current=current, peak=peak);
+        return report;
+
+    def logReport(self):
+        report = self.report();
+        lines = [ 'Profile:' ];
+        for name, entry in sorted(report['phases'].items()):
+            line = '  {:<28} {:>8} calls {:>12.3f} ms'.format(name, entry['calls'], 1e3*entry['seconds']);
+            if self.memory:
+                line += ' {:>12} B'.format(entry['allocated']);
+            lines.append(line);
+        for name, value in sorted(report['counters'].items()):
+            lines.append('  {:<28} {:>8}'.format(name, value));
+        for snapshot in report['snapshots']:
+            lines.append('  snapshot \033[1m{}\033[0m: {} B current, {} B peak'.format(snapshot['label'], snapshot['current'], snapshot['peak']));
+            lines += [ '    {:>10} B {:>7}x {}'.format(stat['size'], stat['count'], stat['location']) for stat in snapshot['top'] ];
+        logInfo(*lines);
+        return;
+
+    def writeReport(self, path: str):
+        with open(path, 'w') as fp:
+            json.dump(self.report(), fp, indent=2);
+        return;
+
+    def emit(self, target: Union[str, None] = None):
+        '''
+        Reports to the log (target None or '-') or as JSON to the file `target`.
+        '''
+        if target is None or target == '-':
+            self.logReport();
+        else:
+            self.writeReport(target);
+        return;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL VARIABLES
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+PROFILER: Profiler = Profiler();
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def profileTarget() -> Union[str, None]:
+    '''
+    Returns '-' (report to the log) or the path of a JSON report if LOGIC_PROFILE is set, otherwise None.
+    '''
+    value = os.environ.get(ENV_PROFILE, '');
+    if value in ['', '0']:
+        return None;
+    elif value in ['1', 'log']:
+        return '-';
+    return value;
+
+def configureFromEnvironment():
+    target = profileTarget();
+    if target is None:
+        return;
+    PROFILER.enable(memory=os.environ.get(ENV_PROFILE_MEMORY, '') == '1');
+    def finish():
+        PROFILER.snapshot('exit');
+        PROFILER.emit(target);
+    atexit.register(finish);
+    return;
+
+configureFromEnvironment();
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+from typing import Any;
+from typing import Callable;
+from typing import Dict;
+from typing import Iterator;
+from typing import List;
+from typing import Sequence;
+from typing import Tuple;
+from typing import TypeVar;
+from typing import Union;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: All traversals use explicit stacks instead of recursion,
+# so that the depth of a tree is only limited by memory and not by the recursion limit.
+# Trees are anything with children; by default these are read from the attribute ‘parts‘.
+T = TypeVar('T');
+R = TypeVar('R');
+
+def getParts(node: Any) -> Sequence[Any]:
+    return node.parts;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS: traversal
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def preOrder(root: T, children: Callable[[T], Sequence[T]] = getParts) -> Iterator[T]:
+    stack: List[T] = [ root ];
+    while len(stack) > 0:
+        node = stack.pop();
+        yield node;
+        stack.extend(reversed(children(node)));
+    return;
+
+def preOrderWithDepth(root: T, children: Callable[[T], Sequence[T]] = getParts, depth: int = 0) -> Iterator[Tuple[T, int]]:
+    stack: List[Tuple[T, int]] = [ (root, depth) ];
+    while len(stack) > 0:
+        node, d = stack.pop();
+        yield node, d;
+        stack.extend([ (child, d + 1) for child in reversed(children(node)) ]);
+    return;
+
+def postOrder(root: T, children: Callable[[T], Sequence[T]] = getParts) -> Iterator[T]:
+    stack: List[Tuple[T, bool]] = [ (root, False) ];
+    while len(stack) > 0:
+        node, expanded = stack.pop();
+        if expanded:
+            yield node;
+            continue;
+        stack.append((node, True));
+        stack.extend([ (child, False) for child in reversed(children(node)) ]);
+    return;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS: folds
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def foldTree(root: T, combine: Callable[[T, List[R]], R], children: Callable[[T], Sequence[T]] = getParts) -> R:
+    '''
+    Bottom-up fold: computes combine(node, [results of the children]) for every node
+    in post-order and returns the result for the root.
+    '''
+    values: List[R] = [];
+    stack: List[Tuple[T, int]] = [ (root, -1) ];
+    while len(stack) > 0:
+        node, n = stack.pop();
+        if n < 0:
+            parts = children(node);
+            stack.append((node, len(parts)));
+            stack.extend([ (child, -1) for child in reversed(parts) ]);
+            continue;
+        if n == 0:
+            values.append(combine(node, []));
+        else:
+            results = values[len(values)-n:];
+            del values[len(values)-n:];
+            values.append(combine(node, results));
+    return values[0];
+
+def foldPreOrder(root: T, visit: Callable[[R, T, int], R], initial: R, children: Callable[[T], Sequence[T]] = getParts) -> R:
+    '''
+    Left fold over all nodes in pre-order: value = visit(value, node, depth).
+    '''
+    value = initial;
+    for node, depth in preOrderWithDepth(root, children=children):
+        value = visit(value, node, depth);
+    return value;
+
+def foldDag(root: T, combine: Callable[[T, List[R]], R], children: Callable[[T], Sequence[T]] = getParts, memo: Union[Dict[T, R], None] = None) -> R:
+    '''
+    Like foldTree, but for directed acyclic graphs of hashable nodes (e.g. hash-consed expressions):
+    the result for each distinct node is computed once and reused for all further occurrences.
+    Passing the same memo to several calls shares results between them.
+    '''
+    memo = dict() if memo is None else memo;
+    values: List[R] = [];
+    stack: List[Tuple[T, int]] = [ (root, -1) ];
+    while len(stack) > 0:
+        node, n = stack.pop();
+        if n < 0:
+            if node in memo:
+                values.append(memo[node]);
+                continue;
+            parts = children(node);
+            stack.append((node, len(parts)));
+            stack.extend([ (child, -1) for child in reversed(parts) ]);
+            continue;
+        if n == 0:
+            value = combine(node, []);
+        else:
+            value = combine(node, values[len(values)-n:]);
+            del values[len(values)-n:];
+        memo[node] = value;
+        values.append(value);
+    return values[0];
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+from typing import Any;
+from typing import Dict;
+from typing import Generic;
+from typing import Iterable;
+from typing import Iterator;
+from typing import List;
+from typing import Tuple;
+from typing import TYPE_CHECKING;
+from typing import TypeVar;
+from typing import Union;
+
+# NOTE: imported for annotations only, so that fol/classes.py can import this module at load time.
+if TYPE_CHECKING:
+    from src.fol.classes import Expression;
+    from src.fol.shared import SharedExpression;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: The canonical key of a formula is its preorder sequence of nodes, each given by
+# kind, 2*(number of parts) + isLabelled and (for labelled nodes) the label, i.e. what Expression.__eq__ compares.
+# Quantifiers omit their variable, and bound occurrences of variables are replaced by their de Bruijn index
+# (an int: 1 for the innermost binder), so that formulas equal up to renaming of bound variables
+# have the same key. Free variables keep their label. The sequence determines the tree, so equal keys
+# mean alpha-equivalent formulas (no false positives beyond the hash of a tuple).
+QUANTIFIER_KINDS: List[str] = [ 'all', 'exists' ];
+
+Formula = Union['Expression', 'SharedExpression'];
+T = TypeVar('T');
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def alphaKey(fml: Formula) -> Tuple[Any, ...]:
+    key: List[Any] = [];
+    binders: Dict[str, List[int]] = dict();
+    depth = 0;
+    # entries are nodes, or the label of a binder to be closed (str):
+    stack: List[Union[Formula, str]] = [ fml ];
+    while len(stack) > 0:
+        t = stack.pop();
+        if isinstance(t, str):
+            binders[t].pop();
+            depth -= 1;
+            continue;
+        kind = t.kind;
+        if kind == 'variable':
+            scope = binders.get(t.label);
+            key.append(kind);
+            if scope:
+                key.append(1);
+                key.append(depth - scope[-1] + 1);
+            elif t.isLabelled:
+                key.append(1);
+                key.append(t.label);
+            else:
+                key.append(0);
+            continue;
+        parts = t.parts;
+        if kind in QUANTIFIER_KINDS and len(parts) == 2 and parts[0].kind == 'variable':
+            key.append(kind);
+            key.append(2);
+            x = parts[0].label;
+            depth += 1;
+            binders.setdefault(x, []).append(depth);
+            stack.append(x);
+            stack.append(parts[1]);
+            continue;
+        labelled = bool(t.isLabelled);
+        key.append(kind);
+        key.append(2*len(parts) + int(labelled));
+        if labelled:
+            key.append(t.label);
+        stack.extend(reversed(parts));
+    return tuple(key);
+
+def alphaHash(fml: Formula) -> int:
+    return hash(alphaKey(fml));
+
+def alphaEquivalent(fml1: Formula, fml2: Formula) -> bool:
+    return alphaKey(fml1) == alphaKey(fml2);
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: AlphaDict
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class AlphaDict(Generic[T]):
+    '''
+    Dictionary with formulas as keys, up to renaming of bound variables.
+    Iteration yields the first inserted representative of each class.
+    '''
+    entries: Dict[Tuple[Any, ...], Tuple[Formula, T]];
+
+    def __init__(self, items: Iterable[Tuple[Formula, T]] = ()):
+        self.entries = dict();
+        for fml, value in items:
+            self[fml] = value;
+        return;
+
+    def __len__(self) -> int:
+        return len(self.entries);
+
+    def __contains__(self, fml: Formula) -> bool:
+        return alphaKey(fml) in self.entries;
+
+    def __getitem__(self, fml: Formula) -> T:
+        return self.entries[alphaKey(fml)][1];
+
+    def __setitem__(self, fml: Formula, value: T):
+        key = alphaKey(fml);
+        entry = self.entries.get(key);
+        self.entries[key] = (fml if entry is None else entry[0], value);
+        return;
+
+    def __delitem__(self, fml: Formula):
+        del self.entries[alphaKey(fml)];
+        return;
+
+    def __iter__(self) -> Iterator[Formula]:
+        return iter([ fml for fml, _ in self.entries.values() ]);
+
+    def get(self, fml: Formula, default: Union[T, None] = None) -> Union[T, None]:
+        entry = self.entries.get(alphaKey(fml));
+        return default if entry is None else entry[1];
+
+    def setdefault(self, fml: Formula, value: T) -> T:
+        key = alphaKey(fml);
+        entry = self.entries.get(key);
+        if entry is None:
+            entry = self.entries[key] = (fml, value);
+        return entry[1];
+
+    def representative(self, fml: Formula) -> Formula:
+        return self.entries[alphaKey(fml)][0];
+
+    def keys(self) -> List[Formula]:
+        return [ fml for fml, _ in self.entries.values() ];
+
+    def values(self) -> List[T]:
+        return [ value for _, value in self.entries.values() ];
+
+    def items(self) -> List[Tuple[Formula, T]]:
+        return list(self.entries.values());
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: AlphaSet
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class AlphaSet(object):
+    '''
+    Set of formulas up to renaming of bound variables, e.g. for deduplication:
+    add() returns whether the formula was new.
+    '''
+    entries: Dict[Tuple[Any, ...], Formula];
+
+    def __init__(self, fmls: Iterable[Formula] = ()):
+        self.entries = dict();
+        for fml in fmls:
+            self.add(fml);
+        return;
+
+    def __len__(self) -> int:
+        return len(self.entries);
+
+    def __contains__(self, fml: Formula) -> bool:
+        return alphaKey(fml) in self.entries;
+
+    def __iter__(self) -> Iterator[Formula]:
+        return iter(list(self.entries.values()));
+
+    def add(self, fml: Formula) -> bool:
+        key = alphaKey(fml);
+        if key in self.entries:
+            return False;
+        self.entries[key] = fml;
+        return True;
+
+    def discard(self, fml: Formula):
+        self.entries.pop(alphaKey(fml), None);
+        return;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS: deduplication
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def deduplicate(fmls: Iterable[Formula]) -> Iterator[Formula]:
+    '''
+    Yields the first formula of each alpha-equivalence class, lazily and in order.
+    '''
+    seen: Dict[Tuple[Any, ...], None] = dict();
+    for fml in fmls:
+        key = alphaKey(fml);
+        if key in seen:
+            continue;
+        seen[key] = None;
+        yield fml;
+    return;
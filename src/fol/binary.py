@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+import io;
+import mmap;
+import os;
+import shutil;
+import struct;
+import sys;
+import tempfile;
+from array import array;
+from typing import IO;
+from typing import Dict;
+from typing import Iterable;
+from typing import Iterator;
+from typing import List;
+from typing import Tuple;
+from typing import Union;
+
+from src.core.traversal import foldTree;
+from src.fol.classes import Descriptor;
+from src.fol.classes import Expression;
+from src.fol.classes import getDescriptor;
+from src.fol.encoding import DESC_WIDTH;
+from src.fol.encoding import SymbolTable;
+from src.fol.shared import SharedExpression;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# File layout (version 1), all integers unsigned 32 bit little endian:
+#   header:  magic, version, #strings, #bytes of string data, #descriptors, #nodes, #edges, #roots
+#   strings: #strings + 1 offsets into the string data
+#   descs:   DESC_WIDTH (6) per descriptor (kind, symbol, display, isLabelled, glueOption, glueOuterOption), see encoding.SymbolTable
+#   nodes:   4 per node (descriptor, label, 2*(number of parts) + outerBrackets, first edge)
+#   edges:   child node indices; the parts of a node are edges[first edge : first edge + number of parts]
+#   roots:   node indices of the stored expressions
+#   string data (utf-8)
+# Nodes are in post-order and hash-consed, i.e. identical subterms are stored once
+# and children always precede their parents.
+MAGIC:        bytes = b'FOLB';
+VERSION:      int = 1;
+HEADER:       struct.Struct = struct.Struct('<4s7I');
+NODE_WIDTH:   int = 4;
+TYPECODE:     str = 'I';
+
+# NOTE: The writer holds the string and descriptor tables (distinct symbols and labels) in memory,
+# but spills nodes, edges and roots to temporary files, so its memory does not grow with the corpus.
+# Identical subterms are shared within a window of MAX_SHARED_NODES nodes only.
+SPILL_SIZE:       int = 1 << 16;
+MAX_SHARED_NODES: int = 1 << 20;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: FolBinaryWriter
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class FolBinaryWriter(SymbolTable):
+    '''
+    Writes the binary format incrementally: only the string and descriptor tables
+    and a window of at most maxShared interned nodes stay in memory. Nodes, edges and roots
+    are spilled to temporary files in blocks of spillSize integers and copied on save.
+    '''
+    nodes:       array;
+    nodeIndex:   Dict[Tuple[int, ...], int];
+    edges:       array;
+    roots:       array;
+    nodeCount:   int;
+    edgeCount:   int;
+    rootCount:   int;
+    spilled:     Dict[str, IO[bytes]];
+    spillSize:   int;
+    maxShared:   int;
+
+    def __init__(self, spillSize: int = SPILL_SIZE, maxShared: int = MAX_SHARED_NODES):
+        super().__init__(typecode=TYPECODE);
+        self.nodes       = array(TYPECODE);
+        self.nodeIndex   = dict();
+        self.edges       = array(TYPECODE);
+        self.roots       = array(TYPECODE);
+        self.nodeCount   = 0;
+        self.edgeCount   = 0;
+        self.rootCount   = 0;
+        self.spilled     = dict();
+        self.spillSize   = spillSize;
+        self.maxShared   = maxShared;
+        return;
+
+    def __len__(self) -> int:
+        return self.rootCount;
+
+    def __enter__(self) -> FolBinaryWriter:
+        return self;
+
+    def __exit__(self, *_):
+        self.close();
+        return;
+
+    def close(self):
+        for fp in self.spilled.values():
+            fp.close();
+        self.spilled = dict();
+        return;
+
+    def node(self, t: Expression, parts: List[int]) -> int:
+        key = (self.descriptor(t.desc), self.string(t.label), 2*len(parts) + int(t.outerBrackets), *parts);
+        index = self.nodeIndex.get(key);
+        if index is None:
+            # subterms are only shared within a window, which keeps the file valid:
+            if len(self.nodeIndex) >= self.maxShared:
+                self.nodeIndex.clear();
+            index = self.nodeCount;
+            self.nodes.extend([ key[0], key[1], key[2], self.edgeCount ]);
+            self.edges.extend(parts);
+            self.nodeCount += 1;
+            self.edgeCount += len(parts);
+            self.nodeIndex[key] = index;
+            self.spill('nodes');
+            self.spill('edges');
+        return index;
+
+    def add(self, fml: Expression) -> int:
+        self.roots.append(foldTree(fml, self.node));
+        self.rootCount += 1;
+        self.spill('roots');
+        return self.rootCount - 1;
+
+    def spill(self, name: str):
+        section = getattr(self, name);
+        if len(section) < self.spillSize:
+            return;
+        if not name in self.spilled:
+            self.spilled[name] = tempfile.TemporaryFile();
+        self.spilled[name].write(littleEndian(section));
+        del section[:];
+        return;
+
+    def write(self, fp: IO[bytes]):
+        data = [ u.encode('utf-8') for u in self.strings ];
+        offsets = array(TYPECODE, [0]);
+        for u in data:
+            offsets.append(offsets[-1] + len(u));
+        fp.write(HEADER.pack(
+            MAGIC, VERSION,
+            len(self.strings), offsets[-1],
+            len(self.descs) // DESC_WIDTH, self.nodeCount, self.edgeCount, self.rootCount,
+        ));
+        fp.write(littleEndian(offsets));
+        fp.write(littleEndian(self.descs));
+        for name in [ 'nodes', 'edges', 'roots' ]:
+            spilled = self.spilled.get(name);
+            if spilled is not None:
+                spilled.seek(0);
+                shutil.copyfileobj(spilled, fp);
+                spilled.seek(0, os.SEEK_END);
+            fp.write(littleEndian(getattr(self, name)));
+        for u in data:
+            fp.write(u);
+        return;
+
+    def tobytes(self) -> bytes:
+        fp = io.BytesIO();
+        self.write(fp);
+        return fp.getvalue();
+
+    def save(self, path: str):
+        with open(path, 'wb') as fp:
+            self.write(fp);
+        return;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: FolBinaryReader
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class FolBinaryReader(object):
+    '''
+    Reads the binary format from a file (memory-mapped) or from bytes.
+    Nothing is decoded up front: strings, descriptors and nodes are read on access,
+    so that opening a large corpus is (almost) free and only the expressions used are built.
+    Each access to an expression builds a fresh Expression tree; shared(...) returns
+    hash-consed SharedExpressions, which keep the sharing of the file.
+    '''
+    buffer:   Union[mmap.mmap, bytes, None];
+    views:    List[memoryview];
+    offsets:  Union[memoryview, array];
+    descs:    Union[memoryview, array];
+    nodes:    Union[memoryview, array];
+    edges:    Union[memoryview, array];
+    roots:    Union[memoryview, array];
+    data:     memoryview;
+    stringCache: Dict[int, str];
+    descCache:   Dict[int, Descriptor];
+    sharedCache: Dict[int, SharedExpression];
+
+    def __init__(self, source: Union[str, bytes]):
+        if isinstance(source, (bytes, bytearray)):
+            self.buffer = bytes(source);
+        else:
+            with open(source, 'rb') as fp:
+                self.buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ);
+        self.views = [];
+        self.stringCache = dict();
+        self.descCache   = dict();
+        self.sharedCache = dict();
+        if len(self.buffer) < HEADER.size:
+            self.close();
+            raise Exception('File is too short for a binary FOL corpus!');
+        magic, version, nstrings, nbytes, ndescs, nnodes, nedges, nroots = HEADER.unpack_from(self.buffer, 0);
+        if not magic == MAGIC:
+            self.close();
+            raise Exception('File is not a binary FOL corpus!');
+        if not version == VERSION:
+            self.close();
+            raise Exception('Binary FOL corpus has version \033[1m{}\033[0m, expected \033[1m{}\033[0m!'.format(version, VERSION));
+        position = HEADER.size;
+        sections = [];
+        for n in [ nstrings + 1, DESC_WIDTH*ndescs, NODE_WIDTH*nnodes, nedges, nroots ]:
+            sections.append(self.section(position, n));
+            position += 4*n;
+        if len(self.buffer) < position + nbytes:
+            self.close();
+            raise Exception('Binary FOL corpus is truncated!');
+        self.offsets, self.descs, self.nodes, self.edges, self.roots = sections;
+        self.data = memoryview(self.buffer)[position:position + nbytes];
+        self.views.append(self.data);
+        return;
+
+    def section(self, position: int, n: int) -> Union[memoryview, array]:
+        view = memoryview(self.buffer)[position:position + 4*n];
+        if sys.byteorder == 'little':
+            # zero copy:
+            view = view.cast(TYPECODE);
+            self.views.append(view);
+            return view;
+        values = array(TYPECODE, view.tobytes());
+        values.byteswap();
+        view.release();
+        return values;
+
+    def __enter__(self) -> FolBinaryReader:
+        return self;
+
+    def __exit__(self, *_):
+        self.close();
+        return;
+
+    def close(self):
+        for view in self.views:
+            view.release();
+        self.views = [];
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close();
+        self.buffer = None;
+        return;
+
+    def __len__(self) -> int:
+        return len(self.roots);
+
+    def __getitem__(self, index: int) -> Expression:
+        return self.expression(self.roots[index]);
+
+    def __iter__(self) -> Iterator[Expression]:
+        for index in range(len(self.roots)):
+            yield self[index];
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # lazy decoding
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def string(self, index: int) -> str:
+        u = self.stringCache.get(index);
+        if u is None:
+            u = str(self.data[self.offsets[index]:self.offsets[index+1]], 'utf-8');
+            self.stringCache[index] = u;
+        return u;
+
+    def descriptor(self, index: int) -> Descriptor:
+        desc = self.descCache.get(index);
+        if desc is None:
+            k = DESC_WIDTH*index;
+            desc = getDescriptor(
+                self.string(self.descs[k]),
+                self.string(self.descs[k+1]),
+                self.string(self.descs[k+2]),
+                bool(self.descs[k+3]),
+                self.string(self.descs[k+4]),
+                self.string(self.descs[k+5]),
+            );
+            self.descCache[index] = desc;
+        return desc;
+
+    def children(self, node: int) -> List[int]:
+        k = NODE_WIDTH*node;
+        start = self.nodes[k+3];
+        return list(self.edges[start:start + (self.nodes[k+2] >> 1)]);
+
+    def expression(self, root: int) -> Expression:
+        # post-order over the node graph (a node is pushed as ~node once its children are pending);
+        # shared subterms are expanded into separate subtrees, since Expressions are mutable.
+        nodes, edges = self.nodes, self.edges;
+        values: List[Expression] = [];
+        stack: List[int] = [ root ];
+        while len(stack) > 0:
+            node = stack.pop();
+            if node >= 0:
+                k = NODE_WIDTH*node;
+                n = nodes[k+2] >> 1;
+                if n > 0:
+                    stack.append(~node);
+                    start = nodes[k+3];
+                    stack.extend(reversed(edges[start:start+n]));
+                    continue;
+                parts = ();
+            else:
+                node = ~node;
+                k = NODE_WIDTH*node;
+                n = nodes[k+2] >> 1;
+                parts = tuple(values[len(values)-n:]);
+                del values[len(values)-n:];
+            # assemble directly, as the constructor would copy the subtrees:
+            t = Expression.__new__(Expression);
+            t.desc          = self.descCache.get(nodes[k]) or self.descriptor(nodes[k]);
+            t.label         = self.stringCache.get(nodes[k+1]) or self.string(nodes[k+1]);
+            t.outerBrackets = (nodes[k+2] & 1) == 1;
+            t.parts         = parts;
+            values.append(t);
+        return values[0];
+
+    def shared(self, index: int) -> SharedExpression:
+        node = self.roots[index];
+        if node in self.sharedCache:
+            return self.sharedCache[node];
+        def combine(node: int, parts: List[SharedExpression]) -> SharedExpression:
+            t = self.sharedCache.get(node);
+            if t is None:
+                k = NODE_WIDTH*node;
+                desc = self.descriptor(self.nodes[k]);
+                t = SharedExpression(
+                    desc.kind, *parts,
+                    label           = self.string(self.nodes[k+1]),
+                    symbol          = desc.symbol,
+                    display         = desc.display,
+                    isLabelled      = desc.isLabelled,
+                    outerBrackets   = (self.nodes[k+2] & 1) == 1,
+                    glueOption      = desc.glueOption,
+                    glueOuterOption = desc.glueOuterOption,
+                );
+                self.sharedCache[node] = t;
+            return t;
+        # subterms already decoded are not expanded again:
+        return foldTree(node, combine, children=lambda node: [] if node in self.sharedCache else self.children(node));
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def dumpFolBinary(fmls: List[Expression]) -> bytes:
+    with FolBinaryWriter() as writer:
+        for fml in fmls:
+            writer.add(fml);
+        return writer.tobytes();
+
+def loadFolBinary(data: bytes) -> List[Expression]:
+    with FolBinaryReader(data) as reader:
+        return list(reader);
+
+def saveFolCorpus(path: str, fmls: Iterable[Expression]):
+    with FolBinaryWriter() as writer:
+        for fml in fmls:
+            writer.add(fml);
+        writer.save(path);
+    return;
+
+def openFolCorpus(path: str) -> FolBinaryReader:
+    return FolBinaryReader(path);
+
+def isFolBinary(path: str) -> bool:
+    try:
+        with open(path, 'rb') as fp:
+            return fp.read(len(MAGIC)) == MAGIC;
+    except:
+        return False;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def littleEndian(section: array) -> bytes:
+    if sys.byteorder != 'little':
+        section = array(section.typecode, section);
+        section.byteswap();
+    return section.tobytes();
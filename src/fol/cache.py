@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+from collections import OrderedDict;
+from threading import Lock;
+from typing import Dict;
+from typing import List;
+from typing import Tuple;
+from typing import Union;
+
+from src.fol.classes import Expression;
+from src.fol.shared import SharedExpression;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+CACHE_SIZE: int = 4096;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: ParseCache
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class ParseCache(object):
+    '''
+    Thread-safe LRU cache: normalised formula string -> parsed expressions.
+    Entries are kept as (immutable) SharedExpressions, and every hit hands out fresh Expression trees,
+    so that callers may freely mutate their results (e.g. via showOuterBraces).
+    Structurally equal subexpressions of different entries share memory.
+    '''
+    maxsize:   int;
+    hits:      int;
+    misses:    int;
+    evictions: int;
+    entries:   OrderedDict;
+    lock:      Lock;
+
+    def __init__(self, maxsize: int = CACHE_SIZE):
+        self.maxsize   = maxsize;
+        self.hits      = 0;
+        self.misses    = 0;
+        self.evictions = 0;
+        self.entries   = OrderedDict();
+        self.lock      = Lock();
+        return;
+
+    def __len__(self) -> int:
+        return len(self.entries);
+
+    def get(self, key: str) -> Union[List[Expression], None]:
+        with self.lock:
+            fmls = self.entries.get(key);
+            if fmls is None:
+                self.misses += 1;
+                return None;
+            self.entries.move_to_end(key);
+            self.hits += 1;
+        # copy outside the lock, entries are immutable:
+        return [ fml.toExpression() for fml in fmls ];
+
+    def put(self, key: str, fmls: List[Expression]):
+        if self.maxsize <= 0:
+            return;
+        # interning is thread-safe (see shared.UNIQUE_LOCK), so it need not hold the lock of the cache:
+        shared: Tuple[SharedExpression, ...] = tuple([ SharedExpression.fromExpression(fml) for fml in fmls ]);
+        with self.lock:
+            self.entries[key] = shared;
+            self.entries.move_to_end(key);
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False);
+                self.evictions += 1;
+        return;
+
+    def resize(self, maxsize: int):
+        with self.lock:
+            self.maxsize = maxsize;
+            while len(self.entries) > max(maxsize, 0):
+                self.entries.popitem(last=False);
+                self.evictions += 1;
+        return;
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear();
+            self.hits      = 0;
+            self.misses    = 0;
+            self.evictions = 0;
+        return;
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(
+                hits      = self.hits,
+                misses    = self.misses,
+                evictions = self.evictions,
+                size      = len(self.entries),
+                maxsize   = self.maxsize,
+            );
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def normaliseFormula(u: str) -> str:
+    '''
+    Key of a formula string in the parse cache: runs of whitespace are collapsed into a single space,
+    except within labels in braces or quotes, where whitespace is part of the label.
+    The grammar reads any run of whitespace like a single space, so strings with the same key parse alike;
+    leading and trailing whitespace is kept (as a single space), since it does not parse.
+    '''
+    chars: List[str] = [];
+    depth = 0;
+    quote = '';
+    space = False;
+    for char in u:
+        if depth == 0 and quote == '' and char.isspace():
+            space = True;
+            continue;
+        if space:
+            chars.append(' ');
+            space = False;
+        if quote != '':
+            if char == quote:
+                quote = '';
+        elif char == '{':
+            depth += 1;
+        elif char == '}':
+            depth = max(depth - 1, 0);
+        elif depth == 0 and char in '\'"':
+            quote = char;
+        chars.append(char);
+    if space:
+        chars.append(' ');
+    return ''.join(chars);
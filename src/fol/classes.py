@@ -6,9 +6,17 @@
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 from __future__ import annotations
+from typing import Any;
+from typing import Dict;
 from typing import List;
+from typing import Tuple;
 
+from src.core.profiling import PROFILER;
+from src.core.traversal import foldTree;
+from src.core.traversal import preOrder;
+from src.core.traversal import preOrderWithDepth;
 from src.core.utils import getAttribute;
+from src.fol.alpha import alphaHash;
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # GLOBAL CONSTANTS
@@ -62,94 +70,312 @@ def glue(option: str, conn: str, *parts: str) -> str:
         return glueQuantifier(conn, *parts, qbrackets=False, subfmlbracket=False, outerBrackets=True, sepchar='. ');
     raise Exception('\033[1m{}\033[0m is an invalid glue option!');
 
+def glueFrame(option: str, conn: str, n: int) -> Tuple[str, str, str]:
+    # (opening, separator, closing) strings, such that glue(option, conn, *parts)
+    # == opening + separator.join(parts) + closing. Used to render without recursion.
+    if option == 'polish':
+        return conn, '', '';
+    elif option == 'polishwithouter':
+        return conn + '(', ',', ')';
+    elif option == 'infix':
+        return '', ' ' + conn + ' ', '';
+    elif option == 'infixwithouter':
+        if n > 1:
+            return '(', ' ' + conn + ' ', ')';
+        return '', ' ' + conn + ' ', '';
+    elif option == 'quantifier':
+        return conn + ' ', '. ', '';
+    elif option == 'quantifierwithouter':
+        return '(' + conn + ' ', '. ', ')';
+    raise Exception('\033[1m{}\033[0m is an invalid glue option!'.format(option));
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS: kind codes
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+KIND_UNDEFINED:          int = 0;
+KIND_VARIABLE:           int = 1;
+KIND_CONSTANT:           int = 2;
+KIND_FUNCTION:           int = 3;
+KIND_FUNCTIONEXPRESSION: int = 4;
+KIND_RELATION:           int = 5;
+KIND_RELATIONEXPRESSION: int = 6;
+KIND_NOT:                int = 7;
+KIND_AND:                int = 8;
+KIND_OR:                 int = 9;
+KIND_IMPLIES:            int = 10;
+KIND_IFF:                int = 11;
+KIND_ALL:                int = 12;
+KIND_EXISTS:             int = 13;
+
+KINDS: List[str] = [
+    'undefined',
+    'variable',
+    'constant',
+    'function',
+    'functionexpression',
+    'relation',
+    'relationexpression',
+    'not',
+    'and',
+    'or',
+    'implies',
+    'iff',
+    'all',
+    'exists',
+];
+KIND_CODES: Dict[str, int] = { kind: code for code, kind in enumerate(KINDS) };
+
+def kindCode(kind: str) -> int:
+    code = KIND_CODES.get(kind);
+    if code is None:
+        # register kinds not known in advance (e.g. from Expression.fromRepr):
+        code = len(KINDS);
+        KINDS.append(kind);
+        KIND_CODES[kind] = code;
+    return code;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: Descriptor
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class Descriptor(object):
+    '''
+    Per-symbol data shared by all nodes with the same kind, symbol, display and glue options.
+    Instances are interned via getDescriptor and must not be modified.
+    '''
+    __slots__ = ('code', 'kind', 'symbol', 'display', 'isLabelled', 'glueOption', 'glueOuterOption');
+
+    code:            int;
+    kind:            str;
+    symbol:          str;
+    display:         str;
+    isLabelled:      bool;
+    glueOption:      str;
+    glueOuterOption: str;
+
+    def __reduce__(self):
+        return (getDescriptor, (self.kind, self.symbol, self.display, self.isLabelled, self.glueOption, self.glueOuterOption));
+
+DESCRIPTORS: Dict[Tuple[str, str, str, bool, str, str], Descriptor] = dict();
+
+def getDescriptor(
+    kind: str,
+    symbol: str = '',
+    display: str = '',
+    isLabelled: bool = False,
+    glueOption: str = 'polish',
+    glueOuterOption: str = 'polish'
+) -> Descriptor:
+    key = (kind, symbol, display, isLabelled, glueOption, glueOuterOption);
+    desc = DESCRIPTORS.get(key);
+    if desc is None:
+        desc = Descriptor();
+        desc.code            = kindCode(kind);
+        desc.kind            = kind;
+        desc.symbol          = symbol;
+        desc.display         = display;
+        desc.isLabelled      = isLabelled;
+        desc.glueOption      = glueOption;
+        desc.glueOuterOption = glueOuterOption;
+        DESCRIPTORS[key] = desc;
+    return desc;
+
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # CLASS: Expression
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 class Expression(object):
-    kind:    str;
-    parts:   List[Expression];
+    # per node: descriptor, children, label and bracket flag only.
+    # kind, symbol, display, isLabelled and the glue options live in the shared descriptor;
+    # parts is a tuple, so that leaves share the empty tuple.
+    __slots__ = ('desc', 'parts', 'label', 'outerBrackets');
+
+    desc:          Descriptor;
+    parts:         Tuple[Expression, ...];
+    label:         str; # reserved for unique identifiers/‘names‘
+    outerBrackets: bool;
+
+    def __init__(self, kind: str, *parts: Expression, adopt: bool = False):
+        # NOTE: the subexpressions are copied, unless the caller hands them over (adopt),
+        # as parsers do for freshly built trees.
+        self.desc = getDescriptor(kind);
+        if adopt:
+            self.parts = tuple([ part.showOuterBraces(True) for part in parts ]);
+        else:
+            self.parts = tuple([ part.__copy__().showOuterBraces(True) for part in parts ]);
+        self.label = '';
+        self.outerBrackets = False;
+        if PROFILER.enabled:
+            PROFILER.count('expression.nodes');
+        return;
 
-    label:   str = ''; # reserved for unique identifiers/‘names‘
-    symbol:  str = ''; # for computing parseable expression
-    display: str = ''; # use e.g. for LaTeX formatting
+    @property
+    def code(self) -> int:
+        return self.desc.code;
 
-    isLabelled:    bool  = False;
-    outerBrackets: bool  = False;
-    glueOption: str      = 'polish';
-    glueOuterOption: str = 'polish';
+    @property
+    def kind(self) -> str:
+        return self.desc.kind;
 
-    def __init__(self, kind: str, *parts: Expression):
-        self.kind = kind;
-        self.parts = [ part.__copy__().showOuterBraces(True) for part in parts ];
-        return;
+    @kind.setter
+    def kind(self, value: str):
+        self.setDescriptor(kind=value);
+
+    @property
+    def symbol(self) -> str: # for computing parseable expression
+        return self.desc.symbol;
+
+    @symbol.setter
+    def symbol(self, value: str):
+        self.setDescriptor(symbol=value);
+
+    @property
+    def display(self) -> str: # use e.g. for LaTeX formatting
+        return self.desc.display;
+
+    @display.setter
+    def display(self, value: str):
+        self.setDescriptor(display=value);
+
+    @property
+    def isLabelled(self) -> bool:
+        return self.desc.isLabelled;
+
+    @isLabelled.setter
+    def isLabelled(self, value: bool):
+        self.setDescriptor(isLabelled=value);
+
+    @property
+    def glueOption(self) -> str:
+        return self.desc.glueOption;
+
+    @glueOption.setter
+    def glueOption(self, value: str):
+        self.setDescriptor(glueOption=value);
+
+    @property
+    def glueOuterOption(self) -> str:
+        return self.desc.glueOuterOption;
+
+    @glueOuterOption.setter
+    def glueOuterOption(self, value: str):
+        self.setDescriptor(glueOuterOption=value);
+
+    def setDescriptor(self, **changes: Any) -> Expression:
+        desc = self.desc;
+        self.desc = getDescriptor(
+            changes.get('kind',            desc.kind),
+            changes.get('symbol',          desc.symbol),
+            changes.get('display',         desc.display),
+            changes.get('isLabelled',      desc.isLabelled),
+            changes.get('glueOption',      desc.glueOption),
+            changes.get('glueOuterOption', desc.glueOuterOption),
+        );
+        return self;
 
     @staticmethod
     def fromRepr(r: dict) -> Expression:
-        kind = getAttribute(r, 'kind', expectedtype=str, default='undefined');
-        parts = getAttribute(r, 'parts', expectedtype=list, default=[])
-        t = Expression(kind=kind, *[Expression.fromRepr(_) for _ in parts]);
-        t.outerBrackets   = getAttribute(r, 'outerBrackets',   expectedtype=bool, default=False);
-        t.isLabelled      = getAttribute(r, 'isLabelled',      expectedtype=bool, default=False);
-        t.label           = getAttribute(r, 'label',           expectedtype=str,  default='undefined');
-        t.symbol          = getAttribute(r, 'symbol',          expectedtype=str,  default='undefined');
-        t.display         = getAttribute(r, 'display',         expectedtype=str,  default='undefined');
-        t.glueOption      = getAttribute(r, 'glueOption',      expectedtype=str,  default='undefined');
-        t.glueOuterOption = getAttribute(r, 'glueOuterOption', expectedtype=str,  default='undefined');
-        return t;
+        def combine(r: dict, parts: List[Expression]) -> Expression:
+            kind = getAttribute(r, 'kind', expectedtype=str, default='undefined');
+            t = Expression(kind, *parts, adopt=True);
+            t.outerBrackets   = getAttribute(r, 'outerBrackets',   expectedtype=bool, default=False);
+            t.label           = getAttribute(r, 'label',           expectedtype=str,  default='undefined');
+            t.desc = getDescriptor(
+                kind,
+                getAttribute(r, 'symbol',          expectedtype=str,  default='undefined'),
+                getAttribute(r, 'display',         expectedtype=str,  default='undefined'),
+                getAttribute(r, 'isLabelled',      expectedtype=bool, default=False),
+                getAttribute(r, 'glueOption',      expectedtype=str,  default='undefined'),
+                getAttribute(r, 'glueOuterOption', expectedtype=str,  default='undefined'),
+            );
+            return t;
+        return foldTree(r, combine, children=lambda r: getAttribute(r, 'parts', expectedtype=list, default=[]));
 
     def __copy__(self) -> Expression:
-        t = Expression(self.kind, *self.parts);
-        t.isLabelled      = self.isLabelled;
-        t.outerBrackets   = self.outerBrackets;
-        t.label           = self.label;
-        t.symbol          = self.symbol;
-        t.display         = self.display;
-        t.glueOption      = self.glueOption;
-        t.glueOuterOption = self.glueOuterOption;
-        return t;
-
-    def __deepcopy__(self) -> Expression:
-        t = Expression(self.kind, *[part.__deepcopy__() for part in self.parts]);
-        t.isLabelled      = self.isLabelled;
-        t.outerBrackets   = self.outerBrackets;
-        t.label           = self.label;
-        t.symbol          = self.symbol;
-        t.display         = self.display;
-        t.glueOption      = self.glueOption;
-        t.glueOuterOption = self.glueOuterOption;
-        return t;
+        # copies the entire tree (as the constructor always did); children get outer brackets.
+        def combine(t: Expression, parts: List[Expression]) -> Expression:
+            e = Expression.__new__(Expression);
+            e.desc          = t.desc;
+            e.label         = t.label;
+            e.outerBrackets = t.outerBrackets;
+            e.parts         = tuple([ part.showOuterBraces(True) for part in parts ]) if len(parts) > 0 else ();
+            return e;
+        if PROFILER.enabled:
+            PROFILER.count('expression.copies');
+            PROFILER.count('expression.copiedNodes', sum(1 for _ in preOrder(self)));
+        return foldTree(self, combine);
+
+    def __deepcopy__(self, memo: Any = None) -> Expression:
+        return self.__copy__();
 
     def __eq__(self, o):
         if not isinstance(o, Expression):
             return False;
-        n = len(self.parts);
-        if not(self.kind == o.kind and n == len(o.parts) and self.isLabelled == o.isLabelled):
-            return False;
-        if self.isLabelled and not (self.label == o.label):
-            return False;
-        for k in range(n):
-            if not (self.parts[k] == o.parts[k]):
+        stack: List[Tuple[Expression, Expression]] = [ (self, o) ];
+        while len(stack) > 0:
+            a, b = stack.pop();
+            n = len(a.parts);
+            if not(a.desc.code == b.desc.code and n == len(b.parts) and a.desc.isLabelled == b.desc.isLabelled):
+                return False;
+            if a.desc.isLabelled and not (a.label == b.label):
                 return False;
+            stack.extend(zip(a.parts, b.parts));
         return True;
 
-    def __repr__(self) -> dict:
-        return dict(
-            kind            = self.kind,
-            label           = self.label,
-            symbol          = self.symbol,
-            display         = self.display,
-            outerBrackets   = self.outerBrackets,
-            glueOption      = self.glueOption,
-            glueOuterOption = self.glueOuterOption,
-            parts           = [ repr(_) for _ in self.parts ],
-        );
+    def __hash__(self) -> int:
+        # consistent with __eq__, and moreover invariant under renaming of bound variables (see fol/alpha.py).
+        # NOTE: this walks the whole tree on every call; collections of formulas should use
+        # alpha.AlphaSet / alpha.AlphaDict, which compute the key once per formula and operation.
+        # Do not modify an expression while it is a key of a dictionary or an element of a set.
+        return alphaHash(self);
+
+    def __repr__(self) -> str:
+        return '<Expression {} {}>'.format(self.kind, str(self));
+
+    def toRepr(self) -> dict:
+        # inverse of Expression.fromRepr
+        return foldTree(self, lambda t, parts: dict(
+            kind            = t.kind,
+            label           = t.label,
+            symbol          = t.symbol,
+            display         = t.display,
+            isLabelled      = t.isLabelled,
+            outerBrackets   = t.outerBrackets,
+            glueOption      = t.glueOption,
+            glueOuterOption = t.glueOuterOption,
+            parts           = parts,
+        ));
 
     def __str__(self):
-        if self.valence == 0:
-            return self.symbol;
-        option = self.glueOuterOption if self.outerBrackets else self.glueOption;
-        return glue(option, self.symbol, *[str(_) for _ in self.parts]);
+        return self.render('symbol');
+
+    def render(self, attribute: str = 'symbol') -> str:
+        '''
+        Glues the attribute (‘symbol‘ or ‘display‘) of all nodes together,
+        emitting strings onto a stack instead of recursively concatenating subexpressions.
+        '''
+        tokens: List[str] = [];
+        stack: List[Any] = [ self ];
+        while len(stack) > 0:
+            t = stack.pop();
+            if isinstance(t, str):
+                tokens.append(t);
+                continue;
+            desc = t.desc;
+            n = len(t.parts);
+            if n == 0:
+                tokens.append(getattr(desc, attribute));
+                continue;
+            option = desc.glueOuterOption if t.outerBrackets else desc.glueOption;
+            opening, separator, closing = glueFrame(option, getattr(desc, attribute), n);
+            stack.append(closing);
+            for k in range(n-1, 0, -1):
+                stack.append(t.parts[k]);
+                stack.append(separator);
+            stack.append(t.parts[0]);
+            tokens.append(opening);
+        return ''.join(tokens);
 
     @property
     def valence(self) -> int:
@@ -157,14 +383,11 @@ class Expression(object):
 
     @property
     def depth(self) -> int:
-        return max([0] + [subfml.depth + 1 for subfml in self.parts]);
+        return max([ d for _, d in preOrderWithDepth(self) ]);
 
     @property
     def expr(self):
-        if self.valence == 0:
-            return self.display;
-        option = self.glueOuterOption if self.outerBrackets else self.glueOption;
-        return glue(option, self.display, *[_.expr for _ in self.parts]);
+        return self.render('display');
 
     def showOuterBraces(self, show: bool=True) -> Expression:
         self.outerBrackets = show;
@@ -176,12 +399,12 @@ class Expression(object):
         raise Exception('Formula has no subformula of index {}.'.format(index));
 
     def pretty(self, preindent: str = '', tab: str = '  ', prepend: str = '', depth: int = 0) -> str:
-        indent = preindent + tab*depth;
-        symb = ' \033[1m{}\033[0m'.format(self.label) if (self.IsAtomic or self.IsTerm) else '';
-        return '\n'.join(
-            [indent + prepend + self.kind + symb] \
-            + [child.pretty(preindent, tab, '|__ ', depth+1) for child in self.parts]
-        );
+        lines: List[str] = [];
+        for t, d in preOrderWithDepth(self, depth=depth):
+            indent = preindent + tab*d;
+            symb = ' \033[1m{}\033[0m'.format(t.label) if (t.IsAtomic or t.IsTerm) else '';
+            lines.append(indent + (prepend if t is self else '|__ ') + t.kind + symb);
+        return '\n'.join(lines);
 
     @property
     def IsTerm(self) -> bool:
@@ -189,7 +412,7 @@ class Expression(object):
 
     @property
     def IsAtomic(self) -> bool:
-        return self.kind == 'relationexpression';
+        return self.desc.code == KIND_RELATIONEXPRESSION;
 
     @property
     def IsNegatedAtomic(self) -> bool:
@@ -205,47 +428,47 @@ class Expression(object):
 
     @property
     def IsVariable(self) -> bool:
-        return self.kind == 'variable';
+        return self.desc.code == KIND_VARIABLE;
 
     @property
     def IsConstant(self) -> bool:
-        return self.kind == 'constant';
+        return self.desc.code == KIND_CONSTANT;
 
     @property
     def IsFunction(self) -> bool:
-        return self.kind == 'function';
+        return self.desc.code == KIND_FUNCTION;
 
     @property
     def IsFunctionExpression(self) -> bool:
-        return self.kind == 'functionexpression';
+        return self.desc.code == KIND_FUNCTIONEXPRESSION;
 
     @property
     def IsRelation(self) -> bool:
-        return self.kind == 'relation';
+        return self.desc.code == KIND_RELATION;
 
     @property
     def IsRelationExpression(self) -> bool:
-        return self.kind == 'relationexpression';
+        return self.desc.code == KIND_RELATIONEXPRESSION;
 
     @property
     def IsNegation(self) -> bool:
-        return self.kind == 'not';
+        return self.desc.code == KIND_NOT;
 
     @property
     def IsConjunction(self) -> bool:
-        return self.kind == 'and';
+        return self.desc.code == KIND_AND;
 
     @property
     def IsDisjunction(self) -> bool:
-        return self.kind == 'or';
+        return self.desc.code == KIND_OR;
 
     @property
     def IsImplication(self) -> bool:
-        return self.kind == 'implies';
+        return self.desc.code == KIND_IMPLIES;
 
     @property
     def IsDoubleImplication(self) -> bool:
-        return self.kind == 'iff';
+        return self.desc.code == KIND_IFF;
 
     @property
     def IsQuantified(self) -> bool:
@@ -253,8 +476,8 @@ class Expression(object):
 
     @property
     def IsUniversalQuantified(self) -> bool:
-        return self.kind == 'all';
+        return self.desc.code == KIND_ALL;
 
     @property
     def IsExistentialQuantified(self) -> bool:
-        return self.kind == 'exists';
+        return self.desc.code == KIND_EXISTS;
@@ -7,9 +7,11 @@
 
 from __future__ import annotations;
 from copy import copy;
+from sys import intern;
 from typing import Union;
 
 from src.fol.classes import Expression;
+from src.fol.classes import getDescriptor;
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # GLOBAL CONSTANTS
@@ -21,88 +23,75 @@ from src.fol.classes import Expression;
 # METHODS: Generic const, unary, binary
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-def genericZeroary(kind: str) -> Expression:
+def genericZeroary(kind: str, symbol: str = '', display: str = '', isLabelled: bool = False) -> Expression:
     t = Expression(kind);
     t.outerBrackets   = False;
-    t.glueOption      = 'polish';
-    t.glueOuterOption = 'polish';
+    t.desc            = getDescriptor(kind, symbol, display, isLabelled, 'polish', 'polish');
     return t;
 
-def genericUnary(kind: str, args0: Expression) -> Expression:
-    t = Expression(kind, args0);
+def genericUnary(kind: str, args0: Expression, symbol: str = '', display: str = '', adopt: bool = False) -> Expression:
+    t = Expression(kind, args0, adopt=adopt);
     t.outerBrackets   = False;
-    t.glueOption      = 'polish';
-    t.glueOuterOption = 'polish';
+    t.desc            = getDescriptor(kind, symbol, display, False, 'polish', 'polish');
     return t;
 
-def genericBinary(kind: str, args0: Expression, args1: Expression) -> Expression:
-    t = Expression(kind, args0, args1);
+def genericBinary(kind: str, args0: Expression, args1: Expression, symbol: str = '', display: str = '', adopt: bool = False) -> Expression:
+    t = Expression(kind, args0, args1, adopt=adopt);
     t.outerBrackets   = False;
-    t.glueOption      = 'infix';
-    t.glueOuterOption = 'infixwithouter';
+    t.desc            = getDescriptor(kind, symbol, display, False, 'infix', 'infixwithouter');
     return t;
 
-def genericAssociative(kind: str, *args: Expression) -> Expression:
-    t = Expression(kind, *args);
+def genericAssociative(kind: str, *args: Expression, symbol: str = '', display: str = '', adopt: bool = False) -> Expression:
+    t = Expression(kind, *args, adopt=adopt);
     t.outerBrackets   = False;
-    t.glueOption      = 'infix';
-    t.glueOuterOption = 'infixwithouter';
+    t.desc            = getDescriptor(kind, symbol, display, False, 'infix', 'infixwithouter');
     return t;
 
 def genericLabelledToken(kind, name: str, index: Union[str, None] = None, is_indexlike: bool = False, is_generic: bool = False) -> Expression:
-    t = genericZeroary(kind);
-    t.isLabelled = True;
     if index is None:
-        t.label      = name;
-        t.symbol     = name;
-        t.display    = name;
+        label   = name;
+        symbol  = name;
+        display = name;
     elif is_indexlike:
         if is_generic:
-            t.label      = index;
-            t.symbol     = '{}{{{}}}'.format(name, index);
-            t.display    = '{{{}}}'.format(index);
+            label   = index;
+            symbol  = '{}{{{}}}'.format(name, index);
+            display = '{{{}}}'.format(index);
         else:
-            t.label      = '{{{}}}'.format(index);
-            t.symbol     = '{{{}}}'.format(index);
-            t.display    = '{{{}}}'.format(index);
+            label   = '{{{}}}'.format(index);
+            symbol  = '{{{}}}'.format(index);
+            display = '{{{}}}'.format(index);
     else:
         if is_generic:
-            t.label      = index;
-            t.symbol     = '{}{{{}}}'.format(name, index);
-            t.display    = '{}_{{{}}}'.format(name, index);
+            label   = index;
+            symbol  = '{}{{{}}}'.format(name, index);
+            display = '{}_{{{}}}'.format(name, index);
         else:
-            t.label      = '{}_{{{}}}'.format(name, index);
-            t.symbol     = '{}_{{{}}}'.format(name, index);
-            t.display    = '{}_{{{}}}'.format(name, index);
+            label   = '{}_{{{}}}'.format(name, index);
+            symbol  = '{}_{{{}}}'.format(name, index);
+            display = '{}_{{{}}}'.format(name, index);
+    t = genericZeroary(kind, symbol, display, isLabelled=True);
+    t.label = intern(label);
     return t;
 
-def genericPolishFuncReln(kind: str, S: Expression, *terms: Expression) -> Expression:
-    t = Expression(kind, *terms);
-    t.isLabelled      = True;
+def genericPolishFuncReln(kind: str, S: Expression, *terms: Expression, adopt: bool = False) -> Expression:
+    t = Expression(kind, *terms, adopt=adopt);
     t.outerBrackets   = True;
     t.label           = S.label;
-    t.symbol          = S.symbol;
-    t.display         = S.display;
-    t.glueOption      = 'polishwithouter';
-    t.glueOuterOption = 'polishwithouter';
+    t.desc            = getDescriptor(kind, S.symbol, S.display, True, 'polishwithouter', 'polishwithouter');
     return t;
 
-def genericInfixFuncReln(kind: str, S: Expression, *terms: Expression) -> Expression:
-    t = Expression(kind, *terms);
-    t.isLabelled      = True;
+def genericInfixFuncReln(kind: str, S: Expression, *terms: Expression, adopt: bool = False) -> Expression:
+    t = Expression(kind, *terms, adopt=adopt);
     t.outerBrackets   = True;
     t.label           = S.label;
-    t.symbol          = S.symbol;
-    t.display         = S.display;
-    t.glueOption      = 'infix';
-    t.glueOuterOption = 'infixwithouter';
+    t.desc            = getDescriptor(kind, S.symbol, S.display, True, 'infix', 'infixwithouter');
     return t;
 
-def genericQuantified(kind: str, x: Expression, fml: Expression) -> Expression:
-    t = Expression(kind, x, fml);
-    t.glueOption      = 'quantifier';
-    t.glueOuterOption = 'quantifierwithouter';
+def genericQuantified(kind: str, x: Expression, fml: Expression, symbol: str = '', display: str = '', adopt: bool = False) -> Expression:
+    t = Expression(kind, x, fml, adopt=adopt);
     t.outerBrackets   = False;
+    t.desc            = getDescriptor(kind, symbol, display, False, 'quantifier', 'quantifierwithouter');
     return t;
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -118,78 +107,57 @@ def Constant(name: str, index: Union[str, None], is_indexlike: bool, is_generic:
 def Function(name: str, index: Union[str, None], is_indexlike: bool, is_generic: bool) -> Expression:
     return genericLabelledToken('function', name, index, is_indexlike, is_generic);
 
-def FunctionExpression(F: Expression, *terms: Expression, polish: bool = True) -> Expression:
+def FunctionExpression(F: Expression, *terms: Expression, polish: bool = True, adopt: bool = False) -> Expression:
     kind = 'functionexpression';
-    return genericPolishFuncReln(kind, F, *terms) if polish else genericInfixFuncReln(kind, F, *terms);
+    return genericPolishFuncReln(kind, F, *terms, adopt=adopt) if polish else genericInfixFuncReln(kind, F, *terms, adopt=adopt);
 
 def Relation(name: str, index: Union[str, None], is_indexlike: bool, is_generic: bool) -> Expression:
     return genericLabelledToken('relation', name, index, is_indexlike, is_generic);
 
-def RelationExpression(R: Expression, *terms: Expression, polish: bool = True) -> Expression:
+def RelationExpression(R: Expression, *terms: Expression, polish: bool = True, adopt: bool = False) -> Expression:
     kind = 'relationexpression';
-    return genericPolishFuncReln(kind, R, *terms) if polish else genericInfixFuncReln(kind, R, *terms);
+    return genericPolishFuncReln(kind, R, *terms, adopt=adopt) if polish else genericInfixFuncReln(kind, R, *terms, adopt=adopt);
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # METHODS: 0th order connectives
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-def Not(subfml: Expression) -> Expression:
+def Not(subfml: Expression, adopt: bool = False) -> Expression:
     kind = 'not';
-    t = genericUnary(kind, subfml);
-    t.symbol  = '!';
-    t.display = r'\mathop{\neg}';
-    return t;
+    return genericUnary(kind, subfml, symbol='!', display=r'\mathop{\neg}', adopt=adopt);
 
-def And(*subfmls: Expression) -> Expression:
+def And(*subfmls: Expression, adopt: bool = False) -> Expression:
     if len(subfmls) == 0:
         raise Exception('Conjunciton of 0 formulae not yet implemented!');
     elif len(subfmls) == 1:
-        return copy(subfmls[0]);
+        return subfmls[0] if adopt else copy(subfmls[0]);
     kind = 'and';
-    t = genericAssociative(kind, *subfmls);
-    t.symbol  = '&&';
-    t.display = r'\mathbin{\wedge}';
-    return t;
+    return genericAssociative(kind, *subfmls, symbol='&&', display=r'\mathbin{\wedge}', adopt=adopt);
 
-def Or(*subfmls: Expression) -> Expression:
+def Or(*subfmls: Expression, adopt: bool = False) -> Expression:
     if len(subfmls) == 0:
         raise Exception('Conjunciton of 0 formulae not yet implemented!');
     elif len(subfmls) == 1:
-        return copy(subfmls[0]);
+        return subfmls[0] if adopt else copy(subfmls[0]);
     kind = 'or';
-    t = genericAssociative(kind, *subfmls);
-    t.symbol  = '||';
-    t.display = r'\mathbf{\vee}';
-    return t;
+    return genericAssociative(kind, *subfmls, symbol='||', display=r'\mathbf{\vee}', adopt=adopt);
 
-def Implies(subfml0: Expression, subfml1: Expression) -> Expression:
+def Implies(subfml0: Expression, subfml1: Expression, adopt: bool = False) -> Expression:
     kind = 'implies';
-    t = genericBinary(kind, subfml0, subfml1);
-    t.symbol  = '->';
-    t.display = r'\mathbin{\rightarrow}';
-    return t;
+    return genericBinary(kind, subfml0, subfml1, symbol='->', display=r'\mathbin{\rightarrow}', adopt=adopt);
 
-def Iff(subfml0: Expression, subfml1: Expression) -> Expression:
+def Iff(subfml0: Expression, subfml1: Expression, adopt: bool = False) -> Expression:
     kind = 'iff';
-    t = genericBinary(kind, subfml0, subfml1);
-    t.symbol  = '<->';
-    t.display = r'\mathbin{\leftrightarrow}';
-    return t;
+    return genericBinary(kind, subfml0, subfml1, symbol='<->', display=r'\mathbin{\leftrightarrow}', adopt=adopt);
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # METHODS: 1st order quantifiers
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-def QuantifiedAll(x: Expression, subfml: Expression) -> Expression:
+def QuantifiedAll(x: Expression, subfml: Expression, adopt: bool = False) -> Expression:
     kind = 'all';
-    t = genericQuantified(kind, x, subfml);
-    t.symbol  = 'all';
-    t.display = r'\mathop{\forall}';
-    return t;
+    return genericQuantified(kind, x, subfml, symbol='all', display=r'\mathop{\forall}', adopt=adopt);
 
-def QuantifiedExists(x: Expression, subfml: Expression) -> Expression:
+def QuantifiedExists(x: Expression, subfml: Expression, adopt: bool = False) -> Expression:
     kind = 'exists';
-    t = genericQuantified(kind, x, subfml);
-    t.symbol  = 'exists';
-    t.display = r'\mathop{\exists}';
-    return t;
+    return genericQuantified(kind, x, subfml, symbol='exists', display=r'\mathop{\exists}', adopt=adopt);
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+from array import array;
+from typing import Dict;
+from typing import List;
+from typing import Tuple;
+
+from src.fol.classes import Descriptor;
+from src.fol.classes import Expression;
+from src.fol.classes import getDescriptor;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# Flat post-order encoding of a list of expressions:
+#   strings: string table (kinds, symbols, displays, glue options, labels)
+#   descs:   6 ints per descriptor (kind, symbol, display, isLabelled, glueOption, glueOuterOption)
+#   nodes:   3 ints per node (descriptor, label, 2*(number of parts) + outerBrackets)
+# Roots follow each other in post-order, so decoding leaves them on the stack in order.
+EncodedExpressions = Tuple[List[str], bytes, bytes];
+
+DESC_WIDTH: int = 6;
+NODE_WIDTH: int = 3;
+TYPECODE:   str = 'i';
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: SymbolTable
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class SymbolTable(object):
+    '''
+    String table and descriptor table (DESC_WIDTH ints per descriptor) of an encoding.
+    Shared by the Encoder and the binary corpus writer (src/fol/binary.py), which differ in the node layout only.
+    '''
+    strings:      List[str];
+    stringIndex:  Dict[str, int];
+    descs:        array;
+    descIndex:    Dict[int, int];
+
+    def __init__(self, typecode: str = TYPECODE):
+        self.strings     = [];
+        self.stringIndex = dict();
+        self.descs       = array(typecode);
+        self.descIndex   = dict();
+        return;
+
+    def string(self, u: str) -> int:
+        index = self.stringIndex.get(u);
+        if index is None:
+            index = len(self.strings);
+            self.strings.append(u);
+            self.stringIndex[u] = index;
+        return index;
+
+    def descriptor(self, desc: Descriptor) -> int:
+        # descriptors are interned, so the identity is a valid key:
+        index = self.descIndex.get(id(desc));
+        if index is None:
+            index = len(self.descs) // DESC_WIDTH;
+            self.descs.extend([
+                self.string(desc.kind),
+                self.string(desc.symbol),
+                self.string(desc.display),
+                int(desc.isLabelled),
+                self.string(desc.glueOption),
+                self.string(desc.glueOuterOption),
+            ]);
+            self.descIndex[id(desc)] = index;
+        return index;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: Encoder
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class Encoder(SymbolTable):
+    nodes: array;
+
+    def __init__(self):
+        super().__init__();
+        self.nodes = array(TYPECODE);
+        return;
+
+    def add(self, fml: Expression):
+        stack: List[Tuple[Expression, bool]] = [ (fml, False) ];
+        while len(stack) > 0:
+            t, expanded = stack.pop();
+            if not expanded:
+                stack.append((t, True));
+                stack.extend([ (part, False) for part in reversed(t.parts) ]);
+                continue;
+            self.nodes.extend([ self.descriptor(t.desc), self.string(t.label), 2*len(t.parts) + int(t.outerBrackets) ]);
+        return;
+
+    def result(self) -> EncodedExpressions:
+        return self.strings, self.descs.tobytes(), self.nodes.tobytes();
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def encodeExpressions(fmls: List[Expression]) -> EncodedExpressions:
+    encoder = Encoder();
+    for fml in fmls:
+        encoder.add(fml);
+    return encoder.result();
+
+def decodeExpressions(encoded: EncodedExpressions) -> List[Expression]:
+    strings, data_descs, data_nodes = encoded;
+    descs_flat = array(TYPECODE);
+    descs_flat.frombytes(data_descs);
+    nodes = array(TYPECODE);
+    nodes.frombytes(data_nodes);
+    descs: List[Descriptor] = [
+        getDescriptor(
+            strings[descs_flat[k]],
+            strings[descs_flat[k+1]],
+            strings[descs_flat[k+2]],
+            bool(descs_flat[k+3]),
+            strings[descs_flat[k+4]],
+            strings[descs_flat[k+5]],
+        )
+        for k in range(0, len(descs_flat), DESC_WIDTH)
+    ];
+    stack: List[Expression] = [];
+    for k in range(0, len(nodes), NODE_WIDTH):
+        n, brackets = divmod(nodes[k+2], 2);
+        # assemble directly, as the constructor would copy the subtrees:
+        t = Expression.__new__(Expression);
+        t.desc          = descs[nodes[k]];
+        t.label         = strings[nodes[k+1]];
+        t.outerBrackets = brackets == 1;
+        if n > 0:
+            t.parts = tuple(stack[len(stack)-n:]);
+            del stack[len(stack)-n:];
+        else:
+            t.parts = ();
+        stack.append(t);
+    return stack;
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+import re;
+from typing import Callable;
+from typing import List;
+from typing import Tuple;
+from typing import Union;
+
+from src.fol.classes import Expression;
+from src.fol.construction import Constant;
+from src.fol.construction import Variable;
+from src.fol.construction import Function;
+from src.fol.construction import FunctionExpression;
+from src.fol.construction import Relation;
+from src.fol.construction import RelationExpression;
+from src.fol.construction import Not;
+from src.fol.construction import And;
+from src.fol.construction import Or;
+from src.fol.construction import Iff;
+from src.fol.construction import Implies;
+from src.fol.construction import QuantifiedAll;
+from src.fol.construction import QuantifiedExists;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: The fast path only accepts an unambiguous subset of src/grammars/fol.lark.
+# Everything else (word connectives, infix functions/relations, generic labels,
+# quoted labels, ‘for all‘/‘there exists‘, ...) is rejected, so that the Earley parser decides.
+RE_SPACE:   re.Pattern = re.compile(r'\s+');
+RE_LETTERS: re.Pattern = re.compile(r'[a-zA-Z]+');
+RE_DIGITS:  re.Pattern = re.compile(r'[0-9]+');
+RE_SYMBOL:  re.Pattern = re.compile(r'[\+\*\-]');
+RE_INDEX:   re.Pattern = re.compile(r'\{([^\{\}\'\"\s]+)\}');
+RE_NOT:     re.Pattern = re.compile(r'!|~');
+RE_QSEP:    re.Pattern = re.compile(r'\.|:');
+RE_QUANT:   re.Pattern = re.compile(r'(all|ex)\s');
+RE_INFIX:   List[Tuple[str, re.Pattern]] = [
+    ('and',     re.compile(r'&+|\^|\.')),
+    ('or',      re.compile(r'\|+')),
+    ('iff',     re.compile(r'<-+>|<=+>')),
+    ('implies', re.compile(r'-+>|=+>|>')),
+];
+KEYWORDS: List[str] = [ 'not', 'v', 'or', 'and', 'all', 'ex', 'exists', 'for', 'there', 'const', 'var', 'func', 'reln' ];
+KEYWORDS_PREFIX: List[str] = [ 'not', 'v', 'or', 'and' ];
+
+# parser modes and stack frames, see FastParser.run:
+MODE_TERM:        int = 0;
+MODE_TERM_DONE:   int = 1;
+MODE_CLOSED:      int = 2;
+MODE_CLOSED_DONE: int = 3;
+MODE_INFIX_DONE:  int = 4;
+FRAME_TOP:        int = 0;
+FRAME_NOT:        int = 1;
+FRAME_QUANT:      int = 2;
+FRAME_INFIX:      int = 3;
+FRAME_BRACKET:    int = 4;
+FRAME_ARGS:       int = 5;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# MAIN METHOD string -> Expression (fast path)
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def parseFolExprsFast(u: str) -> List[Expression]:
+    '''
+    Parser for the unambiguous part of the FOL grammar (recursive descent with an explicit stack).
+    Produces the same trees as the Earley parser in src/fol/parser.py,
+    and raises an exception on any input it does not handle.
+    '''
+    try:
+        return FastParser(u).parseList(lambda p: p.parseExpr());
+    except:
+        pass;
+    # only unambiguous if some entry cannot be a formula:
+    terms = FastParser(u).parseList(lambda p: p.parseTerm());
+    if all(t.IsFunctionExpression for t in terms):
+        raise Exception('Fast path cannot decide between terms and expressions in \033[1m{}\033[0m!'.format(u));
+    return terms;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: FastParser
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class FastParser(object):
+    text: str;
+    pos:  int;
+
+    def __init__(self, text: str):
+        self.text = text;
+        self.pos  = 0;
+        return;
+
+    def fail(self, what: str):
+        raise Exception('Fast path cannot parse {} at position {} of \033[1m{}\033[0m!'.format(what, self.pos, self.text));
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # scanning
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def peek(self) -> str:
+        return self.text[self.pos:self.pos+1];
+
+    def match(self, pattern: re.Pattern) -> Union[re.Match, None]:
+        m = pattern.match(self.text, self.pos);
+        if m is not None:
+            self.pos = m.end();
+        return m;
+
+    def skipSpace(self) -> bool:
+        return self.match(RE_SPACE) is not None;
+
+    def expect(self, char: str):
+        if not self.peek() == char:
+            self.fail('\'{}\''.format(char));
+        self.pos += 1;
+        return;
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # lists
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def parseList(self, parseItem: Callable[[FastParser], Expression]) -> List[Expression]:
+        items = [ parseItem(self) ];
+        while self.pos < len(self.text):
+            self.skipSpace();
+            self.expect(',');
+            self.skipSpace();
+            items.append(parseItem(self));
+        return items;
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # labels
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def parseIndex(self) -> Union[str, None]:
+        m = self.match(RE_INDEX);
+        if m is None:
+            return None;
+        return m.group(1);
+
+    def parseName(self, allow_symbol: bool = False) -> Tuple[str, Union[str, None], bool, bool]:
+        m = self.match(RE_LETTERS);
+        if m is None:
+            if allow_symbol and self.match(RE_SYMBOL) is not None:
+                return self.text[self.pos-1], None, False, False;
+            self.fail('name');
+        name = m.group(0);
+        if name in KEYWORDS:
+            self.fail('keyword');
+        index = None;
+        m = self.match(RE_DIGITS);
+        if m is not None:
+            index = m.group(0);
+        elif self.peek() == '_':
+            self.pos += 1;
+            index = self.parseIndex();
+            if index is None:
+                self.fail('subscript');
+        if self.peek() in ['_', '{', '\'', '"'] or RE_LETTERS.match(self.text, self.pos) or RE_DIGITS.match(self.text, self.pos):
+            self.fail('label');
+        return name, index, False, False;
+
+    def parseConstantLabel(self) -> Union[Tuple[str, Union[str, None], bool, bool], None]:
+        m = self.match(RE_DIGITS);
+        index = m.group(0) if m is not None else self.parseIndex();
+        if index is None:
+            return None;
+        return '', index, True, False;
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # terms and expressions
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    # NOTE: Instead of recursing, the parser keeps pending constructions as frames on a stack:
+    #   (FRAME_NOT,)                 negation of the next closed expression
+    #   (FRAME_QUANT, word, x)       quantification of the next closed expression
+    #   (FRAME_INFIX, parts, kind)   infix chain of closed expressions
+    #   (FRAME_BRACKET,)             bracketed infix expression
+    #   (FRAME_ARGS, F, terms, reln) arguments of a function/relation symbol
+    #   (FRAME_TOP,)                 the entry point
+    # and alternates between the modes ‘expect‘ (read a term/closed expression) and ‘reduce‘
+    # (hand a finished term/closed/infix expression to the frame on top). Nesting depth is thus unbounded.
+
+    def parseTerm(self) -> Expression:
+        return self.run(MODE_TERM);
+
+    def parseExpr(self) -> Expression:
+        return self.run(MODE_CLOSED, [ (FRAME_TOP,), (FRAME_INFIX, [], None) ]);
+
+    def run(self, mode: int, stack: Union[List[tuple], None] = None) -> Expression:
+        stack = stack or [ (FRAME_TOP,) ];
+        value: Union[Expression, None] = None;
+        is_open = False;
+        while True:
+            if mode == MODE_TERM:
+                label = self.parseConstantLabel();
+                if label is not None:
+                    value, mode = Constant(*label), MODE_TERM_DONE;
+                    continue;
+                label = self.parseName(allow_symbol=True);
+                start = self.pos;
+                self.skipSpace();
+                if self.peek() == '(':
+                    self.pos += 1;
+                    self.skipSpace();
+                    stack.append((FRAME_ARGS, Function(*label), [], False));
+                    continue;
+                self.pos = start;
+                if label[0] in ['+', '*', '-']:
+                    self.fail('variable');
+                value, mode = Variable(*label), MODE_TERM_DONE;
+            elif mode == MODE_TERM_DONE:
+                frame = stack[-1];
+                if frame[0] == FRAME_TOP:
+                    return value;
+                frame[2].append(value);
+                self.skipSpace();
+                if self.peek() == ',':
+                    self.pos += 1;
+                    self.skipSpace();
+                    mode = MODE_TERM;
+                    continue;
+                self.expect(')');
+                stack.pop();
+                _, S, terms, reln = frame;
+                if reln:
+                    value, mode = RelationExpression(S, *terms, polish=True, adopt=True), MODE_CLOSED_DONE;
+                else:
+                    value = FunctionExpression(S, *terms, polish=True, adopt=True);
+            elif mode == MODE_CLOSED:
+                if self.match(RE_NOT) is not None:
+                    self.skipSpace();
+                    stack.append((FRAME_NOT,));
+                elif self.peek() == '(':
+                    self.pos += 1;
+                    self.skipSpace();
+                    start = self.pos;
+                    m = self.match(RE_QUANT);
+                    if m is not None:
+                        self.pos -= 1;
+                        self.skipSpace();
+                        x = Variable(*self.parseName());
+                        self.skipSpace();
+                        if self.peek() == ')':
+                            self.pos += 1;
+                            if self.peek() == '.':
+                                self.fail('quantifier separator');
+                            self.match(RE_QSEP);
+                            self.skipSpace();
+                            stack.append((FRAME_QUANT, m.group(1), x));
+                            continue;
+                        self.pos = start;
+                    stack.append((FRAME_BRACKET,));
+                    stack.append((FRAME_INFIX, [], None));
+                else:
+                    m = self.match(RE_QUANT);
+                    if m is not None:
+                        self.pos -= 1;
+                        self.skipSpace();
+                        x = Variable(*self.parseName());
+                        spaced = self.skipSpace();
+                        # NOTE: ‘.‘ is also a conjunction symbol, which Earley may read as ‘all x <empty> . ...‘
+                        sep = self.match(RE_QSEP);
+                        if sep is None or (spaced and sep.group(0) == '.'):
+                            self.fail('quantifier separator');
+                        self.skipSpace();
+                        stack.append((FRAME_QUANT, m.group(1), x));
+                        continue;
+                    if any(self.text.startswith(word, self.pos) for word in KEYWORDS_PREFIX):
+                        self.fail('keyword');
+                    label = self.parseName(allow_symbol=True);
+                    self.skipSpace();
+                    self.expect('(');
+                    self.skipSpace();
+                    stack.append((FRAME_ARGS, Relation(*label), [], True));
+                    mode = MODE_TERM;
+            elif mode == MODE_CLOSED_DONE:
+                frame = stack[-1];
+                if frame[0] == FRAME_NOT:
+                    stack.pop();
+                    value = Not(value, adopt=True);
+                elif frame[0] == FRAME_QUANT:
+                    stack.pop();
+                    value = self.quantify(frame[1], frame[2], value);
+                else:
+                    # infix chain:
+                    _, parts, kind = frame;
+                    parts.append(value);
+                    start = self.pos;
+                    self.skipSpace();
+                    kind_ = self.parseInfixSymbol();
+                    if kind_ is None:
+                        self.pos = start;
+                        stack.pop();
+                        value, is_open = self.combineInfix(kind, parts);
+                        mode = MODE_INFIX_DONE;
+                        continue;
+                    if not (kind is None or kind == kind_):
+                        self.fail('mixed connectives');
+                    stack[-1] = (FRAME_INFIX, parts, kind_);
+                    self.skipSpace();
+                    mode = MODE_CLOSED;
+            elif mode == MODE_INFIX_DONE:
+                frame = stack.pop();
+                if frame[0] == FRAME_TOP:
+                    return value;
+                # bracketed; NOTE: Earley reads ‘(P(x))‘ as a relation with an empty name and fails:
+                if not is_open and value.IsAtomic:
+                    self.fail('bracketed atomic expression');
+                self.skipSpace();
+                self.expect(')');
+                value, mode = value.showOuterBraces(True), MODE_CLOSED_DONE;
+
+    def combineInfix(self, kind: Union[str, None], parts: List[Expression]) -> Tuple[Expression, bool]:
+        if kind is None:
+            return parts[0], False;
+        elif kind == 'and':
+            return And(*parts, adopt=True), True;
+        elif kind == 'or':
+            return Or(*parts, adopt=True), True;
+        elif len(parts) > 2:
+            self.fail('non-associative connective');
+        elif kind == 'implies':
+            return Implies(*parts, adopt=True), True;
+        return Iff(*parts, adopt=True), True;
+
+    def parseInfixSymbol(self) -> Union[str, None]:
+        for kind, pattern in RE_INFIX:
+            if self.match(pattern) is not None:
+                return kind;
+        return None;
+
+    def quantify(self, word: str, x: Expression, fml: Expression) -> Expression:
+        if word == 'all':
+            return QuantifiedAll(x, fml, adopt=True);
+        return QuantifiedExists(x, fml, adopt=True);
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+import re;
+from typing import Any;
+from typing import Dict;
+from typing import Iterable;
+from typing import List;
+from typing import Set;
+from typing import Tuple;
+from typing import Union;
+
+import numpy as np;
+
+from src.core.traversal import foldDag;
+from src.fol.classes import Expression;
+from src.fol.normalform import freeVariables;
+from src.fol.normalform import miniscope;
+from src.fol.normalform import rectify;
+from src.fol.shared import SharedExpression;
+from src.fol.shared import cacheFreeVariables;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: A (sub)formula or term with free variables v_1, ..., v_k evaluates to an array with one axis per variable
+# (a boolean array for formulae, an integer array of domain elements for terms), the axes in a fixed global order
+# of the variables. Connectives broadcast, quantifiers reduce an axis with all/any.
+# Quantifiers are moved inwards first (see miniscope), so that arrays have as few axes as possible,
+# and quantifiers whose body would exceed MAX_CELLS are evaluated in chunks of one of the other variables.
+MAX_CELLS: int = 1 << 24;
+RE_ELEMENT: re.Pattern = re.compile(r'^\{?([0-9]+)\}?$');
+
+Value = Tuple[Tuple[str, ...], np.ndarray];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: FiniteStructure
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class FiniteStructure(object):
+    '''
+    Structure with domain {0, ..., size-1}.
+    Relations are boolean arrays of shape (size,)*arity (or collections of tuples),
+    functions are integer arrays of shape (size,)*arity with values in the domain, constants are domain elements.
+    Symbols are given by their labels; numerals n, {n} denote the element n unless defined otherwise.
+    The relation = is equality unless defined otherwise.
+    '''
+    size:      int;
+    relations: Dict[str, np.ndarray];
+    functions: Dict[str, np.ndarray];
+    constants: Dict[str, int];
+
+    def __init__(self,
+        size: int,
+        relations: Union[Dict[str, Any], None] = None,
+        functions: Union[Dict[str, Any], None] = None,
+        constants: Union[Dict[str, int], None] = None,
+    ):
+        self.size      = size;
+        self.relations = { name: self.relationTable(name, table) for name, table in (relations or dict()).items() };
+        self.functions = { name: self.functionTable(name, table) for name, table in (functions or dict()).items() };
+        self.constants = dict();
+        for name, value in (constants or dict()).items():
+            if not 0 <= value < size:
+                raise Exception('Constant \033[1m{}\033[0m is not an element of the domain!'.format(name));
+            self.constants[name] = int(value);
+        return;
+
+    def relationTable(self, name: str, table: Any) -> np.ndarray:
+        if isinstance(table, np.ndarray) or isinstance(table, bool):
+            table = np.asarray(table, dtype=bool);
+        else:
+            tuples = [ tuple(x) for x in table ];
+            if len(tuples) == 0:
+                raise Exception('Cannot infer the arity of the empty relation \033[1m{}\033[0m, use an array!'.format(name));
+            arity = len(tuples[0]);
+            array = np.zeros((self.size,)*arity, dtype=bool);
+            array[tuple(np.array(tuples).T)] = True;
+            table = array;
+        if any([ n != self.size for n in table.shape ]):
+            raise Exception('Table of relation \033[1m{}\033[0m has the wrong shape!'.format(name));
+        return table;
+
+    def functionTable(self, name: str, table: Any) -> np.ndarray:
+        table = np.asarray(table, dtype=np.intp);
+        if any([ n != self.size for n in table.shape ]):
+            raise Exception('Table of function \033[1m{}\033[0m has the wrong shape!'.format(name));
+        if table.size > 0 and (table.min() < 0 or table.max() >= self.size):
+            raise Exception('Function \033[1m{}\033[0m has values outside the domain!'.format(name));
+        return table;
+
+    def relation(self, label: str) -> Union[np.ndarray, None]:
+        return lookup(self.relations, label);
+
+    def function(self, label: str) -> np.ndarray:
+        table = lookup(self.functions, label);
+        if table is None:
+            raise Exception('Function \033[1m{}\033[0m is not interpreted!'.format(label));
+        return table;
+
+    def constant(self, label: str) -> int:
+        value = lookup(self.constants, label);
+        if value is not None:
+            return value;
+        m = RE_ELEMENT.match(label);
+        if m is not None and int(m.group(1)) < self.size:
+            return int(m.group(1));
+        raise Exception('Constant \033[1m{}\033[0m is not interpreted!'.format(label));
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: ModelChecker
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class ModelChecker(object):
+    structure: FiniteStructure;
+    maxCells:  int;
+    order:     Dict[str, int];
+    closed:    Dict[SharedExpression, Value];
+    stats:     Dict[str, int];
+
+    def __init__(self, structure: FiniteStructure, maxCells: int = MAX_CELLS):
+        self.structure = structure;
+        self.maxCells  = maxCells;
+        self.order     = dict();
+        self.closed    = dict();
+        self.stats     = dict(chunks=0, peakCells=0);
+        return;
+
+    def evaluate(self, fml: Union[Expression, SharedExpression], bindings: Union[Dict[str, np.ndarray], None] = None) -> Value:
+        '''
+        Returns (free variables, boolean array) of a formula, i.e. the set of satisfying assignments.
+        `bindings` restricts (free) variables to arrays of domain elements (default: the whole domain).
+        '''
+        t = fml if isinstance(fml, SharedExpression) else SharedExpression.fromExpression(fml);
+        # bindings go by label, so variables bound under the same label are renamed first:
+        if bindings and not boundLabels(t).isdisjoint(bindings):
+            t = rectify(t);
+        t = miniscope(t);
+        cacheFreeVariables(t);
+        self.order = variableOrder(t);
+        self.closed = dict();
+        return self.run(t, bindings or dict());
+
+    def run(self, t: SharedExpression, bindings: Dict[str, np.ndarray]) -> Value:
+        # values of subformulas none of whose free variables are restricted here are shared by all chunks:
+        memo: Dict[SharedExpression, Value] = { u: value for u, value in self.closed.items() if self.fv(u).isdisjoint(bindings) };
+        chunked: Dict[SharedExpression, None] = dict();
+
+        def children(t: SharedExpression) -> List[SharedExpression]:
+            if t.kind in ['variable', 'constant']:
+                return [];
+            elif t.kind in ['all', 'exists']:
+                if self.cells(t.parts[1], bindings) > self.maxCells and self.splittable(t, bindings):
+                    chunked[t] = None;
+                    return [];
+                return [ t.parts[1] ];
+            return list(t.parts);
+
+        def combine(t: SharedExpression, r: List[Value]) -> Value:
+            if t in chunked:
+                value = self.runChunked(t, bindings);
+            else:
+                value = self.combine(t, r, bindings);
+            self.stats['peakCells'] = max(self.stats['peakCells'], value[1].size);
+            if self.fv(t).isdisjoint(bindings):
+                self.closed[t] = value;
+            return value;
+
+        return foldDag(t, combine, children=children, memo=memo);
+
+    def runChunked(self, t: SharedExpression, bindings: Dict[str, np.ndarray]) -> Value:
+        '''
+        Evaluates a quantifier whose body is too large at once, in blocks of its largest free variable.
+        '''
+        y = max(self.fv(t), key=lambda v: self.rangeOf(v, bindings).size);
+        values = self.rangeOf(y, bindings);
+        size = max(1, (self.maxCells * values.size) // self.cells(t.parts[1], bindings));
+        axes = self.axes(self.fv(t));
+        blocks: List[np.ndarray] = [];
+        for start in range(0, values.size, size):
+            self.stats['chunks'] += 1;
+            sub = dict(bindings);
+            sub[y] = values[start:start + size];
+            blocks.append(self.aligned(self.run(t, sub), axes, sub));
+        return axes, np.concatenate(blocks, axis=axes.index(y));
+
+    def combine(self, t: SharedExpression, r: List[Value], bindings: Dict[str, np.ndarray]) -> Value:
+        kind = t.kind;
+        structure = self.structure;
+        if kind == 'variable':
+            return (t.label,), self.rangeOf(t.label, bindings);
+        elif kind == 'constant':
+            return (), np.asarray(structure.constant(t.label), dtype=np.intp);
+        elif kind == 'functionexpression':
+            axes, args = self.broadcast(r);
+            return axes, structure.function(t.label)[tuple(args)];
+        elif kind == 'relationexpression':
+            axes, args = self.broadcast(r);
+            table = structure.relation(t.label);
+            if table is None:
+                if t.label == '=' and len(args) == 2:
+                    return axes, np.equal(args[0], args[1]);
+                raise Exception('Relation \033[1m{}\033[0m is not interpreted!'.format(t.label));
+            return axes, np.asarray(table[tuple(args)] if len(args) > 0 else table);
+        elif kind == 'not':
+            return r[0][0], np.logical_not(r[0][1]);
+        elif kind in ['and', 'or', 'implies', 'iff']:
+            axes, args = self.broadcast(r);
+            if kind == 'and':
+                value = args[0];
+                for x in args[1:]:
+                    value = np.logical_and(value, x);
+            elif kind == 'or':
+                value = args[0];
+                for x in args[1:]:
+                    value = np.logical_or(value, x);
+            elif kind == 'implies':
+                value = np.logical_or(np.logical_not(args[0]), args[1]);
+            else:
+                value = np.equal(args[0], args[1]);
+            return axes, value;
+        elif kind in ['all', 'exists']:
+            axes, value = r[0];
+            x = t.parts[0].label;
+            if not x in axes:
+                return axes, value;
+            i = axes.index(x);
+            reduced = value.all(axis=i) if kind == 'all' else value.any(axis=i);
+            return axes[:i] + axes[i+1:], reduced;
+        raise Exception('Cannot evaluate expressions of kind \033[1m{}\033[0m!'.format(kind));
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # axes
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def fv(self, t: SharedExpression) -> frozenset:
+        return freeVariables(t);
+
+    def splittable(self, t: SharedExpression, bindings: Dict[str, np.ndarray]) -> bool:
+        # chunking needs a free variable with more than one value left:
+        return any([ self.rangeOf(v, bindings).size > 1 for v in self.fv(t) ]);
+
+    def axes(self, variables: Iterable[str]) -> Tuple[str, ...]:
+        return tuple(sorted(variables, key=lambda v: self.order.get(v, len(self.order))));
+
+    def rangeOf(self, x: str, bindings: Dict[str, np.ndarray]) -> np.ndarray:
+        values = bindings.get(x);
+        return np.arange(self.structure.size, dtype=np.intp) if values is None else values;
+
+    def shape(self, axes: Tuple[str, ...], bindings: Dict[str, np.ndarray]) -> Tuple[int, ...]:
+        return tuple([ self.rangeOf(v, bindings).size for v in axes ]);
+
+    def cells(self, t: SharedExpression, bindings: Dict[str, np.ndarray]) -> int:
+        return int(np.prod(self.shape(self.axes(self.fv(t)), bindings), dtype=np.int64));
+
+    def broadcast(self, values: List[Value]) -> Tuple[Tuple[str, ...], List[np.ndarray]]:
+        # reshapes the arrays to a common list of axes (size 1 where a variable does not occur)
+        axes = self.axes(set([ v for axes, _ in values for v in axes ]));
+        arrays: List[np.ndarray] = [];
+        for vs, array in values:
+            shape = [ array.shape[vs.index(v)] if v in vs else 1 for v in axes ];
+            arrays.append(array.reshape(shape));
+        return axes, arrays;
+
+    def aligned(self, value: Value, axes: Tuple[str, ...], bindings: Dict[str, np.ndarray]) -> np.ndarray:
+        vs, array = value;
+        shape = [ array.shape[vs.index(v)] if v in vs else 1 for v in axes ];
+        return np.broadcast_to(array.reshape(shape), self.shape(axes, bindings));
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def evaluateFormula(fml: Union[Expression, SharedExpression], structure: FiniteStructure, maxCells: int = MAX_CELLS) -> Value:
+    return ModelChecker(structure, maxCells=maxCells).evaluate(fml);
+
+def checkModel(
+    fml: Union[Expression, SharedExpression],
+    structure: FiniteStructure,
+    assignment: Union[Dict[str, int], None] = None,
+    maxCells: int = MAX_CELLS,
+) -> bool:
+    '''
+    Whether the structure satisfies the formula under the assignment of its free variables.
+    Values assigned to other variables are ignored.
+    '''
+    t = fml if isinstance(fml, SharedExpression) else SharedExpression.fromExpression(fml);
+    assignment = assignment or dict();
+    free = t.freeVariables;
+    bindings = { x: np.asarray([ value ], dtype=np.intp) for x, value in assignment.items() if x in free };
+    axes, value = ModelChecker(structure, maxCells=maxCells).evaluate(t, bindings=bindings);
+    unassigned = [ x for x in axes if not x in assignment ];
+    if len(unassigned) > 0:
+        raise Exception('Free variables \033[1m{}\033[0m are not assigned!'.format(', '.join(unassigned)));
+    return bool(np.all(value));
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def lookup(table: Dict[str, Any], label: str) -> Any:
+    # symbols may be given with or without the braces of the parsed label:
+    if label in table:
+        return table[label];
+    return table.get(label.strip('{}'));
+
+def boundLabels(fml: SharedExpression) -> Set[str]:
+    labels: Set[str] = set();
+    def combine(t: SharedExpression, _) -> None:
+        if t.kind in ['all', 'exists']:
+            labels.add(t.parts[0].label);
+    foldDag(fml, combine);
+    return labels;
+
+def variableOrder(fml: SharedExpression) -> Dict[str, int]:
+    # variables in order of first occurrence; determines the order of axes
+    order: Dict[str, int] = dict();
+    seen = set();
+    stack: List[SharedExpression] = [ fml ];
+    while len(stack) > 0:
+        t = stack.pop();
+        if t in seen:
+            continue;
+        seen.add(t);
+        if t.kind == 'variable' and not t.label in order:
+            order[t.label] = len(order);
+        stack.extend(reversed(t.parts));
+    return order;
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+import re;
+from itertools import count;
+from typing import Dict;
+from typing import FrozenSet;
+from typing import List;
+from typing import Set;
+from typing import Tuple;
+from typing import Union;
+
+from src.core.traversal import foldDag;
+from src.core.traversal import preOrder;
+from src.fol.classes import Descriptor;
+from src.fol.classes import Expression;
+from src.fol.construction import Constant;
+from src.fol.construction import Function;
+from src.fol.construction import FunctionExpression;
+from src.fol.construction import Relation;
+from src.fol.construction import RelationExpression;
+from src.fol.construction import Variable;
+from src.fol.construction import Not;
+from src.fol.construction import And;
+from src.fol.construction import Or;
+from src.fol.construction import QuantifiedAll;
+from src.fol.construction import QuantifiedExists;
+from src.fol.shared import SharedExpression;
+from src.fol.shared import cacheFreeVariables;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: All transformations work on hash-consed SharedExpressions and are memoised per node,
+# so that a subformula occurring several times is transformed once and shared in the result.
+# A literal is (sign, atom); a clause is a disjunction of literals, its variables are universally quantified.
+Literal = Tuple[bool, SharedExpression];
+Clause = Tuple[Literal, ...];
+Prefix = Tuple[Tuple[str, SharedExpression], ...];
+
+def prototypeDescriptors() -> Dict[str, Descriptor]:
+    # descriptors exactly as used by src/fol/construction.py:
+    x = Variable('x', None, False, False);
+    P = RelationExpression(Relation('P', None, False, False), x);
+    return {
+        'not':    Not(P).desc,
+        'and':    And(P, P).desc,
+        'or':     Or(P, P).desc,
+        'all':    QuantifiedAll(x, P).desc,
+        'exists': QuantifiedExists(x, P).desc,
+    };
+
+DESCRIPTORS: Dict[str, Descriptor] = prototypeDescriptors();
+# formulae treated as atoms; the last three are those of propositional logic (src/prop/construction.py):
+ATOMIC_KINDS: List[str] = [ 'relationexpression', 'atom', 'tautology', 'contradiction' ];
+RE_BASENAME: re.Pattern = re.compile(r'[a-zA-Z]+');
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# MAIN METHODS: Expression -> normal forms
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def toNNF(fml: Union[Expression, SharedExpression]) -> Expression:
+    return flatten(negationNormalForm(asShared(fml))).toExpression();
+
+def toPrenex(fml: Union[Expression, SharedExpression]) -> Expression:
+    prefix, matrix = prenexForm(asShared(fml));
+    return quantify(prefix, flatten(matrix)).toExpression();
+
+def toSkolem(fml: Union[Expression, SharedExpression]) -> Expression:
+    prefix, matrix = skolemForm(asShared(fml));
+    return quantify(prefix, flatten(matrix)).toExpression();
+
+def toMiniscope(fml: Union[Expression, SharedExpression]) -> Expression:
+    return flatten(miniscope(asShared(fml))).toExpression();
+
+def toClauses(fml: Union[Expression, SharedExpression]) -> List[Clause]:
+    return clausalForm(asShared(fml));
+
+def toCNF(fml: Union[Expression, SharedExpression]) -> Expression:
+    return clausesToExpression(toClauses(fml));
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS: normal forms of SharedExpressions
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def negationNormalForm(fml: SharedExpression) -> SharedExpression:
+    '''
+    Pushes negations down to the atoms and eliminates ->, <->.
+    Nodes are visited once per polarity, so <-> (which needs both polarities of its arguments)
+    does not cause exponential growth of the (shared) result.
+    '''
+    def children(item: Tuple[SharedExpression, bool]) -> List[Tuple[SharedExpression, bool]]:
+        t, positive = item;
+        kind = t.kind;
+        if kind == 'not':
+            return [ (t.parts[0], not positive) ];
+        elif kind in ['and', 'or']:
+            return [ (part, positive) for part in t.parts ];
+        elif kind == 'implies':
+            return [ (t.parts[0], not positive), (t.parts[1], positive) ];
+        elif kind == 'iff':
+            return [ (t.parts[0], True), (t.parts[0], False), (t.parts[1], True), (t.parts[1], False) ];
+        elif kind in ['all', 'exists']:
+            return [ (t.parts[1], positive) ];
+        elif kind in ATOMIC_KINDS:
+            return [];
+        raise Exception('Cannot compute normal form of \033[1m{}\033[0m!'.format(kind));
+
+    def combine(item: Tuple[SharedExpression, bool], r: List[SharedExpression]) -> SharedExpression:
+        t, positive = item;
+        kind = t.kind;
+        if kind in ATOMIC_KINDS:
+            return t if positive else connective('not', t);
+        elif kind == 'not':
+            return r[0];
+        elif kind == 'and':
+            return connective('and' if positive else 'or', *r);
+        elif kind == 'or':
+            return connective('or' if positive else 'and', *r);
+        elif kind == 'implies':
+            return connective('or' if positive else 'and', *r);
+        elif kind == 'iff':
+            a, not_a, b, not_b = r;
+            if positive:
+                return connective('and', connective('or', not_a, b), connective('or', a, not_b));
+            return connective('or', connective('and', a, not_b), connective('and', not_a, b));
+        elif kind == 'all':
+            return connective('all' if positive else 'exists', t.parts[0], r[0]);
+        return connective('exists' if positive else 'all', t.parts[0], r[0]);
+
+    return foldDag((fml, True), combine, children=children).withOuterBraces(False);
+
+def rectify(fml: SharedExpression) -> SharedExpression:
+    '''
+    Renames bound variables, such that no variable is bound twice or occurs both free and bound.
+    Every quantifier occurrence is treated separately (sharing of quantified subformulas is undone),
+    quantifier-free subformulas stay shared.
+    '''
+    labels = variableLabels(fml);
+    free = cacheFreeVariables(fml);
+    quantified = containsQuantifier(fml);
+    used: Set[str] = set(labels) | set(free);
+    bound: Set[str] = set();
+    binders: Dict[int, SharedExpression] = dict();
+    counters: Dict[str, int] = dict();
+    tags = count(1);
+
+    def fresh(x: SharedExpression) -> SharedExpression:
+        if not (x.label in bound or x.label in free):
+            bound.add(x.label);
+            return x;
+        m = RE_BASENAME.match(x.label);
+        base = m.group(0) if m is not None else 'x';
+        while True:
+            counters[base] = counters.get(base, 0) + 1;
+            y = SharedExpression.fromExpression(Variable(base, str(counters[base]), False, False));
+            if not y.label in used:
+                used.add(y.label);
+                bound.add(y.label);
+                return y;
+
+    # items: (node, renaming restricted to the free variables of node, tag);
+    # nodes containing quantifiers get a unique tag, so that each occurrence is renamed separately.
+    def item(t: SharedExpression, env: FrozenSet[Tuple[str, SharedExpression]]) -> tuple:
+        fv = freeVariables(t);
+        env = frozenset([ (u, y) for u, y in env if u in fv ]);
+        return (t, env, next(tags) if quantified[t] else 0);
+
+    def children(it: tuple) -> List[tuple]:
+        t, env, tag = it;
+        if t.kind in ['all', 'exists']:
+            x = t.parts[0];
+            y = fresh(x);
+            binders[tag] = y;
+            env_ = frozenset([ (u, z) for u, z in env if not u == x.label ] + ([] if y is x else [ (x.label, y) ]));
+            return [ item(t.parts[1], env_) ];
+        return [ item(part, env) for part in t.parts ];
+
+    def combine(it: tuple, parts: List[SharedExpression]) -> SharedExpression:
+        t, env, tag = it;
+        if t.kind == 'variable':
+            return dict(env).get(t.label, t);
+        elif t.kind in ['all', 'exists']:
+            return connective(t.kind, binders[tag], parts[0]);
+        return withParts(t, parts);
+
+    return foldDag(item(fml, frozenset()), combine, children=children).withOuterBraces(False);
+
+def prenexForm(fml: SharedExpression) -> Tuple[Prefix, SharedExpression]:
+    '''
+    Returns (quantifier prefix, quantifier-free matrix) of the rectified negation normal form.
+    The prefix lists the quantifiers in pre-order, i.e. outer ones (and left ones) first.
+    '''
+    fml = rectify(negationNormalForm(fml));
+    quantified = containsQuantifier(fml);
+    prefix: Prefix = tuple([
+        (t.kind, t.parts[0])
+        for t in preOrder(fml, children=lambda t: [ part for part in t.parts if quantified[part] ])
+        if t.kind in ['all', 'exists']
+    ]);
+
+    def children(t: SharedExpression) -> List[SharedExpression]:
+        if t.kind in ['all', 'exists']:
+            return [ t.parts[1] ];
+        elif quantified[t]:
+            return list(t.parts);
+        return [];
+
+    def combine(t: SharedExpression, r: List[SharedExpression]) -> SharedExpression:
+        if t.kind in ['all', 'exists']:
+            return r[0];
+        elif quantified[t]:
+            return connective(t.kind, *r);
+        return t;
+
+    matrix = foldDag(fml, combine, children=children);
+    return prefix, matrix.withOuterBraces(False);
+
+def miniscope(fml: SharedExpression) -> SharedExpression:
+    '''
+    Moves quantifiers of the rectified negation normal form inwards as far as possible
+    (all over and, exists over or, and past subformulas in which the variable is not free).
+    Quantified variables then range over as few subformulas as possible.
+    '''
+    fml = rectify(negationNormalForm(fml));
+    cacheFreeVariables(fml);
+
+    def push(kind: str, x: SharedExpression, t: SharedExpression) -> SharedExpression:
+        if not x.label in freeVariables(t):
+            return t;
+        junction = 'and' if kind == 'all' else 'or';
+        if t.kind == junction:
+            return connective(junction, *[ push(kind, x, part) for part in junctionParts(t) ]);
+        elif t.kind in ['and', 'or']:
+            parts = junctionParts(t);
+            independent = [ part for part in parts if not x.label in freeVariables(part) ];
+            dependent = [ part for part in parts if x.label in freeVariables(part) ];
+            if len(independent) > 0:
+                return connective(t.kind, *independent, push(kind, x, connective(t.kind, *dependent)));
+        return connective(kind, x, t);
+
+    def combine(t: SharedExpression, parts: List[SharedExpression]) -> SharedExpression:
+        if t.kind in ['all', 'exists']:
+            return push(t.kind, t.parts[0], parts[1]);
+        return withParts(t, parts);
+
+    return foldDag(fml, combine).withOuterBraces(False);
+
+def skolemForm(fml: SharedExpression) -> Tuple[Prefix, SharedExpression]:
+    '''
+    Replaces existentially quantified variables of the prenex form by Skolem terms
+    in the universally quantified variables to their left. Returns the (universal) prefix and the matrix.
+    '''
+    prefix, matrix = prenexForm(fml);
+    symbols = signatureLabels(matrix);
+    universal: List[SharedExpression] = [];
+    substitution: Dict[str, SharedExpression] = dict();
+    k = 0;
+    for kind, x in prefix:
+        if kind == 'all':
+            universal.append(x);
+            continue;
+        while True:
+            k += 1;
+            if len(universal) == 0:
+                term = Constant('sk', str(k), False, False);
+            else:
+                term = FunctionExpression(Function('sk', str(k), False, False), *[ y.toExpression() for y in universal ]);
+            if not term.label in symbols:
+                break;
+        substitution[x.label] = SharedExpression.fromExpression(term);
+    matrix = substitute(matrix, substitution);
+    return tuple([ ('all', x) for x in universal ]), matrix;
+
+def clausalForm(fml: SharedExpression) -> List[Clause]:
+    '''
+    Definitional (Tseitin/Plaisted-Greenbaum) clausal form of the Skolem form.
+    Every compound subformula of the matrix below the top level conjunction/disjunctions
+    gets a new atom D_k(free variables) and (as all occurrences are positive in negation normal form)
+    only the implication D_k -> subformula is added. The number of clauses is linear in the size of the matrix.
+    '''
+    _, matrix = skolemForm(fml);
+    cacheFreeVariables(matrix);
+    symbols = signatureLabels(matrix);
+    variables: Dict[str, SharedExpression] = { x.label: x for x in variableNodes(matrix) };
+    clauses: List[Clause] = [];
+    names = count(1);
+
+    def definition(t: SharedExpression) -> SharedExpression:
+        while True:
+            R = Relation('D', str(next(names)), False, False);
+            if not R.label in symbols:
+                break;
+        fv = sorted(freeVariables(t));
+        return SharedExpression.fromExpression(RelationExpression(R, *[ variables[u].toExpression() for u in fv ]));
+
+    def children(t: SharedExpression) -> List[SharedExpression]:
+        return junctionParts(t) if t.kind in ['and', 'or'] else [];
+
+    def combine(t: SharedExpression, r: List[Literal]) -> Literal:
+        if t.kind in ATOMIC_KINDS:
+            return (True, t.withOuterBraces(False));
+        elif t.kind == 'not':
+            return (False, t.parts[0].withOuterBraces(False));
+        D = definition(t);
+        if t.kind == 'and':
+            clauses.extend([ ((False, D), literal) for literal in r ]);
+        else:
+            clauses.append(((False, D),) + tuple(r));
+        return (True, D);
+
+    memo: Dict[SharedExpression, Literal] = dict();
+    conjuncts = junctionParts(matrix) if matrix.kind == 'and' else [ matrix ];
+    for conjunct in conjuncts:
+        if conjunct.kind == 'or':
+            clauses.append(tuple([ foldDag(part, combine, children=children, memo=memo) for part in junctionParts(conjunct) ]));
+        else:
+            clauses.append((foldDag(conjunct, combine, children=children, memo=memo),));
+    return clauses;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS: clauses -> Expression
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def literalToExpression(literal: Literal) -> Expression:
+    positive, atom = literal;
+    return atom.toExpression() if positive else Not(atom.toExpression(), adopt=True);
+
+def clauseToExpression(clause: Clause) -> Expression:
+    if len(clause) == 0:
+        raise Exception('The empty clause has no expression!');
+    return Or(*[ literalToExpression(literal) for literal in clause ], adopt=True);
+
+def clausesToExpression(clauses: List[Clause]) -> Expression:
+    if len(clauses) == 0:
+        raise Exception('The empty set of clauses has no expression!');
+    return And(*[ clauseToExpression(clause) for clause in clauses ], adopt=True).showOuterBraces(False);
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS: construction of shared nodes
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def asShared(fml: Union[Expression, SharedExpression]) -> SharedExpression:
+    if isinstance(fml, SharedExpression):
+        return fml;
+    return SharedExpression.fromExpression(fml);
+
+def connective(kind: str, *parts: SharedExpression) -> SharedExpression:
+    # duplicate arguments of conjunctions and disjunctions are dropped; nesting is kept (see flatten):
+    if kind in ['and', 'or']:
+        parts = tuple(dict.fromkeys([ part.withOuterBraces(True) for part in parts ]));
+        if len(parts) == 1:
+            return parts[0];
+    desc = DESCRIPTORS[kind];
+    return SharedExpression(
+        kind, *[ part.withOuterBraces(True) for part in parts ],
+        symbol          = desc.symbol,
+        display         = desc.display,
+        isLabelled      = desc.isLabelled,
+        glueOption      = desc.glueOption,
+        glueOuterOption = desc.glueOuterOption,
+    );
+
+def junctionParts(t: SharedExpression) -> List[SharedExpression]:
+    '''
+    Arguments of a conjunction (disjunction) with nested conjunctions (disjunctions) expanded, without duplicates.
+    '''
+    parts: Dict[SharedExpression, None] = dict();
+    stack: List[SharedExpression] = list(reversed(t.parts));
+    while len(stack) > 0:
+        part = stack.pop();
+        if part.kind == t.kind:
+            stack.extend(reversed(part.parts));
+        else:
+            parts[part] = None;
+    return list(parts);
+
+def flatten(fml: SharedExpression) -> SharedExpression:
+    '''
+    Merges nested conjunctions and disjunctions.
+    Done as a separate pass, as merging on every construction is quadratic for long chains.
+    '''
+    def children(t: SharedExpression) -> List[SharedExpression]:
+        return junctionParts(t) if t.kind in ['and', 'or'] else list(t.parts);
+
+    def combine(t: SharedExpression, parts: List[SharedExpression]) -> SharedExpression:
+        if t.kind in ['and', 'or']:
+            return connective(t.kind, *parts);
+        return withParts(t, parts);
+
+    return foldDag(fml, combine, children=children).withOuterBraces(fml.outerBrackets);
+
+def withParts(t: SharedExpression, parts: List[SharedExpression]) -> SharedExpression:
+    parts = tuple([ part.withOuterBraces(True) for part in parts ]);
+    if parts == t.parts:
+        return t;
+    return SharedExpression(
+        t.kind, *parts,
+        label           = t.label,
+        symbol          = t.symbol,
+        display         = t.display,
+        isLabelled      = t.isLabelled,
+        outerBrackets   = t.outerBrackets,
+        glueOption      = t.glueOption,
+        glueOuterOption = t.glueOuterOption,
+    );
+
+def quantify(prefix: Prefix, matrix: SharedExpression) -> SharedExpression:
+    t = matrix;
+    for kind, x in reversed(prefix):
+        t = connective(kind, x, t);
+    return t.withOuterBraces(False);
+
+def substitute(fml: SharedExpression, substitution: Dict[str, SharedExpression]) -> SharedExpression:
+    # replaces free occurrences of variables (by label); quantifier-free input assumed.
+    def combine(t: SharedExpression, parts: List[SharedExpression]) -> SharedExpression:
+        if t.kind == 'variable':
+            return substitution.get(t.label, t);
+        return withParts(t, parts);
+    return foldDag(fml, combine).withOuterBraces(fml.outerBrackets);
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS: variables and signature
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def freeVariables(fml: SharedExpression) -> FrozenSet[str]:
+    # cached on the shared nodes (see SharedExpression.freeVariables and cacheFreeVariables)
+    return fml.freeVariables;
+
+def containsQuantifier(fml: SharedExpression) -> Dict[SharedExpression, bool]:
+    memo: Dict[SharedExpression, bool] = dict();
+    foldDag(fml, lambda t, r: t.kind in ['all', 'exists'] or any(r), memo=memo);
+    return memo;
+
+def variableNodes(fml: SharedExpression) -> List[SharedExpression]:
+    memo: Dict[SharedExpression, None] = dict();
+    foldDag(fml, lambda t, r: None, memo=memo);
+    return [ t for t in memo if t.kind == 'variable' ];
+
+def variableLabels(fml: SharedExpression) -> Set[str]:
+    return set([ t.label for t in variableNodes(fml) ]);
+
+def signatureLabels(fml: SharedExpression) -> Set[str]:
+    return set([ label for _, label, _ in fml.signature ]);
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+import os;
+from collections import deque;
+from functools import partial;
+from multiprocessing import get_context;
+from typing import IO;
+from typing import Iterable;
+from typing import Iterator;
+from typing import List;
+from typing import Tuple;
+from typing import Union;
+
+from src.fol.classes import Expression;
+from src.fol.encoding import EncodedExpressions;
+from src.fol.encoding import decodeExpressions;
+from src.fol.encoding import encodeExpressions;
+from src.fol.stream import MAX_RECORD_LINES;
+from src.fol.stream import FolRecord;
+from src.fol.stream import FolRecordError;
+from src.fol.stream import readFolRecords;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: parseFolStreamParallel keeps at most MAX_PENDING_CHUNKS chunks per worker in flight,
+# so that a large stream is not read ahead into memory.
+STREAM_CHUNK_SIZE: int = 256;
+MAX_PENDING_CHUNKS: int = 2;
+
+# result of one chunk: encoded formulae that parsed + (index within chunk, message) for the others
+ChunkResult = Tuple[EncodedExpressions, List[Tuple[int, str]]];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# MAIN METHOD
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def parseFolExprsParallel(
+    formulae: List[str],
+    processes: Union[int, None] = None,
+    chunksize: Union[int, None] = None,
+    fastpath: bool = True,
+    strict: bool = True,
+) -> List[Union[Expression, Exception]]:
+    '''
+    Parses each string in `formulae` as one expression, distributing the work over a process pool.
+    Workers compile the grammar once (in the initialiser) and send back a compact flat
+    encoding of the results instead of pickled Expression graphs. Results keep the input order.
+    If `strict` is set, the first failure is raised; otherwise it is returned in place.
+    '''
+    processes = processes or os.cpu_count() or 1;
+    if chunksize is None:
+        # a few chunks per worker balances load without much scheduling overhead:
+        chunksize = max(1, min(1024, len(formulae) // (4*processes) + 1));
+    chunks = [ formulae[k:k+chunksize] for k in range(0, len(formulae), chunksize) ];
+    results: List[Union[Expression, Exception]] = [];
+    parse = partial(parseChunk, fastpath=fastpath);
+    if processes == 1 or len(chunks) <= 1:
+        outputs = map(parse, chunks);
+        results = collectResults(chunks, outputs, strict);
+    else:
+        with get_context().Pool(processes=processes, initializer=initWorker) as pool:
+            outputs = pool.imap(parse, chunks);
+            results = collectResults(chunks, outputs, strict);
+    return results;
+
+def parseFolStreamParallel(
+    fp: IO[str],
+    processes: Union[int, None] = None,
+    chunksize: int = STREAM_CHUNK_SIZE,
+    fastpath: bool = True,
+    maxLines: int = MAX_RECORD_LINES,
+) -> Iterator[Union[Expression, FolRecordError]]:
+    '''
+    As stream.parseFolStream, but the records are parsed in chunks by a process pool.
+    Results keep the input order.
+    '''
+    processes = processes or os.cpu_count() or 1;
+    pending = deque();
+    with get_context().Pool(processes=processes, initializer=initWorker) as pool:
+        for chunk in chunkRecords(readFolRecords(fp, maxLines=maxLines), chunksize):
+            texts = [ record.text for record in chunk if not isinstance(record, FolRecordError) ];
+            pending.append((chunk, pool.apply_async(parseChunk, (texts, fastpath))));
+            if len(pending) >= MAX_PENDING_CHUNKS*processes:
+                chunk, output = pending.popleft();
+                yield from collectRecords(chunk, output.get());
+        while len(pending) > 0:
+            chunk, output = pending.popleft();
+            yield from collectRecords(chunk, output.get());
+    return;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# WORKER METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def initWorker():
+    # load the grammar once per process (from the on-disk cache if possible):
+    from src.fol.parser import getLexer;
+    getLexer();
+    return;
+
+def parseChunk(chunk: List[str], fastpath: bool = True) -> ChunkResult:
+    from src.fol.parser import parseFolExpr;
+    fmls: List[Expression] = [];
+    errors: List[Tuple[int, str]] = [];
+    for index, u in enumerate(chunk):
+        try:
+            fmls.append(parseFolExpr(u, fastpath=fastpath));
+        except Exception as e:
+            errors.append((index, str(e)));
+    return encodeExpressions(fmls), errors;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def collectResults(chunks: List[List[str]], outputs, strict: bool) -> List[Union[Expression, Exception]]:
+    results: List[Union[Expression, Exception]] = [];
+    for chunk, (encoded, errors) in zip(chunks, outputs):
+        if strict and len(errors) > 0:
+            raise Exception(errors[0][1]);
+        fmls = iter(decodeExpressions(encoded));
+        failed = dict(errors);
+        for index in range(len(chunk)):
+            results.append(Exception(failed[index]) if index in failed else next(fmls));
+    return results;
+
+def collectRecords(chunk: List[Union[FolRecord, FolRecordError]], output: ChunkResult) -> Iterator[Union[Expression, FolRecordError]]:
+    encoded, errors = output;
+    fmls = iter(decodeExpressions(encoded));
+    failed = dict(errors);
+    index = 0;
+    for record in chunk:
+        if isinstance(record, FolRecordError):
+            yield record;
+            continue;
+        yield FolRecordError(record, failed[index]) if index in failed else next(fmls);
+        index += 1;
+    return;
+
+def chunkRecords(records: Iterable[Union[FolRecord, FolRecordError]], chunksize: int) -> Iterator[List[Union[FolRecord, FolRecordError]]]:
+    chunk = [];
+    for record in records:
+        chunk.append(record);
+        if len(chunk) >= chunksize:
+            yield chunk;
+            chunk = [];
+    if len(chunk) > 0:
+        yield chunk;
+    return;
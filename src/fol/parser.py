@@ -6,12 +6,21 @@
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 from __future__ import annotations;
-from lark import Lark;
-from lark import Tree;
+from threading import Lock;
+from typing import Any;
+from typing import Dict;
 from typing import List;
 from typing import Tuple;
+from typing import TYPE_CHECKING;
 from typing import Union;
 
+if TYPE_CHECKING:
+    from lark import Lark;
+
+from src.core.grammar import grammarPath;
+from src.core.profiling import PROFILER;
+from src.core.grammar import loadGrammar;
+
 from src.fol.classes import Expression;
 from src.fol.construction import Constant;
 from src.fol.construction import Variable;
@@ -26,122 +35,222 @@ from src.fol.construction import Iff;
 from src.fol.construction import Implies;
 from src.fol.construction import QuantifiedAll;
 from src.fol.construction import QuantifiedExists;
+from src.fol.cache import ParseCache;
+from src.fol.cache import normaliseFormula;
+from src.fol.fastparser import parseFolExprsFast;
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # GLOBAL CONSTANTS
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-PATH_GRAMMAR: str = 'src/grammars/fol.lark';
-LEXER: Lark;
+PATH_GRAMMAR: str = grammarPath('fol.lark');
 
-# lexer durch LARK erzeugen
-with open(PATH_GRAMMAR, 'r') as fp:
-    grammar = ''.join(fp.readlines());
-    LEXER   = Lark(grammar, start='search', regex=True);
+# rules (resp. aliases) of the grammar which become expressions, see lexedNode:
+LEXED_EXPRESSIONS: List[str] = [
+    'expr', 'term', 'quantified', 'exprclosed', 'termclosed', 'expropen', 'termopen',
+    'constant', 'variable', 'funcpolish', 'funcinfix', 'relnpolish', 'relninfix',
+    'not', 'and', 'or', 'implies', 'iff', 'all', 'exists',
+];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL VARIABLES
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# lexer durch LARK erzeugen (erst beim ersten Gebrauch)
+LEXER: Union[Lark, None] = None;
+LEXER_LOCK: Lock = Lock();
+
+# optional cache of parse results, see parseFolExprs(..., cache=True)
+PARSE_CACHE: ParseCache = ParseCache();
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHOD getLexer
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def getLexer() -> Lark:
+    global LEXER;
+    if LEXER is None:
+        with LEXER_LOCK:
+            if LEXER is None:
+                with PROFILER.phase('grammar.load'):
+                    LEXER = loadGrammar(PATH_GRAMMAR, start='search', regex=True, tree_class=lexedNode);
+    return LEXER;
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # MAIN METHOD string -> PropLogicExpr
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-def parseFolExprToStr(u: str) -> str:
-    return str(parseFolExpr(u));
+def parseFolExprToStr(u: str, fastpath: bool = True, cache: bool = False) -> str:
+    return str(parseFolExpr(u, fastpath=fastpath, cache=cache));
 
-def parseFolExprsToStr(u: str) -> List[str]:
-    return [str(_) for _ in parseFolExprs(u)];
+def parseFolExprsToStr(u: str, fastpath: bool = True, cache: bool = False) -> List[str]:
+    return [str(_) for _ in parseFolExprs(u, fastpath=fastpath, cache=cache)];
 
-def parseFolExpr(u: str) -> Expression:
-    fmls = parseFolExprs(u);
+def parseFolExpr(u: str, fastpath: bool = True, cache: bool = False) -> Expression:
+    fmls = parseFolExprs(u, fastpath=fastpath, cache=cache);
     if len(fmls) == 1:
         return fmls[0];
     raise Exception('String \033[1m{}\033[0m must contain exactly one expression!'.format(u));
 
-def parseFolExprs(u: str) -> List[Expression]:
+def parseFolExprs(u: str, fastpath: bool = True, cache: bool = False) -> List[Expression]:
+    # look up / store the result under the whitespace-normalised string in the parse cache (if required);
+    # the string itself is parsed, so that the cache never changes which strings parse:
+    if cache:
+        key = normaliseFormula(u);
+        fmls = PARSE_CACHE.get(key);
+        if fmls is None:
+            if PROFILER.enabled:
+                PROFILER.count('parse.cache.misses');
+            fmls = parseFolExprsUncached(u, fastpath=fastpath);
+            PARSE_CACHE.put(key, fmls);
+        elif PROFILER.enabled:
+            PROFILER.count('parse.cache.hits');
+        return fmls;
+    return parseFolExprsUncached(u, fastpath=fastpath);
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS: parse cache
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def parseCacheStats() -> Dict[str, int]:
+    return PARSE_CACHE.stats();
+
+def resizeParseCache(maxsize: int):
+    PARSE_CACHE.resize(maxsize);
+
+def clearParseCache():
+    PARSE_CACHE.clear();
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# PRIVATE METHODS: string -> Expression
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def parseFolExprsUncached(u: str, fastpath: bool = True) -> List[Expression]:
+    # try recursive descent first, fall back to Earley on anything it does not handle:
+    if fastpath:
+        try:
+            with PROFILER.phase('parse.fastpath'):
+                return parseFolExprsFast(u);
+        except:
+            if PROFILER.enabled:
+                PROFILER.count('parse.fastpath.fallbacks');
     try:
-        fmls = lexedToExprs(LEXER.parse(u));
+        lexer = getLexer();
+        with PROFILER.phase('parse.lark'):
+            fmls = lexedToExprs(lexer.parse(u));
     except:
         raise Exception('Could not parse expressions \033[1m{}\033[0m!'.format(u));
     return fmls;
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-# PRIVATE METHODS: recursive lex -> Expression
+# CLASS: LexedNode
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-def lexedToExprs(u: Tree) -> List[Expression]:
-    typ = u.data;
-    if typ in ['term', 'expr']:
-        return [ lexedToExpr(u) ];
-    elif typ in ['terms', 'exprs']:
-        return [ lexedToExpr(uu) for uu in filterSubexpr(u) ];
+class LexedNode(object):
+    '''
+    Parse tree node for the parts of the grammar below expressions (names, operators, indices);
+    offers the interface of lark.Tree that the conversion and Lark's inlining of rules rely on.
+    '''
+    __slots__ = ('data', 'children');
+
+    data:     str;
+    children: List[Union[str, LexedNode]];
+
+    def __init__(self, data: str, children: List[Union[str, LexedNode]]):
+        self.data     = data;
+        self.children = children;
+        return;
+
+# all separators, spaces and brackets:
+NONCAPTURE: LexedNode = LexedNode('noncapture', []);
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# PRIVATE METHODS: lex -> Expression
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def lexedToExprs(u: Union[Expression, List[Expression]]) -> List[Expression]:
+    if isinstance(u, Expression):
+        return [ u ];
+    elif isinstance(u, list):
+        return u;
     raise Exception('Could not parse expression!');
 
-def lexedToExpr(u: Tree) -> Expression:
-    children = filterSubexpr(u);
-    typ = u.data;
-    if typ == 'expr':
-        return lexedToExpr(children[0]);
-    if typ == 'exprclosed':
-        return lexedToExpr(children[0]).showOuterBraces(True);
-    elif typ == 'expropen':
-        return lexedToExpr(children[0]).showOuterBraces(False);
+def lexedNode(typ: str, children: List[Any]) -> Any:
+    # NOTE: Lark calls this (as tree_class) for every rule of the chosen derivation, bottom-up,
+    # with the (filtered and inlined) results of the subrules. Expressions are thus built during the parse,
+    # and neither a parse tree of the expressions nor intermediate lists of children are kept.
+    if typ == 'noncapture':
+        return NONCAPTURE;
+    elif typ in ['terms', 'exprs']:
+        return [ child for child in children if isinstance(child, Expression) ];
+    elif typ in LEXED_EXPRESSIONS:
+        return lexedCombine(typ, children);
+    return LexedNode(typ, children);
+
+def lexedCombine(typ: str, children: List[Any]) -> Expression:
+    parts: List[Expression] = [];
+    for child in children:
+        if isinstance(child, Expression):
+            parts.append(child);
+        elif isinstance(child, list):
+            parts.extend(child);
+    if typ in ['expr', 'term', 'quantified']:
+        return parts[0];
+    elif typ in ['exprclosed', 'termclosed']:
+        return parts[0].showOuterBraces(True);
+    elif typ in ['expropen', 'termopen']:
+        return parts[0].showOuterBraces(False);
     elif typ == 'constant':
-        label = lexedToLabel(children[0], is_indexlike=True);
+        label = lexedToLabel(filterSubexpr(children)[0], is_indexlike=True);
         return Constant(*label);
     elif typ == 'variable':
-        label = lexedToLabel(children[0]);
+        label = lexedToLabel(filterSubexpr(children)[0]);
         return Variable(*label);
-    elif typ == 'term':
-        return lexedToExpr(children[0]);
-    elif typ == 'termclosed':
-        return lexedToExpr(children[0]).showOuterBraces(True);
-    elif typ == 'termopen':
-        return lexedToExpr(children[0]).showOuterBraces(False);
     elif typ == 'funcpolish':
-        label = lexedToLabel(children[0]);
-        return FunctionExpression(Function(*label), *lexedToExprs(children[1]), polish=True);
+        label = lexedToLabel(filterSubexpr(children)[0]);
+        return FunctionExpression(Function(*label), *parts, polish=True, adopt=True);
     elif typ == 'funcinfix':
-        labels = list(set([ lexedToLabel(child) for child in filterOps(u) ]));
+        labels = list(set([ lexedToLabel(child) for child in filterOps(children) ]));
         assert len(labels) == 1, 'Cannot parse expression with inconsistent infix symbols';
-        return FunctionExpression(Function(*labels[0]), *[ lexedToExpr(child) for child in filterOutOps(u) ], polish=False);
+        return FunctionExpression(Function(*labels[0]), *parts, polish=False, adopt=True);
     elif typ == 'relnpolish':
-        label = lexedToLabel(children[0]);
-        return RelationExpression(Relation(*label), *lexedToExprs(children[1]), polish=True);
+        label = lexedToLabel(filterSubexpr(children)[0]);
+        return RelationExpression(Relation(*label), *parts, polish=True, adopt=True);
     elif typ == 'relninfix':
-        labels = list(set([ lexedToLabel(child) for child in filterOps(u) ]));
+        labels = list(set([ lexedToLabel(child) for child in filterOps(children) ]));
         assert len(labels) == 1, 'Cannot parse expression with inconsistent infix symbols';
-        return RelationExpression(Relation(*labels[0]), *[ lexedToExpr(child) for child in filterOutOps(u) ], polish=False);
+        return RelationExpression(Relation(*labels[0]), *parts, polish=False, adopt=True);
     elif typ == 'not':
-        return Not(lexedToExpr(children[0]));
+        return Not(parts[0], adopt=True);
     elif typ == 'and':
-        return And(*[lexedToExpr(child) for child in children]);
+        return And(*parts, adopt=True);
     elif typ == 'or':
-        return Or(*[lexedToExpr(child) for child in children]);
+        return Or(*parts, adopt=True);
     elif typ == 'implies':
-        return Implies(lexedToExpr(children[0]), lexedToExpr(children[1]));
+        return Implies(parts[0], parts[1], adopt=True);
     elif typ == 'iff':
-        return Iff(lexedToExpr(children[0]), lexedToExpr(children[1]));
-    elif typ == 'quantified':
-        return lexedToExpr(children[0]);
+        return Iff(parts[0], parts[1], adopt=True);
     elif typ == 'all':
-        return QuantifiedAll(lexedToExpr(children[0]), lexedToExpr(children[1]));
+        return QuantifiedAll(parts[0], parts[1], adopt=True);
     elif typ == 'exists':
-        return QuantifiedExists(lexedToExpr(children[0]), lexedToExpr(children[1]));
+        return QuantifiedExists(parts[0], parts[1], adopt=True);
     raise Exception('Could not parse expression!');
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # AUXILIARY METHODS: filtration
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-def lexedToLabel(u: Tree, is_indexlike: bool = False) -> Tuple[str, Union[str, None], bool, bool]:
+def lexedToLabel(u: LexedNode, is_indexlike: bool = False) -> Tuple[str, Union[str, None], bool, bool]:
     typ = u.data;
     if typ == 'op':
-        children = filterSubexpr(u);
+        children = filterSubexpr(u.children);
         return lexedToLabel(children[0]);
     elif typ == 'name':
         is_generic = False;
-        children = filterOutNoncapture(u);
+        children = filterOutNoncapture(u.children);
         name = lexedToStr(children[0]);
         index = lexedToStr(children[1]) if len(children) >= 2 else None;
-        is_generic = ( isinstance(children[0], Tree) and children[0].data == 'symb' );
+        is_generic = ( not isinstance(children[0], str) and children[0].data == 'symb' );
         if is_indexlike:
             if is_generic:
                 is_indexlike = False;
@@ -151,19 +260,16 @@ def lexedToLabel(u: Tree, is_indexlike: bool = False) -> Tuple[str, Union[str, N
         return name, index, is_indexlike, is_generic;
     raise Exception('Could not parse label!');
 
-def lexedToStr(u: Union[str, Tree]) -> str:
+def lexedToStr(u: Union[str, LexedNode]) -> str:
     if isinstance(u, str):
         return str(u);
     return ''.join([ lexedToStr(uu) for uu in u.children ]);
 
-def filterSubexpr(u: Tree) -> List[Tree]:
-    return [uu for uu in u.children if isinstance(uu, Tree) and hasattr(uu, 'data') and not uu.data == 'noncapture'];
-
-def filterOps(u: Tree) -> List[Tree]:
-    return [uu for uu in filterSubexpr(u) if uu.data == 'op' ];
+def filterSubexpr(children: List[Any]) -> List[LexedNode]:
+    return [uu for uu in children if isinstance(uu, LexedNode) and not uu is NONCAPTURE];
 
-def filterOutOps(u: Tree) -> List[Tree]:
-    return [uu for uu in filterSubexpr(u) if not uu.data == 'op' ];
+def filterOps(children: List[Any]) -> List[LexedNode]:
+    return [uu for uu in filterSubexpr(children) if uu.data == 'op' ];
 
-def filterOutNoncapture(u: Tree) -> List[Union[str, Tree]]:
-    return [uu for uu in u.children if not isinstance(uu, Tree) or ( hasattr(uu, 'data') and not uu.data == 'noncapture' ) ];
+def filterOutNoncapture(children: List[Any]) -> List[Union[str, LexedNode]]:
+    return [uu for uu in children if isinstance(uu, str) or ( isinstance(uu, LexedNode) and not uu is NONCAPTURE ) ];
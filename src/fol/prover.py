@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+import heapq;
+import time;
+from collections import Counter;
+from collections import deque;
+from typing import Deque;
+from typing import Dict;
+from typing import Iterable;
+from typing import Iterator;
+from typing import List;
+from typing import Sequence;
+from typing import Tuple;
+from typing import Union;
+
+try:
+    import resource;
+except:
+    # not available on all platforms; the memory limit is then ignored.
+    resource = None;
+
+from src.core.traversal import preOrder;
+from src.fol.classes import Expression;
+from src.fol.construction import Variable;
+from src.fol.normalform import Clause;
+from src.fol.normalform import Literal;
+from src.fol.normalform import asShared;
+from src.fol.normalform import clausalForm;
+from src.fol.normalform import connective;
+from src.fol.normalform import freeVariables;
+from src.fol.normalform import substitute;
+from src.fol.normalform import variableNodes;
+from src.fol.shared import SharedExpression;
+from src.fol.subsumption import FeatureVectorIndex;
+from src.fol.termindex import DiscriminationTree;
+from src.fol.unification import Substitution;
+from src.fol.unification import unify;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: Saturation by binary resolution and factoring in an Otter-style given-clause loop.
+# Kept clauses are active (inferences among them are done) or passive (waiting to be selected).
+# The given clause is picked from the passive clauses alternately by age and by weight (number of symbols),
+# and all resolvents with active clauses are found through discrimination trees over the active literals.
+# New clauses are discarded if they are tautologies or subsumed by a kept clause (forward subsumption)
+# and delete kept clauses they subsume (backward subsumption), both through a feature vector index.
+# With literal selection (the default), a clause with negative literals only takes part in inferences through
+# its heaviest negative literal, and factoring is only done on positive clauses; this remains complete.
+# Variables of each clause are renamed to v_{0}, v_{1}, ... in order of occurrence; the given clause
+# uses w_{0}, w_{1}, ... during inferences so that it is variable disjoint from the active clauses.
+STATUS_UNSATISFIABLE: str = 'unsatisfiable';
+STATUS_SATISFIABLE:   str = 'satisfiable';
+STATUS_TIMEOUT:       str = 'timeout';
+STATUS_MEMORYOUT:     str = 'memoryout';
+STATUS_CLAUSELIMIT:   str = 'clauselimit';
+
+CHECK_INTERVAL: int = 256;
+
+_variables: Dict[Tuple[str, int], SharedExpression] = dict();
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: ProverClause
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class ProverClause(object):
+    __slots__ = ('id', 'literals', 'variables', 'eligible', 'weight', 'rule', 'parents', 'state');
+    id:        int;
+    literals:  Clause;
+    variables: int;
+    eligible:  Tuple[int, ...];
+    weight:    int;
+    rule:      str;
+    parents:   Tuple[ProverClause, ...];
+    state:     str;
+
+    def __init__(self, id: int, literals: Clause, variables: int, rule: str, parents: Tuple[ProverClause, ...]):
+        self.id        = id;
+        self.literals  = literals;
+        self.variables = variables;
+        self.eligible  = tuple(range(len(literals)));
+        self.weight    = sum([ atom.size for _, atom in literals ]);
+        self.rule      = rule;
+        self.parents   = parents;
+        self.state     = 'passive';
+        return;
+
+    def __repr__(self) -> str:
+        return '<ProverClause {} [{}] {}>'.format(self.id, self.rule, clauseToStr(self.literals));
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: ProofResult
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class ProofResult(object):
+    status:      str;
+    emptyClause: Union[ProverClause, None];
+    stats:       Dict[str, float];
+
+    def __init__(self, status: str, emptyClause: Union[ProverClause, None], stats: Dict[str, float]):
+        self.status      = status;
+        self.emptyClause = emptyClause;
+        self.stats       = stats;
+        return;
+
+    def __repr__(self) -> str:
+        return '<ProofResult {}>'.format(self.status);
+
+    @property
+    def isUnsatisfiable(self) -> bool:
+        return self.status == STATUS_UNSATISFIABLE;
+
+    def proof(self) -> List[ProverClause]:
+        '''
+        The clauses the empty clause was derived from, parents before children.
+        '''
+        if self.emptyClause is None:
+            return [];
+        seen: Dict[int, ProverClause] = dict();
+        stack: List[ProverClause] = [ self.emptyClause ];
+        while len(stack) > 0:
+            clause = stack.pop();
+            if clause.id in seen:
+                continue;
+            seen[clause.id] = clause;
+            stack.extend(clause.parents);
+        return [ seen[k] for k in sorted(seen) ];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: Prover
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class Prover(object):
+    '''
+    Given-clause prover for a set of clauses (as returned by normalform.clausalForm).
+    - ageWeightRatio: (a, w) picks a clauses by age, then w by weight, and so on.
+    - selection: restrict inferences to a selected negative literal where there is one.
+    - timeLimit (seconds), memoryLimit (peak resident memory in MB) and maxClauses (number of kept clauses)
+      stop the search with the corresponding status.
+    '''
+    ageWeightRatio: Tuple[int, int];
+    timeLimit:      Union[float, None];
+    memoryLimit:    Union[float, None];
+    maxClauses:     Union[int, None];
+    selection:      bool;
+    input:          List[Clause];
+    clauses:        List[ProverClause];
+    passiveByAge:   Deque[ProverClause];
+    passiveByWeight: List[Tuple[int, int, ProverClause]];
+    positive:       DiscriminationTree;
+    negative:       DiscriminationTree;
+    subsumption:    FeatureVectorIndex;
+    stats:          Dict[str, float];
+    start:          float;
+
+    def __init__(self,
+        clauses: Iterable[Clause],
+        ageWeightRatio: Tuple[int, int] = (1, 5),
+        timeLimit: Union[float, None] = None,
+        memoryLimit: Union[float, None] = None,
+        maxClauses: Union[int, None] = None,
+        selection: bool = True,
+    ):
+        if ageWeightRatio[0] < 0 or ageWeightRatio[1] < 0 or sum(ageWeightRatio) == 0:
+            raise Exception('Invalid age/weight ratio \033[1m{}\033[0m!'.format(ageWeightRatio));
+        self.ageWeightRatio  = ageWeightRatio;
+        self.timeLimit       = timeLimit;
+        self.memoryLimit     = memoryLimit;
+        self.maxClauses      = maxClauses;
+        self.selection       = selection;
+        self.input           = list(clauses);
+        self.clauses         = [];
+        self.passiveByAge    = deque();
+        self.passiveByWeight = [];
+        self.positive        = DiscriminationTree();
+        self.negative        = DiscriminationTree();
+        # symbols by number of occurrences, which get the first features:
+        symbols = Counter([ t.label for clause in self.input for _, atom in clause for t in preOrder(atom) if t.kind != 'variable' ]);
+        self.subsumption     = FeatureVectorIndex([ label for label, _ in symbols.most_common() ]);
+        self.start           = time.perf_counter();
+        self.stats = dict(
+            input            = len(self.input),
+            given            = 0,
+            generated        = 0,
+            kept             = 0,
+            tautologies      = 0,
+            forwardSubsumed  = 0,
+            backwardSubsumed = 0,
+        );
+        return;
+
+    def run(self) -> ProofResult:
+        self.start = time.perf_counter();
+        status = None;
+        empty = None;
+        for literals in self.input:
+            empty = self.add(literals, 'input', ());
+            if empty is not None:
+                status = STATUS_UNSATISFIABLE;
+                break;
+        picks = 0;
+        while status is None:
+            status = self.exhausted();
+            if status is not None:
+                break;
+            given = self.select(picks);
+            picks += 1;
+            if given is None:
+                status = STATUS_SATISFIABLE;
+                break;
+            self.stats['given'] += 1;
+            self.activate(given);
+            for k, (literals, rule, parents) in enumerate(self.infer(given)):
+                self.stats['generated'] += 1;
+                empty = self.add(literals, rule, parents);
+                if empty is not None:
+                    status = STATUS_UNSATISFIABLE;
+                    break;
+                if k % CHECK_INTERVAL == CHECK_INTERVAL - 1:
+                    status = self.exhausted();
+                    if status is not None:
+                        break;
+        return ProofResult(status, empty, self.statistics());
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # clause management
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def add(self, literals: Iterable[Literal], rule: str, parents: Tuple[ProverClause, ...]) -> Union[ProverClause, None]:
+        '''
+        Simplifies and keeps a new clause unless it is redundant. Returns it if it is the empty clause.
+        '''
+        normalised = normaliseClause(literals);
+        if normalised is None:
+            self.stats['tautologies'] += 1;
+            return None;
+        literals, variables = normalised;
+        for _ in self.subsumption.subsuming(literals):
+            self.stats['forwardSubsumed'] += 1;
+            return None;
+        clause = ProverClause(len(self.clauses), literals, variables, rule, parents);
+        if self.selection:
+            clause.eligible = selectLiterals(literals);
+        self.clauses.append(clause);
+        self.stats['kept'] += 1;
+        if len(literals) == 0:
+            return clause;
+        for other, _ in list(self.subsumption.subsumed(literals)):
+            self.stats['backwardSubsumed'] += 1;
+            self.discard(other);
+        self.subsumption.insert(literals, clause);
+        self.passiveByAge.append(clause);
+        heapq.heappush(self.passiveByWeight, (clause.weight, clause.id, clause));
+        return None;
+
+    def discard(self, clause: ProverClause):
+        self.subsumption.remove(clause.literals, clause);
+        if clause.state == 'active':
+            for j in clause.eligible:
+                sign, atom = clause.literals[j];
+                (self.positive if sign else self.negative).remove(atom, (clause, j));
+        # passive clauses are dropped lazily from the queues:
+        clause.state = 'dead';
+        return;
+
+    def select(self, picks: int) -> Union[ProverClause, None]:
+        byAge = picks % sum(self.ageWeightRatio) < self.ageWeightRatio[0];
+        for queue in ([ 'age', 'weight' ] if byAge else [ 'weight', 'age' ]):
+            while True:
+                if queue == 'age':
+                    if len(self.passiveByAge) == 0:
+                        break;
+                    clause = self.passiveByAge.popleft();
+                else:
+                    if len(self.passiveByWeight) == 0:
+                        break;
+                    clause = heapq.heappop(self.passiveByWeight)[2];
+                if clause.state == 'passive':
+                    return clause;
+        return None;
+
+    def activate(self, clause: ProverClause):
+        clause.state = 'active';
+        for j in clause.eligible:
+            sign, atom = clause.literals[j];
+            (self.positive if sign else self.negative).insert(atom, (clause, j));
+        return;
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # inferences
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def infer(self, given: ProverClause) -> Iterator[Tuple[List[Literal], str, Tuple[ProverClause, ...]]]:
+        # binary resolution with all active clauses (the given clause included, renamed apart):
+        renaming = { variable('v', k).label: variable('w', k) for k in range(given.variables) };
+        literals = [ (sign, substitute(atom, renaming)) for sign, atom in given.literals ];
+        for i in given.eligible:
+            sign, atom = literals[i];
+            for _, (other, j), sigma in (self.negative if sign else self.positive).unifiable(atom):
+                if other.state == 'dead':
+                    continue;
+                resolvent = applySubstitution([ literal for k, literal in enumerate(literals) if k != i ], sigma);
+                resolvent += applySubstitution([ literal for k, literal in enumerate(other.literals) if k != j ], sigma);
+                yield resolvent, 'resolution', (given, other);
+        # factoring (of eligible literals):
+        for n, i in enumerate(given.eligible):
+            sign, atom = given.literals[i];
+            for j in given.eligible[n+1:]:
+                if given.literals[j][0] != sign:
+                    continue;
+                sigma = unify(atom, given.literals[j][1]);
+                if sigma is not None:
+                    yield applySubstitution([ literal for k, literal in enumerate(given.literals) if k != j ], sigma), 'factoring', (given,);
+        return;
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # resources and statistics
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def exhausted(self) -> Union[str, None]:
+        if self.timeLimit is not None and time.perf_counter() - self.start > self.timeLimit:
+            return STATUS_TIMEOUT;
+        if self.maxClauses is not None and len(self.subsumption) > self.maxClauses:
+            return STATUS_CLAUSELIMIT;
+        if self.memoryLimit is not None and resource is not None:
+            # ru_maxrss is in kB on Linux (bytes on macOS; the limit is then only reached later):
+            if resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 > self.memoryLimit:
+                return STATUS_MEMORYOUT;
+        return None;
+
+    def statistics(self) -> Dict[str, float]:
+        stats = dict(self.stats);
+        seconds = max(time.perf_counter() - self.start, 1e-9);
+        stats['seconds'] = seconds;
+        stats['active'] = sum([ 1 for clause in self.clauses if clause.state == 'active' ]);
+        stats['generatedPerSecond'] = stats['generated'] / seconds;
+        stats['keptPerSecond'] = stats['kept'] / seconds;
+        stats['subsumedPerSecond'] = (stats['forwardSubsumed'] + stats['backwardSubsumed']) / seconds;
+        return stats;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def prove(
+    axioms: Sequence[Union[Expression, SharedExpression]],
+    conjecture: Union[Expression, SharedExpression, None] = None,
+    **options,
+) -> ProofResult:
+    '''
+    Refutes the axioms together with the negated (universally closed) conjecture.
+    Status 'unsatisfiable' means the conjecture follows (resp. the axioms are inconsistent).
+    Options are those of Prover.
+    '''
+    parts = [ asShared(fml) for fml in axioms ];
+    if conjecture is not None:
+        t = asShared(conjecture);
+        fv = freeVariables(t);
+        for x in sorted([ x for x in variableNodes(t) if x.label in fv ], key=lambda x: x.label, reverse=True):
+            t = connective('all', x, t);
+        parts.append(connective('not', t));
+    if len(parts) == 0:
+        raise Exception('Nothing to prove!');
+    fml = parts[0] if len(parts) == 1 else connective('and', *parts);
+    return Prover(clausalForm(fml), **options).run();
+
+def refute(clauses: Iterable[Clause], **options) -> ProofResult:
+    return Prover(clauses, **options).run();
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def variable(prefix: str, k: int) -> SharedExpression:
+    key = (prefix, k);
+    x = _variables.get(key);
+    if x is None:
+        x = _variables[key] = SharedExpression.fromExpression(Variable(prefix, str(k), False, False)).withOuterBraces(True);
+    return x;
+
+def applySubstitution(literals: List[Literal], sigma: Substitution) -> List[Literal]:
+    if len(sigma) == 0:
+        return literals;
+    return [ (sign, substitute(atom, sigma)) for sign, atom in literals ];
+
+def normaliseClause(literals: Iterable[Literal]) -> Union[Tuple[Clause, int], None]:
+    '''
+    Drops duplicate and false literals and renames variables canonically.
+    Returns (clause, number of variables), or None for a tautology.
+    '''
+    seen: Dict[Literal, None] = dict();
+    for sign, atom in literals:
+        atom = atom.withOuterBraces(True);
+        if atom.kind in ['tautology', 'contradiction']:
+            if sign == (atom.kind == 'tautology'):
+                return None;
+            continue;
+        if (not sign, atom) in seen:
+            return None;
+        seen[(sign, atom)] = None;
+    renaming: Dict[str, SharedExpression] = dict();
+    for _, atom in seen:
+        stack: List[SharedExpression] = [ atom ];
+        while len(stack) > 0:
+            t = stack.pop();
+            if t.kind == 'variable':
+                if not t.label in renaming:
+                    renaming[t.label] = variable('v', len(renaming));
+                continue;
+            stack.extend(reversed(t.parts));
+    if all([ x.label == label for label, x in renaming.items() ]):
+        return tuple(seen), len(renaming);
+    clause = tuple(dict.fromkeys([ (sign, substitute(atom, renaming)) for sign, atom in seen ]));
+    return clause, len(renaming);
+
+def selectLiterals(clause: Clause) -> Tuple[int, ...]:
+    # the heaviest negative literal, else all (positive) literals:
+    negative = [ j for j, (sign, _) in enumerate(clause) if not sign ];
+    if len(negative) == 0:
+        return tuple(range(len(clause)));
+    return (max(negative, key=lambda j: clause[j][1].size),);
+
+def clauseToStr(clause: Clause) -> str:
+    if len(clause) == 0:
+        return '\\bot';
+    return ' || '.join([ str(atom) if sign else '!' + str(atom) for sign, atom in clause ]);
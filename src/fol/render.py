@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+import re;
+from typing import Any;
+from typing import Callable;
+from typing import Dict;
+from typing import IO;
+from typing import List;
+from typing import Set;
+from typing import Tuple;
+from typing import Union;
+
+from src.fol.classes import Expression;
+from src.fol.classes import glueFrame;
+from src.fol.shared import SharedExpression;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: A backend renders a node without parts as one string (leaf) and any other node as a frame
+# (opening, separator, closing), which is emitted around and between the renderings of its parts.
+# The renderer pushes frames and parts onto one stack and emits the strings in order into a buffer,
+# which is handed to a write function whenever it holds FLUSH_TOKENS strings: no intermediate strings
+# of subformulas are built, and output to a stream never holds more than one buffer in memory.
+# Statements (one formula of a file) are framed by the backend as well, e.g. fof(name, axiom, ...). for TPTP;
+# free variables are universally closed in TPTP and SMT-LIB, where they are not allowed.
+FLUSH_TOKENS: int = 1 << 14;
+QUANTIFIER_KINDS: List[str] = [ 'all', 'exists' ];
+SIGNATURE_KINDS: List[str] = [ 'constant', 'functionexpression', 'relationexpression', 'atom' ];
+
+Formula = Union[Expression, SharedExpression];
+Frame = Tuple[str, str, str];
+
+RE_BRACES: re.Pattern = re.compile(r'[{}]');
+RE_NONWORD: re.Pattern = re.compile(r'[^A-Za-z0-9_]');
+RE_TPTP_LOWER_WORD: re.Pattern = re.compile(r'[a-z][A-Za-z0-9_]*');
+RE_SMTLIB_SYMBOL: re.Pattern = re.compile(r'[A-Za-z~!$%^&*_+=<>?/\-][0-9A-Za-z~!@$%^&*_+=<>.?/\-]*');
+SMTLIB_RESERVED: Set[str] = set([
+    'and', 'or', 'not', 'xor', '=>', '=', 'distinct', 'ite', 'true', 'false', 'forall', 'exists',
+    'let', 'match', 'par', 'as', '_', '!', 'NUMERAL', 'DECIMAL', 'STRING', 'BINARY', 'HEXADECIMAL',
+]);
+SMTLIB_SORT: str = 'U';
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: Backend
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class Backend(object):
+    '''
+    Output syntax. Subclasses implement leaf and frame, and may frame statements
+    (prologue, statement, epilogue) for writing whole files.
+    A backend may keep state (e.g. declared symbols), so every writer uses a new instance.
+    '''
+    name: str = '';
+
+    def leaf(self, t: Formula) -> str:
+        raise NotImplementedError;
+
+    def frame(self, t: Formula) -> Frame:
+        raise NotImplementedError;
+
+    def prologue(self) -> str:
+        return '';
+
+    def statement(self, fml: Formula, name: str) -> Tuple[str, str]:
+        return '', '\n';
+
+    def epilogue(self) -> str:
+        return '';
+
+    def unsupported(self, t: Formula) -> Exception:
+        return Exception('Nodes of kind \033[1m{}\033[0m cannot be rendered in the format \033[1m{}\033[0m!'.format(t.kind, self.name));
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: GlueBackend (symbol, display)
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class GlueBackend(Backend):
+    '''
+    The syntax of the expression itself: ‘symbol‘ is parseable, ‘display‘ is LaTeX.
+    '''
+    attribute: str;
+
+    def __init__(self, attribute: str = 'symbol'):
+        self.name = attribute;
+        self.attribute = attribute;
+        return;
+
+    def leaf(self, t: Formula) -> str:
+        return getattr(t, self.attribute);
+
+    def frame(self, t: Formula) -> Frame:
+        option = t.glueOuterOption if t.outerBrackets else t.glueOption;
+        return glueFrame(option, getattr(t, self.attribute), len(t.parts));
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: TptpBackend
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TptpBackend(Backend):
+    '''
+    TPTP first-order form (fof). Binary connectives are always bracketed.
+    Variables become upper words (braces dropped, other characters replaced by _),
+    other symbols lower words or, where that is not possible, single-quoted atoms.
+    Distinct symbols that would get the same name (e.g. x and X) are told apart by a suffix _2, _3, ...
+    '''
+    names:     Dict[Tuple[bool, str], str];
+    variables: Set[str];
+    atoms:     Set[str];
+
+    def __init__(self):
+        self.name = 'tptp';
+        self.names = dict();
+        self.variables = set();
+        self.atoms = set();
+        return;
+
+    def symbolName(self, symbol: str, variable: bool = False) -> str:
+        key = (variable, symbol);
+        name = self.names.get(key);
+        if name is None:
+            core = RE_BRACES.sub('', symbol);
+            if variable:
+                core = RE_NONWORD.sub('_', core);
+                core = core[0].upper() + core[1:] if core[:1].isalpha() else 'V' + core;
+            issued = self.variables if variable else self.atoms;
+            name = core if variable else atomName(core);
+            k = 1;
+            while name in issued:
+                k += 1;
+                name = '{}_{}'.format(core, k) if variable else atomName('{}_{}'.format(core, k));
+            issued.add(name);
+            self.names[key] = name;
+        return name;
+
+    def leaf(self, t: Formula) -> str:
+        kind = t.kind;
+        if kind == 'variable':
+            return self.symbolName(t.symbol, variable=True);
+        elif kind in SIGNATURE_KINDS:
+            return self.symbolName(t.symbol);
+        elif kind == 'tautology':
+            return '$true';
+        elif kind == 'contradiction':
+            return '$false';
+        raise self.unsupported(t);
+
+    def frame(self, t: Formula) -> Frame:
+        kind = t.kind;
+        if kind == 'not':
+            return '~ ', '', '';
+        elif kind == 'and':
+            return '(', ' & ', ')';
+        elif kind == 'or':
+            return '(', ' | ', ')';
+        elif kind == 'implies':
+            return '(', ' => ', ')';
+        elif kind == 'iff':
+            return '(', ' <=> ', ')';
+        elif kind == 'all':
+            return '![', ']: ', '';
+        elif kind == 'exists':
+            return '?[', ']: ', '';
+        elif kind == 'relationexpression' and t.symbol == '=' and len(t.parts) == 2:
+            return '(', ' = ', ')';
+        elif kind in SIGNATURE_KINDS:
+            return self.symbolName(t.symbol) + '(', ',', ')';
+        raise self.unsupported(t);
+
+    def statement(self, fml: Formula, name: str) -> Tuple[str, str]:
+        free, _ = symbolsOf(fml);
+        closure = '![{}]: '.format(','.join([ self.symbolName(x, variable=True) for x in free ])) if len(free) > 0 else '';
+        return 'fof({},axiom,{}'.format(atomName(RE_BRACES.sub('', name)), closure), ').\n';
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: SmtLibBackend
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class SmtLibBackend(Backend):
+    '''
+    SMT-LIB 2 over one uninterpreted sort U. Statements are assertions, preceded by declarations
+    of the symbols not yet declared. Symbols are kept as they are, quoted with |...| where necessary.
+    SMT-LIB has no overloading, so a symbol used again with another kind or arity gets the name symbol/arity.
+    Variables and functions share one namespace, so no name is issued twice
+    (e.g. of a variable f and a function f, the one named second becomes f_2).
+    '''
+    names:     Dict[Tuple[bool, str], str];
+    issued:    Set[str];
+    declared:  Dict[str, Tuple[str, int]];
+    overloads: Dict[Tuple[str, str, int], str];
+
+    def __init__(self):
+        self.name = 'smtlib';
+        self.names = dict();
+        self.issued = set();
+        self.declared = dict();
+        self.overloads = dict();
+        return;
+
+    def symbolName(self, symbol: str, variable: bool = False) -> str:
+        key = (variable, symbol);
+        name = self.names.get(key);
+        if name is None:
+            # |abc| and abc are the same symbol, so names are compared without the quotes:
+            core = symbol if RE_SMTLIB_SYMBOL.fullmatch(symbol) else symbol.replace('|', '_').replace('\\', '_');
+            plain = core;
+            k = 1;
+            while plain in self.issued:
+                k += 1;
+                plain = '{}_{}'.format(core, k);
+            self.issued.add(plain);
+            if RE_SMTLIB_SYMBOL.fullmatch(plain) and not plain in SMTLIB_RESERVED:
+                name = plain;
+            else:
+                name = '|' + plain + '|';
+            self.names[key] = name;
+        return name;
+
+    def signatureName(self, kind: str, symbol: str, arity: int) -> str:
+        name = self.overloads.get((kind, symbol, arity));
+        return self.symbolName(symbol) if name is None else name;
+
+    def leaf(self, t: Formula) -> str:
+        kind = t.kind;
+        if kind == 'variable':
+            return self.symbolName(t.symbol, variable=True);
+        elif kind in SIGNATURE_KINDS:
+            return self.signatureName(kind, t.symbol, 0);
+        elif kind == 'tautology':
+            return 'true';
+        elif kind == 'contradiction':
+            return 'false';
+        raise self.unsupported(t);
+
+    def frame(self, t: Formula) -> Frame:
+        kind = t.kind;
+        if kind == 'not':
+            return '(not ', '', ')';
+        elif kind == 'and':
+            return '(and ', ' ', ')';
+        elif kind == 'or':
+            return '(or ', ' ', ')';
+        elif kind == 'implies':
+            return '(=> ', ' ', ')';
+        elif kind == 'iff':
+            return '(= ', ' ', ')';
+        elif kind in QUANTIFIER_KINDS:
+            return '(' + ('forall' if kind == 'all' else 'exists') + ' ((', ' ' + SMTLIB_SORT + ')) ', ')';
+        elif kind == 'relationexpression' and t.symbol == '=' and len(t.parts) == 2:
+            return '(= ', ' ', ')';
+        elif kind in SIGNATURE_KINDS:
+            return '(' + self.signatureName(kind, t.symbol, len(t.parts)) + ' ', ' ', ')';
+        raise self.unsupported(t);
+
+    def prologue(self) -> str:
+        return '(declare-sort {} 0)\n'.format(SMTLIB_SORT);
+
+    def statement(self, fml: Formula, name: str) -> Tuple[str, str]:
+        free, symbols = symbolsOf(fml);
+        lines: List[str] = [];
+        for kind, symbol, arity in symbols:
+            if kind == 'relationexpression' and symbol == '=' and arity == 2:
+                continue;
+            f = self.signatureName(kind, symbol, arity);
+            declared = self.declared.get(f);
+            if declared == (kind, arity):
+                continue;
+            k = 0;
+            while declared is not None:
+                k += 1;
+                f = self.symbolName('{}/{}'.format(symbol, arity) + ('' if k == 1 else '/{}'.format(k)));
+                declared = self.declared.get(f);
+            if k > 0:
+                self.overloads[(kind, symbol, arity)] = f;
+            self.declared[f] = (kind, arity);
+            result = SMTLIB_SORT if kind in [ 'constant', 'functionexpression' ] else 'Bool';
+            lines.append('(declare-fun {} ({}) {})\n'.format(f, ' '.join([ SMTLIB_SORT ] * arity), result));
+        opening = '(assert ';
+        closing = ')\n';
+        if len(free) > 0:
+            opening += '(forall ({}) '.format(' '.join([ '({} {})'.format(self.symbolName(x, variable=True), SMTLIB_SORT) for x in free ]));
+            closing = ')' + closing;
+        return ''.join(lines) + opening, closing;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL VARIABLES: backends
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+BACKENDS: Dict[str, Callable[[], Backend]] = {
+    'symbol':  lambda: GlueBackend('symbol'),
+    'display': lambda: GlueBackend('display'),
+    'tptp':    TptpBackend,
+    'smtlib':  SmtLibBackend,
+};
+
+def registerBackend(name: str, factory: Callable[[], Backend]):
+    BACKENDS[name] = factory;
+    return;
+
+def getBackend(backend: Union[str, Backend]) -> Backend:
+    if isinstance(backend, Backend):
+        return backend;
+    factory = BACKENDS.get(backend);
+    if factory is None:
+        raise Exception('Unknown output format \033[1m{}\033[0m!'.format(backend));
+    return factory();
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: FormulaWriter
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class FormulaWriter(object):
+    '''
+    Writes formulas as statements of the backend to a text stream, one at a time.
+    The stream is not closed by the writer.
+    '''
+    fp:      IO[str];
+    backend: Backend;
+    count:   int;
+
+    def __init__(self, fp: IO[str], backend: Union[str, Backend] = 'symbol'):
+        self.fp      = fp;
+        self.backend = getBackend(backend);
+        self.count   = 0;
+        self.fp.write(self.backend.prologue());
+        return;
+
+    def __enter__(self) -> FormulaWriter:
+        return self;
+
+    def __exit__(self, *_):
+        self.close();
+        return;
+
+    def write(self, fml: Formula, name: Union[str, None] = None):
+        self.count += 1;
+        opening, closing = self.backend.statement(fml, name if name is not None else 'f{}'.format(self.count));
+        self.fp.write(opening);
+        emit(fml, self.backend, self.fp.write);
+        self.fp.write(closing);
+        return;
+
+    def close(self):
+        self.fp.write(self.backend.epilogue());
+        return;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def renderString(fml: Formula, backend: Union[str, Backend] = 'symbol') -> str:
+    chunks: List[str] = [];
+    emit(fml, getBackend(backend), chunks.append);
+    return ''.join(chunks);
+
+def renderTo(fml: Formula, fp: IO[str], backend: Union[str, Backend] = 'symbol'):
+    emit(fml, getBackend(backend), fp.write);
+    return;
+
+def emit(fml: Formula, backend: Backend, write: Callable[[str], Any], flush: int = FLUSH_TOKENS):
+    tokens: List[str] = [];
+    stack: List[Union[Formula, str]] = [ fml ];
+    while len(stack) > 0:
+        t = stack.pop();
+        if isinstance(t, str):
+            tokens.append(t);
+        elif len(t.parts) == 0:
+            tokens.append(backend.leaf(t));
+        else:
+            parts = t.parts;
+            opening, separator, closing = backend.frame(t);
+            stack.append(closing);
+            for k in range(len(parts)-1, 0, -1):
+                stack.append(parts[k]);
+                stack.append(separator);
+            stack.append(parts[0]);
+            tokens.append(opening);
+        if len(tokens) >= flush:
+            write(''.join(tokens));
+            tokens.clear();
+    if len(tokens) > 0:
+        write(''.join(tokens));
+    return;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def atomName(core: str) -> str:
+    # a TPTP lower word, or else a single-quoted atom:
+    if RE_TPTP_LOWER_WORD.fullmatch(core):
+        return core;
+    return '\'' + core.replace('\\', '\\\\').replace('\'', '\\\'') + '\'';
+
+def symbolsOf(fml: Formula) -> Tuple[List[str], List[Tuple[str, str, int]]]:
+    # symbols of the free variables and (kind, symbol, arity) of the signature, in order of first occurrence.
+    # Variables are bound by label, as everywhere else; the symbols are what the backends render.
+    free: Dict[str, None] = dict();
+    signature: Dict[Tuple[str, str, int], None] = dict();
+    binders: Dict[str, int] = dict();
+    # entries are nodes, or the label of a binder to be closed (str):
+    stack: List[Union[Formula, str]] = [ fml ];
+    while len(stack) > 0:
+        t = stack.pop();
+        if isinstance(t, str):
+            binders[t] -= 1;
+            continue;
+        kind = t.kind;
+        if kind == 'variable':
+            if binders.get(t.label, 0) == 0:
+                free[t.symbol] = None;
+            continue;
+        parts = t.parts;
+        if kind in QUANTIFIER_KINDS and len(parts) == 2:
+            x = parts[0].label;
+            binders[x] = binders.get(x, 0) + 1;
+            stack.append(x);
+            stack.append(parts[1]);
+            continue;
+        if kind in SIGNATURE_KINDS:
+            signature[(kind, t.symbol, len(parts))] = None;
+        stack.extend(reversed(parts));
+    return list(free), list(signature);
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+from collections import ChainMap;
+from typing import Dict;
+from typing import FrozenSet;
+from typing import Iterable;
+from typing import List;
+from typing import Set;
+from typing import Tuple;
+from typing import Union;
+
+from src.core.traversal import foldDag;
+from src.fol.classes import Expression;
+from src.fol.construction import Variable;
+from src.fol.normalform import RE_BASENAME;
+from src.fol.normalform import asShared;
+from src.fol.normalform import withParts;
+from src.fol.shared import SharedExpression;
+from src.fol.shared import cacheFreeVariables;
+from src.fol.unification import Substitution;
+from src.fol.unification import Symbol;
+from src.fol.unification import asTerm;
+from src.fol.unification import braced;
+from src.fol.unification import extendMatch;
+from src.fol.unification import symbolOf;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: Rewriting works on hash-consed SharedExpressions. A rule lhs -> rhs applies to a subterm (or subformula)
+# which is an instance lhs.sigma of its left-hand side, where the variables of the rule stand for terms,
+# and replaces it by rhs.sigma (substituted without capture). Rules are looked up by the symbol at the root
+# and matched in order, so the first applicable rule wins; matching only descends as deep as the left-hand side,
+# whereas a discrimination tree would flatten the (possibly exponentially large) unfolded subterm.
+# A rule read from a string as an atom f(...) -> ... with a term (or variable) on the right-hand side
+# also applies to the term f(...), see asTerm, as the parser reads f(...) as a term only in argument position.
+# Strategies: innermost (arguments first) and outermost (root first) compute normal forms,
+# fixpoint repeats parallel bottom-up passes (at most one step per node and pass) until nothing changes.
+# Normal forms are memoised per node in the rewrite system, so every distinct subterm is rewritten once,
+# also across calls. Rewriting stops after maxSteps rule applications (resp. maxPasses passes);
+# results of a call that hit a limit are returned but not memoised.
+STRATEGIES: List[str] = [ 'innermost', 'outermost', 'fixpoint' ];
+QUANTIFIER_KINDS: List[str] = [ 'all', 'exists' ];
+TERM_KINDS: List[str] = [ 'variable', 'constant', 'functionexpression', 'relationexpression' ];
+MAX_STEPS: int = 100000;
+MAX_PASSES: int = 1000;
+
+Formula = Union[Expression, SharedExpression];
+Environment = FrozenSet[Tuple[str, SharedExpression]];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: RewriteRule
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class RewriteRule(object):
+    __slots__ = ('lhs', 'rhs', 'name');
+    lhs:  SharedExpression;
+    rhs:  SharedExpression;
+    name: str;
+
+    def __init__(self, lhs: Formula, rhs: Formula, name: str = ''):
+        self.lhs  = braced(lhs);
+        self.rhs  = braced(rhs);
+        self.name = name;
+        if self.lhs.kind == 'variable':
+            raise Exception('The left-hand side of a rewrite rule must not be a variable!');
+        extra = self.rhs.freeVariables - self.lhs.freeVariables;
+        if len(extra) > 0:
+            raise Exception('The variables \033[1m{}\033[0m of the right-hand side do not occur on the left-hand side!'.format(', '.join(sorted(extra))));
+        return;
+
+    def __repr__(self) -> str:
+        return '<RewriteRule {}{} -> {}>'.format(self.name + ': ' if self.name else '', str(self.lhs), str(self.rhs));
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: RewriteSystem
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class RewriteSystem(object):
+    '''
+    Ordered list of rewrite rules with memoised normal forms.
+    Rules may be given as RewriteRule or as pairs (lhs, rhs).
+    '''
+    rules:     List[RewriteRule];
+    heads:     Dict[Symbol, List[RewriteRule]];
+    memo:      Dict[str, Dict[SharedExpression, SharedExpression]];
+    maxSteps:  int;
+    maxPasses: int;
+    steps:     int;
+    limited:   bool;
+    stats:     Dict[str, int];
+
+    def __init__(self,
+        rules: Iterable[Union[RewriteRule, Tuple[Formula, Formula]]],
+        maxSteps: int = MAX_STEPS,
+        maxPasses: int = MAX_PASSES,
+    ):
+        self.rules = [ rule if isinstance(rule, RewriteRule) else RewriteRule(*rule) for rule in rules ];
+        self.heads = dict();
+        for rule in self.rules:
+            self.heads.setdefault(symbolOf(rule.lhs), []).append(rule);
+            if rule.lhs.kind == 'relationexpression' and rule.rhs.kind in TERM_KINDS:
+                term = RewriteRule(asTerm(rule.lhs), asTerm(rule.rhs), rule.name);
+                self.heads.setdefault(symbolOf(term.lhs), []).append(term);
+        self.memo      = { strategy: dict() for strategy in STRATEGIES + [ 'pass' ] };
+        self.maxSteps  = maxSteps;
+        self.maxPasses = maxPasses;
+        self.steps     = 0;
+        self.limited   = False;
+        self.stats     = dict(steps=0, passes=0, limitReached=False);
+        return;
+
+    def rewrite(self, fml: Formula, strategy: str = 'innermost') -> Formula:
+        '''
+        Rewrites the formula by the strategy; returns an Expression for an Expression, else a SharedExpression.
+        '''
+        if not strategy in STRATEGIES:
+            raise Exception('Unknown rewriting strategy \033[1m{}\033[0m!'.format(strategy));
+        t = asShared(fml);
+        self.steps   = 0;
+        self.limited = False;
+        self.stats   = dict(steps=0, passes=0, limitReached=False);
+        if strategy == 'fixpoint':
+            result = self.fixpoint(braced(t));
+        else:
+            result = self.normalise(braced(t), strategy);
+        self.stats['steps'] = self.steps;
+        self.stats['limitReached'] = self.limited;
+        result = result.withOuterBraces(t.outerBrackets);
+        return result.toExpression() if isinstance(fml, Expression) else result;
+
+    def step(self, t: SharedExpression) -> Union[SharedExpression, None]:
+        '''
+        Result of applying the first applicable rule at the root of the (braced) node, or None.
+        '''
+        rules = self.heads.get(symbolOf(t)) if t.kind != 'variable' else None;
+        if rules is None:
+            return None;
+        if self.steps >= self.maxSteps:
+            self.limited = True;
+            return None;
+        for rule in rules:
+            sigma = extendMatch(rule.lhs, t);
+            if sigma is not None:
+                self.steps += 1;
+                return replaceFree(rule.rhs, sigma);
+        return None;
+
+    def normalise(self, root: SharedExpression, strategy: str) -> SharedExpression:
+        # frames (node, stage, redex): stage 0 visits a node, stage 1 rebuilds it from the normal forms of its parts,
+        # stage 2 takes over the normal form of the node it was rewritten to.
+        # results are collected separately and kept only if no limit was hit.
+        local: Dict[SharedExpression, SharedExpression] = dict();
+        values = ChainMap(local, self.memo[strategy]);
+        innermost = (strategy == 'innermost');
+        stack: List[Tuple[SharedExpression, int, Union[SharedExpression, None]]] = [ (root, 0, None) ];
+        while len(stack) > 0:
+            t, stage, r = stack.pop();
+            if stage == 0:
+                if t in values:
+                    continue;
+                if not innermost:
+                    r = self.step(t);
+                    if r is not None:
+                        stack.append((t, 2, r));
+                        stack.append((r, 0, None));
+                        continue;
+                stack.append((t, 1, None));
+                stack.extend([ (part, 0, None) for part in reversed(t.parts) if not part in values ]);
+            elif stage == 1:
+                u = withParts(t, [ values[part] for part in t.parts ]);
+                if innermost:
+                    r = self.step(u);
+                    if r is None:
+                        values[t] = values[u] = u;
+                        continue;
+                elif u is t:
+                    values[t] = t;
+                    continue;
+                else:
+                    # the root may have become a redex:
+                    r = u;
+                stack.append((t, 2, r));
+                stack.append((r, 0, None));
+            else:
+                values[t] = values[r];
+        if not self.limited:
+            self.memo[strategy].update(local);
+        return values[root];
+
+    def fixpoint(self, root: SharedExpression) -> SharedExpression:
+        values = self.memo['fixpoint'];
+        t = root;
+        visited: List[SharedExpression] = [];
+        while not t in values:
+            if self.stats['passes'] >= self.maxPasses:
+                self.limited = True;
+                break;
+            visited.append(t);
+            u = self.rewritePass(t);
+            self.stats['passes'] += 1;
+            if u is t:
+                if not self.limited:
+                    values[t] = t;
+                break;
+            t = u;
+        t = values.get(t, t);
+        if not self.limited:
+            for s in visited:
+                values[s] = t;
+        return t;
+
+    def rewritePass(self, root: SharedExpression) -> SharedExpression:
+        # one parallel bottom-up pass; as in normalise, results are kept only if no limit was hit.
+        local: Dict[SharedExpression, SharedExpression] = dict();
+        def combine(t: SharedExpression, parts: List[SharedExpression]) -> SharedExpression:
+            u = withParts(t, parts);
+            r = self.step(u);
+            return u if r is None else r;
+        result = foldDag(root, combine, memo=ChainMap(local, self.memo['pass']));
+        if not self.limited:
+            self.memo['pass'].update(local);
+        return result;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def rewrite(
+    fml: Formula,
+    rules: Union[RewriteSystem, Iterable[Union[RewriteRule, Tuple[Formula, Formula]]]],
+    strategy: str = 'innermost',
+    **options,
+) -> Formula:
+    '''
+    Rewrites the formula by the rules. Pass a RewriteSystem to reuse its memoised normal forms between calls.
+    Options are those of RewriteSystem.
+    '''
+    system = rules if isinstance(rules, RewriteSystem) else RewriteSystem(rules, **options);
+    return system.rewrite(fml, strategy);
+
+def substituteFree(fml: Formula, substitution: Dict[str, Formula]) -> Formula:
+    '''
+    Replaces the free occurrences of variables (by label) by terms. Bound variables which would capture
+    a variable of a substituted term are renamed. Returns an Expression for an Expression, else a SharedExpression.
+    '''
+    t = asShared(fml);
+    sigma = { x: braced(s) for x, s in substitution.items() };
+    result = replaceFree(t, sigma).withOuterBraces(t.outerBrackets);
+    return result.toExpression() if isinstance(fml, Expression) else result;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def replaceFree(fml: SharedExpression, sigma: Substitution) -> SharedExpression:
+    # items: (node, substitution restricted to the free variables of node);
+    # subformulas without substituted variables are returned as they are, without descending into them.
+    binders: Dict[Tuple[SharedExpression, Environment], Tuple[SharedExpression, Environment]] = dict();
+    cacheFreeVariables(fml);
+
+    def item(t: SharedExpression, env: Iterable[Tuple[str, SharedExpression]]) -> Tuple[SharedExpression, Environment]:
+        fv = t.freeVariables;
+        return (t, frozenset([ (x, s) for x, s in env if x in fv ]));
+
+    def binder(it: Tuple[SharedExpression, Environment]) -> Tuple[SharedExpression, Environment]:
+        # the bound variable is not free in the node, hence not substituted; it is renamed if it would capture.
+        result = binders.get(it);
+        if result is None:
+            t, env = it;
+            x, body = t.parts;
+            if any([ x.label in s.freeVariables for _, s in env ]):
+                avoid = set(body.freeVariables).union(*[ s.freeVariables for _, s in env ]);
+                y = freshVariable(x, avoid);
+                result = (y, env | frozenset([ (x.label, y) ]));
+            else:
+                result = (x, env);
+            binders[it] = result;
+        return result;
+
+    def children(it: Tuple[SharedExpression, Environment]) -> List[Tuple[SharedExpression, Environment]]:
+        t, env = it;
+        if len(env) == 0:
+            return [];
+        if t.kind in QUANTIFIER_KINDS and len(t.parts) == 2:
+            return [ item(t.parts[1], binder(it)[1]) ];
+        return [ item(part, env) for part in t.parts ];
+
+    def combine(it: Tuple[SharedExpression, Environment], parts: List[SharedExpression]) -> SharedExpression:
+        t, env = it;
+        if len(env) == 0:
+            return t;
+        if t.kind == 'variable':
+            return dict(env).get(t.label, t);
+        if t.kind in QUANTIFIER_KINDS and len(t.parts) == 2:
+            return withParts(t, [ binder(it)[0], parts[0] ]);
+        return withParts(t, parts);
+
+    return foldDag(item(fml, sigma.items()), combine, children=children);
+
+def freshVariable(x: SharedExpression, avoid: Set[str]) -> SharedExpression:
+    m = RE_BASENAME.match(x.label);
+    base = m.group(0) if m is not None else 'x';
+    k = 0;
+    while True:
+        k += 1;
+        y = SharedExpression.fromExpression(Variable(base, str(k), False, False)).withOuterBraces(True);
+        if not y.label in avoid:
+            return y;
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+import asyncio;
+import json;
+import os;
+import re;
+import socket;
+from collections import deque;
+from concurrent.futures import Executor;
+from concurrent.futures import ProcessPoolExecutor;
+from concurrent.futures import ThreadPoolExecutor;
+from concurrent.futures.process import BrokenProcessPool;
+from timeit import default_timer as timer;
+from typing import Any;
+from typing import Callable;
+from typing import Deque;
+from typing import Dict;
+from typing import List;
+from typing import Tuple;
+from typing import Union;
+
+from src.fol.classes import Expression;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: The protocol is one JSON object per line in both directions (over a Unix socket or localhost TCP).
+# A request {"id": ..., "op": ..., ...} is answered by {"id": ..., "ok": true, "result": ...} resp.
+# {"id": ..., "ok": false, "error": "..."}; responses on one connection may arrive out of order.
+#   parse      formula[, fastpath]  -> list of formulae (symbol form)
+#   render     formula[, format]    -> string in the format symbol, display, tptp or smtlib
+#   normalize  formula, form        -> formula (symbol form) in the form nnf, prenex, skolem, miniscope or cnf
+#   check      formula[, fastpath]  -> {"wellFormed": bool, "count": int} resp. {"wellFormed": false, "message": str}
+#   metrics                         -> counters, latency percentiles (ms) and throughput (requests/s)
+# Requests are queued and the batcher hands them to the worker pool in batches: when a worker is free,
+# it waits BATCH_DELAY for more requests and takes up to BATCH_SIZE of them. Backpressure: at most one batch
+# per worker is in flight and at most MAX_PENDING requests are queued; beyond that, connections are not read from.
+# Error messages are sent without the terminal formatting (\033[...m) of the exceptions raised in src.
+# If a worker process dies, its batch fails and the pool is replaced.
+HOST: str = '127.0.0.1';
+PORT: int = 8765;
+BATCH_SIZE: int = 64;
+BATCH_DELAY: float = 0.002;
+MAX_PENDING: int = 1024;
+MAX_LINE: int = 1 << 24;
+LATENCY_WINDOW: int = 10000;
+RE_FORMATTING: re.Pattern = re.compile(r'\033\[[0-9;]*m');
+
+OPERATIONS: List[str] = [ 'parse', 'render', 'normalize', 'check', 'metrics' ];
+FORMATS: List[str] = [ 'symbol', 'display', 'tptp', 'smtlib' ];
+FORMS: List[str] = [ 'nnf', 'prenex', 'skolem', 'miniscope', 'cnf' ];
+
+Pending = Tuple[dict, asyncio.Future, float];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# WORKER METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def initWorker():
+    # load the grammar once per worker (from the on-disk cache if possible):
+    from src.fol.parser import getLexer;
+    getLexer();
+    return;
+
+def runBatch(requests: List[dict]) -> List[dict]:
+    return [ runRequest(request) for request in requests ];
+
+def runRequest(request: dict) -> dict:
+    try:
+        return dict(ok=True, result=evaluateRequest(request));
+    except Exception as e:
+        return dict(ok=False, error=plainMessage(e));
+
+def evaluateRequest(request: dict) -> Any:
+    from src.fol.parser import parseFolExpr;
+    from src.fol.parser import parseFolExprs;
+    op = request.get('op');
+    u = request.get('formula');
+    if not isinstance(u, str):
+        raise Exception('Operation \033[1m{}\033[0m requires a formula (string)!'.format(op));
+    fastpath = bool(request.get('fastpath', True));
+    if op == 'parse':
+        return [ str(fml) for fml in parseFolExprs(u, fastpath=fastpath) ];
+    elif op == 'check':
+        try:
+            fmls = parseFolExprs(u, fastpath=fastpath);
+        except Exception as e:
+            return dict(wellFormed=False, message=plainMessage(e));
+        return dict(wellFormed=True, count=len(fmls));
+    elif op == 'render':
+        from src.fol.render import renderString;
+        backend = request.get('format', 'symbol');
+        if not backend in FORMATS:
+            raise Exception('Unknown format \033[1m{}\033[0m!'.format(backend));
+        return renderString(parseFolExpr(u, fastpath=fastpath), backend);
+    elif op == 'normalize':
+        return str(normalise(parseFolExpr(u, fastpath=fastpath), request.get('form')));
+    raise Exception('Unknown operation \033[1m{}\033[0m!'.format(op));
+
+def normalise(fml: Expression, form: Any) -> Expression:
+    from src.fol.normalform import toCNF;
+    from src.fol.normalform import toMiniscope;
+    from src.fol.normalform import toNNF;
+    from src.fol.normalform import toPrenex;
+    from src.fol.normalform import toSkolem;
+    methods: Dict[str, Callable[[Expression], Expression]] = dict(nnf=toNNF, prenex=toPrenex, skolem=toSkolem, miniscope=toMiniscope, cnf=toCNF);
+    if not form in methods:
+        raise Exception('Unknown normal form \033[1m{}\033[0m (one of {})!'.format(form, ', '.join(FORMS)));
+    return methods[form](fml);
+
+def plainMessage(e: Exception) -> str:
+    return RE_FORMATTING.sub('', str(e));
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: ServiceMetrics
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class ServiceMetrics(object):
+    started:   float;
+    requests:  int;
+    errors:    int;
+    batches:   int;
+    latencies: Deque[float];
+    finished:  Deque[float];
+
+    def __init__(self):
+        self.started   = timer();
+        self.requests  = 0;
+        self.errors    = 0;
+        self.batches   = 0;
+        self.latencies = deque(maxlen=LATENCY_WINDOW);
+        self.finished  = deque(maxlen=LATENCY_WINDOW);
+        return;
+
+    def record(self, latency: float, ok: bool):
+        self.requests += 1;
+        self.errors += 0 if ok else 1;
+        self.latencies.append(latency);
+        self.finished.append(timer());
+        return;
+
+    def snapshot(self, pending: int = 0, connections: int = 0) -> Dict[str, Any]:
+        now = timer();
+        uptime = now - self.started;
+        latencies = sorted(self.latencies);
+        def percentile(q: float) -> Union[float, None]:
+            if len(latencies) == 0:
+                return None;
+            return 1e3*latencies[min(len(latencies) - 1, int(q*len(latencies)))];
+        # throughput over the window of recent requests (at most the last LATENCY_WINDOW):
+        window = now - self.finished[0] if len(self.finished) > 0 else 0.;
+        return dict(
+            uptime        = uptime,
+            requests      = self.requests,
+            errors        = self.errors,
+            batches       = self.batches,
+            meanBatchSize = self.requests/self.batches if self.batches > 0 else None,
+            pending       = pending,
+            connections   = connections,
+            latencyMs     = dict(p50=percentile(0.5), p95=percentile(0.95), p99=percentile(0.99), max=percentile(1.)),
+            throughput    = self.requests/uptime if uptime > 0 else None,
+            recentThroughput = len(self.finished)/window if window > 0 else None,
+        );
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: FolService
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class FolService(object):
+    '''
+    Long-running server for the operations listed above, see serveFol.
+    With processes=0, batches run in a single thread of the server process (e.g. for tests).
+    '''
+    processes:   int;
+    batchSize:   int;
+    batchDelay:  float;
+    maxPending:  int;
+    metrics:     ServiceMetrics;
+    executor:    Union[Executor, None];
+    server:      Union[asyncio.AbstractServer, None];
+    queue:       asyncio.Queue;
+    slots:       asyncio.Semaphore;
+    batcher:     Union[asyncio.Task, None];
+    tasks:       set;
+    connections: int;
+    path:        Union[str, None];
+
+    def __init__(self,
+        processes:  Union[int, None] = None,
+        batchSize:  int = BATCH_SIZE,
+        batchDelay: float = BATCH_DELAY,
+        maxPending: int = MAX_PENDING,
+    ):
+        self.processes   = (os.cpu_count() or 1) if processes is None else processes;
+        self.batchSize   = max(1, batchSize);
+        self.batchDelay  = batchDelay;
+        self.maxPending  = max(1, maxPending);
+        self.metrics     = ServiceMetrics();
+        self.executor    = None;
+        self.server      = None;
+        self.batcher     = None;
+        self.tasks       = set();
+        self.connections = 0;
+        self.path        = None;
+        return;
+
+    async def start(self, path: Union[str, None] = None, host: str = HOST, port: int = PORT):
+        '''
+        Listens on the Unix socket `path` if given, otherwise on host:port (port 0 for any free port).
+        '''
+        loop = asyncio.get_running_loop();
+        self.executor = self.newExecutor();
+        # start the workers (and compile the grammar) before accepting requests:
+        await loop.run_in_executor(self.executor, runBatch, []);
+        self.queue   = asyncio.Queue(maxsize=self.maxPending);
+        self.slots   = asyncio.Semaphore(max(1, self.processes));
+        self.batcher = asyncio.create_task(self.runBatcher());
+        if path is not None:
+            if os.path.exists(path):
+                os.unlink(path);
+            self.server = await asyncio.start_unix_server(self.handleConnection, path=path, limit=MAX_LINE);
+            self.path = path;
+        else:
+            self.server = await asyncio.start_server(self.handleConnection, host=host, port=port, limit=MAX_LINE);
+        return;
+
+    def newExecutor(self) -> Executor:
+        if self.processes > 0:
+            return ProcessPoolExecutor(max_workers=self.processes, initializer=initWorker);
+        return ThreadPoolExecutor(max_workers=1, initializer=initWorker);
+
+    @property
+    def address(self) -> Union[str, Tuple[str, int]]:
+        if self.path is not None:
+            return self.path;
+        return self.server.sockets[0].getsockname()[:2];
+
+    async def serveForever(self):
+        await self.server.serve_forever();
+        return;
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close();
+            await self.server.wait_closed();
+        if self.batcher is not None:
+            self.batcher.cancel();
+        for task in list(self.tasks):
+            task.cancel();
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True);
+        if self.path is not None and os.path.exists(self.path):
+            os.unlink(self.path);
+        return;
+
+    async def handleConnection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1;
+        lock = asyncio.Lock();
+        replies = set();
+        try:
+            while True:
+                try:
+                    line = await reader.readline();
+                except ValueError:
+                    await self.send(writer, lock, dict(id=None, ok=False, error='Request exceeds {} bytes!'.format(MAX_LINE)));
+                    break;
+                if len(line) == 0:
+                    break;
+                if len(line.strip()) == 0:
+                    continue;
+                t0 = timer();
+                try:
+                    request = json.loads(line);
+                    if not isinstance(request, dict):
+                        raise ValueError('Request must be a JSON object!');
+                except ValueError as e:
+                    await self.send(writer, lock, dict(id=None, ok=False, error='Invalid request: {}'.format(e)));
+                    continue;
+                if request.get('op') == 'metrics':
+                    result = self.metrics.snapshot(pending=self.queue.qsize(), connections=self.connections);
+                    await self.send(writer, lock, dict(id=request.get('id'), ok=True, result=result));
+                    continue;
+                future = asyncio.get_running_loop().create_future();
+                # blocks while the queue is full, so that this connection is no longer read from:
+                await self.queue.put((request, future, t0));
+                reply = asyncio.create_task(self.reply(writer, lock, request.get('id'), future));
+                replies.add(reply);
+                self.tasks.add(reply);
+                reply.add_done_callback(replies.discard);
+                reply.add_done_callback(self.tasks.discard);
+            if len(replies) > 0:
+                await asyncio.gather(*replies, return_exceptions=True);
+        except (ConnectionError, asyncio.CancelledError):
+            pass;
+        finally:
+            self.connections -= 1;
+            writer.close();
+        return;
+
+    async def reply(self, writer: asyncio.StreamWriter, lock: asyncio.Lock, id: Any, future: asyncio.Future):
+        response = await future;
+        await self.send(writer, lock, dict(id=id, **response));
+        return;
+
+    async def send(self, writer: asyncio.StreamWriter, lock: asyncio.Lock, response: dict):
+        async with lock:
+            writer.write(json.dumps(response).encode('utf-8') + b'\n');
+            await writer.drain();
+        return;
+
+    async def runBatcher(self):
+        while True:
+            # take a worker slot first, so that requests accumulate while all workers are busy:
+            await self.slots.acquire();
+            batch: List[Pending] = [ await self.queue.get() ];
+            if self.batchDelay > 0 and self.queue.qsize() < self.batchSize - 1:
+                await asyncio.sleep(self.batchDelay);
+            while len(batch) < self.batchSize and not self.queue.empty():
+                batch.append(self.queue.get_nowait());
+            task = asyncio.create_task(self.runBatch(batch));
+            self.tasks.add(task);
+            task.add_done_callback(self.tasks.discard);
+
+    async def runBatch(self, batch: List[Pending]):
+        executor = self.executor;
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(executor, runBatch, [ request for request, _, _ in batch ]);
+        except BrokenProcessPool as e:
+            results = [ dict(ok=False, error='Worker failed: {}'.format(plainMessage(e))) ]*len(batch);
+            # all batches in flight fail with the pool, which is replaced once:
+            if executor is self.executor:
+                executor.shutdown(wait=False, cancel_futures=True);
+                self.executor = self.newExecutor();
+        except Exception as e:
+            results = [ dict(ok=False, error='Worker failed: {}'.format(plainMessage(e))) ]*len(batch);
+        finally:
+            self.slots.release();
+        self.metrics.batches += 1;
+        now = timer();
+        for (_, future, t0), result in zip(batch, results):
+            self.metrics.record(now - t0, result['ok']);
+            if not future.done():
+                future.set_result(result);
+        return;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: ServiceClient
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class ServiceClient(object):
+    '''
+    Blocking client, e.g. for tests and scripts:
+        with ServiceClient(path='/tmp/logic.sock') as client:
+            client.request('normalize', formula='!(P(x) && Q(x))', form='nnf');
+    '''
+    sock:    socket.socket;
+    fp:      Any;
+    counter: int;
+    buffer:  Dict[Any, dict];
+
+    def __init__(self, path: Union[str, None] = None, host: str = HOST, port: int = PORT, timeout: Union[float, None] = None):
+        if path is not None:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM);
+            self.sock.settimeout(timeout);
+            self.sock.connect(path);
+        else:
+            self.sock = socket.create_connection((host, port), timeout=timeout);
+        self.fp      = self.sock.makefile('rb');
+        self.counter = 0;
+        self.buffer  = dict();
+        return;
+
+    def __enter__(self) -> ServiceClient:
+        return self;
+
+    def __exit__(self, *_):
+        self.close();
+        return False;
+
+    def close(self):
+        self.fp.close();
+        self.sock.close();
+        return;
+
+    def request(self, op: str, **fields: Any) -> dict:
+        '''
+        Sends one request and returns the response (with ok and result resp. error).
+        '''
+        return self.requestMany([ dict(op=op, **fields) ])[0];
+
+    def requestMany(self, requests: List[dict]) -> List[dict]:
+        '''
+        Sends all requests at once (so that the server can batch them) and returns the responses in order.
+        '''
+        ids = [];
+        lines = [];
+        for request in requests:
+            self.counter += 1;
+            ids.append(self.counter);
+            lines.append(json.dumps(dict(request, id=self.counter)).encode('utf-8') + b'\n');
+        self.sock.sendall(b''.join(lines));
+        responses = [];
+        for id in ids:
+            while not id in self.buffer:
+                line = self.fp.readline();
+                if len(line) == 0:
+                    raise ConnectionError('Connection closed by the server!');
+                response = json.loads(line);
+                self.buffer[response.get('id')] = response;
+            responses.append(self.buffer.pop(id));
+        return responses;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def serveFol(
+    path: Union[str, None] = None,
+    host: str = HOST,
+    port: int = PORT,
+    ready: Union[Callable[[FolService], Any], None] = None,
+    **options: Any,
+):
+    '''
+    Runs a FolService until interrupted; options are those of FolService.
+    '''
+    async def run():
+        service = FolService(**options);
+        await service.start(path=path, host=host, port=port);
+        if ready is not None:
+            ready(service);
+        try:
+            await service.serveForever();
+        finally:
+            await service.close();
+    try:
+        asyncio.run(run());
+    except KeyboardInterrupt:
+        pass;
+    return;
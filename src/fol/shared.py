@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+import threading;
+from typing import Any;
+from typing import FrozenSet;
+from typing import Iterable;
+from typing import List;
+from typing import Tuple;
+from typing import Union;
+from weakref import WeakValueDictionary;
+
+from src.fol.classes import Expression;
+from src.fol.classes import getDescriptor;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL VARIABLES
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# unique table: structural key -> node. Entries vanish with the last reference to a node.
+UNIQUE_TABLE: WeakValueDictionary = WeakValueDictionary();
+# guards the miss-and-insert path of the unique table, so that concurrent threads agree on one node per key:
+UNIQUE_LOCK: threading.Lock = threading.Lock();
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: Derived attributes (size, depth, free variables, signature) are cached on the shared nodes only:
+# these are immutable, so the cache never needs invalidating, and every shared subformula is computed once,
+# also across formulas. Expressions are mutable (parts, labels and descriptors are assigned directly),
+# so they compute these attributes afresh.
+# Size and depth are two integers and computed for every node below the one asked about.
+# Free variables and signature are sets, which would grow quadratically in total along chains of nodes,
+# so they are computed (by one pass over the distinct nodes) and stored for the node asked about only,
+# or directly from the parts where those already know theirs. Algorithms which need the free variables
+# of every subformula call cacheFreeVariables first.
+# The size counts the nodes of the tree (repeated subformulas count repeatedly); the depth of leaves is 0.
+# A symbol of the signature is (kind, label, arity) as in fol/unification.py.
+SIGNATURE_KINDS: List[str] = [ 'constant', 'functionexpression', 'relationexpression', 'atom' ];
+QUANTIFIER_KINDS: List[str] = [ 'all', 'exists' ];
+
+Symbol = Tuple[str, str, int];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: SharedExpression
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class SharedExpression(object):
+    '''
+    Immutable, hash-consed counterpart of Expression.
+    Structurally identical (sub)expressions are represented by one and the same node,
+    so that equality is an identity check and the hash is computed once on construction.
+    Unlike Expression.__eq__, all attributes (symbols, brackets, glue options) take part in the identity.
+    '''
+    __slots__ = (
+        'kind', 'parts', 'label', 'symbol', 'display',
+        'isLabelled', 'outerBrackets', 'glueOption', 'glueOuterOption',
+        '_hash', '_size', '_depth', '_free', '_signature', '__weakref__',
+    );
+
+    kind:            str;
+    parts:           Tuple[SharedExpression, ...];
+    label:           str;
+    symbol:          str;
+    display:         str;
+    isLabelled:      bool;
+    outerBrackets:   bool;
+    glueOption:      str;
+    glueOuterOption: str;
+
+    def __new__(cls,
+        kind: str,
+        *parts: SharedExpression,
+        label: str = '',
+        symbol: str = '',
+        display: str = '',
+        isLabelled: bool = False,
+        outerBrackets: bool = False,
+        glueOption: str = 'polish',
+        glueOuterOption: str = 'polish',
+    ) -> SharedExpression:
+        key = (kind, label, symbol, display, isLabelled, outerBrackets, glueOption, glueOuterOption, parts);
+        t = UNIQUE_TABLE.get(key);
+        if t is not None:
+            return t;
+        t = object.__new__(cls);
+        setter = object.__setattr__;
+        setter(t, 'kind',            kind);
+        setter(t, 'parts',           parts);
+        setter(t, 'label',           label);
+        setter(t, 'symbol',          symbol);
+        setter(t, 'display',         display);
+        setter(t, 'isLabelled',      isLabelled);
+        setter(t, 'outerBrackets',   outerBrackets);
+        setter(t, 'glueOption',      glueOption);
+        setter(t, 'glueOuterOption', glueOuterOption);
+        setter(t, '_hash',           hash(key));
+        setter(t, '_size',           -1);
+        setter(t, '_depth',          -1);
+        setter(t, '_free',           None);
+        setter(t, '_signature',      None);
+        with UNIQUE_LOCK:
+            # another thread may have inserted the key since the lookup above:
+            existing = UNIQUE_TABLE.get(key);
+            if existing is not None:
+                return existing;
+            UNIQUE_TABLE[key] = t;
+        return t;
+
+    def __setattr__(self, key: str, value: Any):
+        raise AttributeError('SharedExpression is immutable!');
+
+    def __delattr__(self, key: str):
+        raise AttributeError('SharedExpression is immutable!');
+
+    def __copy__(self) -> SharedExpression:
+        return self;
+
+    def __deepcopy__(self, *_) -> SharedExpression:
+        return self;
+
+    def __reduce__(self):
+        return (SharedExpression.fromExpression, (self.toExpression(),));
+
+    def __eq__(self, o) -> bool:
+        return self is o;
+
+    def __ne__(self, o) -> bool:
+        return not (self is o);
+
+    def __hash__(self) -> int:
+        return self._hash;
+
+    def __str__(self) -> str:
+        from src.fol.render import renderString;
+        return renderString(self, 'symbol');
+
+    def __repr__(self) -> str:
+        return '<SharedExpression {} {}>'.format(self.kind, str(self));
+
+    @property
+    def valence(self) -> int:
+        return len(self.parts);
+
+    @property
+    def expr(self) -> str:
+        from src.fol.render import renderString;
+        return renderString(self, 'display');
+
+    @property
+    def size(self) -> int:
+        if self._size < 0:
+            computeShape(self);
+        return self._size;
+
+    @property
+    def depth(self) -> int:
+        if self._depth < 0:
+            computeShape(self);
+        return self._depth;
+
+    @property
+    def freeVariables(self) -> FrozenSet[str]:
+        free = self._free;
+        if free is None:
+            free = computeFreeVariables(self);
+        return free;
+
+    @property
+    def signature(self) -> FrozenSet[Symbol]:
+        signature = self._signature;
+        if signature is None:
+            signature = computeSignature(self);
+        return signature;
+
+    def withOuterBraces(self, show: bool = True) -> SharedExpression:
+        '''
+        Immutable analogue of Expression.showOuterBraces.
+        '''
+        if self.outerBrackets == show:
+            return self;
+        return SharedExpression(
+            self.kind, *self.parts,
+            label           = self.label,
+            symbol          = self.symbol,
+            display         = self.display,
+            isLabelled      = self.isLabelled,
+            outerBrackets   = show,
+            glueOption      = self.glueOption,
+            glueOuterOption = self.glueOuterOption,
+        );
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # conversion
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    @staticmethod
+    def fromExpression(fml: Expression) -> SharedExpression:
+        # post-order with an explicit stack; children are interned before their parents.
+        done: List[SharedExpression] = [];
+        stack: List[Tuple[Expression, bool]] = [ (fml, False) ];
+        while len(stack) > 0:
+            t, expanded = stack.pop();
+            if not expanded:
+                stack.append((t, True));
+                stack.extend([ (part, False) for part in reversed(t.parts) ]);
+                continue;
+            n = len(t.parts);
+            parts = tuple(done[len(done)-n:]) if n > 0 else ();
+            if n > 0:
+                del done[len(done)-n:];
+            done.append(SharedExpression(
+                t.kind, *parts,
+                label           = t.label,
+                symbol          = t.symbol,
+                display         = t.display,
+                isLabelled      = t.isLabelled,
+                outerBrackets   = t.outerBrackets,
+                glueOption      = t.glueOption,
+                glueOuterOption = t.glueOuterOption,
+            ));
+        return done[0];
+
+    def toExpression(self) -> Expression:
+        # NOTE: every occurrence of a shared node becomes a node of its own,
+        # since Expression trees are mutable and must not alias subtrees.
+        done: List[Expression] = [];
+        stack: List[Tuple[SharedExpression, bool]] = [ (self, False) ];
+        while len(stack) > 0:
+            t, expanded = stack.pop();
+            if not expanded:
+                stack.append((t, True));
+                stack.extend([ (part, False) for part in reversed(t.parts) ]);
+                continue;
+            n = len(t.parts);
+            # build without the constructor, which would copy the subtrees once more:
+            e = Expression(t.kind);
+            e.parts           = tuple(done[len(done)-n:]) if n > 0 else ();
+            e.label           = t.label;
+            e.outerBrackets   = t.outerBrackets;
+            e.desc            = getDescriptor(t.kind, t.symbol, t.display, t.isLabelled, t.glueOption, t.glueOuterOption);
+            if n > 0:
+                del done[len(done)-n:];
+            done.append(e);
+        return done[0];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def toShared(*fmls: Expression) -> List[SharedExpression]:
+    return [ SharedExpression.fromExpression(fml) for fml in fmls ];
+
+def fromShared(*fmls: SharedExpression) -> List[Expression]:
+    return [ fml.toExpression() for fml in fmls ];
+
+def sharedTableSize() -> int:
+    return len(UNIQUE_TABLE);
+
+def signatureOf(fmls: Iterable[Union[Expression, SharedExpression]]) -> FrozenSet[Symbol]:
+    '''
+    Signature of a collection of formulas. Subformulas shared between the formulas are visited once.
+    '''
+    symbols: set = set();
+    for fml in fmls:
+        if isinstance(fml, Expression):
+            fml = SharedExpression.fromExpression(fml);
+        symbols.update(fml.signature);
+    return frozenset(symbols);
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def cacheFreeVariables(fml: SharedExpression) -> FrozenSet[str]:
+    '''
+    Computes and stores the free variables of every node below fml (bottom-up, reusing a part's set where possible),
+    for algorithms which look them up at every subformula.
+    '''
+    setter = object.__setattr__;
+    stack: List[Tuple[SharedExpression, bool]] = [ (fml, False) ];
+    while len(stack) > 0:
+        t, expanded = stack.pop();
+        if t._free is not None:
+            continue;
+        if not expanded:
+            stack.append((t, True));
+            stack.extend([ (part, False) for part in t.parts if part._free is None ]);
+            continue;
+        setter(t, '_free', freeVariablesFromParts(t));
+    return fml._free;
+
+def computeShape(fml: SharedExpression):
+    # post-order over the nodes without size; size and depth are stored on every node visited.
+    setter = object.__setattr__;
+    stack: List[Tuple[SharedExpression, bool]] = [ (fml, False) ];
+    while len(stack) > 0:
+        t, expanded = stack.pop();
+        if t._size >= 0:
+            continue;
+        if not expanded:
+            stack.append((t, True));
+            stack.extend([ (part, False) for part in t.parts if part._size < 0 ]);
+            continue;
+        parts = t.parts;
+        setter(t, '_size', 1 + sum([ part._size for part in parts ]));
+        setter(t, '_depth', 1 + max([ part._depth for part in parts ]) if len(parts) > 0 else 0);
+    return;
+
+def computeFreeVariables(fml: SharedExpression) -> FrozenSet[str]:
+    setter = object.__setattr__;
+    if all([ part._free is not None for part in fml.parts ]):
+        free = freeVariablesFromParts(fml);
+        setter(fml, '_free', free);
+        return free;
+    # one pass over the distinct pairs (node, labels bound above it); known sets of nodes below are reused.
+    found: set = set();
+    seen: set = set();
+    stack: List[Tuple[SharedExpression, FrozenSet[str]]] = [ (fml, frozenset()) ];
+    while len(stack) > 0:
+        item = stack.pop();
+        if item in seen:
+            continue;
+        seen.add(item);
+        t, bound = item;
+        if t._free is not None:
+            found.update(t._free if len(bound) == 0 else t._free - bound);
+        elif t.kind == 'variable':
+            if not t.label in bound:
+                found.add(t.label);
+        elif t.kind in QUANTIFIER_KINDS and len(t.parts) == 2:
+            x = t.parts[0].label;
+            stack.append((t.parts[1], bound if x in bound else bound | frozenset([ x ])));
+        else:
+            stack.extend([ (part, bound) for part in t.parts ]);
+    free = frozenset(found);
+    setter(fml, '_free', free);
+    return free;
+
+def computeSignature(fml: SharedExpression) -> FrozenSet[Symbol]:
+    setter = object.__setattr__;
+    # one pass over the distinct nodes; known signatures of nodes below are reused.
+    found: set = set();
+    seen: set = set();
+    stack: List[SharedExpression] = [ fml ];
+    while len(stack) > 0:
+        t = stack.pop();
+        if t in seen:
+            continue;
+        seen.add(t);
+        if t._signature is not None:
+            found.update(t._signature);
+            continue;
+        if t.kind in SIGNATURE_KINDS:
+            found.add((t.kind, t.label, len(t.parts)));
+        stack.extend(t.parts);
+    signature = frozenset(found);
+    setter(fml, '_signature', signature);
+    return signature;
+
+def freeVariablesFromParts(t: SharedExpression) -> FrozenSet[str]:
+    # free variables of a node whose parts know theirs
+    parts = t.parts;
+    if t.kind == 'variable':
+        return frozenset([ t.label ]);
+    elif len(parts) == 0:
+        return frozenset();
+    elif t.kind in QUANTIFIER_KINDS and len(parts) == 2:
+        body = parts[1]._free;
+        return body - frozenset([ parts[0].label ]) if parts[0].label in body else body;
+    return unionOf([ part._free for part in parts ]);
+
+def unionOf(sets: List[FrozenSet[Any]]) -> FrozenSet[Any]:
+    # reuses a part's set where possible, so that chains of nodes share one set
+    largest = max(sets, key=len, default=frozenset());
+    if all([ s <= largest for s in sets ]):
+        return largest;
+    return frozenset().union(*sets);
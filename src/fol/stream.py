@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+import sys;
+from typing import IO;
+from typing import Iterator;
+from typing import List;
+from typing import Union;
+
+from src.fol.classes import Expression;
+from src.fol.parser import parseFolExpr;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: Records are split at newlines and commas outside brackets, braces and quotes. As in cache.normaliseFormula,
+# the contents of braces are a label, where only braces count and quotes do not open (e.g. {it's}).
+# A record may continue over at most MAX_RECORD_LINES lines within brackets. A record that is still unbalanced
+# after that (or at the end of input) is reported for its first line, and the following lines are read again,
+# so that an unbalanced bracket costs one line of input rather than the rest of the stream.
+CHUNK_SIZE: int = 1 << 16;
+MAX_RECORD_SIZE: int = 1 << 24;
+MAX_RECORD_LINES: int = 1 << 10;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: FolRecord, FolRecordError
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class FolRecord(object):
+    '''
+    One formula of an input stream together with its position.
+    line and column are 1-based and point to the first character of the record,
+    offset is the 0-based character offset within the stream.
+    '''
+    text:   str;
+    line:   int;
+    column: int;
+    offset: int;
+
+    def __init__(self, text: str, line: int, column: int, offset: int):
+        self.text   = text;
+        self.line   = line;
+        self.column = column;
+        self.offset = offset;
+        return;
+
+class FolRecordError(FolRecord):
+    message: str;
+
+    def __init__(self, record: FolRecord, message: str):
+        super(FolRecordError, self).__init__(record.text, record.line, record.column, record.offset);
+        self.message = message;
+        return;
+
+    def __str__(self) -> str:
+        return 'line {}, column {} (offset {}): {}'.format(self.line, self.column, self.offset, self.message);
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS: streaming
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def openFolStream(path: str) -> IO[str]:
+    if path == '-':
+        return sys.stdin;
+    return open(path, 'r');
+
+def readFolRecords(
+    fp: IO[str],
+    chunksize: int = CHUNK_SIZE,
+    maxLines: int = MAX_RECORD_LINES,
+) -> Iterator[Union[FolRecord, FolRecordError]]:
+    '''
+    Lazily splits a stream into formulae separated by newlines or commas.
+    Separators inside brackets or quotes do not count, so that e.g. ‘P(x,y)‘
+    and formulae broken over several lines within brackets stay intact.
+    Blank records are skipped; leading/trailing whitespace is stripped.
+    A record left unbalanced over several lines is reported for its first line only
+    and reading resumes at the next line, so that no other line is lost.
+    '''
+    buffer: List[str] = [];
+    size = 0;
+    lines = 0;
+    depth = 0;
+    braces = 0;
+    quote = '';
+    line, column, offset = 1, 1, 0;
+    start = (1, 1, 0);
+    overflow = False;
+    rescan = '';
+    while True:
+        if rescan != '':
+            chunk, rescan = rescan, '';
+        else:
+            chunk = fp.read(chunksize);
+        message = None;
+        if chunk == '':
+            if overflow or ''.join(buffer).strip() == '' or (depth == 0 and braces == 0 and quote == ''):
+                break;
+            message = 'Unbalanced brackets or quotes at end of input!';
+        for k, char in enumerate(chunk):
+            if quote != '':
+                if char == quote:
+                    quote = '';
+            elif char == '{':
+                braces += 1;
+            elif char == '}':
+                braces = max(braces - 1, 0);
+            elif braces > 0:
+                pass;
+            elif char == '(':
+                depth += 1;
+            elif char == ')':
+                depth = max(depth - 1, 0);
+            elif char in '\'"':
+                quote = char;
+            closed = (depth == 0 and braces == 0 and quote == '');
+            if char == '\n' and not closed:
+                lines += 1;
+            if closed and char in ',\n':
+                record = ''.join(buffer);
+                if overflow:
+                    yield FolRecordError(FolRecord('', *start), 'Record exceeds {} characters!'.format(MAX_RECORD_SIZE));
+                elif not record.strip() == '':
+                    yield makeFolRecord(record, *start);
+                buffer, size, lines, overflow = [], 0, 0, False;
+            elif lines > maxLines:
+                if overflow:
+                    # the record cannot be read again, so start afresh with the next line:
+                    yield FolRecordError(FolRecord('', *start), 'Record exceeds {} characters!'.format(MAX_RECORD_SIZE));
+                    buffer, size, lines, overflow = [], 0, 0, False;
+                    depth, braces, quote = 0, 0, '';
+                else:
+                    message = 'Unbalanced brackets or quotes (record exceeds {} lines)!'.format(maxLines);
+                    buffer.append(chunk[k:]);
+                    break;
+            else:
+                if size < MAX_RECORD_SIZE:
+                    buffer.append(char);
+                    size += 1;
+                else:
+                    overflow = True;
+            # advance position:
+            offset += 1;
+            if char == '\n':
+                line, column = line + 1, 1;
+            else:
+                column += 1;
+            if size == 0 and not overflow:
+                start = (line, column, offset);
+        if message is None:
+            continue;
+        # resynchronise: report the first line of the record and read the lines after it again:
+        record = ''.join(buffer);
+        head, newline, tail = record.partition('\n');
+        yield FolRecordError(makeFolRecord(head, *start), message);
+        buffer, size, lines, overflow = [], 0, 0, False;
+        depth, braces, quote = 0, 0, '';
+        if newline == '':
+            break;
+        line, column, offset = start[0] + 1, 1, start[2] + len(head) + 1;
+        start = (line, column, offset);
+        rescan = tail;
+    record = ''.join(buffer);
+    if overflow:
+        yield FolRecordError(FolRecord('', *start), 'Record exceeds {} characters!'.format(MAX_RECORD_SIZE));
+    elif not record.strip() == '':
+        yield makeFolRecord(record, *start);
+    return;
+
+def parseFolStream(
+    fp: IO[str],
+    fastpath: bool = True,
+    chunksize: int = CHUNK_SIZE,
+    maxLines: int = MAX_RECORD_LINES,
+) -> Iterator[Union[Expression, FolRecordError]]:
+    '''
+    Lazily parses a stream of formulae, yielding either an Expression
+    or a FolRecordError (with position) for every record.
+    '''
+    for record in readFolRecords(fp, chunksize=chunksize, maxLines=maxLines):
+        if isinstance(record, FolRecordError):
+            yield record;
+            continue;
+        try:
+            yield parseFolExpr(record.text, fastpath=fastpath);
+        except Exception as e:
+            yield FolRecordError(record, str(e));
+    return;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def makeFolRecord(text: str, line: int, column: int, offset: int) -> FolRecord:
+    # move the position past stripped leading whitespace:
+    n = len(text) - len(text.lstrip());
+    for char in text[:n]:
+        offset += 1;
+        if char == '\n':
+            line, column = line + 1, 1;
+        else:
+            column += 1;
+    return FolRecord(text.strip(), line, column, offset);
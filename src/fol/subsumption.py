@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+from typing import Any;
+from typing import Dict;
+from typing import Iterable;
+from typing import Iterator;
+from typing import List;
+from typing import Sequence;
+from typing import Tuple;
+
+from src.fol.normalform import Clause;
+from src.fol.shared import SharedExpression;
+from src.fol.unification import Substitution;
+from src.fol.unification import extendMatch;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: C subsumes D if C.sigma is a sub-multiset of D for some substitution sigma.
+# Feature vector indexing (Schulz) stores clauses under integer features that can only grow under instantiation
+# and under adding literals: numbers of positive/negative literals, per sign the number of symbols,
+# and per sign the number of occurrences of each predicate and function symbol. If C subsumes D then
+# features(C) <= features(D) componentwise, so candidates are found by walking a trie of feature values,
+# pruning every branch that violates the bound.
+# Every feature adds a level to the trie, so only the first symbols given get their own features (MAX_FEATURES in all).
+MAX_FEATURES: int = 32;
+Feature = Tuple[bool, str];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: FeatureVectorIndex
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class FeatureVectorIndex(object):
+    '''
+    Trie over feature vectors of clauses. Values (e.g. clause objects) are stored with their clause.
+    The symbols with features are fixed on creation; others only count towards the totals.
+    '''
+    features: Dict[Feature, int];
+    root:     Dict[int, Any];
+    count:    int;
+
+    def __init__(self, symbols: Iterable[str]):
+        self.features = dict();
+        for label in symbols:
+            if len(self.features) >= MAX_FEATURES:
+                break;
+            for sign in [ True, False ]:
+                self.features[(sign, label)] = len(self.features) + 4;
+        self.root  = dict();
+        self.count = 0;
+        return;
+
+    def __len__(self) -> int:
+        return self.count;
+
+    def vector(self, clause: Clause) -> Tuple[int, ...]:
+        values = [ 0 ] * (len(self.features) + 4);
+        for sign, atom in clause:
+            values[0 if sign else 1] += 1;
+            stack: List[SharedExpression] = [ atom ];
+            while len(stack) > 0:
+                t = stack.pop();
+                if t.kind == 'variable':
+                    continue;
+                values[2 if sign else 3] += 1;
+                i = self.features.get((sign, t.label));
+                if i is not None:
+                    values[i] += 1;
+                stack.extend(t.parts);
+        return tuple(values);
+
+    def insert(self, clause: Clause, value: Any):
+        node = self.root;
+        for x in self.vector(clause):
+            node = node.setdefault(x, dict());
+        node[value] = clause;
+        self.count += 1;
+        return;
+
+    def remove(self, clause: Clause, value: Any) -> bool:
+        path: List[Tuple[Dict[int, Any], int]] = [];
+        node = self.root;
+        for x in self.vector(clause):
+            child = node.get(x);
+            if child is None:
+                return False;
+            path.append((node, x));
+            node = child;
+        if not value in node:
+            return False;
+        del node[value];
+        self.count -= 1;
+        for parent, x in reversed(path):
+            if len(parent[x]) > 0:
+                break;
+            del parent[x];
+        return True;
+
+    def subsuming(self, clause: Clause) -> Iterator[Tuple[Any, Clause]]:
+        '''
+        Stored clauses that subsume the given clause (forward subsumption).
+        '''
+        for value, other in self.candidates(self.vector(clause), below=True):
+            if subsumes(other, clause):
+                yield value, other;
+        return;
+
+    def subsumed(self, clause: Clause) -> Iterator[Tuple[Any, Clause]]:
+        '''
+        Stored clauses subsumed by the given clause (backward subsumption).
+        '''
+        for value, other in self.candidates(self.vector(clause), below=False):
+            if subsumes(clause, other):
+                yield value, other;
+        return;
+
+    def candidates(self, vector: Sequence[int], below: bool) -> List[Tuple[Any, Clause]]:
+        # stored clauses whose feature vector is componentwise <= (below) or >= the given one
+        result: List[Tuple[Any, Clause]] = [];
+        depth = len(vector);
+        stack: List[Tuple[Dict[int, Any], int]] = [ (self.root, 0) ];
+        while len(stack) > 0:
+            node, i = stack.pop();
+            if i == depth:
+                result.extend(node.items());
+                continue;
+            bound = vector[i];
+            for x, child in node.items():
+                if x <= bound if below else x >= bound:
+                    stack.append((child, i + 1));
+        return result;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def subsumes(C: Clause, D: Clause) -> bool:
+    '''
+    Multiset subsumption by backtracking: each literal of C is matched (with one common substitution)
+    onto a distinct literal of D of the same sign and predicate.
+    '''
+    if len(C) > len(D):
+        return False;
+    options: List[Tuple[SharedExpression, List[int]]] = [];
+    for sign, atom in C:
+        js = [ j for j, (s, a) in enumerate(D) if s == sign and a.label == atom.label ];
+        if len(js) == 0:
+            return False;
+        options.append((atom, js));
+    # literals with the fewest options first:
+    options.sort(key=lambda option: len(option[1]));
+    stack: List[Tuple[int, int, Substitution, Tuple[int, ...]]] = [ (0, 0, dict(), ()) ];
+    while len(stack) > 0:
+        k, n, sigma, used = stack.pop();
+        if k == len(options):
+            return True;
+        atom, js = options[k];
+        if n >= len(js):
+            continue;
+        # alternative: the next option for the same literal of C
+        stack.append((k, n + 1, sigma, used));
+        j = js[n];
+        if j in used:
+            continue;
+        extended = extendMatch(atom, D[j][1], sigma);
+        if extended is not None:
+            stack.append((k + 1, 0, extended, used + (j,)));
+    return False;
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+from typing import Any;
+from typing import Callable;
+from typing import Dict;
+from typing import Iterator;
+from typing import List;
+from typing import Tuple;
+from typing import Union;
+
+from src.fol.classes import Expression;
+from src.fol.shared import SharedExpression;
+from src.fol.unification import Substitution;
+from src.fol.unification import Symbol;
+from src.fol.unification import asTerm;
+from src.fol.unification import match;
+from src.fol.unification import symbolOf;
+from src.fol.unification import unify;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: A (perfect) discrimination tree stores terms by the preorder sequence of their symbols,
+# with all variables replaced by the wildcard STAR. Terms with a common prefix share a path.
+# A retrieval walks the tree along the query, following wildcards where the kind of retrieval allows
+# and skipping whole subterms (of the query, or of the stored terms) opposite a wildcard.
+# Repeated variables are ignored by the walk, so candidates are confirmed by match/unify.
+# Stored terms and queries are read with asTerm: the parser reads f(...) at the top as an atom,
+# and both readings have to meet on the same path. Atoms are hence stored (and returned) as terms.
+STAR: Symbol = ('variable', '*', 0);
+
+Entry = Tuple[SharedExpression, Any, Substitution];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: DiscriminationNode
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class DiscriminationNode(object):
+    __slots__ = ('children', 'entries');
+    children: Dict[Symbol, DiscriminationNode];
+    entries:  Dict[SharedExpression, List[Any]];
+
+    def __init__(self):
+        self.children = dict();
+        self.entries  = dict();
+        return;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: DiscriminationTree
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class DiscriminationTree(object):
+    '''
+    Index of terms (or atoms) with attached values.
+    For unifiable terms, query and stored terms are expected not to share variables.
+    '''
+    root:  DiscriminationNode;
+    count: int;
+
+    def __init__(self):
+        self.root  = DiscriminationNode();
+        self.count = 0;
+        return;
+
+    def __len__(self) -> int:
+        return self.count;
+
+    def __iter__(self) -> Iterator[Tuple[SharedExpression, Any]]:
+        stack: List[DiscriminationNode] = [ self.root ];
+        while len(stack) > 0:
+            node = stack.pop();
+            for t, values in node.entries.items():
+                for value in values:
+                    yield t, value;
+            stack.extend(node.children.values());
+        return;
+
+    def insert(self, t: Union[Expression, SharedExpression], value: Any = None):
+        t = asTerm(t);
+        node = self.root;
+        for key in flatKeys(t):
+            child = node.children.get(key);
+            if child is None:
+                child = node.children[key] = DiscriminationNode();
+            node = child;
+        node.entries.setdefault(t, []).append(value);
+        self.count += 1;
+        return;
+
+    def remove(self, t: Union[Expression, SharedExpression], value: Any = None) -> bool:
+        '''
+        Removes one occurrence of (t, value); prunes paths that become empty.
+        '''
+        t = asTerm(t);
+        path: List[Tuple[DiscriminationNode, Symbol]] = [];
+        node = self.root;
+        for key in flatKeys(t):
+            child = node.children.get(key);
+            if child is None:
+                return False;
+            path.append((node, key));
+            node = child;
+        values = node.entries.get(t);
+        if values is None or not value in values:
+            return False;
+        values.remove(value);
+        if len(values) == 0:
+            del node.entries[t];
+        self.count -= 1;
+        for parent, key in reversed(path):
+            child = parent.children[key];
+            if len(child.entries) > 0 or len(child.children) > 0:
+                break;
+            del parent.children[key];
+        return True;
+
+    def generalizations(self, query: Union[Expression, SharedExpression]) -> List[Entry]:
+        '''
+        Stored terms s with s.sigma = query, as (s, value, sigma).
+        '''
+        query = asTerm(query);
+        return self.confirm(self.candidates(query, storedWildcards=True, queryWildcards=False), lambda s: match(s, query));
+
+    def instances(self, query: Union[Expression, SharedExpression]) -> List[Entry]:
+        '''
+        Stored terms s with query.sigma = s, as (s, value, sigma).
+        '''
+        query = asTerm(query);
+        return self.confirm(self.candidates(query, storedWildcards=False, queryWildcards=True), lambda s: match(query, s));
+
+    def unifiable(self, query: Union[Expression, SharedExpression]) -> List[Entry]:
+        '''
+        Stored terms s unifiable with the query, as (s, value, most general unifier).
+        '''
+        query = asTerm(query);
+        return self.confirm(self.candidates(query, storedWildcards=True, queryWildcards=True), lambda s: unify(s, query));
+
+    def candidates(self, query: SharedExpression, storedWildcards: bool, queryWildcards: bool) -> List[DiscriminationNode]:
+        # leaves reached by the query; a state is (node, position in the query, number of stored terms still to skip)
+        keys = flatKeys(query);
+        ends = subtermEnds(keys);
+        leaves: List[DiscriminationNode] = [];
+        stack: List[Tuple[DiscriminationNode, int, int]] = [ (self.root, 0, 0) ];
+        while len(stack) > 0:
+            node, pos, skip = stack.pop();
+            if skip > 0:
+                for key, child in node.children.items():
+                    stack.append((child, pos, skip - 1 + key[2]));
+                continue;
+            if pos == len(keys):
+                leaves.append(node);
+                continue;
+            key = keys[pos];
+            if key == STAR:
+                if queryWildcards:
+                    # the query variable stands for any stored subterm:
+                    for key, child in node.children.items():
+                        stack.append((child, pos + 1, key[2]));
+                else:
+                    child = node.children.get(STAR);
+                    if child is not None:
+                        stack.append((child, pos + 1, 0));
+                continue;
+            child = node.children.get(key);
+            if child is not None:
+                stack.append((child, pos + 1, 0));
+            if storedWildcards:
+                # a stored variable stands for the whole query subterm at this position:
+                child = node.children.get(STAR);
+                if child is not None:
+                    stack.append((child, ends[pos], 0));
+        return leaves;
+
+    def confirm(self, leaves: List[DiscriminationNode], check: Callable[[SharedExpression], Union[Substitution, None]]) -> List[Entry]:
+        result: List[Entry] = [];
+        for node in leaves:
+            for t, values in node.entries.items():
+                sigma = check(t);
+                if sigma is None:
+                    continue;
+                result.extend([ (t, value, sigma) for value in values ]);
+        return result;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def flatKeys(t: SharedExpression) -> List[Symbol]:
+    keys: List[Symbol] = [];
+    stack: List[SharedExpression] = [ t ];
+    while len(stack) > 0:
+        t = stack.pop();
+        keys.append(STAR if t.kind == 'variable' else symbolOf(t));
+        stack.extend(reversed(t.parts));
+    return keys;
+
+def subtermEnds(keys: List[Symbol]) -> List[int]:
+    # ends[i] = position after the subterm starting at position i
+    ends = [ 0 ] * len(keys);
+    for i in range(len(keys) - 1, -1, -1):
+        j = i + 1;
+        for _ in range(keys[i][2]):
+            j = ends[j];
+        ends[i] = j;
+    return ends;
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+from typing import Any;
+from typing import Dict;
+from typing import Iterable;
+from typing import List;
+from typing import Tuple;
+from typing import Union;
+
+from src.fol.classes import Expression;
+from src.fol.normalform import asShared;
+from src.fol.normalform import withParts;
+from src.fol.shared import SharedExpression;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: Terms are built from variables, constants and function expressions (atoms may be unified likewise).
+# Variables are identified by their label, all other nodes by (kind, label, arity).
+# The parser reads f(...) as a term only in argument position and as an atom (relationexpression) at the top,
+# so terms given as strings are read with asTerm.
+# A substitution maps variable labels to terms and is idempotent, so it is applied with normalform.substitute.
+# Unification works on equivalence classes of (hash-consed) subterms in a union-find structure;
+# bindings are never applied eagerly, so that the result stays a DAG of polynomial size
+# even where the fully written out terms would be exponential.
+Substitution = Dict[str, SharedExpression];
+Symbol = Tuple[str, str, int];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: Unifier
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class Unifier(object):
+    '''
+    Union-find over subterms. Each class has (at most) one non-variable term, its schema;
+    classes are merged by size with path compression. The occurs check is done once, when writing out the substitution.
+    '''
+    parent:    Dict[Any, Any];
+    size:      Dict[Any, int];
+    schema:    Dict[Any, SharedExpression];
+    variables: Dict[str, SharedExpression];
+
+    def __init__(self):
+        self.parent    = dict();
+        self.size      = dict();
+        self.schema    = dict();
+        self.variables = dict();
+        return;
+
+    def key(self, t: SharedExpression) -> Any:
+        if t.kind == 'variable':
+            if not t.label in self.parent:
+                self.parent[t.label] = t.label;
+                self.size[t.label] = 1;
+                self.variables[t.label] = t;
+            return t.label;
+        if not t in self.parent:
+            self.parent[t] = t;
+            self.size[t] = 1;
+            self.schema[t] = t;
+        return t;
+
+    def find(self, a: Any) -> Any:
+        root = a;
+        while self.parent[root] != root:
+            root = self.parent[root];
+        while self.parent[a] != root:
+            self.parent[a], a = root, self.parent[a];
+        return root;
+
+    def unify(self, pairs: Iterable[Tuple[SharedExpression, SharedExpression]]) -> bool:
+        stack: List[Tuple[SharedExpression, SharedExpression]] = list(pairs);
+        while len(stack) > 0:
+            s, t = stack.pop();
+            a = self.find(self.key(s));
+            b = self.find(self.key(t));
+            if a == b:
+                continue;
+            sa = self.schema.get(a);
+            sb = self.schema.get(b);
+            if sa is not None and sb is not None:
+                if symbolOf(sa) != symbolOf(sb):
+                    return False;
+                stack.extend(zip(sa.parts, sb.parts));
+            schema = sa if sa is not None else sb;
+            if self.size[a] < self.size[b]:
+                a, b = b, a;
+            self.parent[b] = a;
+            self.size[a] += self.size[b];
+            self.schema.pop(b, None);
+            if schema is not None:
+                self.schema[a] = schema;
+        return True;
+
+    def substitution(self) -> Union[Substitution, None]:
+        '''
+        Writes out the class of each variable as a term (sharing subterms), or None if a class
+        (indirectly) contains itself via the subterms of its schema, i.e. if the occurs check fails.
+        '''
+        resolved: Dict[Any, SharedExpression] = dict();
+        pending: Dict[Any, None] = dict();
+        for x in list(self.variables):
+            stack: List[Tuple[Any, bool]] = [ (self.find(x), False) ];
+            while len(stack) > 0:
+                a, done = stack.pop();
+                t = self.schema.get(a);
+                if done:
+                    parts = [ resolved[self.find(self.key(part))] for part in t.parts ];
+                    resolved[a] = withParts(t, parts);
+                    del pending[a];
+                    continue;
+                if a in resolved:
+                    continue;
+                if t is None:
+                    resolved[a] = self.variables[a];
+                    continue;
+                # a class still being written out further up the current path means a cycle:
+                if a in pending:
+                    return None;
+                pending[a] = None;
+                stack.append((a, True));
+                for part in t.parts:
+                    b = self.find(self.key(part));
+                    if b in pending:
+                        return None;
+                    if not b in resolved:
+                        stack.append((b, False));
+        sigma: Substitution = dict();
+        for x in self.variables:
+            t = resolved[self.find(x)];
+            if not (t.kind == 'variable' and t.label == x):
+                sigma[x] = t;
+        return sigma;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def unify(s: Union[Expression, SharedExpression], t: Union[Expression, SharedExpression]) -> Union[Substitution, None]:
+    '''
+    Most general unifier of two terms (or atoms), or None if they are not unifiable.
+    '''
+    return unifyAll([ (s, t) ]);
+
+def unifyAll(pairs: Iterable[Tuple[Union[Expression, SharedExpression], Union[Expression, SharedExpression]]]) -> Union[Substitution, None]:
+    unifier = Unifier();
+    if not unifier.unify([ (braced(s), braced(t)) for s, t in pairs ]):
+        return None;
+    return unifier.substitution();
+
+def match(
+    pattern: Union[Expression, SharedExpression],
+    t: Union[Expression, SharedExpression],
+    sigma: Union[Substitution, None] = None,
+) -> Union[Substitution, None]:
+    '''
+    Substitution of the variables of the pattern only, which makes it equal to t, or None.
+    Variables of t are treated as constants. If `sigma` is given, the result extends it (sigma is not modified).
+    '''
+    return extendMatch(braced(pattern), braced(t), sigma);
+
+def extendMatch(pattern: SharedExpression, t: SharedExpression, sigma: Union[Substitution, None] = None) -> Union[Substitution, None]:
+    # match for (braced) shared nodes, without normalising the input
+    sigma = dict() if sigma is None else dict(sigma);
+    stack: List[Tuple[SharedExpression, SharedExpression]] = [ (pattern, t) ];
+    while len(stack) > 0:
+        p, u = stack.pop();
+        if p.kind == 'variable':
+            bound = sigma.get(p.label);
+            if bound is None:
+                sigma[p.label] = u;
+            elif not bound == u:
+                return None;
+        elif symbolOf(p) != symbolOf(u):
+            return None;
+        else:
+            stack.extend(zip(p.parts, u.parts));
+    return sigma;
+
+def isInstance(t: Union[Expression, SharedExpression], pattern: Union[Expression, SharedExpression]) -> bool:
+    return match(pattern, t) is not None;
+
+def asTerm(t: Union[Expression, SharedExpression]) -> SharedExpression:
+    '''
+    Reads an atom f(s, ...) (e.g. a term parsed with parseFolExpr) as the term f(s, ...); other nodes are kept.
+    '''
+    u = braced(t);
+    if u.kind != 'relationexpression':
+        return u;
+    return SharedExpression(
+        'functionexpression', *u.parts,
+        label           = u.label,
+        symbol          = u.symbol,
+        display         = u.display,
+        isLabelled      = u.isLabelled,
+        outerBrackets   = u.outerBrackets,
+        glueOption      = u.glueOption,
+        glueOuterOption = u.glueOuterOption,
+    );
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def symbolOf(t: SharedExpression) -> Symbol:
+    return (t.kind, t.label, len(t.parts));
+
+def braced(t: Union[Expression, SharedExpression]) -> SharedExpression:
+    # subterms always carry outer braces, so roots are normalised likewise to compare nodes by identity:
+    return asShared(t).withOuterBraces(True);
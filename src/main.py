@@ -7,18 +7,31 @@
 
 import os;
 import sys;
+from argparse import ArgumentParser;
+from argparse import Namespace;
 sys.tracebacklimit = 1; # <- DEVNOTE: for debugging, raise this value!
 sys.path.insert(0, os.getcwd());
 
-# from src.core.log import logInfo;
+from src.core.log import logInfo;
 from src.core.log import logDebug;
 # from src.core.log import logWarn;
-# from src.core.log import logError;
+from src.core.log import logError;
 # from src.core.log import logFatal;
+from src.core.profiling import PROFILER;
 from src.core.utils import getAttribute;
 from src.core.utils import readConfig;
+from src.fol.binary import FolBinaryWriter;
+from src.fol.binary import isFolBinary;
+from src.fol.binary import openFolCorpus;
+from src.fol.parallel import parseFolStreamParallel;
 from src.fol.parser import parseFolExpr;
 from src.fol.parser import parseFolExprs;
+from src.fol.render import FormulaWriter;
+from src.fol.service import FolService;
+from src.fol.service import serveFol;
+from src.fol.stream import FolRecordError;
+from src.fol.stream import openFolStream;
+from src.fol.stream import parseFolStream;
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # GLOBAL VARIABLE
@@ -32,7 +45,18 @@ CONFIG: dict;
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 def main():
-    setup(*sys.argv[1:]);
+    args = parseArguments(*sys.argv[1:]);
+    setup(args.config);
+    if args.command in ['validate', 'convert']:
+        profiling = startProfiling(args);
+        errors = runStream(args);
+        if profiling:
+            PROFILER.snapshot('end');
+            PROFILER.emit(args.profile_output);
+        if errors > 0:
+            sys.exit(1);
+    elif args.command == 'serve':
+        runService(args);
     return;
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -46,6 +70,107 @@ def setup(path: str, *_):
     CONFIG = readConfig(PATH_CONFIG);
     return;
 
+def parseArguments(*args: str) -> Namespace:
+    parser = ArgumentParser(prog='main.py');
+    parser.add_argument('config', type=str, help='path to config file');
+    subparsers = parser.add_subparsers(dest='command');
+    for command, description in [
+        ('validate', 'check that every formula in a file parses'),
+        ('convert',  'parse every formula in a file and write one formula per line'),
+    ]:
+        subparser = subparsers.add_parser(command, help=description);
+        subparser.add_argument('input', type=str, help='newline or comma separated formulae (- for stdin) or a binary corpus');
+        subparser.add_argument('--earley', action='store_true', help='always use the Earley parser');
+        subparser.add_argument('--processes', type=int, default=1, help='parse in this many worker processes (0: number of CPUs)');
+        subparser.add_argument('--profile', action='store_true', help='report timings per phase and counters');
+        subparser.add_argument('--profile-memory', action='store_true', help='also trace allocations (implies --profile)');
+        subparser.add_argument('--profile-output', type=str, default=None, help='write the profile as JSON to this file instead of the log');
+        if command == 'convert':
+            subparser.add_argument('--output', type=str, default='-', help='output file (- for stdout)');
+            subparser.add_argument('--format', type=str, default='symbol', choices=['symbol', 'display', 'tptp', 'smtlib', 'binary'], help='output format (binary is written incrementally via temporary files and needs --output)');
+    subparser = subparsers.add_parser('serve', help='answer parse, render, normalize and check requests (JSON lines) until interrupted');
+    subparser.add_argument('--socket', type=str, default=None, help='listen on this Unix socket instead of localhost TCP');
+    subparser.add_argument('--port', type=int, default=8765, help='localhost TCP port');
+    subparser.add_argument('--processes', type=int, default=None, help='number of worker processes (default: number of CPUs)');
+    subparser.add_argument('--batch-size', type=int, default=64, help='maximal number of requests per batch');
+    subparser.add_argument('--batch-delay', type=float, default=0.002, help='seconds to wait for further requests of a batch');
+    subparser.add_argument('--max-pending', type=int, default=1024, help='maximal number of queued requests');
+    return parser.parse_args(args);
+
+def runService(args: Namespace):
+    def ready(service: FolService):
+        address = service.address;
+        logInfo('Listening on \033[1m{}\033[0m with {} worker processes.'.format(
+            address if isinstance(address, str) else '{}:{}'.format(*address),
+            service.processes,
+        ));
+    serveFol(
+        path       = args.socket,
+        port       = args.port,
+        ready      = ready,
+        processes  = args.processes,
+        batchSize  = args.batch_size,
+        batchDelay = args.batch_delay,
+        maxPending = args.max_pending,
+    );
+    return;
+
+def startProfiling(args: Namespace) -> bool:
+    # if already enabled via LOGIC_PROFILE, the report is emitted at exit:
+    if PROFILER.enabled or not (args.profile or args.profile_memory or args.profile_output is not None):
+        return False;
+    PROFILER.enable(memory=args.profile_memory);
+    return True;
+
+def runStream(args: Namespace) -> int:
+    count = 0;
+    errors = 0;
+    fp_out = None;
+    writer = None;
+    text_writer = None;
+    if args.command == 'convert':
+        if args.format == 'binary':
+            if args.output == '-':
+                raise Exception('Binary output requires an output file (--output)!');
+            writer = FolBinaryWriter();
+        else:
+            fp_out = sys.stdout if args.output == '-' else open(args.output, 'w');
+            text_writer = FormulaWriter(fp_out, args.format);
+    # binary corpora are read back directly, text is parsed:
+    is_binary = not args.input == '-' and isFolBinary(args.input);
+    fp = openFolCorpus(args.input) if is_binary else openFolStream(args.input);
+    try:
+        if is_binary:
+            fmls = fp;
+        elif args.processes == 1:
+            fmls = parseFolStream(fp, fastpath=not args.earley);
+        else:
+            fmls = parseFolStreamParallel(fp, processes=args.processes or None, fastpath=not args.earley);
+        for fml in fmls:
+            count += 1;
+            if isinstance(fml, FolRecordError):
+                errors += 1;
+                logError(str(fml));
+                continue;
+            if writer is not None:
+                writer.add(fml);
+            elif text_writer is not None:
+                text_writer.write(fml);
+        if writer is not None:
+            writer.save(args.output);
+        if text_writer is not None:
+            text_writer.close();
+    finally:
+        if not fp is sys.stdin:
+            fp.close();
+        if writer is not None:
+            writer.close();
+        if not (fp_out is None or fp_out is sys.stdout):
+            fp_out.close();
+    if fp_out is not sys.stdout:
+        logInfo('Processed {} formulae with {} errors.'.format(count, errors));
+    return errors;
+
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # EXECUTION
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+from typing import Dict;
+from typing import Iterable;
+from typing import List;
+from typing import Sequence;
+from typing import Tuple;
+from typing import Union;
+from weakref import WeakValueDictionary;
+
+from src.core.traversal import foldDag;
+from src.fol.classes import Expression;
+from src.fol.shared import SharedExpression;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: Nodes are integers indexing the arrays level/low/high of the manager; 0 and 1 are the terminals.
+# By the unique table there is exactly one node per (level, low, high), so that two functions
+# (over the same manager) are equal iff their nodes are. Handles (Bdd) are interned per node as well,
+# hence equivalence of formulae is `bdd1 is bdd2`.
+FALSE: int = 0;
+TRUE:  int = 1;
+TERMINAL_LEVEL: int = 1 << 30;
+
+CACHE_SIZE: int = 1 << 18;
+GC_THRESHOLD: int = 1 << 16;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: Bdd
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class Bdd(object):
+    '''
+    Handle on a node of a BddManager. Only nodes reachable from live handles survive garbage collection.
+    '''
+    __slots__ = ('manager', 'node', '__weakref__');
+
+    manager: BddManager;
+    node:    int;
+
+    def __init__(self, manager: BddManager, node: int):
+        self.manager = manager;
+        self.node    = node;
+        return;
+
+    def __repr__(self) -> str:
+        return '<Bdd node {}, size {}>'.format(self.node, self.size());
+
+    def __invert__(self) -> Bdd:
+        return self.manager.apply('not', self);
+
+    def __and__(self, o: Bdd) -> Bdd:
+        return self.manager.apply('and', self, o);
+
+    def __or__(self, o: Bdd) -> Bdd:
+        return self.manager.apply('or', self, o);
+
+    def __xor__(self, o: Bdd) -> Bdd:
+        return self.manager.apply('xor', self, o);
+
+    def implies(self, o: Bdd) -> Bdd:
+        return self.manager.apply('implies', self, o);
+
+    def iff(self, o: Bdd) -> Bdd:
+        return self.manager.apply('iff', self, o);
+
+    def isTautology(self) -> bool:
+        return self.node == TRUE;
+
+    def isSatisfiable(self) -> bool:
+        return self.node != FALSE;
+
+    def isContradiction(self) -> bool:
+        return self.node == FALSE;
+
+    def size(self) -> int:
+        return self.manager.size(self.node);
+
+    def countModels(self, nvars: Union[int, None] = None) -> int:
+        return self.manager.countModels(self.node, nvars=nvars);
+
+    def anySat(self) -> Union[Dict[str, bool], None]:
+        return self.manager.anySat(self.node);
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: BddManager
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class BddManager(object):
+    '''
+    Reduced ordered binary decision diagrams with a unique table, a bounded computed table for ite
+    and mark-and-sweep garbage collection (roots: all live Bdd handles).
+    Variables are ordered as given in `order`; unknown ones are appended on first use.
+    '''
+    order:        List[str];
+    levels:       Dict[str, int];
+    level:        List[int];
+    low:          List[int];
+    high:         List[int];
+    free:         List[int];
+    unique:       Dict[Tuple[int, int, int], int];
+    computed:     Dict[Tuple[int, int, int], int];
+    handles:      WeakValueDictionary;
+    cacheSize:    int;
+    gcThreshold:  int;
+    counters:     Dict[str, int];
+
+    def __init__(self, order: Iterable[str] = (), cacheSize: int = CACHE_SIZE, gcThreshold: int = GC_THRESHOLD):
+        self.order       = [];
+        self.levels      = dict();
+        self.level       = [ TERMINAL_LEVEL, TERMINAL_LEVEL ];
+        self.low         = [ FALSE, TRUE ];
+        self.high        = [ FALSE, TRUE ];
+        self.free        = [];
+        self.unique      = dict();
+        self.computed    = dict();
+        self.handles     = WeakValueDictionary();
+        self.cacheSize   = cacheSize;
+        self.gcThreshold = gcThreshold;
+        self.counters    = dict(
+            cacheHits     = 0,
+            cacheMisses   = 0,
+            cacheClears   = 0,
+            uniqueHits    = 0,
+            uniqueMisses  = 0,
+            gcRuns        = 0,
+            gcFreed       = 0,
+            peakNodes     = 0,
+        );
+        for name in order:
+            self.addVar(name);
+        return;
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # variables and handles
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def addVar(self, name: str) -> int:
+        if not name in self.levels:
+            self.levels[name] = len(self.order);
+            self.order.append(name);
+        return self.levels[name];
+
+    def var(self, name: str) -> Bdd:
+        return self.handle(self.makeNode(self.addVar(name), FALSE, TRUE));
+
+    def true(self) -> Bdd:
+        return self.handle(TRUE);
+
+    def false(self) -> Bdd:
+        return self.handle(FALSE);
+
+    def handle(self, node: int) -> Bdd:
+        h = self.handles.get(node);
+        if h is None:
+            h = Bdd(self, node);
+            self.handles[node] = h;
+        return h;
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # construction
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def makeNode(self, lvl: int, low: int, high: int) -> int:
+        if low == high:
+            return low;
+        key = (lvl, low, high);
+        node = self.unique.get(key);
+        if node is not None:
+            self.counters['uniqueHits'] += 1;
+            return node;
+        self.counters['uniqueMisses'] += 1;
+        if len(self.free) > 0:
+            node = self.free.pop();
+            self.level[node] = lvl;
+            self.low[node]   = low;
+            self.high[node]  = high;
+        else:
+            node = len(self.level);
+            self.level.append(lvl);
+            self.low.append(low);
+            self.high.append(high);
+        self.unique[key] = node;
+        return node;
+
+    def ite(self, f: Bdd, g: Bdd, h: Bdd) -> Bdd:
+        node = self.iteNodes(f.node, g.node, h.node);
+        # collect between top level operations only, never inside one:
+        result = self.handle(node);
+        self.maybeCollect();
+        return result;
+
+    def apply(self, op: str, f: Bdd, g: Union[Bdd, None] = None) -> Bdd:
+        if op == 'not':
+            return self.ite(f, self.false(), self.true());
+        elif op == 'and':
+            return self.ite(f, g, self.false());
+        elif op == 'or':
+            return self.ite(f, self.true(), g);
+        elif op == 'implies':
+            return self.ite(f, g, self.true());
+        elif op in ['iff', 'xor']:
+            # built in one step, so that ~g is not kept alive:
+            notg = self.iteNodes(g.node, FALSE, TRUE);
+            node = self.iteNodes(f.node, g.node, notg) if op == 'iff' else self.iteNodes(f.node, notg, g.node);
+            result = self.handle(node);
+            self.maybeCollect();
+            return result;
+        raise Exception('Unknown operation \033[1m{}\033[0m!'.format(op));
+
+    def iteNodes(self, f: int, g: int, h: int) -> int:
+        '''
+        if-then-else on nodes: (f and g) or (not f and h), as an explicit stack over the Shannon expansion.
+        '''
+        level = self.level;
+        low = self.low;
+        high = self.high;
+        computed = self.computed;
+        counters = self.counters;
+        values: List[int] = [];
+        stack: List[Tuple[int, int, int, int]] = [ (f, g, h, -1) ];
+        while len(stack) > 0:
+            f, g, h, top = stack.pop();
+            if top >= 0:
+                r1 = values.pop();
+                r0 = values.pop();
+                r = self.makeNode(top, r0, r1);
+                if len(computed) >= self.cacheSize:
+                    computed.clear();
+                    counters['cacheClears'] += 1;
+                computed[(f, g, h)] = r;
+                values.append(r);
+                continue;
+            # terminal cases and normalisation:
+            if f == TRUE:
+                values.append(g);
+                continue;
+            elif f == FALSE:
+                values.append(h);
+                continue;
+            if g == f:
+                g = TRUE;
+            if h == f:
+                h = FALSE;
+            if g == h:
+                values.append(g);
+                continue;
+            elif g == TRUE and h == FALSE:
+                values.append(f);
+                continue;
+            key = (f, g, h);
+            r = computed.get(key);
+            if r is not None:
+                counters['cacheHits'] += 1;
+                values.append(r);
+                continue;
+            counters['cacheMisses'] += 1;
+            top = min(level[f], level[g], level[h]);
+            stack.append((f, g, h, top));
+            f0, f1 = (low[f], high[f]) if level[f] == top else (f, f);
+            g0, g1 = (low[g], high[g]) if level[g] == top else (g, g);
+            h0, h1 = (low[h], high[h]) if level[h] == top else (h, h);
+            stack.append((f1, g1, h1, -1));
+            stack.append((f0, g0, h0, -1));
+        return values[0];
+
+    def fromExpression(self, fml: Union[Expression, SharedExpression]) -> Bdd:
+        '''
+        BDD of a propositional (or quantifier-free ground) formula. Atoms are named by their strings.
+        Unknown atoms are added to the order in the order of first occurrence.
+        '''
+        t = fml if isinstance(fml, SharedExpression) else SharedExpression.fromExpression(fml);
+        for atom in atomNames(t):
+            self.addVar(atom);
+        nodes: Dict[SharedExpression, Bdd] = dict();
+
+        def combine(t: SharedExpression, r: List[Bdd]) -> Bdd:
+            kind = t.kind;
+            if kind in ['atom', 'relationexpression']:
+                return self.var(str(t.withOuterBraces(False)));
+            elif kind == 'tautology':
+                return self.true();
+            elif kind == 'contradiction':
+                return self.false();
+            elif kind == 'not':
+                return ~r[0];
+            elif kind in ['and', 'or']:
+                value = r[0];
+                for x in r[1:]:
+                    value = value & x if kind == 'and' else value | x;
+                return value;
+            elif kind == 'implies':
+                return r[0].implies(r[1]);
+            elif kind == 'iff':
+                return r[0].iff(r[1]);
+            raise Exception('Cannot build a BDD for expressions of kind \033[1m{}\033[0m!'.format(kind));
+
+        # handles in the memo keep the intermediate results alive during garbage collections:
+        return foldDag(t, combine, children=lambda t: [] if t.kind in ['atom', 'relationexpression'] else t.parts, memo=nodes);
+
+    def transfer(self, f: Bdd) -> Bdd:
+        '''
+        Copy of a BDD of another manager (e.g. with a different variable order) in this manager.
+        '''
+        source = f.manager;
+        def combine(node: int, r: List[Bdd]) -> Bdd:
+            if node <= TRUE:
+                return self.handle(node);
+            x = self.var(source.order[source.level[node]]);
+            return self.ite(x, r[1], r[0]);
+        return foldDag(f.node, combine, children=lambda node: [] if node <= TRUE else [ source.low[node], source.high[node] ]);
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # queries
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def size(self, node: int) -> int:
+        # number of nodes, terminals included
+        seen = set();
+        stack = [ node ];
+        while len(stack) > 0:
+            n = stack.pop();
+            if n in seen:
+                continue;
+            seen.add(n);
+            if n > TRUE:
+                stack.extend([ self.low[n], self.high[n] ]);
+        return len(seen);
+
+    def countModels(self, node: int, nvars: Union[int, None] = None) -> int:
+        '''
+        Number of satisfying assignments of the first `nvars` variables of the order (default: all),
+        which must include all variables the function depends on. Linear in the size of the BDD.
+        '''
+        n = len(self.order) if nvars is None else nvars;
+        level = self.level;
+        low = self.low;
+        high = self.high;
+        lvl = lambda x: n if x <= TRUE else level[x];
+
+        def combine(x: int, r: List[int]) -> int:
+            if x <= TRUE:
+                return x;
+            l = level[x];
+            if l >= n:
+                raise Exception('The function depends on more than \033[1m{}\033[0m variables!'.format(n));
+            return (r[0] << (lvl(low[x]) - l - 1)) + (r[1] << (lvl(high[x]) - l - 1));
+
+        count = foldDag(node, combine, children=lambda x: [] if x <= TRUE else [ low[x], high[x] ]);
+        return count << lvl(node);
+
+    def anySat(self, node: int) -> Union[Dict[str, bool], None]:
+        # a satisfying (partial) assignment: the variables on one path to TRUE
+        if node == FALSE:
+            return None;
+        assignment: Dict[str, bool] = dict();
+        while node > TRUE:
+            name = self.order[self.level[node]];
+            if self.high[node] != FALSE:
+                assignment[name] = True;
+                node = self.high[node];
+            else:
+                assignment[name] = False;
+                node = self.low[node];
+        return assignment;
+
+    def numNodes(self) -> int:
+        return len(self.unique);
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        counters = self.counters;
+        lookups = counters['cacheHits'] + counters['cacheMisses'];
+        lookupsUnique = counters['uniqueHits'] + counters['uniqueMisses'];
+        return dict(
+            counters,
+            nodes          = self.numNodes(),
+            cacheEntries   = len(self.computed),
+            cacheHitRate   = counters['cacheHits'] / lookups if lookups > 0 else 0.0,
+            uniqueHitRate  = counters['uniqueHits'] / lookupsUnique if lookupsUnique > 0 else 0.0,
+        );
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # garbage collection
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def maybeCollect(self):
+        n = self.numNodes();
+        self.counters['peakNodes'] = max(self.counters['peakNodes'], n);
+        if n >= self.gcThreshold:
+            self.collectGarbage();
+            # grow the threshold if little could be freed:
+            if 2*self.numNodes() > self.gcThreshold:
+                self.gcThreshold *= 2;
+        return;
+
+    def collectGarbage(self) -> int:
+        '''
+        Frees all nodes not reachable from a live handle and clears the computed table.
+        Returns the number of freed nodes.
+        '''
+        low = self.low;
+        high = self.high;
+        marked = bytearray(len(self.level));
+        marked[FALSE] = marked[TRUE] = 1;
+        stack = list(self.handles.keys());
+        while len(stack) > 0:
+            n = stack.pop();
+            if marked[n]:
+                continue;
+            marked[n] = 1;
+            stack.append(low[n]);
+            stack.append(high[n]);
+        freed = [ node for node in self.unique.values() if not marked[node] ];
+        for node in freed:
+            del self.unique[(self.level[node], low[node], high[node])];
+        self.free.extend(freed);
+        self.computed.clear();
+        self.counters['gcRuns'] += 1;
+        self.counters['gcFreed'] += len(freed);
+        return len(freed);
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def buildBdd(fml: Union[Expression, SharedExpression], order: Union[Sequence[str], None] = None) -> Bdd:
+    return BddManager(order or ()).fromExpression(fml);
+
+def areEquivalentBdd(*fmls: Union[Expression, SharedExpression], manager: Union[BddManager, None] = None) -> bool:
+    manager = manager or BddManager();
+    bdds = [ manager.fromExpression(fml) for fml in fmls ];
+    return all([ b is bdds[0] for b in bdds ]);
+
+def atomNames(fml: SharedExpression) -> List[str]:
+    # names of atoms in order of first occurrence (depth first, left to right)
+    names: Dict[str, None] = dict();
+    seen = set();
+    stack: List[SharedExpression] = [ fml ];
+    while len(stack) > 0:
+        t = stack.pop();
+        if t in seen:
+            continue;
+        seen.add(t);
+        if t.kind in ['atom', 'relationexpression']:
+            names[str(t.withOuterBraces(False))] = None;
+            continue;
+        stack.extend(reversed(t.parts));
+    return list(names);
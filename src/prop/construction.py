@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+
+from src.fol.classes import Expression;
+from src.fol.construction import genericLabelledToken;
+from src.fol.construction import genericZeroary;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: The connectives are those of src/fol/construction.py; only the atomic formulae differ.
+# Atoms are identified by their symbol, which is also how they are written in proplogic.lark.
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS: atomic formulae
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def Atom(index: str) -> Expression:
+    # written: atom 1, atom{p}
+    return genericLabelledToken('atom', 'atom', index, is_indexlike=False, is_generic=True);
+
+def GenericAtom(label: str) -> Expression:
+    # written: {p}
+    return genericLabelledToken('atom', '', label, is_indexlike=True, is_generic=True);
+
+def Tautology() -> Expression:
+    return genericZeroary('tautology', symbol='1', display=r'\top');
+
+def Contradiction() -> Expression:
+    return genericZeroary('contradiction', symbol='0', display=r'\bot');
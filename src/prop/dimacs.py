@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+import gzip;
+from typing import IO;
+from typing import Iterable;
+from typing import List;
+from typing import Sequence;
+from typing import Tuple;
+from typing import Union;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: DIMACS CNF: comment lines 'c ...', a header 'p cnf <variables> <clauses>',
+# then clauses as whitespace separated non-zero integers (-k = negation of variable k), each terminated by 0.
+# Clauses may span lines. A line '%' (as in the SATLIB benchmarks) ends the input.
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS: reading
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def readDimacs(path: str) -> Tuple[int, List[List[int]]]:
+    # files ending in .gz are decompressed on the fly:
+    opener = gzip.open if path.endswith('.gz') else open;
+    with opener(path, 'rt') as fp:
+        return loadDimacs(fp);
+
+def loadDimacs(fp: IO[str]) -> Tuple[int, List[List[int]]]:
+    return parseDimacs(fp.read());
+
+def parseDimacs(u: str) -> Tuple[int, List[List[int]]]:
+    '''
+    Returns (number of variables, clauses). The number of variables is the maximum
+    of the header and the largest variable actually used.
+    '''
+    nvars = 0;
+    tokens: List[str] = [];
+    for line in u.splitlines():
+        line = line.strip();
+        if line == '' or line.startswith('c'):
+            continue;
+        elif line.startswith('%'):
+            break;
+        elif line.startswith('p'):
+            header = line.split();
+            if len(header) != 4 or header[1] != 'cnf':
+                raise Exception('Invalid DIMACS header \033[1m{}\033[0m!'.format(line));
+            nvars = int(header[2]);
+            continue;
+        tokens.extend(line.split());
+    clauses: List[List[int]] = [];
+    clause: List[int] = [];
+    for token in tokens:
+        lit = int(token);
+        if lit == 0:
+            clauses.append(clause);
+            clause = [];
+        else:
+            clause.append(lit);
+            nvars = max(nvars, abs(lit));
+    # tolerate a missing final 0:
+    if len(clause) > 0:
+        clauses.append(clause);
+    return nvars, clauses;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS: writing
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def writeDimacs(path: str, clauses: Sequence[Sequence[int]], nvars: Union[int, None] = None, comments: Iterable[str] = ()):
+    opener = gzip.open if path.endswith('.gz') else open;
+    with opener(path, 'wt') as fp:
+        dumpDimacs(fp, clauses, nvars=nvars, comments=comments);
+    return;
+
+def dumpDimacs(fp: IO[str], clauses: Sequence[Sequence[int]], nvars: Union[int, None] = None, comments: Iterable[str] = ()):
+    fp.write(dimacsToStr(clauses, nvars=nvars, comments=comments));
+    return;
+
+def dimacsToStr(clauses: Sequence[Sequence[int]], nvars: Union[int, None] = None, comments: Iterable[str] = ()) -> str:
+    if nvars is None:
+        nvars = max([ abs(lit) for clause in clauses for lit in clause ], default=0);
+    lines: List[str] = [ 'c {}'.format(comment) for comment in comments ];
+    lines.append('p cnf {} {}'.format(nvars, len(clauses)));
+    lines.extend([ ' '.join([ str(lit) for lit in clause ] + [ '0' ]) for clause in clauses ]);
+    return '\n'.join(lines) + '\n';
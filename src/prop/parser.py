@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+from threading import Lock;
+from typing import List;
+from typing import TYPE_CHECKING;
+from typing import Union;
+
+if TYPE_CHECKING:
+    from lark import Lark;
+    from lark import Tree;
+
+from src.core.grammar import grammarPath;
+from src.core.grammar import loadGrammar;
+from src.core.traversal import foldTree;
+
+from src.fol.classes import Expression;
+from src.fol.construction import Not;
+from src.fol.construction import And;
+from src.fol.construction import Or;
+from src.fol.construction import Iff;
+from src.fol.construction import Implies;
+from src.prop.construction import Atom;
+from src.prop.construction import GenericAtom;
+from src.prop.construction import Tautology;
+from src.prop.construction import Contradiction;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+PATH_GRAMMAR: str = grammarPath('proplogic.lark');
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL VARIABLES
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# lexer durch LARK erzeugen (erst beim ersten Gebrauch)
+LEXER: Union[Lark, None] = None;
+LEXER_LOCK: Lock = Lock();
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHOD getLexer
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def getLexer() -> Lark:
+    global LEXER;
+    if LEXER is None:
+        with LEXER_LOCK:
+            if LEXER is None:
+                LEXER = loadGrammar(PATH_GRAMMAR, start='search', regex=True);
+    return LEXER;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# MAIN METHOD string -> PropLogicExpr
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def parsePropExprToStr(u: str) -> str:
+    return str(parsePropExpr(u));
+
+def parsePropExprsToStr(u: str) -> List[str]:
+    return [str(_) for _ in parsePropExprs(u)];
+
+def parsePropExpr(u: str) -> Expression:
+    fmls = parsePropExprs(u);
+    if len(fmls) == 1:
+        return fmls[0];
+    raise Exception('String \033[1m{}\033[0m must contain exactly one expression!'.format(u));
+
+def parsePropExprs(u: str) -> List[Expression]:
+    try:
+        fmls = lexedToExprs(getLexer().parse(u));
+    except:
+        raise Exception('Could not parse expressions \033[1m{}\033[0m!'.format(u));
+    return fmls;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# PRIVATE METHODS: lex -> Expression
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def lexedToExprs(u: Tree) -> List[Expression]:
+    typ = u.data;
+    if typ == 'expr':
+        return [ lexedToExpr(u) ];
+    elif typ == 'exprs':
+        return [ lexedToExpr(uu) for uu in filterSubexpr(u) ];
+    raise Exception('Could not parse expression!');
+
+def lexedToExpr(u: Tree) -> Expression:
+    return foldTree(u, lexedCombine, children=lexedSubexprs);
+
+def lexedSubexprs(u: Tree) -> List[Tree]:
+    typ = u.data;
+    if typ in ['atom', 'atomic', 'tautology', 'contradiction']:
+        return [];
+    elif typ in ['implies', 'iff']:
+        return filterSubexpr(u)[:2];
+    elif typ in ['and', 'or']:
+        return filterSubexpr(u);
+    return filterSubexpr(u)[:1];
+
+def lexedCombine(u: Tree, parts: List[Expression]) -> Expression:
+    typ = u.data;
+    if typ == 'expr':
+        return parts[0];
+    elif typ == 'exprclosed':
+        return parts[0].showOuterBraces(True);
+    elif typ == 'expropen':
+        return parts[0].showOuterBraces(False);
+    elif typ == 'tautology':
+        return Tautology();
+    elif typ == 'contradiction':
+        return Contradiction();
+    elif typ == 'atom':
+        return Atom(lexedToStr(u).strip());
+    elif typ == 'atomic':
+        return GenericAtom(lexedToStr(u).strip());
+    elif typ == 'not':
+        return Not(parts[0], adopt=True);
+    elif typ == 'and':
+        return And(*parts, adopt=True);
+    elif typ == 'or':
+        return Or(*parts, adopt=True);
+    elif typ == 'implies':
+        return Implies(parts[0], parts[1], adopt=True);
+    elif typ == 'iff':
+        return Iff(parts[0], parts[1], adopt=True);
+    raise Exception('Could not parse expression!');
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS: filtration
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def lexedToStr(u: Union[str, Tree]) -> str:
+    if isinstance(u, str):
+        return str(u);
+    return ''.join([ lexedToStr(uu) for uu in filterOutNoncapture(u) ]);
+
+def filterSubexpr(u: Tree) -> List[Tree]:
+    return [uu for uu in u.children if not isinstance(uu, str) and hasattr(uu, 'data') and not uu.data == 'noncapture'];
+
+def filterOutNoncapture(u: Tree) -> List[Union[str, Tree]]:
+    return [uu for uu in u.children if isinstance(uu, str) or ( hasattr(uu, 'data') and not uu.data == 'noncapture' ) ];
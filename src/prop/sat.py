@@ -0,0 +1,632 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+import heapq;
+from array import array;
+from typing import Dict;
+from typing import Iterable;
+from typing import List;
+from typing import Sequence;
+from typing import Tuple;
+from typing import Union;
+
+from src.fol.classes import Expression;
+from src.fol.normalform import Clause;
+from src.fol.normalform import clausalForm;
+from src.fol.shared import SharedExpression;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: The interface uses DIMACS literals (k / -k for variable k >= 1).
+# Internally variable k is v = k-1 and its literals are 2v (positive) and 2v+1 (negative), so that lit^1 is the negation.
+# All clauses live in one flat integer array: [size, lit_0, lit_1, ..., size, lit_0, ...];
+# a clause is referred to by the position of lit_0, and lit_0, lit_1 are its two watched literals.
+# A deleted clause keeps its negated size; the array is compacted once deleted clauses take up half of it.
+VAR_DECAY:        float = 0.95;
+CLAUSE_DECAY:     float = 0.999;
+RESCALE_LIMIT:    float = 1e100;
+RESTART_BASE:     int   = 100;
+LEARNT_FRACTION:  float = 1/3;
+LEARNT_MIN:       int   = 2000;
+LEARNT_GROWTH:    float = 1.1;
+
+TRUE:  int =  1;
+FALSE: int = -1;
+UNDEF: int =  0;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: SatSolver
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class SatSolver(object):
+    '''
+    Conflict driven clause learning: two watched literals, VSIDS variable activities with phase saving,
+    first-UIP learning with clause minimisation, Luby restarts and activity-based deletion of learnt clauses.
+    '''
+    nvars:        int;
+    nclauses:     int;
+    ok:           bool;
+    pool:         array;
+    watches:      List[List[int]];
+    learnts:      List[int];
+    clauseAct:    Dict[int, float];
+    val:          List[int];
+    level:        List[int];
+    reason:       List[int];
+    polarity:     bytearray;
+    activity:     List[float];
+    heap:         List[Tuple[float, int]];
+    trail:        List[int];
+    trailLim:     List[int];
+    qhead:        int;
+    varInc:       float;
+    clauseInc:    float;
+    wasted:       int;
+    maxLearnts:   float;
+    model:        List[bool];
+    stats:        Dict[str, int];
+
+    def __init__(self, nvars: int = 0):
+        self.nvars      = 0;
+        self.nclauses   = 0;
+        self.ok         = True;
+        self.pool       = array('i');
+        self.watches    = [];
+        self.learnts    = [];
+        self.clauseAct  = dict();
+        self.val        = [];
+        self.level      = [];
+        self.reason     = [];
+        self.polarity   = bytearray();
+        self.activity   = [];
+        self.heap       = [];
+        self.trail      = [];
+        self.trailLim   = [];
+        self.qhead      = 0;
+        self.varInc     = 1.0;
+        self.clauseInc  = 1.0;
+        self.wasted     = 0;
+        self.maxLearnts = 0.0;
+        self.model      = [];
+        self.stats      = dict(decisions=0, propagations=0, conflicts=0, restarts=0, learnts=0, deleted=0);
+        self.ensureVars(nvars);
+        return;
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # public interface
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def newVar(self) -> int:
+        self.ensureVars(self.nvars + 1);
+        return self.nvars;
+
+    def ensureVars(self, nvars: int):
+        while self.nvars < nvars:
+            v = self.nvars;
+            self.nvars += 1;
+            self.watches.extend([ [], [] ]);
+            self.val.extend([ UNDEF, UNDEF ]);
+            self.level.append(0);
+            self.reason.append(-1);
+            # initial phase: false, as in MiniSat
+            self.polarity.append(1);
+            self.activity.append(0.0);
+            heapq.heappush(self.heap, (-0.0, v));
+        return;
+
+    def addClause(self, clause: Iterable[int]) -> bool:
+        '''
+        Adds a clause of DIMACS literals. Returns False if the clause set became trivially unsatisfiable.
+        '''
+        if not self.ok:
+            return False;
+        self.cancelUntil(0);
+        lits: List[int] = [];
+        seen: Dict[int, None] = dict();
+        for x in clause:
+            if x == 0:
+                raise Exception('\033[1m0\033[0m is not a literal!');
+            self.ensureVars(abs(x));
+            lit = 2*(x - 1) if x > 0 else 2*(-x - 1) + 1;
+            # drop duplicate and false literals, skip tautologies and satisfied clauses:
+            if lit ^ 1 in seen or self.val[lit] == TRUE:
+                return True;
+            if lit in seen or self.val[lit] == FALSE:
+                continue;
+            seen[lit] = None;
+            lits.append(lit);
+        if len(lits) == 0:
+            self.ok = False;
+        elif len(lits) == 1:
+            self.enqueue(lits[0], -1);
+            self.ok = self.propagate() < 0;
+        else:
+            self.attach(lits);
+        return self.ok;
+
+    def addClauses(self, clauses: Iterable[Iterable[int]]) -> bool:
+        for clause in clauses:
+            if not self.addClause(clause):
+                return False;
+        return True;
+
+    def solve(self, assumptions: Sequence[int] = (), maxConflicts: Union[int, None] = None) -> Union[bool, None]:
+        '''
+        Returns True (satisfiable, see .model / .value), False (unsatisfiable under the assumptions)
+        or None if maxConflicts was exceeded.
+        '''
+        self.model = [];
+        if not self.ok:
+            return False;
+        assumed = [ 2*(x - 1) if x > 0 else 2*(-x - 1) + 1 for x in assumptions ];
+        self.ensureVars(max([ abs(x) for x in assumptions ], default=0));
+        self.maxLearnts = max(self.numClauses() * LEARNT_FRACTION, LEARNT_MIN);
+        conflicts = 0;
+        k = 0;
+        status: Union[bool, None] = None;
+        while status is None:
+            budget = RESTART_BASE * luby(k);
+            if maxConflicts is not None:
+                budget = min(budget, maxConflicts - conflicts);
+                if budget <= 0:
+                    break;
+            status, n = self.search(budget, assumed);
+            conflicts += n;
+            k += 1;
+            if status is None:
+                self.stats['restarts'] += 1;
+        if status is True:
+            val = self.val;
+            self.model = [ val[2*v] == TRUE for v in range(self.nvars) ];
+        self.cancelUntil(0);
+        return status;
+
+    def value(self, x: int) -> bool:
+        # value of a DIMACS literal in the last model
+        return self.model[x - 1] if x > 0 else not self.model[-x - 1];
+
+    def modelLiterals(self) -> List[int]:
+        return [ v + 1 if b else -(v + 1) for v, b in enumerate(self.model) ];
+
+    def numClauses(self) -> int:
+        # number of (non-unit) problem clauses
+        return self.nclauses;
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # search
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def search(self, budget: int, assumed: List[int]) -> Tuple[Union[bool, None], int]:
+        conflicts = 0;
+        while True:
+            confl = self.propagate();
+            if confl >= 0:
+                conflicts += 1;
+                self.stats['conflicts'] += 1;
+                if len(self.trailLim) == 0:
+                    self.ok = False;
+                    return False, conflicts;
+                learnt, backLevel = self.analyze(confl);
+                self.cancelUntil(backLevel);
+                if len(learnt) == 1:
+                    self.enqueue(learnt[0], -1);
+                else:
+                    ref = self.attach(learnt, learnt=True);
+                    self.enqueue(learnt[0], ref);
+                self.varInc /= VAR_DECAY;
+                self.clauseInc /= CLAUSE_DECAY;
+                continue;
+            if conflicts >= budget:
+                self.cancelUntil(0);
+                return None, conflicts;
+            if len(self.learnts) - len(self.trail) >= self.maxLearnts:
+                self.reduceLearnts();
+                self.maxLearnts *= LEARNT_GROWTH;
+            # assumptions first, then the most active unassigned variable:
+            lit = -1;
+            while len(self.trailLim) < len(assumed):
+                p = assumed[len(self.trailLim)];
+                if self.val[p] == TRUE:
+                    self.trailLim.append(len(self.trail));
+                elif self.val[p] == FALSE:
+                    self.cancelUntil(0);
+                    return False, conflicts;
+                else:
+                    lit = p;
+                    break;
+            if lit < 0:
+                lit = self.pickBranch();
+                if lit < 0:
+                    return True, conflicts;
+            self.stats['decisions'] += 1;
+            self.trailLim.append(len(self.trail));
+            self.enqueue(lit, -1);
+
+    def pickBranch(self) -> int:
+        heap = self.heap;
+        val = self.val;
+        activity = self.activity;
+        while len(heap) > 0:
+            a, v = heapq.heappop(heap);
+            # skip stale entries (the variable was bumped since) and assigned variables:
+            if -a != activity[v] or val[2*v] != UNDEF:
+                continue;
+            return 2*v + self.polarity[v];
+        return -1;
+
+    def enqueue(self, lit: int, ref: int):
+        v = lit >> 1;
+        self.val[lit] = TRUE;
+        self.val[lit ^ 1] = FALSE;
+        self.level[v] = len(self.trailLim);
+        self.reason[v] = ref;
+        self.trail.append(lit);
+        return;
+
+    def cancelUntil(self, lvl: int):
+        if len(self.trailLim) <= lvl:
+            return;
+        trail = self.trail;
+        val = self.val;
+        activity = self.activity;
+        heap = self.heap;
+        start = self.trailLim[lvl];
+        for i in range(len(trail) - 1, start - 1, -1):
+            lit = trail[i];
+            v = lit >> 1;
+            val[lit] = UNDEF;
+            val[lit ^ 1] = UNDEF;
+            self.reason[v] = -1;
+            self.polarity[v] = lit & 1;
+            heapq.heappush(heap, (-activity[v], v));
+        del trail[start:];
+        del self.trailLim[lvl:];
+        self.qhead = start;
+        # drop stale heap entries once they dominate:
+        if len(heap) > 4*self.nvars + 100:
+            self.heap = [ (-activity[u], u) for u in range(self.nvars) if val[2*u] == UNDEF ];
+            heapq.heapify(self.heap);
+        return;
+
+    def propagate(self) -> int:
+        '''
+        Unit propagation over the two watched literals. Returns a conflicting clause or -1.
+        '''
+        pool = self.pool;
+        val = self.val;
+        watches = self.watches;
+        trail = self.trail;
+        level = self.level;
+        reason = self.reason;
+        lvl = len(self.trailLim);
+        qhead = self.qhead;
+        confl = -1;
+        while qhead < len(trail):
+            fl = trail[qhead] ^ 1;
+            qhead += 1;
+            ws = watches[fl];
+            m = len(ws);
+            i = 0;
+            j = 0;
+            while i < m:
+                ref = ws[i];
+                i += 1;
+                size = pool[ref - 1];
+                if size <= 0:
+                    continue;
+                # make sure the false literal is lit_1:
+                first = pool[ref];
+                if first == fl:
+                    first = pool[ref + 1];
+                    pool[ref] = first;
+                    pool[ref + 1] = fl;
+                if val[first] == TRUE:
+                    ws[j] = ref;
+                    j += 1;
+                    continue;
+                # look for a new literal to watch:
+                k = ref + 2;
+                end = ref + size;
+                while k < end:
+                    q = pool[k];
+                    if val[q] != FALSE:
+                        pool[ref + 1] = q;
+                        pool[k] = fl;
+                        watches[q].append(ref);
+                        break;
+                    k += 1;
+                if k < end:
+                    continue;
+                # clause is unit or conflicting:
+                ws[j] = ref;
+                j += 1;
+                if val[first] == FALSE:
+                    confl = ref;
+                    while i < m:
+                        ws[j] = ws[i];
+                        j += 1;
+                        i += 1;
+                else:
+                    v = first >> 1;
+                    val[first] = TRUE;
+                    val[first ^ 1] = FALSE;
+                    level[v] = lvl;
+                    reason[v] = ref;
+                    trail.append(first);
+            del ws[j:];
+            if confl >= 0:
+                qhead = len(trail);
+                break;
+        self.stats['propagations'] += qhead - self.qhead;
+        self.qhead = qhead;
+        return confl;
+
+    def analyze(self, confl: int) -> Tuple[List[int], int]:
+        '''
+        First unique implication point learning. Returns (learnt clause, backtrack level);
+        learnt[0] is the asserting literal and learnt[1] (if any) has the backtrack level.
+        '''
+        pool = self.pool;
+        level = self.level;
+        reason = self.reason;
+        trail = self.trail;
+        seen = bytearray(self.nvars);
+        lvl = len(self.trailLim);
+        learnt: List[int] = [ -1 ];
+        pathC = 0;
+        p = -1;
+        index = len(trail) - 1;
+        while True:
+            if confl in self.clauseAct:
+                self.bumpClause(confl);
+            size = pool[confl - 1];
+            # for reasons, lit_0 is the implied literal p itself:
+            for k in range(confl if p < 0 else confl + 1, confl + size):
+                q = pool[k];
+                v = q >> 1;
+                if not seen[v] and level[v] > 0:
+                    self.bumpVar(v);
+                    seen[v] = 1;
+                    if level[v] >= lvl:
+                        pathC += 1;
+                    else:
+                        learnt.append(q);
+            while not seen[trail[index] >> 1]:
+                index -= 1;
+            p = trail[index];
+            index -= 1;
+            confl = reason[p >> 1];
+            seen[p >> 1] = 0;
+            pathC -= 1;
+            if pathC == 0:
+                break;
+        learnt[0] = p ^ 1;
+        # minimisation: drop literals implied by the remaining ones (recursively, as in MiniSat)
+        abstract = 0;
+        for q in learnt[1:]:
+            abstract |= 1 << (level[q >> 1] & 31);
+        minimised = [ learnt[0] ];
+        for q in learnt[1:]:
+            if reason[q >> 1] < 0 or not self.isRedundant(q, abstract, seen):
+                minimised.append(q);
+        learnt = minimised;
+        if len(learnt) == 1:
+            return learnt, 0;
+        # move a literal of the highest remaining level to position 1:
+        m = max(range(1, len(learnt)), key=lambda i: level[learnt[i] >> 1]);
+        learnt[1], learnt[m] = learnt[m], learnt[1];
+        return learnt, level[learnt[1] >> 1];
+
+    def isRedundant(self, p: int, abstract: int, seen: bytearray) -> bool:
+        '''
+        Whether the literal p of a learnt clause is implied by the other literals (marked in seen).
+        Variables found to be implied stay marked; those of a failed attempt are unmarked again.
+        `abstract` is a bitmask of the levels in the clause, to give up early on literals of other levels.
+        '''
+        pool = self.pool;
+        level = self.level;
+        reason = self.reason;
+        stack: List[int] = [ p ];
+        marked: List[int] = [];
+        while len(stack) > 0:
+            ref = reason[stack.pop() >> 1];
+            for k in range(ref + 1, ref + pool[ref - 1]):
+                q = pool[k];
+                v = q >> 1;
+                if seen[v] or level[v] == 0:
+                    continue;
+                if reason[v] >= 0 and (abstract >> (level[v] & 31)) & 1:
+                    seen[v] = 1;
+                    stack.append(q);
+                    marked.append(v);
+                else:
+                    for u in marked:
+                        seen[u] = 0;
+                    return False;
+        return True;
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # activities
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def bumpVar(self, v: int):
+        activity = self.activity;
+        activity[v] += self.varInc;
+        if activity[v] > RESCALE_LIMIT:
+            for u in range(self.nvars):
+                activity[u] *= 1/RESCALE_LIMIT;
+            self.varInc *= 1/RESCALE_LIMIT;
+            self.heap = [ (-activity[u], u) for u in range(self.nvars) if self.val[2*u] == UNDEF ];
+            heapq.heapify(self.heap);
+        elif self.val[2*v] == UNDEF:
+            heapq.heappush(self.heap, (-activity[v], v));
+        return;
+
+    def bumpClause(self, ref: int):
+        act = self.clauseAct;
+        act[ref] += self.clauseInc;
+        if act[ref] > RESCALE_LIMIT:
+            for r in act:
+                act[r] *= 1/RESCALE_LIMIT;
+            self.clauseInc *= 1/RESCALE_LIMIT;
+        return;
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # clause database
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def attach(self, lits: List[int], learnt: bool = False) -> int:
+        pool = self.pool;
+        pool.append(len(lits));
+        ref = len(pool);
+        pool.extend(lits);
+        self.watches[lits[0]].append(ref);
+        self.watches[lits[1]].append(ref);
+        if learnt:
+            self.learnts.append(ref);
+            self.clauseAct[ref] = 0.0;
+            self.stats['learnts'] += 1;
+        else:
+            self.nclauses += 1;
+        return ref;
+
+    def isLocked(self, ref: int) -> bool:
+        lit = self.pool[ref];
+        return self.val[lit] == TRUE and self.reason[lit >> 1] == ref;
+
+    def reduceLearnts(self):
+        '''
+        Deletes the less active half of the learnt clauses (binary clauses and current reasons are kept).
+        '''
+        act = self.clauseAct;
+        pool = self.pool;
+        learnts = sorted(self.learnts, key=lambda ref: act[ref]);
+        limit = self.clauseInc / max(len(learnts), 1);
+        keep: List[int] = [];
+        for i, ref in enumerate(learnts):
+            size = pool[ref - 1];
+            if size > 2 and not self.isLocked(ref) and (i < len(learnts) // 2 or act[ref] < limit):
+                pool[ref - 1] = -size;
+                del act[ref];
+                self.wasted += size + 1;
+                self.stats['deleted'] += 1;
+            else:
+                keep.append(ref);
+        self.learnts = keep;
+        if 2*self.wasted > len(pool):
+            self.collectGarbage();
+        return;
+
+    def collectGarbage(self):
+        '''
+        Compacts the clause array, dropping deleted clauses, and renumbers all clause references.
+        '''
+        pool = self.pool;
+        fresh = array('i');
+        moved: Dict[int, int] = dict();
+        ref = 1;
+        while ref <= len(pool):
+            size = pool[ref - 1];
+            if size > 0:
+                fresh.append(size);
+                moved[ref] = len(fresh);
+                fresh.extend(pool[ref:ref + size]);
+            ref += abs(size) + 1;
+        self.pool = fresh;
+        self.watches = [ [ moved[r] for r in ws if r in moved ] for ws in self.watches ];
+        self.reason = [ moved.get(r, -1) if r >= 0 else -1 for r in self.reason ];
+        self.learnts = [ moved[r] for r in self.learnts ];
+        self.clauseAct = { moved[r]: a for r, a in self.clauseAct.items() };
+        self.wasted = 0;
+        return;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS: clauses of expressions
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def encodeClauses(clauses: Iterable[Clause]) -> Tuple[List[List[int]], List[SharedExpression]]:
+    '''
+    Numbers the atoms of clauses of (sign, atom) literals (see src/fol/normalform.py).
+    Returns the DIMACS clauses and the atoms, atom k-1 being variable k.
+    The constants 1 and 0 become variables fixed by a unit clause.
+    '''
+    index: Dict[SharedExpression, int] = dict();
+    atoms: List[SharedExpression] = [];
+    result: List[List[int]] = [];
+    for clause in clauses:
+        lits: List[int] = [];
+        for positive, atom in clause:
+            k = index.get(atom);
+            if k is None:
+                atoms.append(atom);
+                k = index[atom] = len(atoms);
+                if atom.kind in ['tautology', 'contradiction']:
+                    result.append([ k if atom.kind == 'tautology' else -k ]);
+            lits.append(k if positive else -k);
+        result.append(lits);
+    return result, atoms;
+
+def solveClauses(clauses: Iterable[Clause]) -> Union[Dict[SharedExpression, bool], None]:
+    '''
+    Satisfying assignment of the atoms of the clauses, or None if they are unsatisfiable.
+    '''
+    cnf, atoms = encodeClauses(clauses);
+    solver = SatSolver(len(atoms));
+    if not solver.addClauses(cnf) or not solver.solve():
+        return None;
+    return { atom: solver.model[k] for k, atom in enumerate(atoms) };
+
+def findModel(fml: Union[Expression, SharedExpression]) -> Union[Dict[str, bool], None]:
+    '''
+    Satisfying assignment of a quantifier-free formula (propositional or ground first order),
+    keyed by the atoms as strings, or None if the formula is unsatisfiable.
+    Auxiliary atoms of the clausal form are not reported.
+    '''
+    t = fml if isinstance(fml, SharedExpression) else SharedExpression.fromExpression(fml);
+    atoms = atomsOf(t);
+    model = solveClauses(clausalForm(t));
+    if model is None:
+        return None;
+    return { str(atom): model.get(atom, False) for atom in atoms };
+
+def isSatisfiableSat(fml: Union[Expression, SharedExpression]) -> bool:
+    return findModel(fml) is not None;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def luby(k: int) -> int:
+    # k-th element (from 0) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8, ...
+    size = 1;
+    seq = 0;
+    while size < k + 1:
+        seq += 1;
+        size = 2*size + 1;
+    while size - 1 != k:
+        size = (size - 1) >> 1;
+        seq -= 1;
+        k = k % size;
+    return 1 << seq;
+
+def atomsOf(fml: SharedExpression) -> List[SharedExpression]:
+    atoms: Dict[SharedExpression, None] = dict();
+    seen: Dict[SharedExpression, None] = dict();
+    stack: List[SharedExpression] = [ fml ];
+    while len(stack) > 0:
+        t = stack.pop();
+        if t in seen:
+            continue;
+        seen[t] = None;
+        if t.kind in ['relationexpression', 'atom']:
+            atoms[t.withOuterBraces(False)] = None;
+            continue;
+        stack.extend(reversed(t.parts));
+    return list(atoms);
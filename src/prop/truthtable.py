@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import annotations;
+from typing import Dict;
+from typing import Iterator;
+from typing import List;
+from typing import Sequence;
+from typing import Set;
+from typing import Tuple;
+from typing import Union;
+
+from src.core.traversal import foldDag;
+from src.fol.classes import Expression;
+from src.fol.shared import SharedExpression;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# NOTE: A truth table over n atoms is a single integer of 2^n bits: bit r is the value of the formula
+# under the assignment in which the i-th atom is true iff bit i of r is set.
+# Connectives thus evaluate all 2^n assignments at once as integer bit operations.
+MAX_ATOMS: int = 30;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# CLASS: TruthTable
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TruthTable(object):
+    atoms: Tuple[str, ...];
+    bits:  int;
+
+    def __init__(self, atoms: Sequence[str], bits: int):
+        self.atoms = tuple(atoms);
+        self.bits  = bits;
+        return;
+
+    def __len__(self) -> int:
+        return 1 << len(self.atoms);
+
+    def __eq__(self, o) -> bool:
+        return isinstance(o, TruthTable) and self.atoms == o.atoms and self.bits == o.bits;
+
+    def __hash__(self) -> int:
+        return hash((self.atoms, self.bits));
+
+    def __repr__(self) -> str:
+        return '<TruthTable {} atoms, {} models>'.format(len(self.atoms), self.countModels());
+
+    def __getitem__(self, assignment: Dict[str, bool]) -> bool:
+        row = sum([ 1 << i for i, atom in enumerate(self.atoms) if assignment[atom] ]);
+        return bool((self.bits >> row) & 1);
+
+    @property
+    def mask(self) -> int:
+        return (1 << len(self)) - 1;
+
+    def isTautology(self) -> bool:
+        return self.bits == self.mask;
+
+    def isSatisfiable(self) -> bool:
+        return self.bits != 0;
+
+    def isContradiction(self) -> bool:
+        return self.bits == 0;
+
+    def countModels(self) -> int:
+        # int.bit_count is Python 3.10+:
+        if hasattr(self.bits, 'bit_count'):
+            return self.bits.bit_count();
+        return bin(self.bits).count('1');
+
+    def models(self) -> Iterator[Dict[str, bool]]:
+        # scan bytes rather than single bits, as shifting a 2^n bit integer per row is quadratic:
+        data = self.bits.to_bytes((len(self) + 7) // 8, 'little');
+        for k, byte in enumerate(data):
+            while byte != 0:
+                low = byte & -byte;
+                row = 8*k + low.bit_length() - 1;
+                byte ^= low;
+                yield { atom: bool((row >> i) & 1) for i, atom in enumerate(self.atoms) };
+        return;
+
+    def extend(self, atoms: Sequence[str]) -> TruthTable:
+        '''
+        The same function as a truth table over a superset of atoms (in the given order).
+        '''
+        atoms = tuple(atoms);
+        if atoms == self.atoms:
+            return self;
+        if not set(self.atoms) <= set(atoms):
+            raise Exception('Atoms \033[1m{}\033[0m do not contain all atoms of the table!'.format(', '.join(atoms)));
+        n = len(atoms);
+        columns = [ atomColumn(atoms.index(atom), n) for atom in self.atoms ];
+        return TruthTable(atoms, selectRows(self.bits, columns, n));
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# MAIN METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def truthTable(fml: Union[Expression, SharedExpression], atoms: Union[Sequence[str], None] = None) -> TruthTable:
+    '''
+    Evaluates a propositional formula under all assignments of its atoms (or of the given atoms) at once.
+    Atoms are identified by their symbol; identical subformulas are evaluated once.
+    '''
+    t = fml if isinstance(fml, SharedExpression) else SharedExpression.fromExpression(fml);
+    atoms = tuple(atomsOf(t) if atoms is None else atoms);
+    n = len(atoms);
+    if n > MAX_ATOMS:
+        raise Exception('Truth tables are limited to \033[1m{}\033[0m atoms!'.format(MAX_ATOMS));
+    index = { atom: i for i, atom in enumerate(atoms) };
+    mask = (1 << (1 << n)) - 1;
+
+    def combine(t: SharedExpression, r: List[int]) -> int:
+        kind = t.kind;
+        if kind == 'atom':
+            if not t.symbol in index:
+                raise Exception('Atom \033[1m{}\033[0m not in the list of atoms!'.format(t.symbol));
+            return atomColumn(index[t.symbol], n);
+        elif kind == 'tautology':
+            return mask;
+        elif kind == 'contradiction':
+            return 0;
+        elif kind == 'not':
+            return mask ^ r[0];
+        elif kind == 'and':
+            value = mask;
+            for x in r:
+                value &= x;
+            return value;
+        elif kind == 'or':
+            value = 0;
+            for x in r:
+                value |= x;
+            return value;
+        elif kind == 'implies':
+            return (mask ^ r[0]) | r[1];
+        elif kind == 'iff':
+            return mask ^ (r[0] ^ r[1]);
+        raise Exception('Cannot evaluate expressions of kind \033[1m{}\033[0m!'.format(kind));
+
+    return TruthTable(atoms, foldDag(t, combine));
+
+def isTautology(fml: Union[Expression, SharedExpression]) -> bool:
+    return truthTable(fml).isTautology();
+
+def isSatisfiable(fml: Union[Expression, SharedExpression]) -> bool:
+    return truthTable(fml).isSatisfiable();
+
+def isContradiction(fml: Union[Expression, SharedExpression]) -> bool:
+    return truthTable(fml).isContradiction();
+
+def countModels(fml: Union[Expression, SharedExpression]) -> int:
+    return truthTable(fml).countModels();
+
+def areEquivalent(fml1: Union[Expression, SharedExpression], fml2: Union[Expression, SharedExpression]) -> bool:
+    t1 = fml1 if isinstance(fml1, SharedExpression) else SharedExpression.fromExpression(fml1);
+    t2 = fml2 if isinstance(fml2, SharedExpression) else SharedExpression.fromExpression(fml2);
+    atoms = list(dict.fromkeys(atomsOf(t1) + atomsOf(t2)));
+    return truthTable(t1, atoms).bits == truthTable(t2, atoms).bits;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def atomsOf(fml: Union[Expression, SharedExpression]) -> List[str]:
+    # symbols of the atoms in order of first occurrence; shared subformulas are visited once:
+    t = fml if isinstance(fml, SharedExpression) else SharedExpression.fromExpression(fml);
+    atoms: Dict[str, None] = dict();
+    seen: Set[SharedExpression] = set();
+    stack: List[SharedExpression] = [ t ];
+    while len(stack) > 0:
+        t = stack.pop();
+        if t in seen:
+            continue;
+        seen.add(t);
+        if t.kind == 'atom':
+            atoms[t.symbol] = None;
+        stack.extend(reversed(t.parts));
+    return list(atoms);
+
+def atomColumn(i: int, n: int) -> int:
+    '''
+    Bits r of 0 <= r < 2^n with bit i of r set, i.e. blocks of 2^i zeros and 2^i ones.
+    Built by doubling, which takes O(n) big integer operations.
+    '''
+    width = 1 << i;
+    column = ((1 << width) - 1) << width;
+    period = width << 1;
+    size = 1 << n;
+    while period < size:
+        column |= column << period;
+        period <<= 1;
+    return column;
+
+def selectRows(bits: int, columns: List[int], n: int) -> int:
+    # value of the table `bits` over k atoms, reading atom i from columns[i] of a table over n atoms:
+    mask = (1 << (1 << n)) - 1;
+    result = 0;
+    for row in range(1 << len(columns)):
+        if not (bits >> row) & 1:
+            continue;
+        selection = mask;
+        for i, column in enumerate(columns):
+            selection &= column if (row >> i) & 1 else mask ^ column;
+        result |= selection;
+    return result;
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import os;
+import sys;
+import gc;
+import json;
+import platform;
+import subprocess;
+import tracemalloc;
+from argparse import ArgumentParser;
+from argparse import Namespace;
+from copy import deepcopy;
+from datetime import datetime;
+from timeit import default_timer as timer;
+from typing import Any;
+from typing import Callable;
+from typing import Dict;
+from typing import List;
+from typing import Tuple;
+sys.tracebacklimit = 1; # <- DEVNOTE: for debugging, raise this value!
+sys.path.insert(0, os.getcwd());
+
+from src.core.log import logInfo;
+from src.core.log import logWarn;
+from src.core.log import logFatal;
+from src.core.traversal import preOrder;
+from src.core.utils import getAttribute;
+from src.core.utils import readConfig;
+from src.fol.classes import Expression;
+from src.fol.construction import And;
+from src.fol.construction import Function;
+from src.fol.construction import FunctionExpression;
+from src.fol.construction import Implies;
+from src.fol.construction import QuantifiedAll;
+from src.fol.construction import QuantifiedExists;
+from src.fol.construction import Relation;
+from src.fol.construction import RelationExpression;
+from src.fol.construction import Variable;
+from src.fol.parser import parseFolExprs;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL VARIABLE
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+PATH_CONFIG: str;
+CONFIG: dict;
+BENCHMARK: dict;
+
+# NOTE: Every corpus is a family of formulae with one size parameter, built with the builders of construction.py
+# and given as text in the syntax of the parser; both must agree, which is checked before measuring.
+# Times are the best of ‘repeat‘ runs; peak memory is measured (with tracemalloc) in a separate run,
+# as tracing slows down allocations. Both are also given per node of the corpus, so that sizes can be compared.
+# As with timeit, garbage collection is off while timing and fast operations are looped so that every timed run lasts at least MIN_SECONDS.
+Corpus = Tuple[Callable[[], Expression], str];
+OPERATIONS: List[str] = [ 'construct', 'parse', 'str', 'expr', 'eq', 'deepcopy' ];
+MIN_SECONDS: float = 0.05;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# MAIN METHOD
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def main():
+    args = parseArguments(*sys.argv[1:]);
+    setup(args.config);
+    results = runBenchmarks(BENCHMARK);
+    report = dict(meta=metadata(), results=results);
+    if args.output is not None:
+        if os.path.dirname(args.output) != '':
+            os.makedirs(os.path.dirname(args.output), exist_ok=True);
+        with open(args.output, 'w') as fp:
+            json.dump(report, fp, indent=2);
+        logInfo('Results written to \033[1m{}\033[0m.'.format(args.output));
+    if args.compare is not None:
+        with open(args.compare, 'r') as fp:
+            baseline = json.load(fp);
+        regressions = compareResults(baseline, report, args.tolerance);
+        if regressions > 0:
+            sys.exit(1);
+    return;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# SECONDARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def parseArguments(*args: str) -> Namespace:
+    parser = ArgumentParser(prog='benchmark.py');
+    parser.add_argument('config', type=str, help='path to config file');
+    parser.add_argument('--output', type=str, default=None, help='write the results as JSON to this file');
+    parser.add_argument('--compare', type=str, default=None, help='JSON results of an earlier run to compare against');
+    parser.add_argument('--tolerance', type=float, default=0.25, help='relative slow-down (or growth in memory) reported as a regression');
+    return parser.parse_args(args);
+
+def setup(path: str, *_):
+    global PATH_CONFIG;
+    global CONFIG;
+    global BENCHMARK;
+    PATH_CONFIG = path;
+    CONFIG = readConfig(PATH_CONFIG);
+    BENCHMARK = getAttribute(CONFIG, 'parts', 'benchmark');
+    return;
+
+def runBenchmarks(spec: dict) -> List[Dict[str, Any]]:
+    repeat = getAttribute(spec, 'repeat', expectedtype=int, default=1);
+    operations = getAttribute(spec, 'operations', expectedtype=list, default=OPERATIONS);
+    results: List[Dict[str, Any]] = [];
+    for corpus in getAttribute(spec, 'corpora', expectedtype=list, default=[]):
+        family = getAttribute(corpus, 'family', expectedtype=str);
+        for size in getAttribute(corpus, 'sizes', expectedtype=list, default=[]):
+            build, text = makeCorpus(family, size);
+            fml = build();
+            parsed = parseFolExprs(text);
+            if not (len(parsed) == 1 and parsed[0] == fml):
+                logFatal('Corpus \033[1m{}\033[0m of size {}: text and construction disagree.'.format(family, size));
+            nodes = len(list(preOrder(fml)));
+            other = deepcopy(fml);
+            for operation in operations:
+                action = getAction(operation, build, text, fml, other);
+                number = calibrate(action);
+                seconds = [ measureTime(action, number) for _ in range(repeat) ];
+                peak = measurePeak(action);
+                results.append(dict(
+                    corpus           = family,
+                    size             = size,
+                    nodes            = nodes,
+                    operation        = operation,
+                    seconds          = min(seconds),
+                    secondsMean      = sum(seconds)/len(seconds),
+                    secondsPerNode   = min(seconds)/nodes,
+                    peakBytes        = peak,
+                    peakBytesPerNode = peak/nodes,
+                ));
+                logInfo('{:<12} {:>6} {:<9} {:>10.3f} ms  {:>8.3f} µs/node  {:>10.1f} B/node'.format(
+                    family, size, operation, 1e3*min(seconds), 1e6*min(seconds)/nodes, peak/nodes));
+    return results;
+
+def compareResults(baseline: dict, report: dict, tolerance: float) -> int:
+    previous = { (r['corpus'], r['size'], r['operation']): r for r in getAttribute(baseline, 'results', expectedtype=list, default=[]) };
+    regressions = 0;
+    for r in report['results']:
+        key = (r['corpus'], r['size'], r['operation']);
+        old = previous.get(key);
+        if old is None:
+            continue;
+        timeRatio = r['seconds']/old['seconds'] if old['seconds'] > 0 else 1.;
+        memoryRatio = r['peakBytes']/old['peakBytes'] if old['peakBytes'] > 0 else 1.;
+        line = '{:<12} {:>6} {:<9} time x{:.2f}  memory x{:.2f}'.format(*key, timeRatio, memoryRatio);
+        if timeRatio > 1. + tolerance or memoryRatio > 1. + tolerance:
+            regressions += 1;
+            logWarn(line);
+        else:
+            logInfo(line);
+    commit = getAttribute(baseline, 'meta', 'commit', default=None) if 'meta' in baseline else None;
+    logInfo('Compared with \033[1m{}\033[0m: {} regressions.'.format(commit or 'baseline', regressions));
+    return regressions;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS: measurement
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def getAction(operation: str, build: Callable[[], Expression], text: str, fml: Expression, other: Expression) -> Callable[[], Any]:
+    if operation == 'construct':
+        return build;
+    elif operation == 'parse':
+        return lambda: parseFolExprs(text);
+    elif operation == 'str':
+        return lambda: str(fml);
+    elif operation == 'expr':
+        return lambda: fml.expr;
+    elif operation == 'eq':
+        return lambda: fml == other;
+    elif operation == 'deepcopy':
+        return lambda: deepcopy(fml);
+    raise Exception('Unknown operation \033[1m{}\033[0m!'.format(operation));
+
+def calibrate(action: Callable[[], Any]) -> int:
+    number = 1;
+    while True:
+        if measureTime(action, number)*number >= MIN_SECONDS:
+            return number;
+        number *= 2;
+
+def measureTime(action: Callable[[], Any], number: int = 1) -> float:
+    enabled = gc.isenabled();
+    gc.disable();
+    try:
+        t0 = timer();
+        for _ in range(number):
+            action();
+        t1 = timer();
+    finally:
+        if enabled:
+            gc.enable();
+    return (t1 - t0)/number;
+
+def measurePeak(action: Callable[[], Any]) -> int:
+    tracemalloc.start();
+    try:
+        action();
+        _, peak = tracemalloc.get_traced_memory();
+    finally:
+        tracemalloc.stop();
+    return peak;
+
+def metadata() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip();
+    except:
+        commit = None;
+    return dict(
+        commit    = commit,
+        python    = platform.python_version(),
+        platform  = platform.platform(),
+        timestamp = datetime.now().isoformat(timespec='seconds'),
+    );
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS: corpora
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def makeCorpus(family: str, size: int) -> Corpus:
+    '''
+    conjunction: ‘size‘ atoms joined by &&;
+    implication: a chain (A_1 -> (A_2 -> ... )) of ‘size‘ implications;
+    quantifiers: ‘size‘ nested quantifiers, alternately all and ex;
+    term: an atom over a balanced binary term of depth ‘size‘.
+    '''
+    if family == 'conjunction':
+        build = lambda: And(*[ atom(k) for k in range(size) ]);
+        return build, ' && '.join([ atomText(k) for k in range(size) ]);
+    elif family == 'implication':
+        def build() -> Expression:
+            fml = atom(size);
+            for k in range(size-1, -1, -1):
+                fml = Implies(atom(k), fml);
+            return fml;
+        return build, ''.join([ '({} -> '.format(atomText(k)) for k in range(size) ]) + atomText(size) + ')'*size;
+    elif family == 'quantifiers':
+        def build() -> Expression:
+            fml = RelationExpression(Relation('R', None, False, False), variable(0), variable(size-1));
+            for k in range(size-1, -1, -1):
+                fml = (QuantifiedAll if k % 2 == 0 else QuantifiedExists)(variable(k), fml);
+            return fml;
+        prefix = ''.join([ '{} x_{{{}}}. '.format('all' if k % 2 == 0 else 'ex', k) for k in range(size) ]);
+        return build, prefix + 'R(x_{{0}},x_{{{}}})'.format(size-1);
+    elif family == 'term':
+        def build() -> Expression:
+            t = Variable('x', None, False, False);
+            for k in range(size):
+                t = FunctionExpression(Function('f', str(k % 3), False, False), t, t);
+            return RelationExpression(Relation('P', None, False, False), t);
+        def text() -> str:
+            t = 'x';
+            for k in range(size):
+                t = 'f_{{{}}}({},{})'.format(k % 3, t, t);
+            return 'P({})'.format(t);
+        return build, text();
+    raise Exception('Unknown corpus family \033[1m{}\033[0m!'.format(family));
+
+def variable(k: int) -> Expression:
+    return Variable('x', str(k), False, False);
+
+def atom(k: int) -> Expression:
+    return RelationExpression(Relation('P', str(k % 10), False, False), variable(k % 5));
+
+def atomText(k: int) -> str:
+    return 'P_{{{}}}(x_{{{}}})'.format(k % 10, k % 5);
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# EXECUTION
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__ == '__main__':
+    main();
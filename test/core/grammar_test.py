@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import glob;
+import os;
+import pickle;
+import tempfile;
+import unittest;
+from unittest import mock;
+
+from src.core.grammar import ENV_CACHE_DIR;
+from src.core.grammar import grammarCacheDir;
+from src.core.grammar import grammarPath;
+from src.core.grammar import loadGrammar;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+GRAMMAR = '''
+start: item ("," item)*
+item: WORD | "(" start ")"
+%import common.WORD
+%import common.WS
+%ignore WS
+''';
+
+EXAMPLE = 'a, (b, c), d';
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def loadGrammarWith(directory: str, path: str, **options):
+    with mock.patch.dict(os.environ, { ENV_CACHE_DIR: directory }):
+        return loadGrammar(path, **options);
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestGrammarCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory();
+        self.path = os.path.join(self.folder.name, 'example.lark');
+        with open(self.path, 'w') as fp:
+            fp.write(GRAMMAR);
+        self.cache = os.path.join(self.folder.name, 'cache');
+        self.expected = loadGrammarWith('', self.path).parse(EXAMPLE);
+        return;
+
+    def tearDown(self):
+        self.folder.cleanup();
+        return;
+
+    def entries(self):
+        return glob.glob(os.path.join(self.cache, 'grammar-*.pickle'));
+
+    def test_written_and_loaded(self):
+        parser = loadGrammarWith(self.cache, self.path);
+        entries = self.entries();
+        self.assertEqual(len(entries), 1);
+        self.assertEqual(parser.parse(EXAMPLE), self.expected);
+        # the second call loads the entry rather than building the parser:
+        with mock.patch('lark.Lark.__init__', side_effect=AssertionError('rebuilt')):
+            parser = loadGrammarWith(self.cache, self.path);
+        self.assertEqual(parser.parse(EXAMPLE), self.expected);
+        self.assertEqual(self.entries(), entries);
+        # other options give another entry:
+        loadGrammarWith(self.cache, self.path, parser='lalr');
+        self.assertEqual(len(self.entries()), 2);
+
+    def test_corrupt_entry_is_rebuilt(self):
+        loadGrammarWith(self.cache, self.path);
+        entry = self.entries()[0];
+        with open(entry, 'rb') as fp:
+            data = fp.read();
+        for corrupt in [ data[:len(data) // 2], b'garbage', b'', pickle.dumps('not a parser') ]:
+            with open(entry, 'wb') as fp:
+                fp.write(corrupt);
+            parser = loadGrammarWith(self.cache, self.path);
+            self.assertEqual(parser.parse(EXAMPLE), self.expected);
+            # the entry has been replaced by a valid one:
+            with mock.patch('lark.Lark.__init__', side_effect=AssertionError('rebuilt')):
+                loadGrammarWith(self.cache, self.path);
+        self.assertEqual(self.entries(), [ entry ]);
+        self.assertEqual(glob.glob(os.path.join(self.cache, '*.tmp')), []);
+
+    def test_disabled(self):
+        with mock.patch.dict(os.environ, { ENV_CACHE_DIR: '' }):
+            self.assertIsNone(grammarCacheDir());
+        parser = loadGrammarWith('', self.path);
+        self.assertEqual(parser.parse(EXAMPLE), self.expected);
+        self.assertFalse(os.path.exists(self.cache));
+
+    def test_repository_grammar(self):
+        parser = loadGrammarWith(self.cache, grammarPath('fol.lark'), start='search', regex=True);
+        self.assertEqual(len(self.entries()), 1);
+        other = loadGrammarWith(self.cache, grammarPath('fol.lark'), start='search', regex=True);
+        self.assertIsNot(other, parser);
+        self.assertEqual(other.parse('P(x) -> Q(y)'), parser.parse('P(x) -> Q(y)'));
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import io;
+import unittest;
+from contextlib import redirect_stderr;
+from contextlib import redirect_stdout;
+
+from src.core.log import logError;
+from src.core.log import logInfo;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestLog(unittest.TestCase):
+    def test_streams(self):
+        out, err = io.StringIO(), io.StringIO();
+        with redirect_stdout(out), redirect_stderr(err):
+            logInfo('done');
+            logError('line 2, column 1', 'second');
+        self.assertIn('INFO', out.getvalue());
+        self.assertNotIn('ERROR', out.getvalue());
+        self.assertEqual(len(err.getvalue().splitlines()), 2);
+        self.assertIn('line 2, column 1', err.getvalue());
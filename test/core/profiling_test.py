@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import io;
+import json;
+import os;
+import tempfile;
+import unittest;
+from contextlib import redirect_stdout;
+from unittest import mock;
+
+from src.core.profiling import ENV_PROFILE;
+from src.core.profiling import ENV_PROFILE_MEMORY;
+from src.core.profiling import NO_PHASE;
+from src.core.profiling import PROFILER;
+from src.core.profiling import Phase;
+from src.core.profiling import Profiler;
+from src.core.profiling import configureFromEnvironment;
+from src.core.profiling import profileTarget;
+from src.fol.parser import parseFolExpr;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestProfiler(unittest.TestCase):
+    def test_enabled(self):
+        profiler = Profiler();
+        profiler.enable();
+        phase = profiler.phase('outer');
+        self.assertIsInstance(phase, Phase);
+        with phase:
+            with profiler.phase('inner'):
+                pass;
+            with profiler.phase('inner'):
+                pass;
+        profiler.count('things');
+        profiler.count('things', 4);
+        report = profiler.report();
+        self.assertEqual(report['phases']['outer']['calls'], 1);
+        self.assertEqual(report['phases']['inner']['calls'], 2);
+        # phase times are inclusive:
+        self.assertGreaterEqual(report['phases']['outer']['seconds'], report['phases']['inner']['seconds']);
+        self.assertEqual(report['counters'], { 'things': 5 });
+        self.assertEqual(report['snapshots'], []);
+        self.assertNotIn('memory', report);
+        out = io.StringIO();
+        with redirect_stdout(out):
+            profiler.emit();
+        self.assertIn('things', out.getvalue());
+        profiler.reset();
+        self.assertEqual(profiler.report()['phases'], dict());
+
+    def test_memory(self):
+        profiler = Profiler();
+        profiler.enable(memory=True);
+        try:
+            with profiler.phase('allocate'):
+                data = [ list(range(10)) for _ in range(1000) ];
+            profiler.snapshot('after');
+            report = profiler.report();
+        finally:
+            profiler.disable();
+        self.assertGreater(report['phases']['allocate']['allocated'], 0);
+        self.assertEqual([ snapshot['label'] for snapshot in report['snapshots'] ], [ 'after' ]);
+        self.assertIn('peak', report['memory']);
+        self.assertEqual(len(data), 1000);
+
+    def test_disabled(self):
+        profiler = Profiler();
+        self.assertIs(profiler.phase('outer'), NO_PHASE);
+        with profiler.phase('outer'):
+            pass;
+        profiler.snapshot('ignored');
+        self.assertEqual(profiler.report()['phases'], dict());
+        self.assertEqual(profiler.report()['snapshots'], []);
+        # call sites leave the global profiler untouched while it is disabled:
+        self.assertFalse(PROFILER.enabled);
+        PROFILER.reset();
+        parseFolExpr('P(x) -> (all y. Q(x, f(y)))', cache=False);
+        self.assertEqual(PROFILER.report(), dict(phases=dict(), counters=dict(), snapshots=[]));
+
+    def test_write_report(self):
+        profiler = Profiler();
+        profiler.enable();
+        with profiler.phase('work'):
+            profiler.count('items', 3);
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'profile.json');
+            profiler.emit(path);
+            with open(path, 'r') as fp:
+                report = json.load(fp);
+        self.assertEqual(sorted(report), [ 'counters', 'phases', 'snapshots' ]);
+        self.assertEqual(sorted(report['phases']['work']), [ 'allocated', 'calls', 'seconds' ]);
+        self.assertEqual(report['phases']['work']['calls'], 1);
+        self.assertEqual(report['counters'], { 'items': 3 });
+
+class TestEnvironment(unittest.TestCase):
+    def test_profile_target(self):
+        for value, target in [ ('', None), ('0', None), ('1', '-'), ('log', '-'), ('out.json', 'out.json') ]:
+            with mock.patch.dict(os.environ, { ENV_PROFILE: value }):
+                self.assertEqual(profileTarget(), target, value);
+        with mock.patch.dict(os.environ, clear=True):
+            self.assertIsNone(profileTarget());
+
+    def test_configure(self):
+        with mock.patch.dict(os.environ, { ENV_PROFILE: '0' }), \
+            mock.patch('src.core.profiling.PROFILER', Profiler()) as profiler, \
+            mock.patch('atexit.register') as register:
+            configureFromEnvironment();
+            self.assertFalse(profiler.enabled);
+            register.assert_not_called();
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'profile.json');
+            with mock.patch.dict(os.environ, { ENV_PROFILE: path, ENV_PROFILE_MEMORY: '1' }), \
+                mock.patch('src.core.profiling.PROFILER', Profiler()) as profiler, \
+                mock.patch('atexit.register') as register:
+                configureFromEnvironment();
+                try:
+                    self.assertTrue(profiler.enabled);
+                    self.assertTrue(profiler.memory);
+                    register.assert_called_once();
+                    profiler.count('items');
+                    # the handler registered for the exit writes the report:
+                    register.call_args[0][0]();
+                finally:
+                    profiler.disable();
+            with open(path, 'r') as fp:
+                report = json.load(fp);
+        self.assertEqual(report['counters'], { 'items': 1 });
+        self.assertEqual([ snapshot['label'] for snapshot in report['snapshots'] ], [ 'exit' ]);
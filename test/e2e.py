@@ -7,6 +7,20 @@
 
 import os;
 import sys;
+import asyncio;
+import json;
+import shutil;
+import tempfile;
+import tracemalloc;
+from argparse import ArgumentParser;
+from argparse import Namespace;
+from multiprocessing import TimeoutError;
+from multiprocessing import get_context;
+from timeit import default_timer as timer;
+from typing import Any;
+from typing import Dict;
+from typing import List;
+from typing import Union;
 sys.tracebacklimit = 1; # <- DEVNOTE: for debugging, raise this value!
 sys.path.insert(0, os.getcwd());
 
@@ -14,8 +28,23 @@ from src.core.log import logInfo;
 from src.core.log import logWarn;
 from src.core.log import logError;
 from src.core.log import logFatal;
+from src.core.traversal import foldTree;
 from src.core.utils import getAttribute;
 from src.core.utils import readConfig;
+from src.fol.binary import dumpFolBinary;
+from src.fol.binary import loadFolBinary;
+from src.fol.classes import Expression;
+from src.fol.alpha import alphaEquivalent;
+from src.fol.fastparser import parseFolExprsFast;
+from src.fol.normalform import asShared;
+from src.fol.parser import getLexer;
+from src.fol.parser import parseFolExpr;
+from src.fol.parser import parseFolExprs;
+from src.fol.prover import STATUS_SATISFIABLE;
+from src.fol.prover import STATUS_UNSATISFIABLE;
+from src.fol.prover import prove;
+from src.fol.service import FolService;
+from src.fol.service import ServiceClient;
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # GLOBAL VARIABLE
@@ -24,34 +53,277 @@ from src.core.utils import readConfig;
 PATH_CONFIG: str;
 CONFIG: dict;
 TESTCASES: list;
+PARITY: dict;
+SERVICE: Union[dict, None];
+
+# NOTE: Every entry of parts -> test is one case: a formula (input), expectations and an optional budget, e.g.
+#   - name: conjunction
+#     input: 'P(x) && Q(x)'
+#     fastpath: true                   # optional, default true
+#     expect:                          # any combination of
+#       output: 'P(x) && Q(x)'         #   str of the parsed formula
+#       structure: [ and, [ P, x ], [ Q, x ] ]
+#                                      #   tree of labels (resp. kinds of unlabelled nodes), leaves as scalars
+#       valid: true                    #   provable (resp. refutable, if false) by the resolution prover
+#       unsatisfiable: false           #   refutable (resp. not) by the resolution prover
+#       freeVariables: [ x ]           #   labels of the free variables
+#       alphaEquivalent: 'P(y) && Q(y)'#   equal up to renaming of bound variables
+#       error: true                    #   the input must not parse
+#     budget:                          # optional
+#       seconds: 0.5                   #   wall time of the case (also the prover's time limit)
+#       megabytes: 16                  #   peak of memory allocated (tracemalloc, measured in a second run)
+# Cases run in a process pool; a case exceeding TIMEOUT_FACTOR times its time budget
+# (at least MIN_TIMEOUT, at most TIMEOUT) is abandoned.
+MIN_TIMEOUT: float = 1.;
+TIMEOUT: float = 60.;
+TIMEOUT_FACTOR: float = 10.;
+EXPECTATIONS: List[str] = [ 'output', 'structure', 'valid', 'unsatisfiable', 'freeVariables', 'alphaEquivalent', 'error' ];
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # MAIN METHOD
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 def main():
-    setup(*sys.argv[1:]);
-    for testcase in TESTCASES:
-        runTests(testcase);
+    args = parseArguments(*sys.argv[1:]);
+    setup(args.config);
+    runParity(PARITY);
+    runTests(TESTCASES, processes=args.processes, report=args.report);
+    if SERVICE is not None:
+        runService(SERVICE);
     return;
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # SECONDARY METHODS
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+def parseArguments(*args: str) -> Namespace:
+    parser = ArgumentParser(prog='e2e.py');
+    parser.add_argument('config', type=str, help='path to config file');
+    parser.add_argument('--processes', type=int, default=None, help='number of worker processes (default: number of CPUs)');
+    parser.add_argument('--report', type=str, default=None, help='write a summary of the test cases as JSON to this file');
+    return parser.parse_args(args);
+
 def setup(path: str, *_):
     global PATH_CONFIG;
     global CONFIG;
     global TESTCASES;
+    global PARITY;
+    global SERVICE;
     PATH_CONFIG = path;
     CONFIG = readConfig(PATH_CONFIG);
     TESTCASES = getAttribute(CONFIG, 'parts', 'test');
+    PARITY = getAttribute(CONFIG, 'parts', 'parity');
+    SERVICE = getOptional(getAttribute(CONFIG, 'parts'), 'service', None);
+    return;
+
+def runParity(spec: dict):
+    formulae = getAttribute(spec, 'formulae', expectedtype=list, default=[]);
+    repeat = getAttribute(spec, 'repeat', expectedtype=int, default=1);
+    failures = 0;
+    for u in formulae:
+        try:
+            fmls = parseFolExprsFast(u);
+        except:
+            logError('Fast path rejected \033[1m{}\033[0m.'.format(u));
+            failures += 1;
+            continue;
+        expected = parseFolExprs(u, fastpath=False);
+        if not (len(fmls) == len(expected) and all(isIdentical(a, b) for a, b in zip(fmls, expected))):
+            logError('Fast path and Earley parser disagree on \033[1m{}\033[0m.'.format(u));
+            failures += 1;
+        elif not all(isIdentical(a, b) for a, b in zip(fmls, loadFolBinary(dumpFolBinary(fmls)))):
+            logError('Binary round trip changes \033[1m{}\033[0m.'.format(u));
+            failures += 1;
+    if failures > 0:
+        logFatal('Parity check failed for {} of {} formulae.'.format(failures, len(formulae)));
+    logInfo('Parity check passed for {} formulae.'.format(len(formulae)));
+    # throughput comparison:
+    for fastpath in [False, True]:
+        t0 = timer();
+        for _ in range(repeat):
+            for u in formulae:
+                parseFolExprs(u, fastpath=fastpath);
+        dt = timer() - t0;
+        logInfo('{}: {:.0f} formulae/s.'.format('fast path' if fastpath else 'Earley', repeat*len(formulae)/dt));
+    return;
+
+def isIdentical(fml1: Expression, fml2: Expression) -> bool:
+    for key in ['kind', 'label', 'symbol', 'display', 'isLabelled', 'outerBrackets', 'glueOption', 'glueOuterOption']:
+        if not getattr(fml1, key) == getattr(fml2, key):
+            return False;
+    return len(fml1.parts) == len(fml2.parts) and all(isIdentical(a, b) for a, b in zip(fml1.parts, fml2.parts));
+
+def runTests(testcases: List[dict], processes: Union[int, None] = None, report: Union[str, None] = None):
+    if len(testcases) == 0:
+        return;
+    processes = processes or os.cpu_count() or 1;
+    t0 = timer();
+    with get_context().Pool(processes=processes, initializer=initWorker) as pool:
+        pending = [ pool.apply_async(runCase, (case,)) for case in testcases ];
+        outcomes = [ collectCase(case, result) for case, result in zip(testcases, pending) ];
+    dt = timer() - t0;
+    failed = [ outcome for outcome in outcomes if not outcome['passed'] ];
+    for outcome in outcomes:
+        line = outcome['name'];
+        if outcome['seconds'] is not None:
+            line += ' ({:.3f} s{})'.format(outcome['seconds'], '' if outcome['peakBytes'] is None else ', {:.1f} MB'.format(outcome['peakBytes']/2**20));
+        if outcome['passed']:
+            logInfo('Passed \033[1m{}\033[0m.'.format(line));
+        else:
+            logError('Failed \033[1m{}\033[0m:'.format(line), *[ '    {}'.format(message) for message in outcome['failures'] ]);
+    if report is not None:
+        if os.path.dirname(report) != '':
+            os.makedirs(os.path.dirname(report), exist_ok=True);
+        with open(report, 'w') as fp:
+            json.dump(dict(passed=len(outcomes) - len(failed), failed=len(failed), seconds=dt, cases=outcomes), fp, indent=2);
+    if len(failed) > 0:
+        logFatal('{} of {} test cases failed.'.format(len(failed), len(outcomes)));
+    logInfo('All {} test cases passed in {:.2f} s.'.format(len(outcomes), dt));
+    return;
+
+def collectCase(case: dict, result: Any) -> Dict[str, Any]:
+    name = str(getOptional(case, 'name', getOptional(case, 'input', '?')));
+    budget = getOptional(case, 'budget', dict());
+    seconds = getOptional(budget, 'seconds', None);
+    try:
+        return result.get(timeout=TIMEOUT if seconds is None else min(TIMEOUT, max(MIN_TIMEOUT, TIMEOUT_FACTOR*seconds)));
+    except TimeoutError:
+        message = 'abandoned after exceeding its time budget{}'.format('' if seconds is None else ' of {} s'.format(seconds));
+    except Exception as e:
+        message = 'could not be run: {}'.format(e);
+    return dict(name=name, passed=False, failures=[ message ], seconds=None, peakBytes=None);
+
+def runService(spec: dict):
+    requests = getOptional(spec, 'requests', []);
+    load = getOptional(spec, 'load', 0);
+    directory = tempfile.mkdtemp();
+    path = os.path.join(directory, 'logic.sock');
+    def client() -> List[str]:
+        failures: List[str] = [];
+        with ServiceClient(path=path, timeout=TIMEOUT) as connection:
+            for case in requests:
+                request = getAttribute(case, 'request');
+                response = connection.request(**request);
+                if getOptional(case, 'error', False):
+                    if response['ok']:
+                        failures.append('{}: expected an error, got {}'.format(json.dumps(request), json.dumps(response)));
+                    continue;
+                expected = getOptional(case, 'result', None);
+                # expected objects may give only some of the keys:
+                actual = response.get('result');
+                if isinstance(expected, dict) and isinstance(actual, dict):
+                    actual = { key: actual.get(key) for key in expected };
+                if not (response['ok'] and actual == expected):
+                    failures.append('{}: expected {}, got {}'.format(json.dumps(request), json.dumps(expected), json.dumps(response)));
+            responses = connection.requestMany([ dict(op='parse', formula='P_{{{}}}(x) -> Q(f(x))'.format(k)) for k in range(load) ]);
+            if not all(response['ok'] for response in responses):
+                failures.append('{} of {} pipelined requests failed'.format(sum(not response['ok'] for response in responses), load));
+            metrics = connection.request('metrics')['result'];
+            if load > 1 and not metrics['batches'] < metrics['requests']:
+                failures.append('requests were not batched: {} batches for {} requests'.format(metrics['batches'], metrics['requests']));
+            logInfo('Service: {} requests in {} batches, latency p50 {:.1f} ms, p99 {:.1f} ms.'.format(
+                metrics['requests'], metrics['batches'], metrics['latencyMs']['p50'] or 0., metrics['latencyMs']['p99'] or 0.));
+        return failures;
+    async def run() -> List[str]:
+        service = FolService(processes=getOptional(spec, 'processes', 1));
+        await service.start(path=path);
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, client);
+        finally:
+            await service.close();
+    try:
+        failures = asyncio.run(run());
+    finally:
+        shutil.rmtree(directory, ignore_errors=True);
+    if len(failures) > 0:
+        logFatal('Service check failed:', *[ '    {}'.format(message) for message in failures ]);
+    logInfo('Service check passed for {} requests.'.format(len(requests) + load));
     return;
 
-def runTests(testcase: dict):
-    logWarn('Not yet implemented');
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# METHODS: test cases (in worker processes)
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def initWorker():
+    # compile the grammar before any case is timed:
+    getLexer();
     return;
 
+def runCase(case: dict) -> Dict[str, Any]:
+    name = str(getOptional(case, 'name', getOptional(case, 'input', '?')));
+    budget = getOptional(case, 'budget', dict());
+    maxSeconds = getOptional(budget, 'seconds', None);
+    maxMegabytes = getOptional(budget, 'megabytes', None);
+    t0 = timer();
+    failures = checkCase(case, maxSeconds);
+    seconds = timer() - t0;
+    peak = None;
+    if maxMegabytes is not None:
+        tracemalloc.start();
+        try:
+            checkCase(case, maxSeconds);
+            _, peak = tracemalloc.get_traced_memory();
+        finally:
+            tracemalloc.stop();
+    if maxSeconds is not None and seconds > maxSeconds:
+        failures.append('took {:.3f} s, budget {} s'.format(seconds, maxSeconds));
+    if maxMegabytes is not None and peak > maxMegabytes*2**20:
+        failures.append('allocated {:.1f} MB, budget {} MB'.format(peak/2**20, maxMegabytes));
+    return dict(name=name, passed=len(failures) == 0, failures=failures, seconds=seconds, peakBytes=peak);
+
+def checkCase(case: dict, maxSeconds: Union[float, None] = None) -> List[str]:
+    u = getAttribute(case, 'input');
+    fastpath = getOptional(case, 'fastpath', True);
+    expect = getOptional(case, 'expect', dict());
+    unknown = [ key for key in expect if key not in EXPECTATIONS ];
+    if len(unknown) > 0:
+        return [ 'unknown expectations {}'.format(', '.join(unknown)) ];
+    try:
+        fml = parseFolExpr(u, fastpath=fastpath);
+    except Exception as e:
+        return [] if getOptional(expect, 'error', False) else [ 'did not parse: {}'.format(e) ];
+    if getOptional(expect, 'error', False):
+        return [ 'parsed as {}, expected an error'.format(fml) ];
+    failures: List[str] = [];
+    options = dict() if maxSeconds is None else dict(timeLimit=maxSeconds);
+    for key, expected in expect.items():
+        if key == 'output':
+            actual = str(fml);
+        elif key == 'structure':
+            actual = structureOf(fml);
+        elif key == 'valid':
+            actual = proofStatus(prove([], fml, **options), STATUS_UNSATISFIABLE, STATUS_SATISFIABLE);
+        elif key == 'unsatisfiable':
+            actual = proofStatus(prove([ fml ], **options), STATUS_UNSATISFIABLE, STATUS_SATISFIABLE);
+        elif key == 'freeVariables':
+            actual = sorted(asShared(fml).freeVariables);
+            expected = sorted([ str(x) for x in expected ]);
+        elif key == 'alphaEquivalent':
+            actual = alphaEquivalent(fml, parseFolExpr(expected, fastpath=fastpath));
+            expected = True;
+        else:
+            continue;
+        if not actual == expected:
+            failures.append('{}: expected {}, got {}'.format(key, json.dumps(expected), json.dumps(actual)));
+    return failures;
+
+def structureOf(fml: Expression) -> Any:
+    def combine(t: Expression, parts: List[Any]) -> Any:
+        head = t.label if t.isLabelled else t.kind;
+        return [ head ] + parts if len(parts) > 0 else head;
+    return foldTree(fml, combine);
+
+def proofStatus(result: Any, yes: str, no: str) -> Union[bool, str]:
+    # anything undecided (time or clause limit) is reported as the status:
+    if result.status == yes:
+        return True;
+    elif result.status == no:
+        return False;
+    return result.status;
+
+def getOptional(obj: Any, key: str, default: Any) -> Any:
+    return getAttribute(obj, key) if isinstance(obj, dict) and key in obj else default;
+
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # EXECUTION
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest;
+
+from src.fol.alpha import AlphaDict;
+from src.fol.alpha import AlphaSet;
+from src.fol.alpha import alphaEquivalent;
+from src.fol.alpha import alphaHash;
+from src.fol.alpha import deduplicate;
+from src.fol.parser import parseFolExpr;
+from src.fol.shared import SharedExpression;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+EQUIVALENT = [
+    ('all x. P(x)', 'all y. P(y)'),
+    ('all x. (ex y. R(x, y))', 'all y. (ex x. R(y, x))'),
+    ('all x. R(x, z)', 'all y. R(y, z)'),
+    ('(all x. P(x)) && (ex x. Q(x))', '(all y. P(y)) && (ex z. Q(z))'),
+    ('all x. (all x. R(x, x))', 'all y. (all z. R(z, z))'),
+];
+
+DIFFERENT = [
+    # shadowing: y is free on the left, bound on the right:
+    ('all x. R(x, y)', 'all y. R(y, y)'),
+    ('all x. (ex y. R(x, y))', 'all x. (ex y. R(y, x))'),
+    # free variables are not renamed:
+    ('P(x)', 'P(y)'),
+    ('all x. R(x, z)', 'all x. R(x, w)'),
+    ('all x. P(x)', 'ex x. P(x)'),
+    ('all x. (all y. R(x, y))', 'all x. (all y. R(y, x))'),
+];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestAlphaKey(unittest.TestCase):
+    def test_equivalent(self):
+        for u, w in EQUIVALENT:
+            fml1, fml2 = parseFolExpr(u), parseFolExpr(w);
+            self.assertTrue(alphaEquivalent(fml1, fml2), (u, w));
+            self.assertEqual(alphaHash(fml1), alphaHash(fml2));
+            self.assertEqual(hash(fml1), hash(fml2));
+            # shared expressions get the same keys:
+            self.assertTrue(alphaEquivalent(SharedExpression.fromExpression(fml1), fml2));
+
+    def test_different(self):
+        for u, w in DIFFERENT:
+            self.assertFalse(alphaEquivalent(parseFolExpr(u), parseFolExpr(w)), (u, w));
+
+    def test_hash_consistent_with_eq(self):
+        for u, _ in EQUIVALENT + DIFFERENT:
+            fml1, fml2 = parseFolExpr(u), parseFolExpr(u);
+            self.assertEqual(fml1, fml2);
+            self.assertEqual(hash(fml1), hash(fml2));
+            self.assertEqual(len({ fml1, fml2 }), 1);
+
+class TestAlphaCollections(unittest.TestCase):
+    def test_alpha_dict(self):
+        first, second, other = parseFolExpr('all x. P(x)'), parseFolExpr('all y. P(y)'), parseFolExpr('all x. Q(x)');
+        table = AlphaDict();
+        self.assertEqual(table.setdefault(first, 1), 1);
+        self.assertEqual(table.setdefault(second, 2), 1);
+        self.assertIs(table.representative(second), first);
+        table[second] = 3;
+        self.assertEqual(table[first], 3);
+        self.assertIs(table.representative(second), first);
+        self.assertIsNone(table.get(other));
+        table[other] = 4;
+        self.assertEqual(len(table), 2);
+        self.assertEqual(table.keys(), [ first, other ]);
+        self.assertEqual(table.values(), [ 3, 4 ]);
+        del table[second];
+        self.assertNotIn(first, table);
+        self.assertEqual(list(table), [ other ]);
+
+    def test_alpha_set(self):
+        first, second, other = parseFolExpr('ex x. R(x, z)'), parseFolExpr('ex y. R(y, z)'), parseFolExpr('ex y. R(y, y)');
+        fmls = AlphaSet([ first ]);
+        self.assertFalse(fmls.add(second));
+        self.assertTrue(fmls.add(other));
+        self.assertIn(second, fmls);
+        self.assertEqual(list(fmls), [ first, other ]);
+        fmls.discard(second);
+        fmls.discard(second);
+        self.assertNotIn(first, fmls);
+        self.assertEqual(len(fmls), 1);
+
+    def test_deduplicate(self):
+        fmls = [ parseFolExpr(u) for u in [ 'all x. P(x)', 'Q(x)', 'all y. P(y)', 'Q(y)', 'Q(x)', 'all z. P(z)' ] ];
+        result = list(deduplicate(iter(fmls)));
+        self.assertEqual([ str(fml) for fml in result ], [ 'all x. P(x)', 'Q(x)', 'Q(y)' ]);
+        self.assertIs(result[0], fmls[0]);
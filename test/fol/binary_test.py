@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import os;
+import struct;
+import tempfile;
+import unittest;
+
+from src.core.traversal import preOrder;
+from src.fol.binary import HEADER;
+from src.fol.binary import NODE_WIDTH;
+from src.fol.binary import FolBinaryReader;
+from src.fol.binary import FolBinaryWriter;
+from src.fol.binary import dumpFolBinary;
+from src.fol.binary import isFolBinary;
+from src.fol.binary import loadFolBinary;
+from src.fol.binary import openFolCorpus;
+from src.fol.binary import saveFolCorpus;
+from src.fol.encoding import decodeExpressions;
+from src.fol.encoding import encodeExpressions;
+from src.fol.parser import parseFolExpr;
+from src.fol.shared import SharedExpression;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+FORMULAE = [
+    'P(x) -> Q(f(x))',
+    'all x. (ex y. R(x, f(y), {c}))',
+    '(P(x) && Q(x)) || (P(x) && Q(x))',
+    'P(\'a b\') <-> !Q(g(f(x), f(x)))',
+    'P({c}) || P({c})',
+];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def formulae():
+    return [ parseFolExpr(u) for u in FORMULAE ];
+
+def shape(fml):
+    return [ (t.kind, t.label, t.outerBrackets, len(t.parts)) for t in preOrder(fml) ];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestRoundTrip(unittest.TestCase):
+    def test_bytes(self):
+        fmls = formulae();
+        result = loadFolBinary(dumpFolBinary(fmls));
+        self.assertEqual([ str(fml) for fml in result ], [ str(fml) for fml in fmls ]);
+        self.assertEqual([ shape(fml) for fml in result ], [ shape(fml) for fml in fmls ]);
+        # descriptors are those of the parser:
+        self.assertTrue(all([ s.desc is t.desc for a, b in zip(result, fmls) for s, t in zip(preOrder(a), preOrder(b)) ]));
+
+    def test_file(self):
+        fmls = formulae();
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'corpus.folb');
+            saveFolCorpus(path, fmls);
+            self.assertTrue(isFolBinary(path));
+            with openFolCorpus(path) as reader:
+                self.assertEqual(len(reader), len(fmls));
+                self.assertEqual([ str(fml) for fml in reader ], [ str(fml) for fml in fmls ]);
+                self.assertEqual(str(reader[-1]), str(fmls[-1]));
+            self.assertIsNone(reader.buffer);
+
+    def test_encoding(self):
+        fmls = formulae();
+        self.assertEqual([ shape(fml) for fml in decodeExpressions(encodeExpressions(fmls)) ], [ shape(fml) for fml in fmls ]);
+        self.assertEqual(decodeExpressions(encodeExpressions([])), []);
+
+    def test_sharing(self):
+        writer = FolBinaryWriter();
+        writer.add(parseFolExpr('(P(x) && Q(x)) || (P(x) && Q(x))'));
+        # identical subterms are stored once:
+        self.assertEqual(writer.nodeCount, 5);
+        self.assertEqual(len(writer.nodes) // NODE_WIDTH, 5);
+        self.assertEqual(writer.edgeCount, 6);
+        self.assertEqual(writer.add(parseFolExpr('P(x)')), 1);
+        self.assertEqual(len(writer), 2);
+
+    def test_spilled(self):
+        fmls = formulae() * 20;
+        data = dumpFolBinary(fmls);
+        # spilling does not change the file:
+        with FolBinaryWriter(spillSize=3) as writer:
+            for fml in fmls:
+                writer.add(fml);
+            self.assertGreater(len(writer.spilled), 0);
+            self.assertLess(len(writer.nodes), 3);
+            self.assertEqual(writer.tobytes(), data);
+            # saving leaves the writer usable:
+            writer.add(fmls[0]);
+            self.assertEqual(len(loadFolBinary(writer.tobytes())), len(fmls) + 1);
+        self.assertEqual(len(writer.spilled), 0);
+        # a small sharing window gives a larger but equivalent file:
+        with FolBinaryWriter(spillSize=7, maxShared=2) as writer:
+            for fml in fmls:
+                writer.add(fml);
+            self.assertLessEqual(len(writer.nodeIndex), 2);
+            other = writer.tobytes();
+        self.assertGreater(len(other), len(data));
+        self.assertEqual([ shape(fml) for fml in loadFolBinary(other) ], [ shape(fml) for fml in fmls ]);
+
+class TestReader(unittest.TestCase):
+    def test_lazy(self):
+        with FolBinaryReader(dumpFolBinary(formulae())) as reader:
+            self.assertEqual(len(reader.stringCache), 0);
+            self.assertEqual(len(reader.descCache), 0);
+            reader[0];
+            used = set(reader.stringCache);
+            self.assertGreater(len(used), 0);
+            self.assertLess(len(used), len(reader.offsets) - 1);
+            self.assertNotIn('{c}', reader.stringCache.values());
+
+    def test_shared(self):
+        fmls = formulae();
+        with FolBinaryReader(dumpFolBinary(fmls)) as reader:
+            for k, fml in enumerate(fmls):
+                t = reader.shared(k);
+                self.assertIsInstance(t, SharedExpression);
+                self.assertIs(t, SharedExpression.fromExpression(fml));
+                self.assertIs(reader.shared(k), t);
+            # subterms decoded for one expression are reused for the next:
+            n = len(reader.sharedCache);
+            self.assertIs(reader.shared(2).parts[0], reader.shared(2).parts[1]);
+            self.assertEqual(len(reader.sharedCache), n);
+            # fresh (mutable) trees per access:
+            self.assertIsNot(reader[0], reader[0]);
+
+    def test_rejected(self):
+        data = dumpFolBinary(formulae());
+        with self.assertRaises(Exception):
+            FolBinaryReader(data[:HEADER.size - 1]);
+        with self.assertRaises(Exception):
+            FolBinaryReader(b'FOLX' + data[4:]);
+        with self.assertRaises(Exception) as context:
+            FolBinaryReader(data[:4] + struct.pack('<I', 2) + data[8:]);
+        self.assertIn('version', str(context.exception));
+        with self.assertRaises(Exception) as context:
+            FolBinaryReader(data[:-1]);
+        self.assertIn('truncated', str(context.exception));
+
+    def test_is_fol_binary(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'corpus.txt');
+            with open(path, 'w') as fp:
+                fp.write('P(x)\n');
+            self.assertFalse(isFolBinary(path));
+            self.assertFalse(isFolBinary(os.path.join(folder, 'missing')));
+            with self.assertRaises(Exception):
+                openFolCorpus(path);
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest;
+
+from src.fol.cache import normaliseFormula;
+from src.fol.parser import clearParseCache;
+from src.fol.parser import parseCacheStats;
+from src.fol.parser import parseFolExprs;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+INPUTS = [
+    'P(x)', '  P(x)', ' P(x)', 'P(x)  ', 'P(x)\n', '\nP(x)',
+    'P(x)  &&  Q(x)', 'P(x)\t&&\nQ(x)', 'P(x) && Q(x)',
+    'P(x),\nQ(x)', 'P(x), Q(x)', 'P(x) ,Q(x)',
+    'P({a  b})', 'P({a b})', 'P(\'a  b\')', 'all  x.  P(x)', 'all x. P(x)',
+];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def outcome(u: str, cache: bool):
+    try:
+        return [ str(fml) for fml in parseFolExprs(u, cache=cache) ];
+    except:
+        return None;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestParseCache(unittest.TestCase):
+    def tearDown(self):
+        clearParseCache();
+
+    def test_transparent(self):
+        for inputs in [ INPUTS, INPUTS[::-1] ]:
+            clearParseCache();
+            for u in inputs:
+                self.assertEqual(outcome(u, cache=True), outcome(u, cache=False), repr(u));
+                # once more from the cache:
+                self.assertEqual(outcome(u, cache=True), outcome(u, cache=False), repr(u));
+        self.assertIsNone(outcome('  P(x)', cache=True));
+
+    def test_hits(self):
+        clearParseCache();
+        outcome('P(x)  &&  Q(x)', cache=True);
+        outcome('P(x)\t&&\nQ(x)', cache=True);
+        stats = parseCacheStats();
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1));
+
+    def test_normalise(self):
+        self.assertEqual(normaliseFormula('  P(x)\t&&\n Q({a  b})  '), ' P(x) && Q({a  b}) ');
+        self.assertEqual(normaliseFormula('P(\'a  b\')'), 'P(\'a  b\')');
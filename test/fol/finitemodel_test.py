@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import random;
+import unittest;
+
+import numpy as np;
+
+from src.fol.finitemodel import FiniteStructure;
+from src.fol.finitemodel import checkModel;
+from src.fol.normalform import asShared;
+from src.fol.parser import parseFolExpr;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+VARIABLES = [ 'x', 'y', 'z' ];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def randomStructure(rng: random.Random, size: int) -> FiniteStructure:
+    return FiniteStructure(size,
+        relations = dict(
+            P = np.array([ rng.random() < 0.5 for _ in range(size) ], dtype=bool),
+            Q = np.array([ [ rng.random() < 0.5 for _ in range(size) ] for _ in range(size) ], dtype=bool),
+        ),
+        functions = dict(f=[ rng.randrange(size) for _ in range(size) ]),
+    );
+
+def randomTerm(rng: random.Random) -> str:
+    x = rng.choice(VARIABLES);
+    return 'f({})'.format(x) if rng.random() < 0.3 else x;
+
+def randomFormula(rng: random.Random, depth: int) -> str:
+    r = rng.random();
+    if depth == 0 or r < 0.2:
+        if rng.random() < 0.5:
+            return 'P({})'.format(randomTerm(rng));
+        return 'Q({}, {})'.format(randomTerm(rng), randomTerm(rng));
+    elif r < 0.35:
+        return '!{}'.format(randomFormula(rng, depth - 1));
+    elif r < 0.65:
+        quantifier = rng.choice([ 'all', 'ex' ]);
+        return '({} {}. {})'.format(quantifier, rng.choice(VARIABLES), randomFormula(rng, depth - 1));
+    connective = rng.choice([ '&&', '||', '->', '<->' ]);
+    return '({} {} {})'.format(randomFormula(rng, depth - 1), connective, randomFormula(rng, depth - 1));
+
+def reference(t, structure: FiniteStructure, env: dict):
+    # plain recursive evaluation by the definition of satisfaction:
+    kind = t.kind;
+    if kind == 'variable':
+        return env[t.label];
+    elif kind == 'functionexpression':
+        return int(structure.function(t.label)[tuple([ reference(s, structure, env) for s in t.parts ])]);
+    elif kind == 'relationexpression':
+        return bool(structure.relation(t.label)[tuple([ reference(s, structure, env) for s in t.parts ])]);
+    elif kind == 'not':
+        return not reference(t.parts[0], structure, env);
+    elif kind in [ 'and', 'or', 'implies', 'iff' ]:
+        values = [ reference(part, structure, env) for part in t.parts ];
+        if kind == 'and':
+            return all(values);
+        elif kind == 'or':
+            return any(values);
+        elif kind == 'implies':
+            return (not values[0]) or values[1];
+        return values[0] == values[1];
+    elif kind in [ 'all', 'exists' ]:
+        x = t.parts[0].label;
+        values = [ reference(t.parts[1], structure, { **env, x: a }) for a in range(structure.size) ];
+        return all(values) if kind == 'all' else any(values);
+    raise Exception('Unexpected kind {}'.format(kind));
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestCheckModel(unittest.TestCase):
+    def test_assignment_of_bound_variable(self):
+        structure = FiniteStructure(2, relations=dict(Q=np.array([ False, True ])));
+        self.assertTrue(checkModel(parseFolExpr('ex y. Q(y)'), structure, { 'y': 0 }));
+        self.assertFalse(checkModel(parseFolExpr('Q(y) || !(ex y. Q(y))'), structure, { 'y': 0 }));
+        self.assertTrue(checkModel(parseFolExpr('!Q(y) && (ex y. Q(y))'), structure, { 'y': 0 }));
+
+    def test_unassigned_free_variable(self):
+        structure = FiniteStructure(2, relations=dict(Q=np.array([ False, True ])));
+        with self.assertRaises(Exception):
+            checkModel(parseFolExpr('Q(x) && Q(y)'), structure, { 'x': 1 });
+
+    def test_against_reference(self):
+        rng = random.Random(1);
+        for _ in range(300):
+            structure = randomStructure(rng, rng.choice([ 2, 3 ]));
+            fml = parseFolExpr(randomFormula(rng, 4));
+            assignment = { x: rng.randrange(structure.size) for x in VARIABLES };
+            expected = reference(asShared(fml), structure, assignment);
+            self.assertEqual(checkModel(fml, structure, assignment), expected, str(fml));
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import random;
+import unittest;
+
+import numpy as np;
+
+from src.core.traversal import preOrder;
+from src.fol.finitemodel import FiniteStructure;
+from src.fol.finitemodel import checkModel;
+from src.fol.normalform import toCNF;
+from src.fol.normalform import toClauses;
+from src.fol.normalform import toMiniscope;
+from src.fol.normalform import toNNF;
+from src.fol.normalform import toPrenex;
+from src.fol.normalform import toSkolem;
+from src.fol.parser import parseFolExpr;
+from src.prop.parser import parsePropExpr;
+from src.prop.sat import findModel;
+from src.prop.sat import isSatisfiableSat;
+from src.prop.truthtable import areEquivalent;
+from src.prop.truthtable import truthTable;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+ATOMS = [ '{A}', '{B}', '{C}', '{D}' ];
+VARIABLES = [ 'x', 'y', 'z' ];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def randomProp(rng: random.Random, depth: int) -> str:
+    r = rng.random();
+    if depth == 0 or r < 0.15:
+        return rng.choice(ATOMS);
+    elif r < 0.3:
+        return '!{}'.format(randomProp(rng, depth - 1));
+    connective = rng.choice([ '&&', '||', '->', '<->' ]);
+    return '({} {} {})'.format(randomProp(rng, depth - 1), connective, randomProp(rng, depth - 1));
+
+def randomStructure(rng: random.Random, size: int) -> FiniteStructure:
+    return FiniteStructure(size,
+        relations = dict(
+            P = np.array([ rng.random() < 0.5 for _ in range(size) ], dtype=bool),
+            Q = np.array([ [ rng.random() < 0.5 for _ in range(size) ] for _ in range(size) ], dtype=bool),
+        ),
+        functions = dict(f=[ rng.randrange(size) for _ in range(size) ]),
+    );
+
+def randomTerm(rng: random.Random) -> str:
+    x = rng.choice(VARIABLES);
+    return 'f({})'.format(x) if rng.random() < 0.3 else x;
+
+def randomFol(rng: random.Random, depth: int) -> str:
+    r = rng.random();
+    if depth == 0 or r < 0.2:
+        if rng.random() < 0.5:
+            return 'P({})'.format(randomTerm(rng));
+        return 'Q({}, {})'.format(randomTerm(rng), randomTerm(rng));
+    elif r < 0.35:
+        return '!{}'.format(randomFol(rng, depth - 1));
+    elif r < 0.65:
+        quantifier = rng.choice([ 'all', 'ex' ]);
+        return '({} {}. {})'.format(quantifier, rng.choice(VARIABLES), randomFol(rng, depth - 1));
+    connective = rng.choice([ '&&', '||', '->', '<->' ]);
+    return '({} {} {})'.format(randomFol(rng, depth - 1), connective, randomFol(rng, depth - 1));
+
+def kindsOf(fml) -> set:
+    return set([ t.kind for t in preOrder(fml) ]);
+
+def isNNF(fml) -> bool:
+    return all([ t.parts[0].kind in [ 'atom', 'relationexpression' ] for t in preOrder(fml) if t.kind == 'not' ]) \
+        and not kindsOf(fml) & set([ 'implies', 'iff' ]);
+
+def iffChain(n: int) -> str:
+    u = '{A1}';
+    for k in range(2, n + 1):
+        u = '({{A{}}} <-> {})'.format(k, u);
+    return u;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestPropositional(unittest.TestCase):
+    def test_equivalent_forms(self):
+        rng = random.Random(11);
+        for _ in range(100):
+            fml = parsePropExpr(randomProp(rng, 4));
+            nnf = toNNF(fml);
+            self.assertTrue(isNNF(nnf), str(nnf));
+            for result in [ nnf, toPrenex(fml), toMiniscope(fml) ]:
+                self.assertTrue(areEquivalent(fml, result), '{} vs {}'.format(fml, result));
+
+    def test_cnf_is_equisatisfiable(self):
+        rng = random.Random(12);
+        outcomes = set();
+        for _ in range(100):
+            fml = parsePropExpr(randomProp(rng, 4));
+            table = truthTable(fml, ATOMS);
+            cnf = toCNF(fml);
+            self.assertEqual(isSatisfiableSat(cnf), table.isSatisfiable(), str(fml));
+            outcomes.add(table.isSatisfiable());
+            # a model of the clauses is one of the formula on its atoms:
+            model = findModel(cnf);
+            if model is not None:
+                self.assertTrue(table[{ atom: model.get(atom, False) for atom in ATOMS }], str(fml));
+        self.assertEqual(outcomes, set([ True, False ]));
+
+    def test_cnf_shape(self):
+        self.assertEqual(str(toCNF(parsePropExpr('{A} <-> {B}'))), '(!{A} || {B}) && ({A} || !{B})');
+        for literal in [ literal for clause in toClauses(parsePropExpr(iffChain(6))) for literal in clause ]:
+            self.assertIn(literal[1].kind, [ 'atom', 'relationexpression' ]);
+
+    def test_cnf_grows_linearly(self):
+        # the <-> chain has 2^(n-1) clauses in a plain CNF:
+        counts = [ len(toClauses(parsePropExpr(iffChain(n)))) for n in range(3, 41) ];
+        steps = set([ b - a for a, b in zip(counts, counts[1:]) ]);
+        self.assertEqual(len(steps), 1, counts);
+        self.assertLessEqual(counts[-1], 10*40);
+
+class TestFirstOrder(unittest.TestCase):
+    def test_equivalent_forms(self):
+        rng = random.Random(13);
+        for _ in range(150):
+            structure = randomStructure(rng, rng.choice([ 2, 3 ]));
+            fml = parseFolExpr(randomFol(rng, 4));
+            assignment = { x: rng.randrange(structure.size) for x in VARIABLES };
+            expected = checkModel(fml, structure, assignment);
+            nnf = toNNF(fml);
+            self.assertTrue(isNNF(nnf), str(nnf));
+            for result in [ nnf, toPrenex(fml), toMiniscope(fml) ]:
+                self.assertEqual(checkModel(result, structure, assignment), expected, '{} vs {}'.format(fml, result));
+
+    def test_prenex_shape(self):
+        rng = random.Random(14);
+        for _ in range(50):
+            result = toPrenex(parseFolExpr(randomFol(rng, 4)));
+            t = result;
+            while t.kind in [ 'all', 'exists' ]:
+                t = t.parts[1];
+            self.assertFalse(kindsOf(t) & set([ 'all', 'exists' ]), str(result));
+
+    def test_skolem_shape(self):
+        self.assertEqual(str(toSkolem(parseFolExpr('all x. ex y. P(x, y)'))), 'all x. P(x,sk_{1}(x))');
+        self.assertEqual(str(toSkolem(parseFolExpr('ex y. all x. P(x, y)'))), 'all x. P(x,sk_{1})');
+        self.assertEqual(str(toSkolem(parseFolExpr('all x. ex y. all z. ex w. Q(x, y, z, w)'))), 'all x. (all z. Q(x,sk_{1}(x),z,sk_{2}(x,z)))');
+        # existential after negation:
+        self.assertEqual(str(toSkolem(parseFolExpr('!(all x. P(x))'))), '!P(sk_{1})');
+        # Skolem symbols do not clash with those of the formula:
+        self.assertEqual(str(toSkolem(parseFolExpr('ex y. P(sk_{1}(z), y)'))), 'P(sk_{1}(z),sk_{2})');
+        rng = random.Random(15);
+        for _ in range(50):
+            result = toSkolem(parseFolExpr(randomFol(rng, 4)));
+            self.assertNotIn('exists', kindsOf(result), str(result));
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import io;
+import unittest;
+
+from src.core.traversal import preOrder;
+from src.fol.encoding import decodeExpressions;
+from src.fol.encoding import encodeExpressions;
+from src.fol.parallel import parseFolExprsParallel;
+from src.fol.parallel import parseFolStreamParallel;
+from src.fol.parser import parseFolExpr;
+from src.fol.stream import FolRecordError;
+from src.fol.stream import parseFolStream;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+FORMULAE = [ 'P(x{}) -> Q(f(x{}), {{c}})'.format(k, k) for k in range(23) ];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def shape(fml):
+    return [ (t.kind, t.label, t.outerBrackets, len(t.parts)) for t in preOrder(fml) ];
+
+def rendered(results):
+    return [ 'error: {}'.format(result) if isinstance(result, Exception) else str(result) for result in results ];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestParseParallel(unittest.TestCase):
+    def test_order(self):
+        expected = [ str(parseFolExpr(u)) for u in FORMULAE ];
+        for processes in [ 1, 2 ]:
+            results = parseFolExprsParallel(FORMULAE, processes=processes, chunksize=4);
+            self.assertEqual([ str(fml) for fml in results ], expected);
+        self.assertEqual(parseFolExprsParallel([], processes=2), []);
+
+    def test_strict(self):
+        formulae = FORMULAE[:5] + [ 'P(x' ] + FORMULAE[5:];
+        for processes in [ 1, 2 ]:
+            with self.assertRaises(Exception):
+                parseFolExprsParallel(formulae, processes=processes, chunksize=3);
+
+    def test_not_strict(self):
+        formulae = FORMULAE[:5] + [ 'P(x', '' ] + FORMULAE[5:];
+        results = [ parseFolExprsParallel(formulae, processes=processes, chunksize=3, strict=False) for processes in [ 1, 2 ] ];
+        self.assertEqual(rendered(results[0]), rendered(results[1]));
+        self.assertIsInstance(results[0][5], Exception);
+        self.assertIsInstance(results[0][6], Exception);
+        self.assertEqual([ str(fml) for fml in results[0][7:] ], [ str(parseFolExpr(u)) for u in FORMULAE[5:] ]);
+
+    def test_fastpath(self):
+        results = [ parseFolExprsParallel(FORMULAE, processes=1, fastpath=fastpath) for fastpath in [ True, False ] ];
+        self.assertEqual([ shape(fml) for fml in results[0] ], [ shape(fml) for fml in results[1] ]);
+
+    def test_encoding(self):
+        fmls = [ parseFolExpr(u) for u in FORMULAE + [ 'all x. (ex y. R(x, y))', '!(P(x) && Q(y))' ] ];
+        result = decodeExpressions(encodeExpressions(fmls));
+        self.assertEqual([ shape(fml) for fml in result ], [ shape(fml) for fml in fmls ]);
+        self.assertEqual([ str(fml) for fml in result ], [ str(fml) for fml in fmls ]);
+
+class TestParseStreamParallel(unittest.TestCase):
+    def test_stream(self):
+        text = '\n'.join(FORMULAE[:10] + [ 'bad((' ] + FORMULAE[10:] + [ 'P(x', 'Q(y)' ]);
+        expected = list(parseFolStream(io.StringIO(text)));
+        result = list(parseFolStreamParallel(io.StringIO(text), processes=2, chunksize=3));
+        self.assertEqual(len(result), len(expected));
+        for fml, other in zip(result, expected):
+            if isinstance(other, FolRecordError):
+                self.assertIsInstance(fml, FolRecordError);
+                self.assertEqual((fml.line, fml.column, fml.offset, fml.text), (other.line, other.column, other.offset, other.text));
+            else:
+                self.assertEqual(shape(fml), shape(other));
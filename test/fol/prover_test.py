@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import itertools;
+import unittest;
+
+from src.fol.normalform import asShared;
+from src.fol.parser import parseFolExpr;
+from src.fol.prover import Prover;
+from src.fol.prover import prove;
+from src.fol.prover import refute;
+from src.fol.subsumption import FeatureVectorIndex;
+from src.fol.subsumption import subsumes;
+from src.fol.unification import asTerm;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# only refuted with factoring:
+FACTORING = '!((all x. all y. (P(x) || P(y))) && (all x. all y. (!P(x) || !P(y))))';
+# saturation never ends:
+INFINITE = ([ 'P({a})', 'all x. (P(x) -> P(f(x)))' ], 'Q({a})');
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def run(axioms, conjecture, **options):
+    return prove([ parseFolExpr(u) for u in axioms ], parseFolExpr(conjecture), **options);
+
+def clause(*literals: str):
+    # literals as strings, negative ones with a leading !
+    return tuple([ (not u.startswith('!'), asShared(parseFolExpr(u.lstrip('!'))).withOuterBraces(True)) for u in literals ]);
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestProver(unittest.TestCase):
+    def test_valid(self):
+        problems = [
+            ([ 'all x. (P(x) -> Q(x))', 'P({a})' ], 'Q({a})'),
+            ([ 'all x. (H(x) -> M(x))', 'H({s})' ], 'ex y. M(y)'),
+            ([], 'ex x. (D(x) -> (all y. D(y)))'),
+            ([], FACTORING),
+            ([ 'all x. all y. (R(x, y) -> R(y, x))', 'all x. all y. all z. ((R(x, y) && R(y, z)) -> R(x, z))', 'R({a}, {b})' ], 'R({a}, {a})'),
+        ];
+        for selection in [ True, False ]:
+            for axioms, conjecture in problems:
+                result = run(axioms, conjecture, selection=selection);
+                self.assertEqual(result.status, 'unsatisfiable', conjecture);
+                self.assertTrue(result.isUnsatisfiable);
+
+    def test_not_valid(self):
+        problems = [
+            ([ 'all x. (P(x) -> Q(x))' ], 'Q({a})'),
+            ([ 'ex x. P(x)' ], 'all x. P(x)'),
+            ([], '(all x. P(x)) || (all x. !P(x))'),
+        ];
+        for axioms, conjecture in problems:
+            result = run(axioms, conjecture);
+            self.assertEqual(result.status, 'satisfiable', conjecture);
+            self.assertFalse(result.isUnsatisfiable);
+            self.assertEqual(result.proof(), []);
+
+    def test_factoring_is_needed(self):
+        result = run([], FACTORING);
+        self.assertIn('factoring', [ c.rule for c in result.proof() ]);
+
+    def test_limits(self):
+        axioms, conjecture = INFINITE;
+        result = run(axioms, conjecture, timeLimit=0.2);
+        self.assertEqual(result.status, 'timeout');
+        self.assertLess(result.stats['seconds'], 5.0);
+        result = run(axioms, conjecture, maxClauses=20);
+        self.assertEqual(result.status, 'clauselimit');
+        self.assertLessEqual(result.stats['kept'], 20 + 1);
+
+    def test_invalid_options(self):
+        for ratio in [ (0, 0), (-1, 2), (1, -1) ]:
+            with self.assertRaises(Exception):
+                Prover([], ageWeightRatio=ratio);
+        with self.assertRaises(Exception):
+            prove([]);
+        # weight only and age only are fine:
+        for ratio in [ (0, 1), (1, 0) ]:
+            self.assertEqual(run([ 'all x. (P(x) -> Q(x))', 'P({a})' ], 'Q({a})', ageWeightRatio=ratio).status, 'unsatisfiable');
+
+    def test_refute(self):
+        self.assertEqual(refute([ clause('P(x)'), clause('!P({a})') ]).status, 'unsatisfiable');
+        self.assertEqual(refute([ clause('P(x)', 'Q(x)'), clause('!P({a})') ]).status, 'satisfiable');
+        # the empty clause in the input:
+        result = refute([ () ]);
+        self.assertEqual(result.status, 'unsatisfiable');
+        self.assertEqual(len(result.proof()), 1);
+
+    def test_proof(self):
+        result = run([ 'all x. (P(x) -> Q(x))', 'all x. (Q(x) -> R(x))', 'P({a})', 'S({b})' ], 'R({a})');
+        proof = result.proof();
+        self.assertIs(proof[-1], result.emptyClause);
+        self.assertEqual(len(result.emptyClause.literals), 0);
+        # parents before children, all ancestors present, the unused axiom absent:
+        ids = [ c.id for c in proof ];
+        self.assertEqual(ids, sorted(ids));
+        for c in proof:
+            self.assertTrue(all([ parent in proof for parent in c.parents ]));
+            self.assertEqual(len(c.parents) == 0, c.rule == 'input');
+        self.assertNotIn('S({b})', [ str(c.literals[0][1]) for c in proof if len(c.literals) == 1 ]);
+        self.assertEqual(len([ c for c in proof if c.rule == 'input' ]), 4);
+
+class TestSubsumption(unittest.TestCase):
+    def test_subsumes(self):
+        self.assertTrue(subsumes(clause('P(x)'), clause('P({a})', 'Q({b})')));
+        self.assertTrue(subsumes(clause('P(x)', '!Q(x)'), clause('!Q(f(y))', 'P(f(y))', 'R(y)')));
+        self.assertFalse(subsumes(clause('P(x)', '!Q(x)'), clause('P({a})', '!Q({b})')));
+        self.assertFalse(subsumes(clause('P(x)'), clause('!P({a})')));
+        self.assertFalse(subsumes(clause('P({a})'), clause('P(x)')));
+        # multisets: two literals of C need two literals of D
+        self.assertFalse(subsumes(clause('P(x)', 'P(y)'), clause('P({a})')));
+        self.assertTrue(subsumes(clause('P(x)', 'P(y)'), clause('P({a})', 'P({b})')));
+        # backtracking over the choice of literal:
+        self.assertTrue(subsumes(clause('R(x, y)', 'R(y, x)'), clause('R({a}, {b})', 'R({b}, {c})', 'R({c}, {b})')));
+        self.assertTrue(subsumes((), clause('P({a})')));
+
+    def test_index(self):
+        clauses = [
+            clause('P(x)'),
+            clause('P({a})', 'Q({b})'),
+            clause('P(f(x))', '!Q(x)'),
+            clause('!Q({a})'),
+            clause('!Q(x)', 'R(x, x)'),
+            clause('R(x, y)'),
+            clause('P({a})', 'R({a}, {b})'),
+        ];
+        index = FeatureVectorIndex([ 'P', 'Q' ]);
+        for k, c in enumerate(clauses):
+            index.insert(c, k);
+        self.assertEqual(len(index), len(clauses));
+        for c in clauses + [ clause('P({b})'), clause('!Q(f(y))', 'R(f(y), f(y))'), clause('R(x, x)') ]:
+            self.assertEqual(sorted([ k for k, _ in index.subsuming(c) ]), [ k for k, other in enumerate(clauses) if subsumes(other, c) ], c);
+            self.assertEqual(sorted([ k for k, _ in index.subsumed(c) ]), [ k for k, other in enumerate(clauses) if subsumes(c, other) ], c);
+        self.assertEqual(sorted([ k for k, _ in index.subsumed(clause('P(x)')) ]), [ 0, 1, 2, 6 ]);
+        # remove:
+        self.assertFalse(index.remove(clauses[0], 99));
+        self.assertFalse(index.remove(clause('S(x)'), 0));
+        self.assertTrue(index.remove(clauses[0], 0));
+        self.assertFalse(index.remove(clauses[0], 0));
+        self.assertEqual(sorted([ k for k, _ in index.subsuming(clause('P({a})', 'Q({b})')) ]), [ 1 ]);
+        for k, c in itertools.islice(enumerate(clauses), 1, None):
+            self.assertTrue(index.remove(c, k));
+        self.assertEqual(len(index), 0);
+        self.assertEqual(index.root, dict());
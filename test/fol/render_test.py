@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import io;
+import unittest;
+
+from src.fol.construction import Relation;
+from src.fol.construction import RelationExpression;
+from src.fol.construction import Variable;
+from src.fol.parser import parseFolExpr;
+from src.fol.render import FormulaWriter;
+from src.fol.render import SmtLibBackend;
+from src.fol.render import TptpBackend;
+from src.fol.render import renderString;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestSymbolNames(unittest.TestCase):
+    def test_tptp_variables_differing_in_case(self):
+        self.assertEqual(renderString(parseFolExpr('all x. P(x, X)'), 'tptp'), '![X]: \'P\'(X,X_2)');
+        fp = io.StringIO();
+        with FormulaWriter(fp, 'tptp') as writer:
+            writer.write(parseFolExpr('all x. P(x, X)'));
+        self.assertEqual(fp.getvalue(), 'fof(f1,axiom,![X]: ![X_2]: \'P\'(X_2,X)).\n');
+
+    def test_tptp_indexed_variables(self):
+        # x1 is read as x_{1}, i.e. the same variable:
+        self.assertEqual(renderString(parseFolExpr('P(x_{1}, x1)'), 'tptp'), '\'P\'(X_1,X_1)');
+        self.assertEqual(renderString(parseFolExpr('P(x_{1}, X1)'), 'tptp'), '\'P\'(X_1,X_1_2)');
+        # built without an index, x1 is a variable of its own:
+        R = Relation('P', None, False, False);
+        fml = RelationExpression(R, Variable('x', '1', False, False), Variable('x1', None, False, False), Variable('X_1', None, False, False));
+        self.assertEqual(renderString(fml, 'tptp'), '\'P\'(X_1,X1,X_1_2)');
+
+    def test_tptp_symbols_dropping_braces(self):
+        self.assertEqual(renderString(parseFolExpr('P(f({f}))'), 'tptp'), '\'P\'(f(f_2))');
+
+    def test_smtlib_variable_named_like_function(self):
+        self.assertEqual(renderString(parseFolExpr('all f. P(f(f))'), 'smtlib'), '(forall ((f U)) (P (f_2 f)))');
+        fp = io.StringIO();
+        with FormulaWriter(fp, 'smtlib') as writer:
+            writer.write(parseFolExpr('P(f(f), f)'));
+        self.assertEqual(fp.getvalue(), '\n'.join([
+            '(declare-sort U 0)',
+            '(declare-fun P (U U) Bool)',
+            '(declare-fun f (U) U)',
+            '(assert (forall ((f_2 U)) (P (f f_2) f_2)))',
+            '',
+        ]));
+
+    def test_smtlib_variables(self):
+        self.assertEqual(renderString(parseFolExpr('all x. P(x, X)'), 'smtlib'), '(forall ((x U)) (P x X))');
+        self.assertEqual(renderString(parseFolExpr('P(x_{1}, x1)'), 'smtlib'), '(P |x_{1}| |x_{1}|)');
+
+    def test_names_are_injective(self):
+        symbols = [ 'x', 'X', 'x_{1}', 'x1', 'X_1', 'X1', 'f', '{f}', 'f_2', 'a|b', 'a_b', 'and', '{and}' ];
+        for backend in [ TptpBackend(), SmtLibBackend() ]:
+            for variable in [ True, False ]:
+                names = [ backend.symbolName(symbol, variable=variable) for symbol in symbols ];
+                self.assertEqual(len(set(names)), len(symbols), names);
+                # names are stable:
+                self.assertEqual(names, [ backend.symbolName(symbol, variable=variable) for symbol in symbols ]);
+        backend = SmtLibBackend();
+        names = [ backend.symbolName(symbol, variable=variable) for symbol in symbols for variable in [ True, False ] ];
+        plain = [ name[1:-1] if name.startswith('|') else name for name in names ];
+        self.assertEqual(len(set(plain)), len(names), names);
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest;
+
+from src.fol.parser import parseFolExpr;
+from src.fol.rewriting import RewriteSystem;
+from src.fol.rewriting import rewrite;
+from src.fol.rewriting import substituteFree;
+from src.fol.unification import asTerm;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+PEANO = [
+    ('plus(x, 0)', 'x'),
+    ('plus(x, s(y))', 's(plus(x, y))'),
+];
+# first(0, {w}) has a normal form, but {w} has none:
+LAZY = [
+    ('first(x, y)', 'x'),
+    ('{w}', 's({w})'),
+];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def rules(pairs):
+    return [ (parseFolExpr(lhs), parseFolExpr(rhs)) for lhs, rhs in pairs ];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestStrategies(unittest.TestCase):
+    def test_terms_inside_formulae(self):
+        for strategy in [ 'innermost', 'outermost', 'fixpoint' ]:
+            result = rewrite(parseFolExpr('P(plus(s(0), s(s(0)))) && Q(plus(0, 0))'), rules(PEANO), strategy);
+            self.assertEqual(str(result), 'P(s(s(s({0})))) && Q({0})', strategy);
+
+    def test_terms_at_the_top(self):
+        for strategy in [ 'innermost', 'outermost', 'fixpoint' ]:
+            self.assertEqual(str(rewrite(parseFolExpr('plus(s(0), s(s(0)))'), rules(PEANO), strategy)), 's(s(s({0})))', strategy);
+            result = rewrite(asTerm(parseFolExpr('plus(s(0), s(0))')), rules(PEANO), strategy);
+            self.assertEqual(result.kind, 'functionexpression');
+            self.assertEqual(str(result), 's(s({0}))');
+
+    def test_outermost_and_step_limit(self):
+        system = RewriteSystem(rules(LAZY), maxSteps=50);
+        self.assertEqual(str(system.rewrite(parseFolExpr('P(first(0, {w}))'), 'outermost')), 'P({0})');
+        self.assertFalse(system.stats['limitReached']);
+        system.rewrite(parseFolExpr('P(first(0, {w}))'), 'innermost');
+        self.assertTrue(system.stats['limitReached']);
+        self.assertEqual(system.stats['steps'], 50);
+        # results of a call that hit the limit are not memoised:
+        self.assertEqual(len(system.memo['innermost']), 0);
+
+    def test_fixpoint(self):
+        system = RewriteSystem(rules(LAZY), maxPasses=100);
+        self.assertEqual(str(system.rewrite(parseFolExpr('P(first(0, {w}))'), 'fixpoint')), 'P({0})');
+        self.assertEqual(system.stats['passes'], 2);
+        system.rewrite(parseFolExpr('P({w})'), 'fixpoint');
+        self.assertTrue(system.stats['limitReached']);
+        self.assertEqual(system.stats['passes'], 100);
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(Exception):
+            rewrite(parseFolExpr('P(x)'), rules(PEANO), 'leftmost');
+
+class TestMemo(unittest.TestCase):
+    def test_normal_forms_are_reused(self):
+        system = RewriteSystem(rules(PEANO));
+        fml = parseFolExpr('P(plus(s(0), s(s(0))))');
+        first = system.rewrite(fml);
+        self.assertEqual(system.stats['steps'], 3);
+        second = system.rewrite(fml);
+        self.assertEqual(system.stats['steps'], 0);
+        self.assertEqual(first, second);
+        # a known subterm in a new formula:
+        self.assertEqual(str(system.rewrite(parseFolExpr('Q(plus(s(0), s(s(0))), plus(0, 0))'))), 'Q(s(s(s({0}))),{0})');
+        self.assertEqual(system.stats['steps'], 1);
+
+class TestCapture(unittest.TestCase):
+    def test_rule_with_bound_variable(self):
+        system = RewriteSystem(rules([ ('Q(x)', 'ex y. R(x, y)') ]));
+        self.assertEqual(str(system.rewrite(parseFolExpr('all y. Q(y)'))), 'all y. (exists y_{1}. R(y,y_{1}))');
+        self.assertEqual(str(system.rewrite(parseFolExpr('all y. Q(f(y))'))), 'all y. (exists y_{1}. R(f(y),y_{1}))');
+        self.assertEqual(str(system.rewrite(parseFolExpr('all z. Q(z)'))), 'all z. (exists y. R(z,y))');
+
+    def test_substitute_free(self):
+        fml = parseFolExpr('(ex y. R(x, y)) && P(x)');
+        self.assertEqual(str(substituteFree(fml, { 'x': asTerm(parseFolExpr('g(y)')) })), '(exists y_{1}. R(g(y),y_{1})) && P(g(y))');
+        self.assertEqual(str(substituteFree(fml, { 'y': asTerm(parseFolExpr('g(x)')) })), str(fml));
+
+    def test_invalid_rules(self):
+        with self.assertRaises(Exception):
+            RewriteSystem(rules([ ('x', 'f(x)') ]));
+        with self.assertRaises(Exception):
+            RewriteSystem(rules([ ('f(x)', 'g(x, y)') ]));
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import asyncio;
+import os;
+import shutil;
+import tempfile;
+import unittest;
+from concurrent.futures.process import BrokenProcessPool;
+
+from src.fol.service import FolService;
+from src.fol.service import ServiceClient;
+from src.fol.service import runRequest;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+TIMEOUT: float = 30.;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestErrorMessages(unittest.TestCase):
+    def test_no_terminal_formatting(self):
+        requests = [
+            dict(op='parse', formula='P(x'),
+            dict(op='parse'),
+            dict(op='render', formula='P(x)', format='latex'),
+            dict(op='normalize', formula='P(x)', form='dnf'),
+            dict(op='simplify', formula='P(x)'),
+        ];
+        for request in requests:
+            response = runRequest(request);
+            self.assertFalse(response['ok'], request);
+            self.assertNotIn('\033', response['error'], request);
+        self.assertEqual(runRequest(dict(op='render', formula='P(x)', format='latex'))['error'], 'Unknown format latex!');
+        response = runRequest(dict(op='check', formula='P(x'));
+        self.assertFalse(response['result']['wellFormed']);
+        self.assertNotIn('\033', response['result']['message']);
+
+class TestBrokenPool(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.directory = tempfile.mkdtemp();
+        self.path = os.path.join(self.directory, 'logic.sock');
+        self.service = FolService(processes=1);
+        await self.service.start(path=self.path);
+        return;
+
+    async def asyncTearDown(self):
+        await self.service.close();
+        shutil.rmtree(self.directory, ignore_errors=True);
+        return;
+
+    async def test_pool_is_replaced(self):
+        broken = self.service.executor;
+        # a worker dies:
+        with self.assertRaises(BrokenProcessPool):
+            await asyncio.wrap_future(broken.submit(os._exit, 1));
+        def client():
+            with ServiceClient(path=self.path, timeout=TIMEOUT) as connection:
+                return [ connection.request('parse', formula='P(x)') for _ in range(3) ];
+        responses = await asyncio.get_running_loop().run_in_executor(None, client);
+        self.assertFalse(responses[0]['ok']);
+        self.assertTrue(responses[0]['error'].startswith('Worker failed'));
+        self.assertEqual(responses[1:], [ dict(id=k, ok=True, result=[ 'P(x)' ]) for k in [ 2, 3 ] ]);
+        self.assertIsNot(self.service.executor, broken);
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import sys;
+import threading;
+import unittest;
+
+from src.core.traversal import preOrder;
+from src.fol.normalform import asShared;
+from src.fol.parser import parseFolExpr;
+from src.fol.shared import SharedExpression;
+from src.fol.shared import cacheFreeVariables;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+FORMULAE = [
+    ('P(x) -> ((all x. Q(x, y)) && R(f(z), {c}))', [ 'x', 'y', 'z' ]),
+    ('(all x. (ex y. (P(x, y) && (all x. Q(x))))) || P(x, x)', [ 'x' ]),
+    ('(all x. P(x)) && (all x. P(x)) && P(x)', [ 'x' ]),
+    ('ex x. all y. P(x, y, g(g(z)))', [ 'z' ]),
+];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def nodesOf(t):
+    seen = dict();
+    stack = [ t ];
+    while len(stack) > 0:
+        s = stack.pop();
+        if not s in seen:
+            seen[s] = None;
+            stack.extend(s.parts);
+    return list(seen);
+
+def depthOf(fml) -> int:
+    if len(fml.parts) == 0:
+        return 0;
+    return 1 + max([ depthOf(part) for part in fml.parts ]);
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestDerivedAttributes(unittest.TestCase):
+    def test_size_and_depth(self):
+        for u, _ in FORMULAE:
+            fml = parseFolExpr(u);
+            t = asShared(fml);
+            self.assertEqual(t.size, len(list(preOrder(fml))), u);
+            self.assertEqual(t.depth, depthOf(fml), u);
+
+    def test_size_computes_no_sets(self):
+        t = asShared(parseFolExpr('P(u) -> (Q(v) -> (R(w) -> S(u, v, w)))'));
+        self.assertEqual(t.size, 13);
+        self.assertEqual(t.depth, 4);
+        self.assertTrue(all([ s._free is None and s._signature is None for s in nodesOf(t) ]));
+
+    def test_free_variables(self):
+        for u, free in FORMULAE:
+            t = asShared(parseFolExpr(u));
+            self.assertEqual(sorted(t.freeVariables), free, u);
+            # stored for the node asked about only:
+            self.assertTrue(all([ s._free is None for s in nodesOf(t) if not s is t and len(s.parts) > 0 ]), u);
+            # by parts, the same:
+            for s in nodesOf(t):
+                object.__setattr__(s, '_free', None);
+            self.assertEqual(sorted(cacheFreeVariables(t)), free, u);
+            self.assertTrue(all([ s._free is not None for s in nodesOf(t) ]), u);
+
+    def test_signature(self):
+        t = asShared(parseFolExpr('P(x) -> ((all x. Q(f(x), {c})) && P(g({c}, y)))'));
+        expected = [
+            ('constant', '{c}', 0),
+            ('functionexpression', 'f', 1),
+            ('functionexpression', 'g', 2),
+            ('relationexpression', 'P', 1),
+            ('relationexpression', 'Q', 2),
+        ];
+        self.assertEqual(sorted(t.signature), expected);
+        self.assertTrue(all([ s._signature is None for s in nodesOf(t) if not s is t ]));
+        # known signatures below are reused:
+        self.assertEqual(sorted(t.parts[1].signature), expected);
+        object.__setattr__(t, '_signature', None);
+        object.__setattr__(t.parts[1], '_signature', frozenset([ ('constant', '{d}', 0) ]));
+        self.assertEqual(sorted(t.signature), [ ('constant', '{d}', 0), ('relationexpression', 'P', 1) ]);
+        object.__setattr__(t, '_signature', None);
+        object.__setattr__(t.parts[1], '_signature', None);
+
+class TestInterning(unittest.TestCase):
+    def test_threads_agree(self):
+        n, m = 8, 2000;
+        barrier = threading.Barrier(n);
+        results = [ None ] * n;
+        def build(index: int):
+            barrier.wait();
+            results[index] = [ SharedExpression('variable', label='thread_{}'.format(k), isLabelled=True) for k in range(m) ];
+        interval = sys.getswitchinterval();
+        sys.setswitchinterval(1e-6);
+        try:
+            threads = [ threading.Thread(target=build, args=(index,)) for index in range(n) ];
+            for thread in threads:
+                thread.start();
+            for thread in threads:
+                thread.join();
+        finally:
+            sys.setswitchinterval(interval);
+        for k in range(m):
+            self.assertTrue(all([ result[k] is results[0][k] for result in results ]), k);
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import io;
+import unittest;
+
+from src.fol.stream import FolRecordError;
+from src.fol.stream import parseFolStream;
+from src.fol.stream import readFolRecords;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def records(text: str, **options):
+    return list(readFolRecords(io.StringIO(text), **options));
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestReadFolRecords(unittest.TestCase):
+    def test_separators(self):
+        result = records('P(x,\n  y), Q(x)\n\n  R({a,b})\n');
+        self.assertEqual([ r.text for r in result ], [ 'P(x,\n  y)', 'Q(x)', 'R({a,b})' ]);
+        self.assertEqual([ (r.line, r.column, r.offset) for r in result ], [ (1, 1, 0), (2, 7, 11), (4, 3, 19) ]);
+
+    def test_apostrophe_in_braces(self):
+        result = records('P({it\'s})\nQ(x)\nR(y)\n', chunksize=3);
+        self.assertEqual([ r.text for r in result ], [ 'P({it\'s})', 'Q(x)', 'R(y)' ]);
+        fmls = list(parseFolStream(io.StringIO('P({it\'s}), Q(\'a, b\')\nR(y)\n')));
+        self.assertFalse(any([ isinstance(fml, FolRecordError) for fml in fmls ]));
+        self.assertEqual([ str(fml) for fml in fmls ], [ 'P({it\'s})', 'Q({a, b})', 'R(y)' ]);
+
+    def test_unbalanced_bracket_at_end(self):
+        result = records('Q(x)\nP(x\nR(y)\n');
+        self.assertEqual(result[0].text, 'Q(x)');
+        self.assertIsInstance(result[1], FolRecordError);
+        self.assertEqual((result[1].text, result[1].line, result[1].column), ('P(x', 2, 1));
+        # reading resumes at the line after the unbalanced one:
+        self.assertEqual((result[2].text, result[2].line, result[2].column, result[2].offset), ('R(y)', 3, 1, 9));
+        self.assertEqual(len(result), 3);
+
+    def test_unbalanced_bracket_is_capped(self):
+        text = 'P(x\n' + ''.join([ 'Q(x{})\n'.format(k) for k in range(10) ]);
+        result = records(text, maxLines=3);
+        self.assertIsInstance(result[0], FolRecordError);
+        self.assertEqual((result[0].line, result[0].column), (1, 1));
+        # the record gave up after 3 line breaks in brackets; the lines after the first are read again:
+        self.assertEqual([ r.text for r in result[1:] ], [ 'Q(x{})'.format(k) for k in range(10) ]);
+        self.assertEqual(result[1].line, 2);
+
+    def test_resynchronise(self):
+        for chunksize in [ 1, 3, 1 << 16 ]:
+            result = list(parseFolStream(io.StringIO('P(x)\nbad((\nQ(y)'), chunksize=chunksize));
+            self.assertEqual(str(result[0]), 'P(x)');
+            self.assertIsInstance(result[1], FolRecordError);
+            self.assertEqual((result[1].text, result[1].line), ('bad((', 2));
+            self.assertEqual(str(result[2]), 'Q(y)');
+            self.assertEqual(len(result), 3);
+        # every line of a multi-line unbalanced record is either kept or reported:
+        result = records('A, B(\nC(\nD(x,\n y)\n', chunksize=2);
+        self.assertEqual([ (r.text, isinstance(r, FolRecordError)) for r in result ], [
+            ('A', False), ('B(', True), ('C(', True), ('D(x,\n y)', False),
+        ]);
+        self.assertEqual([ (r.line, r.column, r.offset) for r in result ], [ (1, 1, 0), (1, 4, 3), (2, 1, 6), (3, 1, 9) ]);
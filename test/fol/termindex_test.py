@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import random;
+import unittest;
+
+from src.fol.parser import parseFolExpr;
+from src.fol.termindex import DiscriminationTree;
+from src.fol.unification import asTerm;
+from src.fol.unification import match;
+from src.fol.unification import unify;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def term(u: str):
+    return asTerm(parseFolExpr(u));
+
+def randomTerm(rng: random.Random, depth: int, variables) -> str:
+    r = rng.random();
+    if depth == 0 or r < 0.3:
+        return rng.choice(variables) if rng.random() < 0.5 else rng.choice([ '{a}', '{b}' ]);
+    elif r < 0.65:
+        return 'f({})'.format(randomTerm(rng, depth - 1, variables));
+    return 'g({}, {})'.format(randomTerm(rng, depth - 1, variables), randomTerm(rng, depth - 1, variables));
+
+def found(entries):
+    return sorted([ (str(t), value) for t, value, _ in entries ]);
+
+def scan(stored, check):
+    return sorted([ (str(t), value) for value, t in enumerate(stored) if check(t) is not None ]);
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestRetrieval(unittest.TestCase):
+    def test_against_linear_scan(self):
+        rng = random.Random(9);
+        # stored terms and queries do not share variables:
+        stored = [ term(randomTerm(rng, 3, [ 'x', 'y', 'z' ])) for _ in range(300) ];
+        index = DiscriminationTree();
+        for value, t in enumerate(stored):
+            index.insert(t, value);
+        self.assertEqual(len(index), len(stored));
+        counts = [ 0, 0, 0 ];
+        for _ in range(200):
+            query = term(randomTerm(rng, 3, [ 'u', 'w' ]));
+            expected = [
+                scan(stored, lambda s: match(s, query)),
+                scan(stored, lambda s: match(query, s)),
+                scan(stored, lambda s: unify(s, query)),
+            ];
+            results = [ index.generalizations(query), index.instances(query), index.unifiable(query) ];
+            for k in range(3):
+                self.assertEqual(found(results[k]), expected[k], str(query));
+                counts[k] += len(expected[k]);
+            # the substitutions are those of match/unify:
+            for s, _, sigma in results[0]:
+                self.assertEqual(sigma, match(s, query));
+            for s, _, sigma in results[2]:
+                self.assertEqual(sigma, unify(s, query));
+        self.assertTrue(all([ count > 0 for count in counts ]));
+
+    def test_repeated_variables(self):
+        index = DiscriminationTree();
+        index.insert(term('g(x, x)'), 'same');
+        index.insert(term('g(x, y)'), 'any');
+        self.assertEqual([ value for _, value, _ in index.generalizations(term('g({a}, {b})')) ], [ 'any' ]);
+        self.assertEqual(sorted([ value for _, value, _ in index.generalizations(term('g({a}, {a})')) ]), [ 'any', 'same' ]);
+        self.assertEqual(sorted([ value for _, value, _ in index.unifiable(term('g(u, f(u))')) ]), [ 'any' ]);
+
+    def test_atoms_and_terms(self):
+        # f(x) as parsed at the top (an atom) and inside a formula (a term) is found under the same path:
+        index = DiscriminationTree();
+        index.insert(parseFolExpr('f(x)'), 'parsed');
+        index.insert(parseFolExpr('P(f({a}))').parts[0], 'subterm');
+        self.assertEqual(len(index.instances(parseFolExpr('f(u)'))), 2);
+        self.assertEqual(len(index.generalizations(parseFolExpr('Q(f({a}))').parts[0])), 2);
+        self.assertEqual(len(index.unifiable(term('f({a})'))), 2);
+        self.assertTrue(index.remove(parseFolExpr('P(f({a}))').parts[0], 'subterm'));
+        self.assertTrue(index.remove(term('f(x)'), 'parsed'));
+        self.assertEqual(len(index), 0);
+
+class TestRemove(unittest.TestCase):
+    def test_pruning(self):
+        rng = random.Random(10);
+        stored = [ term(randomTerm(rng, 3, [ 'x', 'y' ])) for _ in range(100) ];
+        index = DiscriminationTree();
+        for value, t in enumerate(stored):
+            index.insert(t, value);
+        # wrong value or unknown term:
+        self.assertFalse(index.remove(stored[0], -1));
+        self.assertFalse(index.remove(term('h({a})'), 0));
+        self.assertEqual(len(index), len(stored));
+        order = list(range(len(stored)));
+        rng.shuffle(order);
+        for k, value in enumerate(order):
+            self.assertTrue(index.remove(stored[value], value));
+            self.assertFalse(index.remove(stored[value], value));
+            self.assertEqual(len(index), len(stored) - k - 1);
+            if k % 10 == 0:
+                rest = sorted([ (str(stored[v]), v) for v in order[k + 1:] ]);
+                self.assertEqual(sorted([ (str(t), value) for t, value in index ]), rest);
+                self.assertEqual(found(index.instances(term('u'))), rest);
+        # no empty paths are left behind:
+        self.assertEqual(len(index.root.children), 0);
+        self.assertEqual(len(index.root.entries), 0);
+
+    def test_shared_prefix(self):
+        index = DiscriminationTree();
+        index.insert(term('g(f(x), {a})'), 1);
+        index.insert(term('g(f(x), {b})'), 2);
+        index.insert(term('g(f(x), {b})'), 3);
+        index.remove(term('g(f(x), {b})'), 2);
+        self.assertEqual(found(index.instances(term('g(u, w)'))), [ ('g(f(x),{a})', 1), ('g(f(x),{b})', 3) ]);
+        index.remove(term('g(f(x), {b})'), 3);
+        # the common prefix g, f, * stays, the branch {b} is pruned:
+        node = index.root;
+        for key in [ ('functionexpression', 'g', 2), ('functionexpression', 'f', 1), ('variable', '*', 0) ]:
+            self.assertEqual(len(node.children), 1);
+            node = node.children[key];
+        self.assertEqual(list(node.children), [ ('constant', '{a}', 0) ]);
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import random;
+import time;
+import unittest;
+from typing import Dict;
+from typing import Union;
+
+from src.fol.normalform import substitute;
+from src.fol.parser import parseFolExpr;
+from src.fol.unification import asTerm;
+from src.fol.unification import isInstance;
+from src.fol.unification import match;
+from src.fol.unification import unify;
+from src.fol.unification import unifyAll;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def term(u: str):
+    return asTerm(parseFolExpr(u));
+
+def randomTerm(rng: random.Random, depth: int, variables) -> str:
+    r = rng.random();
+    if depth == 0 or r < 0.3:
+        return rng.choice(variables) if rng.random() < 0.6 else rng.choice([ '{a}', '{b}' ]);
+    elif r < 0.65:
+        return 'f({})'.format(randomTerm(rng, depth - 1, variables));
+    return 'g({}, {})'.format(randomTerm(rng, depth - 1, variables), randomTerm(rng, depth - 1, variables));
+
+def reference(s, t, sigma: Union[Dict, None] = None) -> Union[Dict, None]:
+    # textbook recursive unification with eager substitution and occurs check
+    sigma = dict() if sigma is None else sigma;
+    s = resolve(s, sigma);
+    t = resolve(t, sigma);
+    if s.kind == 'variable' and t.kind == 'variable' and s.label == t.label:
+        return sigma;
+    elif s.kind == 'variable':
+        return None if s.label in labelsOf(t, sigma) else { **sigma, s.label: t };
+    elif t.kind == 'variable':
+        return reference(t, s, sigma);
+    elif (s.kind, s.label, len(s.parts)) != (t.kind, t.label, len(t.parts)):
+        return None;
+    for a, b in zip(s.parts, t.parts):
+        sigma = reference(a, b, sigma);
+        if sigma is None:
+            return None;
+    return sigma;
+
+def resolve(t, sigma):
+    while t.kind == 'variable' and t.label in sigma:
+        t = sigma[t.label];
+    return t;
+
+def labelsOf(t, sigma):
+    t = resolve(t, sigma);
+    if t.kind == 'variable':
+        return set([ t.label ]);
+    return set().union(*[ labelsOf(part, sigma) for part in t.parts ]);
+
+def resolveAll(t, sigma):
+    return substitute(t, { x: substituteAll(u, sigma) for x, u in sigma.items() });
+
+def substituteAll(t, sigma):
+    # applies the (triangular) reference unifier until nothing changes
+    while True:
+        u = substitute(t, sigma);
+        if u == t:
+            return t;
+        t = u;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestUnify(unittest.TestCase):
+    def test_examples(self):
+        sigma = unify(parseFolExpr('P(x, f(y))'), parseFolExpr('P(g(z), f(x))'));
+        self.assertEqual({ x: str(t) for x, t in sigma.items() }, { 'x': 'g(z)', 'y': 'g(z)' });
+        self.assertIsNone(unify(parseFolExpr('P(x, {a})'), parseFolExpr('P(y, {b})')));
+        self.assertIsNone(unify(parseFolExpr('P(x)'), parseFolExpr('Q(x)')));
+        self.assertIsNone(unify(term('f(x)'), term('f(x, y)')));
+        self.assertEqual(unify(parseFolExpr('P(x)'), parseFolExpr('P(x)')), dict());
+
+    def test_occurs_check(self):
+        self.assertIsNone(unify(term('x'), term('f(x)')));
+        self.assertIsNone(unify(parseFolExpr('P(x, x)'), parseFolExpr('P(y, f(y))')));
+        # only through several bindings:
+        self.assertIsNone(unify(parseFolExpr('P(x, y, z)'), parseFolExpr('P(f(y), g(z, {a}), h(x))')));
+        self.assertIsNone(unifyAll([ (term('x'), term('f(y)')), (term('y'), term('g(x)')) ]));
+        self.assertIsNotNone(unifyAll([ (term('x'), term('f(y)')), (term('y'), term('g(z)')) ]));
+
+    def test_exponential_dag(self):
+        # P(x1, ..., xn) = P(f(x0, x0), ..., f(x(n-1), x(n-1))): x(n) is a term with 2^(n+1) - 1 nodes
+        n = 60;
+        s = parseFolExpr('P({})'.format(', '.join([ 'x{}'.format(k) for k in range(1, n + 1) ])));
+        t = parseFolExpr('P({})'.format(', '.join([ 'f(x{}, x{})'.format(k, k) for k in range(n) ])));
+        start = time.perf_counter();
+        sigma = unify(s, t);
+        self.assertLess(time.perf_counter() - start, 1.0);
+        self.assertEqual(len(sigma), n);
+        self.assertEqual(sigma['x_{{{}}}'.format(n)].size, 2**(n + 1) - 1);
+        self.assertIs(sigma['x_{{{}}}'.format(n)].parts[0], sigma['x_{{{}}}'.format(n - 1)]);
+        # ... and still subject to the occurs check, here through all n bindings (x1 = f(xn, xn)):
+        t = parseFolExpr('P({})'.format(', '.join([ 'f(x{}, x{})'.format(n, n) ] + [ 'f(x{}, x{})'.format(k, k) for k in range(1, n) ])));
+        self.assertTrue(unify(s, t) is None);
+
+    def test_against_reference(self):
+        rng = random.Random(8);
+        outcomes = set();
+        for _ in range(500):
+            s = term(randomTerm(rng, 4, [ 'x', 'y', 'z' ]));
+            t = term(randomTerm(rng, 4, [ 'x', 'y', 'z' ]));
+            sigma = unify(s, t);
+            expected = reference(s, t);
+            self.assertEqual(sigma is None, expected is None, '{} vs {}'.format(s, t));
+            outcomes.add(sigma is None);
+            if sigma is None:
+                continue;
+            # a unifier, which is idempotent:
+            self.assertEqual(substitute(s, sigma), substitute(t, sigma), '{} vs {}'.format(s, t));
+            self.assertTrue(all([ substitute(u, sigma) == u for u in sigma.values() ]));
+            # and most general, i.e. the reference unifier is an instance of it:
+            for x in sigma:
+                u = term(x);
+                self.assertTrue(isInstance(resolveAll(u, expected), substitute(u, sigma)));
+        self.assertEqual(outcomes, set([ True, False ]));
+
+class TestMatch(unittest.TestCase):
+    def test_match_vs_unify(self):
+        s = parseFolExpr('P(x, {a})');
+        t = parseFolExpr('P({b}, y)');
+        # variables of t are constants for match:
+        self.assertIsNone(match(s, t));
+        self.assertIsNotNone(unify(s, t));
+        sigma = match(parseFolExpr('P(x, f(x))'), parseFolExpr('P(g(y), f(g(y)))'));
+        self.assertEqual({ x: str(u) for x, u in sigma.items() }, { 'x': 'g(y)' });
+        self.assertIsNone(match(parseFolExpr('P(x, x)'), parseFolExpr('P({a}, {b})')));
+        self.assertIsNotNone(unify(parseFolExpr('P(x, x)'), parseFolExpr('P(y, {b})')));
+        self.assertIsNone(match(parseFolExpr('P(x, x)'), parseFolExpr('P(y, {b})')));
+        # no occurs check is needed:
+        self.assertEqual({ x: str(u) for x, u in match(term('x'), term('f(x)')).items() }, { 'x': 'f(x)' });
+        self.assertIsNone(unify(term('x'), term('f(x)')));
+
+    def test_extension(self):
+        sigma = match(term('f(x)'), term('f({a})'));
+        self.assertIsNotNone(match(term('g(x, y)'), term('g({a}, {b})'), sigma));
+        self.assertIsNone(match(term('g(x, y)'), term('g({b}, {b})'), sigma));
+        self.assertEqual(list(sigma), [ 'x' ]);
+
+    def test_kinds(self):
+        # the parser reads f(...) at the top as an atom:
+        u = parseFolExpr('P(f(x))').parts[0];
+        self.assertFalse(isInstance(u, parseFolExpr('f(y)')));
+        self.assertTrue(isInstance(u, term('f(y)')));
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import gc;
+import itertools;
+import random;
+import unittest;
+from typing import Dict;
+
+from src.prop.bdd import Bdd;
+from src.prop.bdd import BddManager;
+from src.prop.bdd import areEquivalentBdd;
+from src.prop.parser import parsePropExpr;
+from src.prop.truthtable import areEquivalent;
+from src.prop.truthtable import truthTable;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+ATOMS = [ '{A}', '{B}', '{C}', '{D}', '{E}' ];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def randomFormula(rng: random.Random, depth: int) -> str:
+    r = rng.random();
+    if depth == 0 or r < 0.15:
+        return rng.choice(ATOMS + [ '0', '1' ] if r < 0.02 else ATOMS);
+    elif r < 0.3:
+        return '!{}'.format(randomFormula(rng, depth - 1));
+    connective = rng.choice([ '&&', '||', '->', '<->' ]);
+    return '({} {} {})'.format(randomFormula(rng, depth - 1), connective, randomFormula(rng, depth - 1));
+
+def evaluate(f: Bdd, assignment: Dict[str, bool]) -> bool:
+    manager = f.manager;
+    node = f.node;
+    while node > 1:
+        name = manager.order[manager.level[node]];
+        node = manager.high[node] if assignment[name] else manager.low[node];
+    return node == 1;
+
+def assignments(atoms):
+    for values in itertools.product([ False, True ], repeat=len(atoms)):
+        yield dict(zip(atoms, values));
+    return;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestAgainstTruthTable(unittest.TestCase):
+    def test_functions(self):
+        rng = random.Random(3);
+        manager = BddManager(ATOMS);
+        for _ in range(80):
+            fml = parsePropExpr(randomFormula(rng, 4));
+            table = truthTable(fml, ATOMS);
+            f = manager.fromExpression(fml);
+            for assignment in assignments(ATOMS):
+                self.assertEqual(evaluate(f, assignment), table[assignment], str(fml));
+            self.assertEqual(f.isTautology(), table.isTautology(), str(fml));
+            self.assertEqual(f.isContradiction(), table.isContradiction(), str(fml));
+
+    def test_equivalence(self):
+        rng = random.Random(4);
+        manager = BddManager(ATOMS);
+        fmls = [ parsePropExpr(randomFormula(rng, 3)) for _ in range(40) ];
+        # some pairs that are equivalent without being equal:
+        fmls += [ parsePropExpr(u) for u in [ '{A} -> {B}', '!{A} || {B}', '!({A} && {C})', '!{A} || !{C}', '{A} <-> {A}', '1' ] ];
+        bdds = [ manager.fromExpression(fml) for fml in fmls ];
+        for (fml1, f1), (fml2, f2) in itertools.combinations(zip(fmls, bdds), 2):
+            self.assertEqual(f1 is f2, areEquivalent(fml1, fml2), '{} vs {}'.format(fml1, fml2));
+        self.assertTrue(areEquivalentBdd(*[ parsePropExpr(u) for u in [ '{A} -> {B}', '!{A} || {B}', '!({A} && !{B})' ] ]));
+        self.assertFalse(areEquivalentBdd(parsePropExpr('{A} -> {B}'), parsePropExpr('{B} -> {A}')));
+
+    def test_count_models_and_any_sat(self):
+        rng = random.Random(5);
+        manager = BddManager(ATOMS);
+        for _ in range(80):
+            fml = parsePropExpr(randomFormula(rng, 4));
+            table = truthTable(fml, ATOMS);
+            f = manager.fromExpression(fml);
+            self.assertEqual(f.countModels(), table.countModels(), str(fml));
+            model = f.anySat();
+            if table.isContradiction():
+                self.assertIsNone(model, str(fml));
+                continue;
+            # every completion of the partial assignment is a model:
+            rest = [ atom for atom in ATOMS if not atom in model ];
+            for assignment in assignments(rest):
+                self.assertTrue(table[{ **model, **assignment }], str(fml));
+        # over a prefix of the order:
+        f = manager.fromExpression(parsePropExpr('{A} || {B}'));
+        self.assertEqual(f.countModels(nvars=2), 3);
+        self.assertEqual(f.countModels(), 3 << 3);
+        with self.assertRaises(Exception):
+            f.countModels(nvars=1);
+
+class TestGarbageCollection(unittest.TestCase):
+    def test_live_handles_survive(self):
+        rng = random.Random(6);
+        manager = BddManager(ATOMS, gcThreshold=8);
+        kept = [];
+        for k in range(60):
+            fml = parsePropExpr(randomFormula(rng, 4));
+            f = manager.fromExpression(fml);
+            # keep every third, drop the rest:
+            if k % 3 == 0:
+                kept.append((truthTable(fml, ATOMS), f));
+        self.assertGreater(manager.counters['gcRuns'], 0);
+        self.assertGreater(manager.counters['gcFreed'], 0);
+        gc.collect();
+        manager.collectGarbage();
+        for table, f in kept:
+            for assignment in assignments(ATOMS):
+                self.assertEqual(evaluate(f, assignment), table[assignment]);
+            self.assertEqual(f.countModels(), table.countModels());
+        # canonicity is kept across collections (freed nodes are reused):
+        for table, f in kept:
+            g = manager.false();
+            for model in table.models():
+                cube = manager.true();
+                for atom, value in model.items():
+                    cube = cube & (manager.var(atom) if value else ~manager.var(atom));
+                g = g | cube;
+            self.assertIs(g, f);
+
+    def test_dropped_handles_are_freed(self):
+        manager = BddManager(ATOMS);
+        f = manager.fromExpression(parsePropExpr('({A} <-> {B}) && ({C} <-> {D})'));
+        g = manager.fromExpression(parsePropExpr('{A} || ({B} && {E})'));
+        del g;
+        gc.collect();
+        freed = manager.collectGarbage();
+        self.assertGreater(freed, 0);
+        self.assertEqual(manager.numNodes(), f.size() - 2);
+
+class TestTransfer(unittest.TestCase):
+    def test_different_orders(self):
+        rng = random.Random(7);
+        source = BddManager(ATOMS);
+        target = BddManager(ATOMS[::-1]);
+        for _ in range(30):
+            fml = parsePropExpr(randomFormula(rng, 4));
+            f = source.fromExpression(fml);
+            g = target.transfer(f);
+            self.assertIs(g.manager, target);
+            self.assertIs(g, target.fromExpression(fml));
+            for assignment in assignments(ATOMS):
+                self.assertEqual(evaluate(g, assignment), evaluate(f, assignment));
+            self.assertEqual(g.countModels(), f.countModels());
+        self.assertEqual(target.order, ATOMS[::-1]);
+
+    def test_order_matters_for_size(self):
+        # (x1 <-> y1) && (x2 <-> y2) && (x3 <-> y3): linear if interleaved, exponential if separated
+        pairs = [ ('{x1}', '{y1}'), ('{x2}', '{y2}'), ('{x3}', '{y3}') ];
+        fml = parsePropExpr(' && '.join([ '({} <-> {})'.format(x, y) for x, y in pairs ]));
+        interleaved = BddManager([ a for pair in pairs for a in pair ]).fromExpression(fml);
+        separated = BddManager([ x for x, _ in pairs ] + [ y for _, y in pairs ]);
+        g = separated.transfer(interleaved);
+        self.assertEqual(interleaved.size(), 3*3 + 2);
+        self.assertEqual(g.size(), 2**4 - 1 + 2**3 - 2 + 2);
+        self.assertIs(interleaved.manager.transfer(g), interleaved);
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import gzip;
+import io;
+import os;
+import tempfile;
+import unittest;
+
+from src.prop.dimacs import dimacsToStr;
+from src.prop.dimacs import dumpDimacs;
+from src.prop.dimacs import loadDimacs;
+from src.prop.dimacs import parseDimacs;
+from src.prop.dimacs import readDimacs;
+from src.prop.dimacs import writeDimacs;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+CLAUSES = [ [ 1, -2, 3 ], [ -1 ], [ 2, 4 ], [] ];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestDimacs(unittest.TestCase):
+    def test_round_trip(self):
+        u = dimacsToStr(CLAUSES, comments=[ 'example' ]);
+        self.assertEqual(u, 'c example\np cnf 4 4\n1 -2 3 0\n-1 0\n2 4 0\n0\n');
+        self.assertEqual(parseDimacs(u), (4, CLAUSES));
+        # the header may declare more variables than are used:
+        self.assertEqual(parseDimacs(dimacsToStr(CLAUSES, nvars=7)), (7, CLAUSES));
+        fp = io.StringIO();
+        dumpDimacs(fp, CLAUSES);
+        fp.seek(0);
+        self.assertEqual(loadDimacs(fp), (4, CLAUSES));
+
+    def test_files(self):
+        with tempfile.TemporaryDirectory() as folder:
+            for name in [ 'example.cnf', 'example.cnf.gz' ]:
+                path = os.path.join(folder, name);
+                writeDimacs(path, CLAUSES, comments=[ 'example' ]);
+                self.assertEqual(readDimacs(path), (4, CLAUSES), name);
+            # the .gz file is compressed:
+            with gzip.open(os.path.join(folder, 'example.cnf.gz'), 'rt') as fp:
+                self.assertEqual(fp.read(), dimacsToStr(CLAUSES, comments=[ 'example' ]));
+
+    def test_layout(self):
+        # clauses spanning lines, comments between clauses, a missing final 0:
+        self.assertEqual(parseDimacs('c x\np cnf 3 2\n1 -2\n  3 0\nc y\n-3 2'), (3, [ [ 1, -2, 3 ], [ -3, 2 ] ]));
+
+    def test_terminator(self):
+        u = 'p cnf 3 2\n 1 -3 0\n2 3 -1 0\n%\n0\n\n';
+        self.assertEqual(parseDimacs(u), (3, [ [ 1, -3 ], [ 2, 3, -1 ] ]));
+        self.assertEqual(parseDimacs('p cnf 5 1\n1 2 0\n%\n3 4 5 0\n'), (5, [ [ 1, 2 ] ]));
+
+    def test_invalid(self):
+        with self.assertRaises(Exception):
+            parseDimacs('p dnf 3 2\n1 0\n');
+        with self.assertRaises(Exception):
+            parseDimacs('p cnf 3\n1 0\n');
+        with self.assertRaises(Exception):
+            parseDimacs('p cnf 3 1\n1 x 0\n');
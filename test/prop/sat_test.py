@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import itertools;
+import random;
+import unittest;
+from typing import List;
+
+from src.prop.sat import SatSolver;
+from src.prop.sat import luby;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# AUXILIARY METHODS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def randomCnf(rng: random.Random, nvars: int, nclauses: int, width: int = 3) -> List[List[int]]:
+    return [
+        [ rng.choice([ 1, -1 ]) * x for x in rng.sample(range(1, nvars + 1), width) ]
+        for _ in range(nclauses)
+    ];
+
+def bruteForce(nvars: int, clauses: List[List[int]]) -> bool:
+    for values in itertools.product([ False, True ], repeat=nvars):
+        if satisfies(values, clauses):
+            return True;
+    return False;
+
+def satisfies(values, clauses: List[List[int]]) -> bool:
+    return all([ any([ values[x - 1] if x > 0 else not values[-x - 1] for x in clause ]) for clause in clauses ]);
+
+def pigeonhole(n: int) -> List[List[int]]:
+    # n+1 pigeons in n holes; variable p(i, j): pigeon i sits in hole j
+    p = lambda i, j: i*n + j + 1;
+    clauses = [ [ p(i, j) for j in range(n) ] for i in range(n + 1) ];
+    for j in range(n):
+        for i, k in itertools.combinations(range(n + 1), 2):
+            clauses.append([ -p(i, j), -p(k, j) ]);
+    return clauses;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestSatSolver(unittest.TestCase):
+    def test_random_against_brute_force(self):
+        rng = random.Random(12);
+        outcomes = set();
+        for _ in range(200):
+            nvars = rng.randint(3, 10);
+            clauses = randomCnf(rng, nvars, rng.randint(1, 6*nvars));
+            solver = SatSolver(nvars);
+            status = solver.addClauses(clauses) and solver.solve();
+            self.assertEqual(status, bruteForce(nvars, clauses), clauses);
+            if status:
+                self.assertTrue(satisfies(solver.model, clauses), clauses);
+                self.assertEqual([ solver.value(x + 1) for x in range(nvars) ], solver.model);
+            outcomes.add(status);
+        # both outcomes occur:
+        self.assertEqual(outcomes, set([ True, False ]));
+
+    def test_trivial(self):
+        solver = SatSolver();
+        self.assertTrue(solver.solve());
+        self.assertTrue(solver.addClauses([ [ 1, -1 ], [ 2 ] ]));
+        self.assertTrue(solver.solve());
+        self.assertEqual(solver.modelLiterals()[1], 2);
+        self.assertEqual(len(solver.modelLiterals()), 2);
+        self.assertFalse(solver.addClause([ -2 ]));
+        self.assertFalse(solver.solve());
+        with self.assertRaises(Exception):
+            SatSolver().addClause([ 1, 0 ]);
+
+    def test_assumptions(self):
+        solver = SatSolver();
+        solver.addClauses([ [ 1, 2 ], [ -1, 3 ], [ -2, 3 ] ]);
+        self.assertTrue(solver.solve());
+        self.assertFalse(solver.solve(assumptions=[ -3 ]));
+        self.assertTrue(solver.solve(assumptions=[ -1 ]));
+        self.assertTrue(solver.value(2) and solver.value(3) and not solver.value(1));
+        # assumptions are not kept:
+        self.assertTrue(solver.solve(assumptions=[ 1, -2 ]));
+        self.assertTrue(solver.solve());
+        # assumptions may name new variables:
+        self.assertTrue(solver.solve(assumptions=[ -5 ]));
+        self.assertFalse(solver.value(5));
+
+    def test_pigeonhole(self):
+        for n in [ 2, 3, 4, 5 ]:
+            solver = SatSolver();
+            solver.addClauses(pigeonhole(n));
+            self.assertFalse(solver.solve(), n);
+            # n pigeons fit:
+            solver = SatSolver();
+            solver.addClauses([ clause for clause in pigeonhole(n) if not (len(clause) == n and clause[0] == n*n + 1) ]);
+            self.assertTrue(solver.solve(), n);
+
+    def test_max_conflicts(self):
+        solver = SatSolver();
+        solver.addClauses(pigeonhole(7));
+        self.assertIsNone(solver.solve(maxConflicts=20));
+        # the budget is checked between conflicts, so it is exceeded by at most the last run of conflicts:
+        self.assertGreaterEqual(solver.stats['conflicts'], 20);
+        self.assertLess(solver.stats['conflicts'], 100);
+        # the solver stays usable:
+        self.assertIsNone(solver.solve(maxConflicts=1));
+        solver = SatSolver();
+        solver.addClauses(pigeonhole(4));
+        self.assertFalse(solver.solve(maxConflicts=100000));
+
+    def test_luby(self):
+        self.assertEqual([ luby(k) for k in range(15) ], [ 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8 ]);
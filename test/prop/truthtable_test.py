@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# IMPORTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import itertools;
+import unittest;
+
+from src.prop.parser import parsePropExpr;
+from src.prop.truthtable import TruthTable;
+from src.prop.truthtable import areEquivalent;
+from src.prop.truthtable import atomColumn;
+from src.prop.truthtable import countModels;
+from src.prop.truthtable import isContradiction;
+from src.prop.truthtable import isSatisfiable;
+from src.prop.truthtable import isTautology;
+from src.prop.truthtable import selectRows;
+from src.prop.truthtable import truthTable;
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# GLOBAL CONSTANTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# formula, tautology, contradiction, number of models:
+FORMULAE = [
+    ('{A} || !{A}', True, False, 2),
+    ('{A} && !{A}', False, True, 0),
+    ('({A} -> {B}) <-> (!{B} -> !{A})', True, False, 4),
+    ('({A} && {B}) || {C}', False, False, 5),
+    ('{A} <-> {B}', False, False, 2),
+    ('atom 1 -> (atom 2 -> atom 1)', True, False, 4),
+    ('true', True, False, 1),
+    ('false', False, True, 0),
+    ('0 || false', False, True, 0),
+    ('{A} && (1 || {B})', False, False, 2),
+];
+
+EQUIVALENT = [
+    ('!({A} && {B})', '!{A} || !{B}'),
+    ('{A} -> {B}', '!{A} || {B}'),
+    ('{A} <-> {B}', '({A} -> {B}) && ({B} -> {A})'),
+    ('{A} || ({B} && {C})', '({A} || {B}) && ({A} || {C})'),
+    # atoms missing on one side:
+    ('{A} || ({B} && !{B})', '{A}'),
+    ('{A} && 1', '{A}'),
+];
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# TESTS
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestParsing(unittest.TestCase):
+    def test_atoms(self):
+        fml = parsePropExpr('{A}');
+        self.assertEqual((fml.kind, fml.symbol), ('atom', '{A}'));
+        fml = parsePropExpr('atom 1');
+        self.assertEqual((fml.kind, str(fml)), ('atom', 'atom{1}'));
+        self.assertEqual(truthTable(parsePropExpr('atom 1 && {A}')).atoms, ('atom{1}', '{A}'));
+
+    def test_constants(self):
+        for u in [ 'true', '1' ]:
+            self.assertEqual(parsePropExpr(u).kind, 'tautology', u);
+        # 0 and false are contradictions (not tautologies):
+        for u in [ 'false', '0' ]:
+            self.assertEqual(parsePropExpr(u).kind, 'contradiction', u);
+        self.assertTrue(isContradiction(parsePropExpr('0 || false')));
+        self.assertTrue(isTautology(parsePropExpr('1 && true')));
+
+class TestTruthTable(unittest.TestCase):
+    def test_properties(self):
+        for u, tautology, contradiction, models in FORMULAE:
+            fml = parsePropExpr(u);
+            self.assertEqual(isTautology(fml), tautology, u);
+            self.assertEqual(isContradiction(fml), contradiction, u);
+            self.assertEqual(isSatisfiable(fml), not contradiction, u);
+            self.assertEqual(countModels(fml), models, u);
+
+    def test_models(self):
+        table = truthTable(parsePropExpr('({A} && {B}) || {C}'));
+        models = list(table.models());
+        self.assertEqual(len(models), table.countModels());
+        for assignment in itertools.product([ False, True ], repeat=3):
+            values = dict(zip([ '{A}', '{B}', '{C}' ], assignment));
+            expected = (values['{A}'] and values['{B}']) or values['{C}'];
+            self.assertEqual(table[values], expected);
+            self.assertEqual(values in models, expected);
+
+    def test_equivalent(self):
+        for u, w in EQUIVALENT:
+            self.assertTrue(areEquivalent(parsePropExpr(u), parsePropExpr(w)), (u, w));
+        self.assertFalse(areEquivalent(parsePropExpr('{A} -> {B}'), parsePropExpr('{B} -> {A}')));
+        self.assertFalse(areEquivalent(parsePropExpr('{A}'), parsePropExpr('{B}')));
+
+    def test_explicit_atoms(self):
+        fml = parsePropExpr('{A} && !{B}');
+        table = truthTable(fml, [ '{B}', '{A}' ]);
+        # rows: bit 0 is {B}, bit 1 is {A}; only row 0b10 is a model:
+        self.assertEqual(table.bits, 0b0100);
+        self.assertEqual(table, truthTable(fml).extend([ '{B}', '{A}' ]));
+        with self.assertRaises(Exception):
+            truthTable(fml, [ '{A}' ]);
+        with self.assertRaises(Exception):
+            truthTable(fml).extend([ '{A}', '{C}' ]);
+
+class TestHelpers(unittest.TestCase):
+    def test_atom_column(self):
+        for n in range(0, 6):
+            for i in range(n):
+                column = atomColumn(i, n);
+                self.assertEqual(column, sum([ 1 << r for r in range(1 << n) if (r >> i) & 1 ]), (i, n));
+
+    def test_select_rows(self):
+        # {A} && !{B} over ({A}, {B}) read over the atoms ({C}, {B}, {A}):
+        bits = truthTable(parsePropExpr('{A} && !{B}')).bits;
+        columns = [ atomColumn(2, 3), atomColumn(1, 3) ];
+        result = selectRows(bits, columns, 3);
+        expected = sum([ 1 << r for r in range(8) if (r >> 2) & 1 and not (r >> 1) & 1 ]);
+        self.assertEqual(result, expected);
+        self.assertEqual(TruthTable(('{C}', '{B}', '{A}'), result), truthTable(parsePropExpr('{A} && !{B}')).extend([ '{C}', '{B}', '{A}' ]));
+        # the constant tables:
+        self.assertEqual(selectRows(1, [], 2), 0b1111);
+        self.assertEqual(selectRows(0, [], 2), 0);